@@ -1,12 +1,17 @@
 from http_request_codegen.hrc_api import (
+    LazySnippet,
     generate_http_request_code,
     generate_http_request_md_fenced_code_block,
+    generate_http_request_program,
+    render_variants,
+    write_http_request_code,
 )
 from http_request_codegen.hrc_support import (
     supported_features,
     supported_methods,
 )
 from http_request_codegen.hrc_valuer import (
+    lazy_json_value_by_parameter,
     lazy_name_by_parameter,
     lazy_value_by_parameter,
 )
@@ -15,10 +20,15 @@ from http_request_codegen.hrc_valuer import (
 __version__ = '0.0.8'
 __title__ = 'http-request-codegen'
 __all__ = (
+    'LazySnippet',
     'generate_http_request_code',
     'generate_http_request_md_fenced_code_block',
+    'generate_http_request_program',
+    'lazy_json_value_by_parameter',
     'lazy_name_by_parameter',
     'lazy_value_by_parameter',
+    'render_variants',
     'supported_features',
     'supported_methods',
+    'write_http_request_code',
 )
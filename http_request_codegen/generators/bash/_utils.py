@@ -2,9 +2,69 @@
 
 from http_request_codegen.generators.python._utils import (  # noqa: F401
     escape_by_quote,
+    post_content_type,
 )
 
 
 DEFAULT_INDENT = '    '
 DEFAULT_QUOTE_CHAR = '"'
 DEFAULT_WRAP = 80
+
+# characters escaped by their own escape sequence in ANSI-C quoted strings
+ANSI_C_ESCAPES = {
+    '\\': '\\\\',
+    '\'': '\\\'',
+    '\n': '\\n',
+    '\r': '\\r',
+    '\t': '\\t',
+}
+
+
+def shell_word(string, quote_char=DEFAULT_QUOTE_CHAR):
+    '''Quotes a string to be passed as one word of a Bash command, keeping
+    its value as is. Strings with control characters other than newlines
+    are quoted by ANSI-C quoting (``$'...'``), escaping them, and other
+    strings by the quotation character.
+
+    Args:
+        string (str): String to quote.
+        quote_char (str): Quotation character of the string.
+
+    Raises:
+        ValueError: If the character is an invalid Bash quotation character.
+
+    Examples:
+        >>> print(shell_word('I cost $5 "each"'))
+        "I cost \\$5 \\"each\\""
+
+        >>> print(shell_word("it's", quote_char="'"))
+        'it'\\''s'
+
+        >>> print(shell_word('foo\\r\\nbar'))
+        $'foo\\r\\nbar'
+
+    Returns:
+        str: The quoted string.
+    '''
+    if quote_char not in ('"', '\''):
+        raise ValueError(
+            '\'%s\' is an invalid Bash quotation character' % quote_char,
+        )
+    string = str(string)
+    if any(
+        (ord(character) < 32 and character != '\n') or ord(character) == 127
+        for character in string
+    ):
+        return '$\'%s\'' % ''.join(
+            ANSI_C_ESCAPES.get(character) or (
+                '\\x%02x' % ord(character)
+                if ord(character) < 32 or ord(character) == 127
+                else character
+            ) for character in string
+        )
+    if quote_char == '\'':
+        return '\'%s\'' % string.replace('\'', '\'\\\'\'')
+    return '"%s"' % ''.join(
+        '\\' + character if character in '\\"$`' else character
+        for character in string
+    )
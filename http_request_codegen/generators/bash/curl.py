@@ -14,20 +14,55 @@ from http_request_codegen.generators.bash._utils import (
     DEFAULT_WRAP,
     escape_by_quote,
 )
+from http_request_codegen.hrc_emitter import Emitter
+from http_request_codegen.hrc_http import (
+    MEASURE_PERCENTILES,
+    validate_compress,
+    validate_measure,
+)
+from http_request_codegen.hrc_layout import (
+    LINE,
+    SOFTLINE,
+    Group,
+    Line,
+    Nest,
+    join,
+)
 from http_request_codegen.hrc_valuer import (
+    lazy_json_body_by_parameters,
     lazy_name_by_parameter,
     lazy_value_by_parameter,
 )
 
 
-def _render_options_map(
-    options_map, options_string, url, oneline=False,
-    indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
-):
-    response = ''
-    if not oneline:
-        response += '\\\n'
-    for i, (option, value) in enumerate(options_map):
+# characters escaped in the quoted values of curl config files
+CONFIG_ESCAPES = {
+    '\\': '\\\\',
+    '"': '\\"',
+    '\n': '\\n',
+    '\r': '\\r',
+    '\t': '\\t',
+}
+
+
+def _escape(value, quote_char=DEFAULT_QUOTE_CHAR):
+    # values are kept as they are without quotation character, like the
+    # ones written to config files, which are escaped after
+    if quote_char is None:
+        return value
+    return escape_by_quote(value, quote_char)
+
+
+def _config_value(value):
+    # double quoted value of a curl config file
+    return '"%s"' % ''.join(
+        CONFIG_ESCAPES.get(character, character) for character in str(value)
+    )
+
+
+def _options_strings(options_map, quote_char=DEFAULT_QUOTE_CHAR):
+    options = []
+    for option, value in options_map:
         if value:
             value_string = ' {quote_char}{value}{quote_char}'.format(
                 value=escape_by_quote(value, quote_char),
@@ -35,81 +70,184 @@ def _render_options_map(
             )
         else:
             value_string = ''
-        response += '{indent}{option}{value_string} {newline}'.format(
-            indent=indent if not oneline else '',
-            option=option,
-            value_string=value_string,
-            newline='\\\n' if not oneline else '',
-        )
-    response += '{indent}{url}'.format(
-        indent=indent if not oneline else '',
-        url=url,
+        options.append(option + value_string)
+    return options
+
+
+def _render_options_map(
+    emitter, options_map, url, oneline=False,
+    indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    wrap=DEFAULT_WRAP, pipe=None, body=None,
+):
+    # the command is rendered in one line if fits in the wrap, in other case
+    # each option is rendered in its own line
+    separator = Line(' ', ' \\')
+    options = _options_strings(options_map, quote_char=quote_char)
+    options.append(url)
+    emitter.write_layout(
+        Group([
+            # commands whose output is piped to curl
+            pipe + ' | ' if pipe else '',
+            'curl',
+            Nest(indent, [separator, join(separator, options)]),
+            # body read from the standard input
+            ' <<\'EOF\'' if body is not None else '',
+        ]),
+        wrap=wrap,
+        flat=oneline,
     )
-    return response
+    if body is not None:
+        emitter.write('\n%s\nEOF' % body)
+
+
+def _transfer_options_map(
+    http2=False, tcp_fastopen=False, keepalive_time=None,
+):
+    # options which tune the connections for throughput
+    if keepalive_time is not None and (
+        isinstance(keepalive_time, bool) or
+        not isinstance(keepalive_time, int) or keepalive_time < 1
+    ):
+        raise ValueError(
+            '\'keepalive_time\' must be a positive integer of seconds',
+        )
+    options_map = []
+    if http2:
+        options_map.append(['--http2', None])
+    if tcp_fastopen:
+        options_map.append(['--tcp-fastopen', None])
+    if keepalive_time is not None:
+        # numbers are not quoted
+        options_map.append(['--keepalive-time %d' % keepalive_time, None])
+    return options_map
+
+
+def _measure_options_map(measure=False):
+    # the response is discarded and the timings are written by curl
+    if not measure:
+        return []
+    if measure is True:
+        write_out = (
+            'dns: %{time_namelookup}s connect: %{time_connect}s'
+            ' tls: %{time_appconnect}s ttfb: %{time_starttransfer}s'
+            ' total: %{time_total}s\\n'
+        )
+    else:
+        write_out = '%{time_total}\\n'
+    return [['-s', None], ['-o', '/dev/null'], ['-w', write_out]]
+
+
+def _measure_render(
+    emitter, command, measure, indent=DEFAULT_INDENT, oneline=False,
+    heredoc=False,
+):
+    # the command is performed `measure` times by a loop whose total times,
+    # sorted, are read by awk, which prints their percentiles in
+    # milliseconds; the program of awk is always single quoted because it
+    # defines strings by double quotes
+    if heredoc:
+        # the lines of the heredoc must not be indented
+        command, separator, body = command.partition('<<\'EOF\'\n')
+        command, body = (command + separator, body + '\n')
+    else:
+        body = ''
+    if not oneline:
+        command = ''.join(
+            indent + line for line in command.splitlines(True)
+        ) + ('\n' if not heredoc else '')
+
+    awk_lines = [
+        (0, '{t[NR] = $1 * 1000} END {'),
+        (1, 'n = split("%s", p)' % ' '.join(
+            str(percentile) for percentile in MEASURE_PERCENTILES
+        )),
+        (1, 'for (i = 1; i <= n; i++) {'),
+        (
+            2,
+            'printf "p%d: %.2f ms\\n", p[i], t[int(NR * p[i] / 100) + 1]',
+        ),
+        (1, '}'),
+        (0, '}'),
+    ]
+    if oneline:
+        awk = '{t[NR] = $1 * 1000} END {%s; %s%s}}' % tuple(
+            line for _, line in awk_lines[1:4]
+        )
+    else:
+        awk = '\n'.join(indent * depth + line for depth, line in awk_lines)
+
+    emitter.write((
+        'for _ in $(seq %(measure)d); do%(newline)s%(command)s%(body)s'
+        '%(done_separator)sdone | sort -n | awk \'%(awk)s\''
+    ) % {
+        'measure': measure,
+        'newline': '\n' if not oneline else ' ',
+        'command': command,
+        'body': body,
+        'done_separator': '; ' if oneline and not heredoc else '',
+        'awk': awk,
+    })
+
+
+def _validate_large_body(large_body=None, body_file=None):
+    if large_body is not None and (
+        isinstance(large_body, bool) or
+        not isinstance(large_body, int) or large_body < 0
+    ):
+        raise ValueError(
+            '\'large_body\' must be a non negative integer of characters',
+        )
+    if body_file is not None and not isinstance(body_file, str):
+        raise TypeError('\'body_file\' must be a string')
 
 
 def _build_headers(
     headers, quote_char=DEFAULT_QUOTE_CHAR,
     content_type='application/x-www-form-urlencoded',
 ):
-    map, string = ([], '')
+    map = []
     for name, value in headers.items():
         option = '-H'
         value = ('%(header_name)s: %(header_value)s') % {
             'header_name': name,
-            'header_value': escape_by_quote(str(value), quote_char),
+            'header_value': _escape(str(value), quote_char),
         }
         map.append([option, value])
 
-        string += (' %(option)s %(value)s') % {
-            'option': option,
-            'value': value,
-        }
         if name.lower() == 'content-type':
-            if value in (
+            for _content_type in (
                 'multipart/form-data',
                 'application/json',
                 'application/x-www-form-urlencoded',
                 'text/plain',
             ):
-                content_type = value
-    return (map, string, content_type)
+                if _content_type in str(headers[name]):
+                    content_type = _content_type
+                    break
+    return (map, content_type)
 
 
-def get(
-    url, parameters=[], headers={}, indent=DEFAULT_INDENT,
-    quote_char=DEFAULT_QUOTE_CHAR, setup=False, teardown=None,
-    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None, **kwargs,
-):
-    '''Pass extra options to 'curl' command in ``kwargs`` parameter. For
-    example, to save the response in a file, pass
-    ``kwargs={'-o': 'filename.ext'}``:
+def _program_headers_map(headers, program=None):
+    # headers defined as constants by programs are expanded from arrays
+    headers_name = program.headers_name(headers) if program else None
+    if not headers_name:
+        return None
+    return [['"${%s[@]}"' % headers_name, None]]
 
-    ```bash
-    curl -o "filename.ext"
-    ```
-    '''
-    '''In this implementation, options values and URLs are not wrapped in
-    multiples lines if these values exceed the wrap length.
-    '''
-    response = ''
-
-    if setup:
-        response += str(setup)
 
-    response += 'curl'
-
-    options_string = ''
+def _get_options_map(
+    parameters=[], headers={}, quote_char=DEFAULT_QUOTE_CHAR, seed=None,
+    locale=None, http2=False, tcp_fastopen=False, keepalive_time=None,
+    kwargs={}, program=None,
+):
     options_map = []
     if kwargs or parameters:
         _d_option_included = False
         for option_name, option_value in kwargs.items():
-            options_string += f' {option_name}'
             if option_value:
-                option_value_string = escape_by_quote(
+                option_value_string = _escape(
                     str(option_value), quote_char,
                 )
-                options_string += ' ' + option_value_string
             else:
                 option_value_string = None
             options_map.append([option_name, option_value_string])
@@ -135,61 +273,125 @@ def get(
                 )
                 parameters_dict[parameter_name] = parameter_value
 
-            params_string = escape_by_quote(
+            params_string = _escape(
                 urlencode(parameters_dict),
                 quote_char,
             )
-            options_string += ' -d {quote_char}{params}{quote_char}'.format(
-                quote_char=quote_char,
-                params=params_string,
-            )
             options_map.append(['-d', params_string])
 
     if headers:
-        headers_map, headers_string, _ = _build_headers(
+        headers_map, _ = _build_headers(
             headers,
             quote_char=quote_char,
         )
-        options_map.extend(headers_map)
-        options_string += headers_string
+        options_map.extend(
+            _program_headers_map(headers, program) or headers_map,
+        )
+    options_map.extend(
+        _transfer_options_map(
+            http2=http2, tcp_fastopen=tcp_fastopen,
+            keepalive_time=keepalive_time,
+        ),
+    )
+    return options_map
 
-    # 1 here is a space
-    if len(options_string) + len(url) + len(response) + 1 < wrap:
-        oneline = True
-    response += ' '
 
-    response += _render_options_map(
+def get(
+    url, parameters=[], headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=False, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    http2=False, tcp_fastopen=False, keepalive_time=None, measure=False,
+    _emitter=None, _program=None, **kwargs,
+):
+    '''Pass extra options to 'curl' command in ``kwargs`` parameter. For
+    example, to save the response in a file, pass
+    ``kwargs={'-o': 'filename.ext'}``:
+
+    ```bash
+    curl -o "filename.ext"
+    ```
+
+    Connections can be tuned for throughput with the next arguments:
+
+    - ``http2``: negotiates HTTP/2 passing ``--http2``.
+    - ``tcp_fastopen``: enables TCP Fast Open passing ``--tcp-fastopen``.
+    - ``keepalive_time``: seconds that a connection must be idle before
+      sending keepalive probes, passed as ``--keepalive-time``.
+
+    Passing ``measure=True``, the response is discarded by
+    ``-s -o '/dev/null'`` and the durations in seconds of the phases of the
+    request are written by ``-w``, from the start of the request until the
+    name is resolved (``dns``), the connection is established
+    (``connect``), the TLS handshake is completed (``tls``), the first byte
+    is received (``ttfb``) and the response is received (``total``).
+
+    Passing an integer, the request is performed that number of times by a
+    loop and the percentiles 50, 90 and 99 of their total durations are
+    printed by ``awk``:
+
+    ```bash
+    for _ in $(seq 100); do
+        curl -s -o '/dev/null' -w '%{time_total}\\n' <url>
+    done | sort -n | awk '{t[NR] = $1 * 1000} END {
+        n = split("50 90 99", p)
+        for (i = 1; i <= n; i++) {
+            printf "p%d: %.2f ms\\n", p[i], t[int(NR * p[i] / 100) + 1]
+        }
+    }'
+    ```
+    '''
+    '''In this implementation, options values and URLs are not wrapped in
+    multiples lines if these values exceed the wrap length.
+    '''
+    validate_measure(measure, program=_program)
+    emitter = Emitter() if _emitter is None else _emitter
+
+    if setup:
+        emitter.write(str(setup))
+
+    options_map = _get_options_map(
+        parameters=parameters, headers=headers, quote_char=quote_char,
+        seed=seed, locale=locale, http2=http2, tcp_fastopen=tcp_fastopen,
+        keepalive_time=keepalive_time, kwargs=kwargs, program=_program,
+    )
+    options_map.extend(_measure_options_map(measure))
+
+    # the command is rendered inside a loop if performed multiple times
+    output = emitter if isinstance(measure, bool) else Emitter()
+    _render_options_map(
+        output,
         options_map,
-        options_string,
         url,
         oneline=oneline,
         indent=indent,
         quote_char=quote_char,
+        wrap=wrap if output is emitter else wrap - len(indent),
     )
+    if output is not emitter:
+        _measure_render(
+            emitter, output.getvalue(), measure, indent=indent,
+            oneline=oneline,
+        )
 
     if teardown:
-        response += str(teardown)
+        emitter.write(str(teardown))
 
-    return response
+    return emitter.getvalue()
 
 
-def post(
-    url, parameters=[], files={}, headers={}, indent=DEFAULT_INDENT,
-    quote_char=DEFAULT_QUOTE_CHAR, setup=False, teardown=None,
-    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None, **kwargs,
+def _post_options_map(
+    parameters=[], files={}, headers={}, quote_char=DEFAULT_QUOTE_CHAR,
+    seed=None, locale=None, compress=None, large_body=None, body_file=None,
+    http2=False, tcp_fastopen=False, keepalive_time=None, kwargs={},
+    program=None,
 ):
-    response = ''
-
-    if setup:
-        response += str(setup)
-
-    response += 'curl'
-
-    options_string = ''
+    # returns the options, the command whose output is piped to curl, the
+    # body written in a heredoc and the command which writes the heredoc in
+    # a file, if curl doesn't read it from the standard input
     options_map = []
 
     # Build headers and discover content type
-    headers_map, headers_string, content_type = _build_headers(
+    headers_map, content_type = _build_headers(
         headers,
         quote_char=quote_char,
         content_type='application/x-www-form-urlencoded'
@@ -199,16 +401,8 @@ def post(
     _x_post_defined = False
     if kwargs:
         for option_name, option_value in kwargs.items():
-            options_string += f' {option_name}'
             if option_value:
                 option_value_str = str(option_value)
-                options_string += (
-                    ' %(quote_char)s%(value)s'
-                    '%(quote_char)s'
-                ) % {
-                    'quote_char': quote_char,
-                    'value': option_value_str,
-                }
             else:
                 option_value_str = None
             options_map.append([option_name, option_value_str])
@@ -223,11 +417,26 @@ def post(
 
     # Add method option
     if not _x_post_defined:
-        options_string += ' -X POST'
         options_map.append(['-X', 'POST'])
 
+    validate_compress(
+        compress,
+        content_type if 'multipart/form-data' not in content_type
+        else 'multipart/form-data',
+    )
+
     # Add parameters
-    if parameters:
+    data = None
+    if parameters and content_type == 'application/json':
+        # JSON must accepts other data types than string
+        data = json.dumps(
+            lazy_json_body_by_parameters(
+                parameters,
+                seed=seed,
+                locale=locale,
+            ),
+        )
+    elif parameters:
         parameters_dict = OrderedDict({})
         for parameter in parameters:
             parameter_name = lazy_name_by_parameter(parameter, seed=seed)
@@ -246,19 +455,50 @@ def post(
                     value=param_value,
                 )
                 options_map.append(['-F', option_value])
-                options_string += f' -F {option_value}'
         else:
-            encode_func = json.dumps if content_type == 'application/json' \
-                else urlencode
-
-            option_value = encode_func(parameters_dict)
-            options_map.append(['-d', option_value])
-            options_string += ' -d {quote_char}{params}{quote_char}'.format(
-                quote_char=quote_char,
-                params=option_value,
+            data = urlencode(parameters_dict)
+
+    _validate_large_body(large_body=large_body, body_file=body_file)
+    if body_file is not None and large_body is None:
+        large_body = 0
+
+    pipe, body, body_writer = (None, None, None)
+    if data is not None and large_body is not None and \
+            len(data) >= large_body:
+        if compress:
+            raise ValueError(
+                '\'compress\' argument can\'t be used with large bodies',
             )
-    else:
-        parameters_dict = {}
+        # the body is not passed as an argument, but written in a heredoc,
+        # which doesn't need to be escaped, and read by curl from a file or
+        # from the standard input, stripping the newline added by heredoc
+        if body_file is not None:
+            body_writer = 'cat > %(quote_char)s%(path)s%(quote_char)s' % {
+                'quote_char': quote_char,
+                'path': _escape(body_file, quote_char),
+            }
+            options_map.append(['-d', '@' + body_file])
+        else:
+            options_map.append(['-d', '@-'])
+        body = data
+    elif data is not None and compress:
+        # the body is compressed by other command and read from the
+        # standard input
+        pipe = (
+            'printf %(quote_char)s%%s%(quote_char)s'
+            ' %(quote_char)s%(data)s%(quote_char)s | %(command)s'
+        ) % {
+            'quote_char': quote_char,
+            'data': _escape(data, quote_char),
+            'command': 'gzip' if compress == 'gzip' else (
+                'python3 -c %(quote_char)simport sys, zlib;'
+                ' sys.stdout.buffer.write(zlib.compress('
+                'sys.stdin.buffer.read()))%(quote_char)s'
+            ) % {'quote_char': quote_char},
+        }
+        options_map.append(['--data-binary', '@-'])
+    elif data is not None:
+        options_map.append(['-d', data])
 
     # Add files
     if files:
@@ -288,31 +528,344 @@ def post(
                     file_data = file_data[0]
             option_value = f'{file_param_name}=@'
             option_value += file_data
-            options_string += f' -F {option_value}'
             options_map.append(['-F', option_value])
 
     # Add headers
-    options_string += headers_string
-    options_map.extend(headers_map)
-
-    # 1 here is a space
-    _current_length = len(options_string) + len(url) + len(response) + 1 \
-        + len(headers) * 2 * len(quote_char)
-    if _current_length < wrap:
-        oneline = True
-
-    # Renderize options
-    response += ' '
-    response += _render_options_map(
+    options_map.extend(
+        _program_headers_map(headers, program) or headers_map,
+    )
+    if pipe:
+        options_map.extend([
+            ['-H', 'Content-Encoding: %s' % compress],
+            ['--compressed', None],
+        ])
+    options_map.extend(
+        _transfer_options_map(
+            http2=http2, tcp_fastopen=tcp_fastopen,
+            keepalive_time=keepalive_time,
+        ),
+    )
+    return (options_map, pipe, body, body_writer)
+
+
+def post(
+    url, parameters=[], files={}, headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=False, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    compress=None, large_body=None, body_file=None, http2=False,
+    tcp_fastopen=False, keepalive_time=None, measure=False, _emitter=None,
+    _program=None, **kwargs,
+):
+    '''Bodies built from parameters can be compressed passing
+    ``compress='gzip'`` or ``compress='deflate'``. The body is printed and
+    piped to ``gzip`` or, for ``deflate``, to a ``python3`` one-liner which
+    compresses it by ``zlib``, because the ``zlib`` format has no standard
+    command line encoder. The compressed body is read by ``curl`` from the
+    standard input. The ``--compressed`` option is passed also, so the
+    response is decompressed if the server compresses it:
+
+    ```bash
+    printf '%s' '{"foo": "bar"}' | gzip | curl \\
+        -X 'POST' \\
+        --data-binary '@-' \\
+        -H 'Content-Type: application/json' \\
+        -H 'Content-Encoding: gzip' \\
+        --compressed \\
+        <url>
+    ```
+
+    Bodies built from parameters whose length is at least ``large_body``
+    characters are not passed as arguments, which are limited in size by the
+    system, but written in a heredoc and read by ``curl`` from the standard
+    input. If ``body_file`` is defined, the heredoc is written in that file,
+    which is read by ``curl``, for all the bodies if ``large_body`` is not
+    defined:
+
+    ```bash
+    cat > 'body.json' <<'EOF'
+    {"foo": "bar"}
+    EOF
+    curl -X 'POST' -d '@body.json' -H 'Content-Type: application/json' <url>
+    ```
+
+    Newlines are stripped from the bodies read by ``-d``, so the newline
+    that ends the heredoc is not sent. Large bodies can't be compressed.
+    Connections can be tuned for throughput with ``http2``, ``tcp_fastopen``
+    and ``keepalive_time``, and requests can be measured passing ``measure``,
+    like [``get``](#get). Large bodies written in files are written only
+    once, before the loop which measures the requests.
+    '''
+    validate_measure(measure, program=_program)
+    emitter = Emitter() if _emitter is None else _emitter
+
+    if setup:
+        emitter.write(str(setup))
+
+    options_map, pipe, body, body_writer = _post_options_map(
+        parameters=parameters, files=files, headers=headers,
+        quote_char=quote_char, seed=seed, locale=locale, compress=compress,
+        large_body=large_body, body_file=body_file, http2=http2,
+        tcp_fastopen=tcp_fastopen, keepalive_time=keepalive_time,
+        kwargs=kwargs, program=_program,
+    )
+
+    options_map.extend(_measure_options_map(measure))
+
+    if body_writer is not None:
+        emitter.write('%s <<\'EOF\'\n%s\nEOF\n' % (body_writer, body))
+
+    # Renderize options, inside a loop if performed multiple times
+    output = emitter if isinstance(measure, bool) else Emitter()
+    _render_options_map(
+        output,
         options_map,
-        options_string,
         url,
         oneline=oneline,
         indent=indent,
         quote_char=quote_char,
+        wrap=wrap if output is emitter else wrap - len(indent),
+        pipe=pipe,
+        body=body if body_writer is None else None,
     )
+    if output is not emitter:
+        _measure_render(
+            emitter, output.getvalue(), measure, indent=indent,
+            oneline=oneline, heredoc=body is not None and body_writer is None,
+        )
 
     if teardown:
-        response += str(teardown)
+        emitter.write(str(teardown))
+
+    return emitter.getvalue()
+
+
+# modes of programs performing all the requests concurrently
+BATCH_MODES = ('parallel', 'config', 'xargs')
+
+# maximum number of concurrent transfers of 'curl --parallel' by default
+DEFAULT_CONCURRENCY = 50
+
+
+def _validate_batch(batch, concurrency):
+    if batch is not None and batch not in BATCH_MODES:
+        raise ValueError(
+            '\'batch\' must be one of %s' % ', '.join(
+                '\'%s\'' % mode for mode in BATCH_MODES
+            ),
+        )
+    if concurrency is not None:
+        if batch is None:
+            raise ValueError('\'concurrency\' argument requires \'batch\'')
+        if isinstance(concurrency, bool) or not isinstance(concurrency, int):
+            raise TypeError('\'concurrency\' must be an integer')
+        if concurrency < 1:
+            raise ValueError('\'concurrency\' must be greater than 0')
+
 
+def _batch_options(
+    program, quote_char=DEFAULT_QUOTE_CHAR, headers_constants=True,
+):
+    # options maps and URL of each request of a batch program
+    response = []
+    for func, kwargs in program.requests:
+        kwargs = dict(kwargs)
+        url = kwargs.pop('url')
+        arguments = {
+            argument: kwargs.pop(argument)
+            for argument in (
+                'parameters', 'headers', 'seed', 'locale', 'http2',
+                'tcp_fastopen', 'keepalive_time',
+            ) if argument in kwargs
+        }
+        validate_measure(kwargs.pop('measure', False), program=program)
+        _program = program if headers_constants else None
+        if func is post:
+            for argument in ('files', 'compress', 'large_body', 'body_file'):
+                if argument in kwargs:
+                    arguments[argument] = kwargs.pop(argument)
+            options_map, pipe, body, _ = _post_options_map(
+                quote_char=quote_char, kwargs=kwargs, program=_program,
+                **arguments,
+            )
+            if pipe:
+                raise ValueError(
+                    '\'compress\' argument can\'t be used by batch programs',
+                )
+            if body is not None:
+                raise ValueError(
+                    'Large bodies can\'t be written by batch programs',
+                )
+        else:
+            options_map = _get_options_map(
+                quote_char=quote_char, kwargs=kwargs, program=_program,
+                **arguments,
+            )
+        response.append((options_map, str(url)))
     return response
+
+
+def _batch_render(
+    emitter, program, batch, concurrency=None, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, wrap=DEFAULT_WRAP,
+):
+    parallel_options = ['--parallel']
+    if concurrency is not None:
+        parallel_options.append('--parallel-max %d' % concurrency)
+
+    if batch == 'parallel':
+        # one 'curl' process performs all the requests, separated by
+        # '--next', so connections are reused between them
+        separator = Line(' ', ' \\')
+        requests_docs = [
+            Group(
+                Nest(
+                    indent,
+                    join(
+                        separator,
+                        _options_strings(options_map, quote_char=quote_char) +
+                        [url],
+                    ),
+                ),
+            ) for options_map, url in _batch_options(
+                program, quote_char=quote_char,
+            )
+        ]
+        emitter.write_layout(
+            Group([
+                'curl ' + ' '.join(parallel_options),
+                Nest(indent, [
+                    separator,
+                    join([separator, '--next', separator], requests_docs),
+                ]),
+            ]),
+            wrap=wrap,
+        )
+        emitter.write('\n')
+    elif batch == 'config':
+        # the requests are read from a config file passed in the standard
+        # input, whose values are quoted with double quotes and escaped as
+        # curl config files require, from the values not escaped
+        emitter.write(
+            'curl %s --config - <<\'EOF\'\n' % ' '.join(parallel_options),
+        )
+        requests_lines = []
+        for options_map, url in _batch_options(
+            program, quote_char=None, headers_constants=False,
+        ):
+            requests_lines.append(
+                ''.join(
+                    option + (
+                        ' ' + _config_value(value) if value else ''
+                    ) + '\n' for option, value in options_map
+                ) + 'url = %s\n' % _config_value(url),
+            )
+        emitter.write('next\n'.join(requests_lines))
+        emitter.write('EOF\n')
+    else:
+        # each line are the arguments of a 'curl' process executed by xargs,
+        # quoted with single quotes because xargs doesn't support escaped
+        # characters between double quotes, and never wrapped because
+        # 'xargs -L 1' doesn't join lines continued by backslashes
+        emitter.write(
+            'xargs -P %d -L 1 curl <<\'EOF\'\n' % (
+                DEFAULT_CONCURRENCY if concurrency is None else concurrency
+            ),
+        )
+        for options_map, url in _batch_options(
+            program, quote_char='\'', headers_constants=False,
+        ):
+            emitter.write(
+                ' '.join(
+                    _options_strings(options_map, quote_char='\'') + [url],
+                ) + '\n',
+            )
+        emitter.write('EOF\n')
+
+
+def program(
+    program, indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    setup=True, teardown=None, wrap=DEFAULT_WRAP, batch=None,
+    concurrency=None, _emitter=None,
+):
+    '''Programs are rendered as Bash scripts, with a shebang as default
+    ``setup``. Headers defined by more than one request are defined once as
+    arrays of options, expanded by each command:
+
+    ```bash
+    #!/usr/bin/env bash
+
+    HEADERS_1=(-H 'Accept: application/json')
+
+    curl "${HEADERS_1[@]}" <url>
+    ...
+    ```
+
+    Each request is performed by its own ``curl`` command, so connections
+    are not shared between requests. To perform all the requests
+    concurrently pass ``batch`` with one of the next modes, limiting the
+    number of concurrent requests with ``concurrency``:
+
+    - ``'parallel'``: one ``curl --parallel`` command with the options of
+      each request separated by ``--next``, which reuses connections.
+    - ``'config'``: one ``curl --parallel`` command which reads the options
+      of the requests from a config file passed in the standard input,
+      quoted with double quotes.
+    - ``'xargs'``: ``xargs -P`` executes a ``curl`` command for each line of
+      its standard input, at most 50 concurrently by default. Options are
+      quoted with single quotes.
+
+    ```bash
+    curl --parallel --parallel-max 4 \\
+        "${HEADERS_1[@]}" <url> \\
+        --next \\
+        -X 'POST' -d 'foo=bar' <url>
+    ```
+
+    Request bodies can't be compressed by batch programs.
+    '''
+    _validate_batch(batch, concurrency)
+
+    emitter = Emitter() if _emitter is None else _emitter
+    if setup:
+        emitter.write(
+            '#!/usr/bin/env bash\n\n' if setup is True else str(setup),
+        )
+
+    # config files and xargs lines can't expand arrays of headers
+    headers_constants = program.headers_constants if batch in (
+        None, 'parallel',
+    ) else []
+    for name, headers in headers_constants:
+        headers_map, _ = _build_headers(headers, quote_char=quote_char)
+        options = [
+            '{option} {quote_char}{value}{quote_char}'.format(
+                option=option, value=value, quote_char=quote_char,
+            ) for option, value in headers_map
+        ]
+        emitter.write_layout(
+            Group([
+                name + '=(',
+                Nest(indent, [SOFTLINE, join(LINE, options)]),
+                SOFTLINE,
+                ')',
+            ]),
+            wrap=wrap,
+        )
+        emitter.write('\n\n')
+
+    if batch is not None:
+        _batch_render(
+            emitter, program, batch, concurrency=concurrency, indent=indent,
+            quote_char=quote_char, wrap=wrap,
+        )
+    else:
+        for func, kwargs in program.requests:
+            func(
+                indent=indent, quote_char=quote_char, setup=False, wrap=wrap,
+                _emitter=emitter, _program=program, **kwargs,
+            )
+            emitter.write('\n')
+
+    if teardown:
+        emitter.write(str(teardown))
+    return emitter.getvalue()
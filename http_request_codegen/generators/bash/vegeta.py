@@ -0,0 +1,341 @@
+'''Bash vegeta load testing scripts generator.'''
+
+from http_request_codegen.generators.bash._utils import (
+    DEFAULT_INDENT,
+    DEFAULT_QUOTE_CHAR,
+    DEFAULT_WRAP,
+    post_content_type,
+    shell_word,
+)
+from http_request_codegen.hrc_emitter import Emitter
+from http_request_codegen.hrc_exceptions import (
+    raise_post_text_plain_n_parameters_not_1,
+)
+from http_request_codegen.hrc_http import body_headers
+from http_request_codegen.hrc_valuer import (
+    body_chunks_by_parameters,
+    resolve_parameters_variants,
+)
+
+
+# extensions of the files which store the bodies, by content type
+BODY_FILES_EXTENSIONS = {
+    'application/json': 'json',
+    'multipart/form-data': 'bin',
+}
+
+
+def _validate_options(rate=None, duration=None, program=None):
+    if program is not None:
+        for argument, value in (('rate', rate), ('duration', duration)):
+            if value is not None:
+                raise ValueError(
+                    (
+                        '\'%s\' is defined for the whole program, it can\'t'
+                        ' be defined by requests'
+                    ) % argument,
+                )
+    if rate is not None and (
+        isinstance(rate, bool) or not isinstance(rate, int) or rate < 1
+    ):
+        raise ValueError(
+            '\'rate\' argument must be a positive integer, but \'%s\''
+            ' passed' % (rate,),
+        )
+    if duration is not None and not isinstance(duration, str):
+        raise TypeError(
+            '\'duration\' argument must be a string, like \'30s\', but'
+            ' \'%s\' passed' % type(duration).__name__,
+        )
+
+
+def _body_write(chunks, filename, quote_char=DEFAULT_QUOTE_CHAR):
+    # command which writes a body to the file read by vegeta, concatenating
+    # the contents of the files with the encoded parts of the body
+    commands = []
+    for chunk in chunks:
+        if isinstance(chunk, tuple):
+            commands.append('cat %s' % shell_word(chunk[0], quote_char))
+        elif chunk or len(chunks) == 1:
+            commands.append(
+                'printf \'%%s\' %s' % shell_word(chunk, quote_char),
+            )
+    if len(commands) == 1:
+        return '%s > %s' % (commands[0], filename)
+    return '{ %s; } > %s' % ('; '.join(commands), filename)
+
+
+def _request_targets(
+    method, url, parameters=[], files={}, headers={}, seed=None,
+    locale=None, variants=None, quote_char=DEFAULT_QUOTE_CHAR,
+    body_filename=None,
+):
+    # returns the commands which write the bodies of the request and the
+    # lines of its targets, one by variant, whose parameters are resolved
+    # in bulk before rendering them
+    content_type = None
+    if method == 'post':
+        content_type = post_content_type(headers, files)
+        if content_type == 'text/plain' and len(parameters) != 1:
+            raise_post_text_plain_n_parameters_not_1(len(parameters))
+        if parameters or files:
+            headers = body_headers(headers, content_type)
+    headers_lines = [
+        '%s: %s' % (name, value) for name, value in headers.items()
+    ]
+
+    url, writes, targets = (str(url), [], [])
+    for variant_parameters in resolve_parameters_variants(
+        parameters, 1 if variants is None else variants, seed=seed,
+        locale=locale,
+    ):
+        target_url, body_line = (url, [])
+        if method == 'get' and variant_parameters:
+            target_url += ('&' if '?' in url else '?') + \
+                body_chunks_by_parameters(
+                    'application/x-www-form-urlencoded', variant_parameters,
+                )[0]
+        elif method == 'post' and (variant_parameters or files):
+            filename = '%s.%s' % (
+                body_filename(),
+                BODY_FILES_EXTENSIONS.get(content_type, 'txt'),
+            )
+            writes.append(
+                _body_write(
+                    body_chunks_by_parameters(
+                        content_type, variant_parameters, files=files,
+                        seed=seed, locale=locale,
+                    ),
+                    filename,
+                    quote_char=quote_char,
+                ),
+            )
+            body_line = ['@' + filename]
+        targets.append(
+            ['%s %s' % (method.upper(), target_url)] + headers_lines +
+            body_line,
+        )
+    return (writes, targets)
+
+
+def _body_filename_func(program=None):
+    # names of the files which store the bodies, unique in the script
+    if program is not None:
+        return lambda: program.variable_name('body')
+
+    names = []
+
+    def body_filename():
+        names.append('body' if not names else 'body%d' % (len(names) + 1))
+        return names[-1]
+    return body_filename
+
+
+def _attack_render(
+    emitter, writes, targets, rate=None, duration=None,
+    quote_char=DEFAULT_QUOTE_CHAR, oneline=False,
+):
+    newline = '\n' if not oneline else ' '
+    for write in writes:
+        emitter.write(write + (';' if oneline else '') + newline)
+    if writes and not oneline:
+        emitter.write('\n')
+
+    command = 'vegeta attack'
+    if rate is not None:
+        command += ' -rate=%d' % rate
+    if duration is not None:
+        command += ' -duration=%s' % shell_word(duration, quote_char)
+
+    if oneline:
+        # the targets can't be defined by a here document in one line, so
+        # they are printed one by line
+        lines = []
+        for target in targets:
+            lines.extend(target + [''])
+        emitter.write(
+            'printf \'%%s\\n\' %s | %s | vegeta report' % (
+                ' '.join(shell_word(line, quote_char) for line in lines[:-1]),
+                command,
+            ),
+        )
+    else:
+        # targets are read from the standard input, separated by empty lines
+        emitter.write('%s <<\'EOF\' | vegeta report\n' % command)
+        emitter.write(
+            '\n'.join(''.join(line + '\n' for line in target)
+                      for target in targets),
+        )
+        emitter.write('EOF\n')
+
+
+def _render(
+    emitter, method, url, parameters=[], files={}, headers={},
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, seed=None, locale=None, variants=None, rate=None,
+    duration=None,
+):
+    _validate_options(rate=rate, duration=duration)
+    writes, targets = _request_targets(
+        method, url, parameters=parameters, files=files, headers=headers,
+        seed=seed, locale=locale, variants=variants, quote_char=quote_char,
+        body_filename=_body_filename_func(),
+    )
+
+    if isinstance(setup, str):
+        emitter.write(setup)
+    elif setup:
+        emitter.write('#!/usr/bin/env bash\n' + ('\n' if not oneline else ''))
+    _attack_render(
+        emitter, writes, targets, rate=rate, duration=duration,
+        quote_char=quote_char, oneline=oneline,
+    )
+    if teardown:
+        emitter.write(str(teardown))
+
+
+def get(
+    url, parameters=[], headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    variants=None, rate=None, duration=None, _emitter=None, _program=None,
+    **kwargs,
+):
+    '''Renders a Bash script which performs a load test by
+    [vegeta](https://github.com/tsenart/vegeta), passing the request as a
+    target in its HTTP format, by a here document, to ``vegeta attack``,
+    whose results are printed by ``vegeta report``. The parameters are
+    encoded in the query of the URL and the initialization snippet is a
+    shebang:
+
+    ```bash
+    #!/usr/bin/env bash
+
+    vegeta attack -rate=100 -duration="30s" <<'EOF' | vegeta report
+    GET http://localhost/?foo=bar
+    Accept: application/json
+    EOF
+    ```
+
+    The number of requests per second and the duration of the attack are
+    passed by ``rate`` and ``duration``, which are not passed to vegeta if
+    they are not defined.
+
+    Passing ``variants``, the parameters are resolved that number of times
+    when the script is generated, defining one target by variant, which
+    vegeta performs in turn, so it does no work building requests while
+    it's running. If a ``seed`` is passed, the variant ``i`` is resolved
+    using ``seed + i`` as seed. vegeta targets have no options, so
+    ``kwargs`` are ignored, and they are not wrapped in multiple lines.
+    '''
+    emitter = Emitter() if _emitter is None else _emitter
+    _render(
+        emitter, 'get', url, parameters=parameters, headers=headers,
+        quote_char=quote_char, setup=setup, teardown=teardown,
+        oneline=oneline, seed=seed, locale=locale, variants=variants,
+        rate=rate, duration=duration,
+    )
+    return emitter.getvalue()
+
+
+def post(
+    url, parameters=[], files={}, headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    variants=None, rate=None, duration=None, _emitter=None, _program=None,
+    **kwargs,
+):
+    '''POST method code generator for vegeta, which accepts the same
+    arguments that the [GET method generator](#get). The body is encoded
+    when the script is generated, depending on the ``Content-Type`` header,
+    and written to a file read by vegeta, referenced by the target. Forms
+    whose content type is not defined and ``multipart/form-data`` bodies,
+    whose boundary is defined by the generator, define it in the target.
+    The files of ``multipart/form-data`` bodies are concatenated with the
+    encoded parts of the body:
+
+    ```bash
+    #!/usr/bin/env bash
+
+    { printf '%s' $'--...\\r\\n...\\r\\n\\r\\n'; cat "<path>"; \
+printf '%s' $'\\r\\n--...--\\r\\n'; } > body.bin
+
+    vegeta attack <<'EOF' | vegeta report
+    POST http://localhost
+    Content-Type: multipart/form-data; boundary=...
+    @body.bin
+    EOF
+    ```
+    '''
+    emitter = Emitter() if _emitter is None else _emitter
+    _render(
+        emitter, 'post', url, parameters=parameters, files=files,
+        headers=headers, quote_char=quote_char, setup=setup,
+        teardown=teardown, oneline=oneline, seed=seed, locale=locale,
+        variants=variants, rate=rate, duration=duration,
+    )
+    return emitter.getvalue()
+
+
+def program(
+    program, indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    setup=True, teardown=None, wrap=DEFAULT_WRAP, rate=None, duration=None,
+    _emitter=None,
+):
+    '''Requests of programs, and the variants of each one, are performed by
+    the same attack, which defines one target by variant. Its ``rate`` and
+    ``duration`` are defined for the whole program, so they can't be
+    defined by requests:
+
+    ```bash
+    #!/usr/bin/env bash
+
+    printf '%s' "foo=bar" > body.txt
+
+    vegeta attack -rate=100 <<'EOF' | vegeta report
+    GET http://localhost/a
+    Accept: application/json
+
+    POST http://localhost/b
+    Content-Type: application/x-www-form-urlencoded
+    @body.txt
+    EOF
+    ```
+    '''
+    _validate_options(rate=rate, duration=duration)
+    emitter = Emitter() if _emitter is None else _emitter
+
+    writes, targets = ([], [])
+    for func, kwargs in program.requests:
+        kwargs = dict(kwargs)
+        _validate_options(
+            rate=kwargs.pop('rate', None),
+            duration=kwargs.pop('duration', None),
+            program=program,
+        )
+        request_writes, request_targets = _request_targets(
+            func.__name__, kwargs.pop('url'),
+            quote_char=quote_char,
+            body_filename=_body_filename_func(program),
+            **{
+                argument: kwargs[argument] for argument in (
+                    'parameters', 'files', 'headers', 'seed', 'locale',
+                    'variants',
+                ) if argument in kwargs
+            }
+        )
+        writes.extend(request_writes)
+        targets.extend(request_targets)
+
+    if isinstance(setup, str):
+        emitter.write(setup)
+    elif setup:
+        emitter.write('#!/usr/bin/env bash\n\n')
+    _attack_render(
+        emitter, writes, targets, rate=rate, duration=duration,
+        quote_char=quote_char,
+    )
+
+    if teardown:
+        emitter.write(str(teardown))
+    return emitter.getvalue()
@@ -0,0 +1 @@
+'''Go implementations request generators.'''
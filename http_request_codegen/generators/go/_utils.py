@@ -0,0 +1,244 @@
+'''Utilities for Go HTTP request generators.'''
+
+from http_request_codegen.generators.python._utils import (  # noqa: F401
+    indented_layout,
+    post_content_type,
+)
+from http_request_codegen.hrc_layout import (
+    LINE,
+    SOFTLINE,
+    Group,
+    IfBreak,
+    Nest,
+    join,
+)
+
+
+DEFAULT_INDENT = '\t'
+DEFAULT_QUOTE_CHAR = '"'
+DEFAULT_WRAP = 80
+
+# characters escaped by their own escape sequence
+ESCAPES = {
+    '\\': '\\\\',
+    '"': '\\"',
+    '\n': '\\n',
+    '\r': '\\r',
+    '\t': '\\t',
+}
+
+
+def escape_string(string):
+    '''Escapes a string to be defined inside a Go interpreted string literal,
+    which is always delimited by double quotes. Backslashes, double quotes
+    and control characters are escaped, the latest using hexadecimal escape
+    sequences except newlines, carriage returns and tabulations.
+
+    Args:
+        string (str): String to escape.
+
+    Raises:
+        TypeError: If the value to escape is not a string.
+
+    Examples:
+        >>> print(escape_string('I need "quotes"\\r\\n escaped.'))
+        I need \\"quotes\\"\\r\\n escaped.
+
+        >>> print(escape_string('\\x00'))
+        \\x00
+
+    Returns:
+        str: The escaped string.
+    '''
+    if not isinstance(string, str):
+        raise TypeError(
+            'The value \'%s\' can not be escaped because is not a'
+            ' string' % (string,),
+        )
+    escaped = []
+    for character in string:
+        if character in ESCAPES:
+            escaped.append(ESCAPES[character])
+        elif ord(character) < 32 or ord(character) == 127:
+            escaped.append('\\x%02x' % ord(character))
+        else:
+            escaped.append(character)
+    return ''.join(escaped)
+
+
+def str_definition(
+    string, indent=DEFAULT_INDENT, wrap=DEFAULT_WRAP, offset=None,
+):
+    '''Creates a definition of a Go string, concatenating multiple strings
+    in multiple lines if it doesn't fit in the wrap. The concatenation
+    operator is placed at the end of the lines, so semicolons are not
+    inserted after them. Escape sequences are never splitted between
+    strings.
+
+    Args:
+        string (str): String to define.
+        indent (str): Indentation of the lines after the first one.
+        wrap (int): Maximum anchor of the code.
+        offset (int): Column where the first string starts, if it's not
+            placed after the indentation.
+
+    Examples:
+        >>> print(str_definition('foo'))
+        "foo"
+
+        >>> print(str_definition('foo\\nbar baz', indent='', wrap=12))
+        "foo\\nbar" +
+        " baz"
+
+    Returns:
+        str: Definition of the string.
+    '''
+    if offset is None:
+        offset = len(indent)
+    escaped = escape_string(str(string))
+    if len(escaped) + offset + 2 <= wrap:
+        return '"%s"' % escaped
+
+    # 2 here are the quotes and the concatenation operator
+    width = max(1, wrap - offset - 4)
+    chunks, chunk = ([], '')
+    for character in str(string):
+        escaped_character = escape_string(character)
+        if chunk and len(chunk) + len(escaped_character) > width:
+            chunks.append(chunk)
+            chunk, width = ('', max(1, wrap - len(indent) - 4))
+        chunk += escaped_character
+    chunks.append(chunk)
+    return (' +\n' + indent).join('"%s"' % chunk for chunk in chunks)
+
+
+def bracket(opening, docs, closing, indent=DEFAULT_INDENT):
+    '''Builds the document of a composite literal or of the arguments of a
+    function call. If broken in multiple lines, each item is placed in its
+    own indented line followed by a comma, as Go requires.
+
+    Args:
+        opening (str): Opening string, like ``'{'``.
+        docs (list): Documents of the items.
+        closing (str): Closing string, like ``'}'``.
+        indent (str): Indentation of the items when broken.
+
+    Examples:
+        >>> from http_request_codegen.hrc_layout import layout
+        >>> print(layout(Group(bracket('{', ['1', '2'], '}', '  ')), wrap=5))
+        {
+          1,
+          2,
+        }
+
+    Returns:
+        list: Document of the collection.
+    '''
+    if not docs:
+        return opening + closing
+    return [
+        opening,
+        Nest(indent, [SOFTLINE, join([',', LINE], docs), IfBreak(',')]),
+        SOFTLINE,
+        closing,
+    ]
+
+
+def value_doc(value, indent=DEFAULT_INDENT, wrap=DEFAULT_WRAP):
+    '''Creates the layout document of the Go definition of a JSON value,
+    defining objects by ``map[string]interface{}`` and arrays by
+    ``[]interface{}`` composite literals.
+
+    Args:
+        value (object): Value to define.
+        indent (str): Indentation string.
+        wrap (int): Maximum anchor of the code.
+
+    Examples:
+        >>> from http_request_codegen.hrc_layout import layout
+        >>> print(layout(value_doc({'foo': [1, None, True]})))
+        map[string]interface{}{"foo": []interface{}{1, nil, true}}
+
+    Returns:
+        object: Document of the value.
+    '''
+    if isinstance(value, dict):
+        return Group([
+            'map[string]interface{}',
+            bracket(
+                '{',
+                [
+                    [
+                        str_definition(name, wrap=float('inf')) + ': ',
+                        value_doc(item, indent=indent, wrap=wrap),
+                    ] for name, item in value.items()
+                ],
+                '}',
+                indent,
+            ),
+        ])
+    elif isinstance(value, (list, tuple)):
+        return Group([
+            '[]interface{}',
+            bracket(
+                '{',
+                [value_doc(item, indent=indent, wrap=wrap) for item in value],
+                '}',
+                indent,
+            ),
+        ])
+    elif isinstance(value, bool):
+        return 'true' if value else 'false'
+    elif value is None:
+        return 'nil'
+    elif isinstance(value, (int, float)):
+        return repr(value)
+    return str_definition(value, indent=indent, wrap=wrap)
+
+
+def statements_code(
+    statements, indent=DEFAULT_INDENT, indent_depth=0, oneline=False,
+    wrap=DEFAULT_WRAP,
+):
+    '''Renders the statements of a Go block, each one defined by its level
+    of indentation and its layout document. Rendered in one line, the
+    statements are separated by semicolons, except after opening and before
+    closing brackets.
+
+    Args:
+        statements (list): Pairs of levels of indentation and documents of
+            the statements.
+        indent (str): Indentation string.
+        indent_depth (int): Levels of indentation of the block.
+        oneline (bool): Renders the statements in one line.
+        wrap (int): Maximum anchor of the code.
+
+    Examples:
+        >>> statements = [(0, 'if ok {'), (1, 'f()'), (1, 'g()'), (0, '}')]
+        >>> print(statements_code(statements, indent='  '))
+        if ok {
+          f()
+          g()
+        }
+
+        >>> print(statements_code(statements, oneline=True))
+        if ok { f(); g() }
+
+    Returns:
+        str: Code of the statements.
+    '''
+    lines = [
+        indented_layout(
+            doc, indent=indent,
+            indent_depth=indent_depth + depth if not oneline else 0,
+            oneline=oneline, wrap=wrap,
+        ) for depth, doc in statements
+    ]
+    if not oneline:
+        return '\n'.join(lines)
+    code = ''
+    for line in lines:
+        if code:
+            code += ' ' if code[-1] in '{(' or line[0] in '})' else '; '
+        code += line
+    return code
@@ -0,0 +1,606 @@
+'''Go net/http code snippets generator.'''
+
+from collections import OrderedDict
+
+
+try:
+    from urllib.parse import parse_qsl, urlsplit, urlunsplit
+except ImportError:
+    from urlparse import parse_qsl, urlsplit, urlunsplit
+
+from http_request_codegen.generators.go._utils import (
+    DEFAULT_INDENT,
+    DEFAULT_QUOTE_CHAR,
+    DEFAULT_WRAP,
+    bracket,
+    post_content_type,
+    statements_code,
+    str_definition,
+    value_doc,
+)
+from http_request_codegen.hrc_emitter import Emitter
+from http_request_codegen.hrc_exceptions import (
+    raise_post_text_plain_n_parameters_not_1,
+)
+from http_request_codegen.hrc_layout import Group
+from http_request_codegen.hrc_valuer import (
+    lazy_json_body_by_parameters,
+    lazy_name_by_parameter,
+    lazy_value_by_parameter,
+)
+
+
+# tuning of the transport of the client by default, reusing up to 100 idle
+# connections to the same host during 90 seconds
+DEFAULT_MAX_IDLE_CONNS_PER_HOST = 100
+DEFAULT_IDLE_CONN_TIMEOUT = 90
+
+
+def _validate_transport(
+    max_idle_conns_per_host=DEFAULT_MAX_IDLE_CONNS_PER_HOST,
+    idle_conn_timeout=DEFAULT_IDLE_CONN_TIMEOUT, http2=True, setup=True,
+):
+    for argument, value in (
+        ('max_idle_conns_per_host', max_idle_conns_per_host),
+        ('idle_conn_timeout', idle_conn_timeout),
+    ):
+        if isinstance(value, bool) or not isinstance(value, int) or \
+                value < 1:
+            raise ValueError(
+                '\'%s\' argument must be a positive integer, but \'%s\''
+                ' passed' % (argument, value),
+            )
+
+    # the transport is only created by the default initialization
+    if not setup or isinstance(setup, str):
+        for argument, value, default in (
+            (
+                'max_idle_conns_per_host', max_idle_conns_per_host,
+                DEFAULT_MAX_IDLE_CONNS_PER_HOST,
+            ),
+            (
+                'idle_conn_timeout', idle_conn_timeout,
+                DEFAULT_IDLE_CONN_TIMEOUT,
+            ),
+            ('http2', http2, True),
+        ):
+            if value != default:
+                raise ValueError(
+                    (
+                        '\'%s\' argument requires the client created by the'
+                        ' initialization snippet, pass \'setup=True\''
+                    ) % argument,
+                )
+
+
+def _client_code(
+    max_idle_conns_per_host=DEFAULT_MAX_IDLE_CONNS_PER_HOST,
+    idle_conn_timeout=DEFAULT_IDLE_CONN_TIMEOUT, http2=True,
+    indent=DEFAULT_INDENT, oneline=False,
+):
+    # the client is shared by all the requests of the package, so its
+    # transport keeps the connections alive between them
+    fields = [
+        ('MaxIdleConnsPerHost', '%d' % max_idle_conns_per_host),
+        ('IdleConnTimeout', '%d * time.Second' % idle_conn_timeout),
+    ]
+    if http2:
+        fields.append(('ForceAttemptHTTP2', 'true'))
+    if oneline:
+        return (
+            'var client = &http.Client{Transport: &http.Transport{%s}}' % (
+                ', '.join('%s: %s' % field for field in fields)
+            )
+        )
+    # values are aligned as gofmt does
+    width = max(len(name) for name, _ in fields) + 1
+    return (
+        'var client = &http.Client{\n%(indent)sTransport: &http.Transport{\n'
+        '%(fields)s%(indent)s},\n}' % {
+            'indent': indent,
+            'fields': ''.join(
+                '%s%s %s,\n' % (indent * 2, (name + ':').ljust(width), value)
+                for name, value in fields
+            ),
+        }
+    )
+
+
+def _values_doc(values, indent=DEFAULT_INDENT, wrap=DEFAULT_WRAP):
+    # 'url.Values' composite literal, whose values are lists of strings
+    return Group([
+        'url.Values',
+        bracket(
+            '{',
+            [
+                Group([
+                    str_definition(name, wrap=float('inf')) + ': ',
+                    bracket(
+                        '{',
+                        [
+                            str_definition(
+                                value, indent=indent * 3,
+                                offset=len(indent * 2), wrap=wrap,
+                            ) for value in name_values
+                        ],
+                        '}',
+                        indent,
+                    ),
+                ]) for name, name_values in values.items()
+            ],
+            '}',
+            indent,
+        ),
+    ])
+
+
+def _parameters_values(parameters, seed=None, locale=None, pairs=[]):
+    # names of the parameters mapped to the lists of their values, which
+    # are always encoded as strings
+    response = OrderedDict()
+    for name, value in pairs:
+        response.setdefault(name, []).append(value)
+    for parameter in parameters:
+        response.setdefault(
+            str(lazy_name_by_parameter(parameter, seed=seed)), [],
+        ).append(
+            str(lazy_value_by_parameter(parameter, seed=seed, locale=locale)),
+        )
+    return response
+
+
+def _file_path(value, seed=None, locale=None):
+    if isinstance(value, str) or value is None:
+        value = [value]
+    filepath = value[0]
+    if filepath is None:
+        # random filepath
+        filepath = lazy_value_by_parameter(
+            {
+                'name': '',
+                'faker': 'faker.providers.file::file_path',
+            },
+            seed=seed,
+            locale=locale,
+        )
+    return (
+        str(filepath),
+        value[1] if len(value) > 1 and value[1] else
+        'application/octet-stream',
+    )
+
+
+def _check_statements(depth, result='log.Fatal(err)'):
+    return [
+        (depth, 'if err != nil {'),
+        (depth + 1, result),
+        (depth, '}'),
+    ]
+
+
+def _call_doc(callee, arguments, indent=DEFAULT_INDENT, suffix=''):
+    return Group([callee, bracket('(', arguments, ')', indent), suffix])
+
+
+def _multipart_statements(
+    parameters, files, indent=DEFAULT_INDENT, wrap=DEFAULT_WRAP, seed=None,
+    locale=None,
+):
+    # the body is written to a pipe by a goroutine while the request reads
+    # it, so the files are streamed without loading them in memory
+    def argument(value, depth):
+        return str_definition(
+            value, indent=indent * 2, offset=len(indent),
+            wrap=wrap - len(indent * depth),
+        )
+
+    statements = [
+        (0, 'body, writer := io.Pipe()'),
+        (0, 'form := multipart.NewWriter(writer)'),
+        (0, 'go func() {'),
+        (1, 'writer.CloseWithError(func() error {'),
+    ]
+    if files:
+        statements.extend([
+            (2, 'writeFile := func(field, path, contentType string) error {'),
+            (3, 'file, err := os.Open(path)'),
+        ])
+        statements.extend(_check_statements(3, result='return err'))
+        statements.extend([
+            (3, 'defer file.Close()'),
+            (3, 'header := make(textproto.MIMEHeader)'),
+            (
+                3,
+                _call_doc(
+                    'header.Set',
+                    [
+                        '"Content-Disposition"',
+                        _call_doc(
+                            'fmt.Sprintf',
+                            [
+                                '"form-data; name=%q; filename=%q"', 'field',
+                                'filepath.Base(path)',
+                            ],
+                            indent=indent,
+                        ),
+                    ],
+                    indent=indent,
+                ),
+            ),
+            (3, 'header.Set("Content-Type", contentType)'),
+            (3, 'part, err := form.CreatePart(header)'),
+        ])
+        statements.extend(_check_statements(3, result='return err'))
+        statements.extend([
+            (3, '_, err = io.Copy(part, file)'),
+            (3, 'return err'),
+            (2, '}'),
+        ])
+    for name, values in _parameters_values(
+        parameters, seed=seed, locale=locale,
+    ).items():
+        for value in values:
+            statements.append(
+                (
+                    2,
+                    _call_doc(
+                        'if err := form.WriteField',
+                        [argument(name, 2), argument(value, 2)],
+                        indent=indent, suffix='; err != nil {',
+                    ),
+                ),
+            )
+            statements.extend([(3, 'return err'), (2, '}')])
+    for name, value in files.items():
+        filepath, content_type = _file_path(value, seed=seed, locale=locale)
+        statements.append(
+            (
+                2,
+                _call_doc(
+                    'if err := writeFile',
+                    [
+                        argument(name, 2), argument(filepath, 2),
+                        argument(content_type, 2),
+                    ],
+                    indent=indent, suffix='; err != nil {',
+                ),
+            ),
+        )
+        statements.extend([(3, 'return err'), (2, '}')])
+    statements.extend([
+        (2, 'return form.Close()'),
+        (1, '}())'),
+        (0, '}()'),
+    ])
+    return statements
+
+
+def _request_statements(
+    method, url, parameters=[], files={}, headers={}, indent=DEFAULT_INDENT,
+    wrap=DEFAULT_WRAP, seed=None, locale=None,
+):
+    # returns the packages imported by the statements which perform the
+    # request and the statements, as pairs of levels of indentation and
+    # layout documents
+    imports = set(['io', 'log', 'net/http', 'os'])
+    statements = []
+    body = 'nil'
+    content_type = None
+
+    def argument(value):
+        return str_definition(
+            value, indent=indent * 2, offset=len(indent), wrap=wrap,
+        )
+
+    # the query of the URL is defined with the parameters, because Go
+    # encodes all of them replacing the query of the request
+    scheme, netloc, path, query, fragment = urlsplit(str(url))
+    if method == 'get' and parameters:
+        url = urlunsplit((scheme, netloc, path, '', fragment))
+        imports.add('net/url')
+        statements.append(
+            (
+                0,
+                Group([
+                    'query := ',
+                    _values_doc(
+                        _parameters_values(
+                            parameters, seed=seed, locale=locale,
+                            pairs=parse_qsl(query, keep_blank_values=True),
+                        ),
+                        indent=indent, wrap=wrap,
+                    ),
+                ]),
+            ),
+        )
+    elif method == 'post':
+        content_type = post_content_type(headers, files)
+        if content_type == 'text/plain' and len(parameters) != 1:
+            raise_post_text_plain_n_parameters_not_1(len(parameters))
+
+        if files:
+            imports.update([
+                'fmt', 'mime/multipart', 'net/textproto', 'path/filepath',
+            ])
+            statements.extend(
+                _multipart_statements(
+                    parameters, files, indent=indent, wrap=wrap, seed=seed,
+                    locale=locale,
+                ),
+            )
+            body = 'body'
+        elif parameters and content_type == 'application/json':
+            imports.update(['bytes', 'encoding/json'])
+            statements.append(
+                (
+                    0,
+                    _call_doc(
+                        'payload, err := json.Marshal',
+                        [
+                            value_doc(
+                                lazy_json_body_by_parameters(
+                                    parameters, seed=seed, locale=locale,
+                                ),
+                                indent=indent, wrap=wrap,
+                            ),
+                        ],
+                        indent=indent,
+                    ),
+                ),
+            )
+            statements.extend(_check_statements(0))
+            body = 'bytes.NewReader(payload)'
+        elif parameters and content_type == 'text/plain':
+            imports.add('strings')
+            body = _call_doc(
+                'strings.NewReader',
+                [
+                    str_definition(
+                        lazy_value_by_parameter(
+                            parameters[0], seed=seed, locale=locale,
+                        ),
+                        indent=indent * 3, offset=len(indent * 2), wrap=wrap,
+                    ),
+                ],
+                indent=indent,
+            )
+        elif parameters:
+            imports.update(['net/url', 'strings'])
+            statements.append(
+                (
+                    0,
+                    Group([
+                        'form := ',
+                        _values_doc(
+                            _parameters_values(
+                                parameters, seed=seed, locale=locale,
+                            ),
+                            indent=indent, wrap=wrap,
+                        ),
+                    ]),
+                ),
+            )
+            body = 'strings.NewReader(form.Encode())'
+
+    statements.append(
+        (
+            0,
+            _call_doc(
+                'req, err := http.NewRequest',
+                [
+                    'http.MethodGet' if method == 'get' else 'http.MethodPost',
+                    argument(url),
+                    body,
+                ],
+                indent=indent,
+            ),
+        ),
+    )
+    statements.extend(_check_statements(0))
+    if method == 'get' and parameters:
+        statements.append((0, 'req.URL.RawQuery = query.Encode()'))
+
+    # the content type of forms and multipart bodies is defined by the
+    # generator if it isn't defined by the headers
+    headers = list(headers.items())
+    if content_type == 'multipart/form-data':
+        headers = [
+            (name, value) for name, value in headers
+            if str(name).lower() != 'content-type'
+        ]
+    for name, value in headers:
+        statements.append(
+            (
+                0,
+                _call_doc(
+                    'req.Header.Set', [argument(name), argument(value)],
+                    indent=indent,
+                ),
+            ),
+        )
+    if content_type == 'multipart/form-data':
+        statements.append(
+            (0, 'req.Header.Set("Content-Type", form.FormDataContentType())'),
+        )
+    elif parameters and content_type == 'application/x-www-form-urlencoded' \
+            and not any(
+                str(name).lower() == 'content-type' for name, _ in headers
+            ):
+        statements.append(
+            (
+                0,
+                'req.Header.Set("Content-Type",'
+                ' "application/x-www-form-urlencoded")',
+            ),
+        )
+
+    # the body of the response is read until the end, so the connection
+    # can be reused by the next requests
+    statements.append((0, 'resp, err := client.Do(req)'))
+    statements.extend(_check_statements(0))
+    statements.extend([
+        (0, 'defer resp.Body.Close()'),
+        (0, 'if _, err := io.Copy(os.Stdout, resp.Body); err != nil {'),
+        (1, 'log.Fatal(err)'),
+        (0, '}'),
+    ])
+    return (imports, statements)
+
+
+def _render(
+    emitter, method, url, parameters=[], files={}, headers={},
+    indent=DEFAULT_INDENT, setup=True, teardown=None, oneline=False,
+    wrap=DEFAULT_WRAP, seed=None, locale=None,
+    max_idle_conns_per_host=DEFAULT_MAX_IDLE_CONNS_PER_HOST,
+    idle_conn_timeout=DEFAULT_IDLE_CONN_TIMEOUT, http2=True,
+):
+    _validate_transport(
+        max_idle_conns_per_host=max_idle_conns_per_host,
+        idle_conn_timeout=idle_conn_timeout, http2=http2, setup=setup,
+    )
+
+    # statements are placed inside the 'main' function with initialization
+    depth = 1 if setup and not isinstance(setup, str) else 0
+    _wrap = wrap - len(indent * depth) if not oneline else float('inf')
+    imports, statements = _request_statements(
+        method, url, parameters=parameters, files=files, headers=headers,
+        indent=indent, wrap=_wrap, seed=seed, locale=locale,
+    )
+    code = statements_code(
+        statements, indent=indent, indent_depth=depth, oneline=oneline,
+        wrap=wrap,
+    )
+
+    if isinstance(setup, str):
+        emitter.write(setup)
+    elif setup:
+        imports.add('time')
+        separator = '\n' if not oneline else '; '
+        emitter.write('package main%s' % ('\n\n' if not oneline else '; '))
+        emitter.write(
+            'import (%(newline)s%(imports)s%(end)s)%(separator)s' % {
+                'newline': '\n' if not oneline else '',
+                'imports': separator.join(
+                    (indent if not oneline else '') + '"%s"' % package
+                    for package in sorted(imports)
+                ),
+                'end': '\n' if not oneline else '',
+                'separator': '\n\n' if not oneline else '; ',
+            },
+        )
+        emitter.write(
+            _client_code(
+                max_idle_conns_per_host=max_idle_conns_per_host,
+                idle_conn_timeout=idle_conn_timeout, http2=http2,
+                indent=indent, oneline=oneline,
+            ),
+        )
+        emitter.write('\n\n' if not oneline else '; ')
+        emitter.write('func main() {%s' % ('\n' if not oneline else ' '))
+        code += '\n}' if not oneline else ' }'
+    emitter.write(code)
+
+    if teardown:
+        emitter.write(str(teardown))
+
+
+def get(
+    url, parameters=[], headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    max_idle_conns_per_host=DEFAULT_MAX_IDLE_CONNS_PER_HOST,
+    idle_conn_timeout=DEFAULT_IDLE_CONN_TIMEOUT, http2=True,
+    _emitter=None, **kwargs,
+):
+    '''Renders a Go program which performs the request using the
+    [``net/http``](https://pkg.go.dev/net/http) package. The initialization
+    snippet defines the package, its imports and a package level
+    ``http.Client`` whose ``http.Transport`` keeps the connections alive
+    between requests, and the request is performed inside the ``main``
+    function. Without initialization, only the statements which perform the
+    request are rendered, expecting a ``client`` defined by the package.
+    Parameters are encoded by ``url.Values``, replacing the query of the
+    URL, and the body of the response is copied to the standard output:
+
+    ```go
+    package main
+
+    import (
+        "io"
+        "log"
+        "net/http"
+        "net/url"
+        "os"
+        "time"
+    )
+
+    var client = &http.Client{
+        Transport: &http.Transport{
+            MaxIdleConnsPerHost: 100,
+            IdleConnTimeout:     90 * time.Second,
+            ForceAttemptHTTP2:   true,
+        },
+    }
+
+    func main() {
+        query := url.Values{"foo": {"bar"}}
+        req, err := http.NewRequest(http.MethodGet, "<url>", nil)
+        ...
+    }
+    ```
+
+    The transport can be tuned by the next arguments:
+
+    - ``max_idle_conns_per_host``: maximum number of idle connections kept
+      alive to each host, 100 by default.
+    - ``idle_conn_timeout``: seconds that an idle connection is kept alive,
+      90 by default.
+    - ``http2``: tries to negotiate HTTP/2 with ``ForceAttemptHTTP2``, which
+      custom transports don't do by default. ``True`` by default.
+
+    The client is created by the default initialization snippet, so these
+    arguments can't be changed with a custom or without ``setup``.
+
+    Go strings are always delimited by double quotes, so ``quote_char`` is
+    ignored, like ``kwargs``.
+    '''
+    emitter = Emitter() if _emitter is None else _emitter
+    _render(
+        emitter, 'get', url, parameters=parameters, headers=headers,
+        indent=indent, setup=setup, teardown=teardown, oneline=oneline,
+        wrap=wrap, seed=seed, locale=locale,
+        max_idle_conns_per_host=max_idle_conns_per_host,
+        idle_conn_timeout=idle_conn_timeout, http2=http2,
+    )
+    return emitter.getvalue()
+
+
+def post(
+    url, parameters=[], files={}, headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    max_idle_conns_per_host=DEFAULT_MAX_IDLE_CONNS_PER_HOST,
+    idle_conn_timeout=DEFAULT_IDLE_CONN_TIMEOUT, http2=True,
+    _emitter=None, **kwargs,
+):
+    '''POST method code generator for Go ``net/http``, which accepts the
+    same arguments that the [GET method generator](#get). The body is
+    built depending on the ``Content-Type`` header:
+
+    - ``application/json``: encoded by ``json.Marshal``.
+    - ``text/plain``: read by ``strings.NewReader``.
+    - ``application/x-www-form-urlencoded``: encoded by ``url.Values``,
+      defining the header if it's not defined.
+    - ``multipart/form-data``: written by a ``multipart.Writer`` to an
+      ``io.Pipe`` by a goroutine, while the request reads the other end of
+      the pipe, so files are streamed without loading them in memory.
+    '''
+    emitter = Emitter() if _emitter is None else _emitter
+    _render(
+        emitter, 'post', url, parameters=parameters, files=files,
+        headers=headers, indent=indent, setup=setup, teardown=teardown,
+        oneline=oneline, wrap=wrap, seed=seed, locale=locale,
+        max_idle_conns_per_host=max_idle_conns_per_host,
+        idle_conn_timeout=idle_conn_timeout, http2=http2,
+    )
+    return emitter.getvalue()
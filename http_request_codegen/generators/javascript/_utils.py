@@ -1,9 +1,12 @@
 '''Utilities for Javascript HTTP request generators.'''
 
+from http_request_codegen.hrc_http import MEASURE_PERCENTILES
+from http_request_codegen.hrc_layout import IfBreak, bracket
 from http_request_codegen.hrc_string import (
     escape_backtick,
     escape_double_quote,
     escape_single_quote,
+    escaped_chunks,
     lazy_escape_quote_func_by_quote_char,
 )
 
@@ -110,7 +113,7 @@ def str_definition(
     Returns:
         str: Javascript string definition reproducted.
     '''
-    string_escaped = string if not _escape else \
+    string_escaped = str(string) if not _escape else \
         escape_by_quote(str(string), quote_char)
 
     if len(str(string)) + len(indent) + len(quote_char) * 2 < wrap:
@@ -120,24 +123,352 @@ def str_definition(
         )
 
     indent_length = len(indent)
-    response = '{quote_char}'.format(
+    # 1 here is the opening quote and 3 the continuation "+ '"
+    chunks = escaped_chunks(
+        string_escaped,
+        wrap - 5 - indent_length,
+        first_width=wrap - 3 - indent_length,
+        escaped_char=quote_char,
+    )
+    _chars_in_last_line = (1 if len(chunks) == 1 else 3) + indent_length \
+        + len(chunks[-1])
+    return '{quote_char}{chunks}{quote_char}{newline}{indent}'.format(
+        chunks='{quote_char}\n{indent}+ {quote_char}'.format(
+            quote_char=quote_char,
+            indent=indent,
+        ).join(chunks),
+        newline='\n' if _chars_in_last_line >= wrap - 1 else '',
+        indent=indent if _chars_in_last_line >= wrap - 1 else '',
         quote_char=quote_char,
     )
-    _chars_in_current_line = len(response) + indent_length
-    for i, ch in enumerate(string):
-        response += ch
-        _chars_in_current_line += 1
-        if _chars_in_current_line >= wrap - 2:
-            if i >= len(string) - 1:
-                break
-            response += '{quote_char}\n{indent}+ {quote_char}'.format(
-                quote_char=quote_char,
-                indent=indent,
+
+
+def value_definition(
+    value, indent=DEFAULT_INDENT, indent_depth=0,
+    quote_char=DEFAULT_QUOTE_CHAR, wrap=DEFAULT_WRAP,
+    newline='\n',
+):
+    '''Creates a definition of a JSON serializable value as Javascript code.
+    Nested objects and arrays are defined recursively.
+
+    Args:
+        value (object): Value that will be defined as Javascript code.
+        indent (str): Indentation used for nested values.
+        indent_depth (int): Number of levels of indentation of the value.
+        quote_char (str): Javascript string quotation character used.
+        wrap (int): Maximum anchor of the code. If it exceeds it, strings will
+            be wrapped in multiple lines.
+        newline (str): Newline character.
+
+    Examples:
+        >>> print(value_definition({'foo': [1, None]}))
+        {
+          'foo': [
+            1,
+            null
+          ]
+        }
+
+        >>> print(value_definition({'foo': [True]}, newline='', indent=''))
+        {'foo': [true]}
+
+    Returns:
+        str: Definition of the value.
+    '''
+    if isinstance(value, (dict, list, tuple)):
+        if not value:
+            return '{}' if isinstance(value, dict) else '[]'
+
+        if isinstance(value, dict):
+            open_char, close_char = ('{', '}')
+            items = [
+                '%(quote_char)s%(key)s%(quote_char)s: ' % {
+                    'quote_char': quote_char,
+                    'key': escape_by_quote(str(key), quote_char),
+                } for key in value.keys()
+            ]
+            values = value.values()
+        else:
+            open_char, close_char = ('[', ']')
+            items, values = ([''] * len(value), value)
+
+        response = open_char + newline
+        for i, (item, _value) in enumerate(zip(items, values)):
+            response += '{indent}{item}{value}{comma}{newline}'.format(
+                indent=indent * (indent_depth + 1),
+                item=item,
+                value=value_definition(
+                    _value, indent=indent, indent_depth=indent_depth + 1,
+                    quote_char=quote_char, wrap=wrap, newline=newline,
+                ),
+                comma=(',' if newline else ', ')
+                if i < len(items) - 1 else '',
+                newline=newline,
             )
-            _chars_in_current_line = 3 + indent_length  # ' ('
-    response += '{quote_char}{newline}{indent}'.format(
-        newline='\n' if _chars_in_current_line >= wrap - 1 else '',
-        indent=indent if _chars_in_current_line >= wrap - 1 else '',
-        quote_char=quote_char,
+        return response + indent * indent_depth + close_char
+    elif isinstance(value, str):
+        return str_definition(
+            value, indent=indent * indent_depth,
+            quote_char=quote_char, wrap=wrap,
+        )
+    elif value is None:
+        return 'null'
+    elif isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def str_doc(
+    string, indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    wrap=DEFAULT_WRAP,
+):
+    '''Creates the layout document of a Javascript string. If its group is
+    broken in multiple lines, the string is wrapped using
+    [``str_definition``](#str_definition).
+
+    Args:
+        string (str): String to define.
+        indent (str): Indentation of the string when broken.
+        quote_char (str): Javascript string quotation character used.
+        wrap (int): Maximum anchor of the code.
+
+    Examples:
+        >>> from http_request_codegen.hrc_layout import Group, layout
+        >>> layout(Group(str_doc("I'm")))
+        "'I\\\\'m'"
+
+    Returns:
+        object: Layout document of the string.
+    '''
+    return IfBreak(
+        str_definition(
+            string, indent=indent,
+            quote_char=quote_char, wrap=wrap,
+        ),
+        '%(quote_char)s%(string)s%(quote_char)s' % {
+            'quote_char': quote_char,
+            'string': escape_by_quote(string, quote_char),
+        },
     )
-    return response
+
+
+def value_doc(
+    value, indent=DEFAULT_INDENT, indent_depth=0,
+    quote_char=DEFAULT_QUOTE_CHAR, wrap=DEFAULT_WRAP,
+):
+    '''Creates the layout document of a JSON serializable value defined as
+    Javascript code. Nested objects and arrays are defined recursively.
+
+    Args:
+        value (object): Value that will be defined as Javascript code.
+        indent (str): Indentation used for nested values.
+        indent_depth (int): Number of levels of indentation of the value.
+        quote_char (str): Javascript string quotation character used.
+        wrap (int): Maximum anchor of the code. If it exceeds it, strings will
+            be wrapped in multiple lines.
+
+    Examples:
+        >>> from http_request_codegen.hrc_layout import Group, layout
+        >>> layout(Group(value_doc({'foo': [True, None]})))
+        "{'foo': [true, null]}"
+
+        >>> print(layout(Group(value_doc({'foo': 'bar'})), wrap=10))
+        {
+          'foo': 'bar'
+        }
+
+    Returns:
+        object: Layout document of the value.
+    '''
+    if isinstance(value, dict):
+        items = []
+        for key, _value in value.items():
+            _key = escape_by_quote(str(key), quote_char)
+            if isinstance(_value, str):
+                # strings are wrapped after the key
+                _value_doc = str_definition(
+                    _value,
+                    indent=indent * (indent_depth + 1) + ' ' * (len(_key) + 4),
+                    quote_char=quote_char, wrap=wrap,
+                )
+            else:
+                _value_doc = value_doc(
+                    _value, indent=indent, indent_depth=indent_depth + 1,
+                    quote_char=quote_char, wrap=wrap,
+                )
+            items.append([
+                '%(quote_char)s%(key)s%(quote_char)s: ' % {
+                    'key': _key,
+                    'quote_char': quote_char,
+                },
+                _value_doc,
+            ])
+        return bracket('{', items, '}', indent)
+    elif isinstance(value, (list, tuple)):
+        return bracket(
+            '[',
+            [
+                value_doc(
+                    _value, indent=indent, indent_depth=indent_depth + 1,
+                    quote_char=quote_char, wrap=wrap,
+                ) for _value in value
+            ],
+            ']',
+            indent,
+        )
+    elif isinstance(value, str):
+        return str_definition(
+            value, indent=indent * indent_depth,
+            quote_char=quote_char, wrap=wrap,
+        )
+    elif value is None:
+        return 'null'
+    elif isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def function_render(
+    emitter, name, body, indent=DEFAULT_INDENT, oneline=False,
+    asynchronous=False,
+):
+    '''Renders a function without arguments whose body are the statements
+    passed, indented one level. The last statement is ended by a semicolon,
+    so it can be an unterminated ``return`` statement.
+
+    Args:
+        emitter (Emitter): Emitter where the function is written.
+        name (str): Name of the function.
+        body (str): Statements of the function.
+        indent (str): Indentation string.
+        oneline (bool): Renders the function in one line.
+        asynchronous (bool): Renders an ``async`` function, whose statements
+            can use ``await``.
+
+    Examples:
+        >>> from http_request_codegen.hrc_emitter import Emitter
+        >>> emitter = Emitter()
+        >>> function_render(emitter, 'request', "return fetch('/')")
+        >>> print(emitter.getvalue())
+        function request() {
+          return fetch('/');
+        }
+        <BLANKLINE>
+        <BLANKLINE>
+    '''
+    newline = '\n' if not oneline else ''
+    emitter.write('%sfunction %s() {%s' % (
+        'async ' if asynchronous else '', name, newline,
+    ))
+    emitter.write(''.join(
+        (indent if not oneline and line.strip() else '') + line
+        for line in body.splitlines(True)
+    ))
+    emitter.write(';%(newline)s}%(newline)s%(newline)s' % {
+        'newline': newline,
+    })
+
+
+def measure_render(
+    emitter, body, measure, name='request', indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, oneline=False,
+):
+    '''Renders a function which performs a request, returning a promise
+    resolved when the body of the response has been read, and an
+    asynchronous ``main`` function which measures its duration by
+    ``performance.now()``. If ``measure`` is an integer, the request is
+    performed that number of times, one after another, and the percentiles
+    of the durations are printed.
+
+    Args:
+        emitter (Emitter): Emitter where the code is written.
+        body (str): Statements of the function which performs the request,
+            ended by a ``return`` statement.
+        measure (bool, int): ``True`` to measure the request once or the
+            number of times that it is performed.
+        name (str): Name of the function which performs the request.
+        indent (str): Indentation string.
+        quote_char (str): Javascript string quotation character used.
+        oneline (bool): Renders the code in one line.
+
+    Examples:
+        >>> from http_request_codegen.hrc_emitter import Emitter
+        >>> emitter = Emitter()
+        >>> measure_render(emitter, "return fetch('/')", True)
+        >>> print(emitter.getvalue())
+        function request() {
+          return fetch('/');
+        }
+        <BLANKLINE>
+        async function main() {
+          const start = performance.now();
+          await request();
+          console.log((performance.now() - start).toFixed(2) + ' ms');
+        }
+        <BLANKLINE>
+        main().catch(function(err) {
+          console.error('Error:', err);
+        });
+    '''
+    function_render(emitter, name, body, indent=indent, oneline=oneline)
+
+    strings = {
+        'quote_char': quote_char,
+        'name': name,
+        'percentiles': ', '.join(
+            str(percentile) for percentile in MEASURE_PERCENTILES
+        ),
+    }
+    if measure is True:
+        lines = [
+            (1, 'const start = performance.now();'),
+            (1, 'await %(name)s();'),
+            (
+                1,
+                'console.log((performance.now() - start).toFixed(2) +'
+                ' %(quote_char)s ms%(quote_char)s);',
+            ),
+        ]
+    else:
+        lines = [
+            (1, 'const timings = [];'),
+            (1, 'for (let i = 0; i < %d; i++) {' % measure),
+            (2, 'const start = performance.now();'),
+            (2, 'await %(name)s();'),
+            (2, 'timings.push(performance.now() - start);'),
+            (1, '}'),
+            (1, 'timings.sort(function(a, b) {'),
+            (2, 'return a - b;'),
+            (1, '});'),
+            (1, 'for (const percentile of [%(percentiles)s]) {'),
+            (
+                2,
+                'const timing = timings[Math.floor(timings.length *'
+                ' percentile / 100)];',
+            ),
+            (
+                2,
+                'console.log(%(quote_char)sp%(quote_char)s + percentile +'
+                ' %(quote_char)s: %(quote_char)s + timing.toFixed(2) +'
+                ' %(quote_char)s ms%(quote_char)s);',
+            ),
+            (1, '}'),
+        ]
+    lines.extend([
+        (0, '}'),
+        (0, ''),
+        (0, 'main().catch(function(err) {'),
+        (
+            1,
+            'console.error(%(quote_char)sError:%(quote_char)s, err);',
+        ),
+        (0, '});'),
+    ])
+
+    newline = '\n' if not oneline else ''
+    emitter.write('async function main() {' + newline)
+    emitter.write(newline.join(
+        (indent * depth if not oneline and line else '') + line % strings
+        for depth, line in lines
+        if line or not oneline
+    ))
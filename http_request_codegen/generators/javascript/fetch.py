@@ -14,12 +14,32 @@ from http_request_codegen.generators.javascript._utils import (
     DEFAULT_QUOTE_CHAR,
     DEFAULT_WRAP,
     escape_by_quote,
+    function_render,
+    measure_render,
     str_definition,
+    str_doc,
+    value_definition,
 )
+from http_request_codegen.hrc_emitter import Emitter
 from http_request_codegen.hrc_exceptions import (
     raise_post_text_plain_n_parameters_not_1,
 )
+from http_request_codegen.hrc_http import (
+    validate_compress,
+    validate_fanout,
+    validate_measure,
+)
+from http_request_codegen.hrc_layout import (
+    LINE,
+    SOFTLINE,
+    Group,
+    Line,
+    Nest,
+    join,
+)
+from http_request_codegen.hrc_program import Identifier
 from http_request_codegen.hrc_valuer import (
+    lazy_json_body_by_parameters,
     lazy_name_by_parameter,
     lazy_value_by_parameter,
 )
@@ -29,10 +49,45 @@ def _promises_chain_render(
     quote_char=DEFAULT_QUOTE_CHAR,
     indent=DEFAULT_INDENT,
     oneline=False,
+    stream=False,
+    node=False,
 ):
+    if stream:
+        # the body of the response is processed by chunks as they arrive,
+        # iterating the stream of NodeJS or reading the stream of browsers
+        if node:
+            lines = [
+                (1, 'for await (const chunk of response.body) {'),
+                (2, 'console.log(chunk);'),
+                (1, '}'),
+            ]
+        else:
+            lines = [
+                (1, 'const reader = response.body.getReader();'),
+                (1, 'while (true) {'),
+                (2, 'const {done, value} = await reader.read();'),
+                (2, 'if (done) {'),
+                (3, 'break;'),
+                (2, '}'),
+                (2, 'console.log(value);'),
+                (1, '}'),
+            ]
+        response_handler = ''.join(
+            (indent * depth if not oneline else '') + line +
+            ('\n' if not oneline else '')
+            for depth, line in lines
+        )
+    else:
+        response_handler = (
+            '%(indent)sconsole.log(response)%(separator)s%(newline)s'
+        ) % {
+            'newline': '\n' if not oneline else '',
+            'indent': indent if not oneline else '',
+            'separator': ';' if not oneline else '',
+        }
     return (
-        ').then(function(response) {%(newline)s%(indent)s'
-        'console.log(response)%(separator)s%(newline)s}).catch('
+        ').then(%(async)sfunction(response) {%(newline)s'
+        '%(response_handler)s}).catch('
         'function(err) {%(newline)s%(indent)sconsole.error('
         '%(quote_char)sError:%(quote_char)s, err)%(separator)s'
         '%(newline)s});'
@@ -41,24 +96,151 @@ def _promises_chain_render(
         'indent': indent if not oneline else '',
         'quote_char': quote_char,
         'separator': ';' if not oneline else '',
+        'async': 'async ' if stream else '',
+        'response_handler': response_handler,
     }
 
 
+def _fanout_render(
+    emitter, request, fanout, concurrency=None, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, oneline=False, asynchronous=False,
+):
+    # the request is performed by a function called `fanout` times by
+    # `main`, directly or by a pool of `concurrency` workers
+    newline = '\n' if not oneline else ''
+    function_render(
+        emitter, 'request', request, indent=indent, oneline=oneline,
+        asynchronous=asynchronous,
+    )
+
+    if concurrency is None:
+        lines = [
+            (1, 'const results = await Promise.allSettled('),
+            (2, 'Array.from({length: %d}, request)' % fanout),
+            (1, ');'),
+        ]
+    else:
+        lines = [
+            (1, 'const results = [];'),
+            (1, 'let next = 0;'),
+            (1, 'async function worker() {'),
+            (2, 'while (next < %d) {' % fanout),
+            (3, 'const index = next++;'),
+            (3, 'try {'),
+            (
+                4,
+                'results[index] = {status: %(quote_char)sfulfilled'
+                '%(quote_char)s, value: await request()};' % {
+                    'quote_char': quote_char,
+                },
+            ),
+            (3, '} catch (reason) {'),
+            (
+                4,
+                'results[index] = {status: %(quote_char)srejected'
+                '%(quote_char)s, reason: reason};' % {
+                    'quote_char': quote_char,
+                },
+            ),
+            (3, '}'),
+            (2, '}'),
+            (1, '}'),
+            (
+                1,
+                'await Promise.all(Array.from({length: %d}, worker));' % (
+                    concurrency
+                ),
+            ),
+        ]
+    lines.append((1, 'console.log(results);'))
+
+    emitter.write('async function main() {' + newline)
+    for depth, line in lines:
+        emitter.write(
+            (indent * depth if not oneline else '') + line + newline,
+        )
+    emitter.write('}%(newline)s%(newline)smain();' % {'newline': newline})
+
+
+def _measure_render(
+    emitter, request, measure, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, oneline=False,
+):
+    # the body of the response is read inside the measurement
+    measure_render(
+        emitter,
+        (
+            '%(request)s).then(function(response) {%(newline)s'
+            '%(indent)sreturn response.text();%(newline)s})'
+        ) % {
+            'request': request,
+            'newline': '\n' if not oneline else '',
+            'indent': indent if not oneline else '',
+        },
+        measure, indent=indent, quote_char=quote_char, oneline=oneline,
+    )
+
+
+def _validate_measure(
+    measure=False, fanout=None, stream_response=False, program=None,
+):
+    validate_measure(measure, program=program)
+    if measure and fanout is not None:
+        raise ValueError(
+            '\'measure\' argument can\'t be used with \'fanout\'',
+        )
+    if measure and stream_response:
+        raise ValueError(
+            '\'measure\' argument can\'t be used with \'stream_response\'',
+        )
+
+
+def _validate_program_fanout(fanout, program=None):
+    if fanout is not None and program is not None:
+        raise ValueError(
+            '\'fanout\' argument is not supported by programs',
+        )
+
+
+def _validate_stream_response(stream_response, fanout=None):
+    if not isinstance(stream_response, bool):
+        raise TypeError(
+            '\'stream_response\' argument must be a boolean, but \'%s\''
+            ' passed' % type(stream_response).__name__,
+        )
+    if stream_response and fanout is not None:
+        raise ValueError(
+            '\'stream_response\' argument can\'t be used with \'fanout\'',
+        )
+
+
 def _headers_render(
-    headers, indent=DEFAULT_INDENT,
+    emitter, headers, indent=DEFAULT_INDENT,
     quote_char=DEFAULT_QUOTE_CHAR, oneline=False,
-    wrap=DEFAULT_WRAP, _comma_at_end=False,
+    wrap=DEFAULT_WRAP, _comma_at_end=False, program=None,
 ):
-    response = (
+    headers_name = program.headers_name(headers) if program else None
+    if headers_name:
+        emitter.write(
+            '%(indent)s%(indent)sheaders: %(name)s%(comma)s%(newline)s' % {
+                'indent': indent if not oneline else '',
+                'name': headers_name,
+                'comma': ',' if _comma_at_end else '',
+                'newline': '\n' if not oneline else '',
+            },
+        )
+        return
+
+    emitter.write((
         '%(indent)s%(indent)sheaders:'
         ' {%(newline)s'
     ) % {
         'indent': indent if not oneline else '',
         'newline': '\n' if not oneline else '',
-    }
+    })
 
     for i, (key, value) in enumerate(headers.items()):
-        response += (
+        emitter.write((
             '%(indent)s%(quote_char)s%(key)s'
             '%(quote_char)s: %(value)s%(comma)s%(newline)s'
         ) % {
@@ -75,21 +257,18 @@ def _headers_render(
                 wrap=wrap,
             ),
             'comma': ',' if i < len(headers) - 1 else '',
-        }
-    response += '{indent}}}{comma}{newline}'.format(
+        })
+    emitter.write('{indent}}}{comma}{newline}'.format(
         indent=indent * 2 if not oneline else '',
         comma=',' if _comma_at_end else '',
         newline='\n' if not oneline else '',
-    )
-
-    return response
+    ))
 
 
 def _kwargs_render(
-    kwargs, indent=DEFAULT_INDENT, wrap=DEFAULT_WRAP,
+    emitter, kwargs, indent=DEFAULT_INDENT, wrap=DEFAULT_WRAP,
     quote_char=DEFAULT_QUOTE_CHAR, oneline=False,
 ):
-    response = ''
     for i, (key, value) in enumerate(kwargs.items()):
         if isinstance(value, str):
             _value = str_definition(
@@ -102,7 +281,7 @@ def _kwargs_render(
             )
         else:
             _value = str(value)
-        response += (
+        emitter.write((
             '%(indent)s%(quote_char)s%(key)s%(quote_char)s:'
             ' %(value)s%(comma)s%(newline)s'
         ) % {
@@ -112,15 +291,85 @@ def _kwargs_render(
             'key': escape_by_quote(key, quote_char),
             'value': _value,
             'comma': ',' if i < len(kwargs) - 1 else '',
+        })
+
+
+def _validate_stream_upload(
+    stream_upload, parameters=[], files={}, compress=None,
+):
+    # returns if the body is sent by a stream
+    if not stream_upload or not files:
+        return False
+    elif len(files) != 1 or parameters:
+        raise ValueError(
+            '\'stream_upload\' argument requires only one file and no'
+            ' parameters',
+        )
+    elif compress:
+        raise ValueError(
+            '\'stream_upload\' argument can\'t be used with \'compress\'',
+        )
+    return True
+
+
+def _file_stream_definition(
+    file_data, node=False, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, oneline=False, wrap=DEFAULT_WRAP,
+    seed=None, locale=None,
+):
+    if not node:
+        return (
+            'document.querySelector(%(quote_char)sinput[type='
+            '%(other_quote_char)sfile%(other_quote_char)s]%(quote_char)s)'
+            '.files[0].stream()'
+        ) % {
+            'quote_char': quote_char,
+            'other_quote_char': '"' if quote_char == '\'' else '\'',
         }
-    return response
+
+    if isinstance(file_data, str):
+        filepath = file_data
+    else:
+        filepath = file_data[0] if file_data is not None else None
+    if filepath is None:
+        filepath = lazy_value_by_parameter(
+            {
+                'name': '',
+                'faker': 'faker.providers.file::file_path',
+            },
+            seed=seed,
+            locale=locale,
+        )
+    # 26 here is the length of 'body: fs.createReadStream('
+    return 'fs.createReadStream(%s)' % (
+        '%(quote_char)s%(filepath)s%(quote_char)s' % {
+            'quote_char': quote_char,
+            'filepath': escape_by_quote(filepath, quote_char),
+        } if oneline else str_definition(
+            filepath, quote_char=quote_char, wrap=wrap,
+            indent=' ' * (len(indent) * 2 + 26),
+        )
+    )
+
+
+def _program_kwargs(url, kwargs, program=None):
+    # NodeJS programs reuse connections by keep-alive agents
+    if program is None or program.setup is not True:
+        return kwargs
+    return dict(
+        kwargs,
+        agent=Identifier(
+            'httpsAgent' if url.startswith('https:') else 'httpAgent',
+        ),
+    )
 
 
 def get(
     url, parameters=[], headers={}, indent=DEFAULT_INDENT,
     quote_char=DEFAULT_QUOTE_CHAR, setup=False, teardown=None,
     oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
-    **kwargs,
+    fanout=None, concurrency=None, stream_response=False, measure=False,
+    _emitter=None, _program=None, **kwargs,
 ):
     '''This implementation will emulate browsers\' fetch API by default.
     using Promises-like response processing.
@@ -149,6 +398,80 @@ def get(
     ```javascript
     import \'whatwg-fetch\';
     ```
+
+    Passing ``fanout``, the request is performed the number of times
+    defined by a function called from an asynchronous ``main`` function,
+    which waits for all of them by ``Promise.allSettled``. The number of
+    requests in flight can be limited by ``concurrency``, which renders a
+    pool of workers performing the requests one after another:
+
+    ```javascript
+    function request() {
+      return fetch(\'<url>\');
+    }
+
+    async function main() {
+      const results = [];
+      let next = 0;
+      async function worker() {
+        while (next < 100) {
+          const index = next++;
+          try {
+            results[index] = {status: \'fulfilled\', value: await request()};
+          } catch (reason) {
+            results[index] = {status: \'rejected\', reason: reason};
+          }
+        }
+      }
+      await Promise.all(Array.from({length: 10}, worker));
+      console.log(results);
+    }
+
+    main();
+    ```
+
+    Passing ``stream_response=True``, the body of the response is
+    processed by chunks as they arrive, without buffering it in memory.
+    Browsers read it by the reader of its stream and NodeJS iterates it
+    asynchronously, which works for ``node-fetch`` and native streams:
+
+    ```javascript
+    fetch(\'<url>\').then(async function(response) {
+      const reader = response.body.getReader();
+      while (true) {
+        const {done, value} = await reader.read();
+        if (done) {
+          break;
+        }
+        console.log(value);
+      }
+    })...
+    ```
+
+    Passing ``measure=True``, the request is rendered inside a function
+    which reads the body of the response, awaited by an asynchronous
+    ``main`` function which prints its duration measured by
+    ``performance.now()``. Passing an integer, the request is performed
+    that number of times, one after another, printing the percentiles 50,
+    90 and 99 of their durations:
+
+    ```javascript
+    function request() {
+      return fetch(\'<url>\').then(function(response) {
+        return response.text();
+      });
+    }
+
+    async function main() {
+      const start = performance.now();
+      await request();
+      console.log((performance.now() - start).toFixed(2) + \' ms\');
+    }
+
+    main().catch(function(err) {
+      console.error(\'Error:\', err);
+    });
+    ```
     '''
 
     '''Implementation details:
@@ -166,21 +489,38 @@ def get(
     instead of use it for implement the request in multiples or one line.
     '''
 
-    response = ''
+    validate_fanout(fanout, concurrency)
+    _validate_program_fanout(fanout, program=_program)
+    _validate_stream_response(stream_response, fanout=fanout)
+    _validate_measure(
+        measure, fanout=fanout, stream_response=stream_response,
+        program=_program,
+    )
+    emitter = Emitter() if _emitter is None else _emitter
+    kwargs = _program_kwargs(url, kwargs, program=_program)
+
+    # NodeJS or browser environment
+    node = bool(setup) if _program is None else bool(_program.setup)
 
     # initialization
     if setup:
         if isinstance(setup, str):
-            response += setup
+            emitter.write(setup)
         else:
             # If `setup == True`, 'node-fetch' for NodeJS is required
-            response += (
+            emitter.write((
                 'const fetch = require(%(quote_char)snode-fetch'
                 '%(quote_char)s);%(newline)s%(newline)s'
             ) % {
                 'newline': '\n' if not oneline else '',
                 'quote_char': quote_char,
-            }
+            })
+
+    # the request is rendered inside a function if performed multiple times
+    # or measured
+    output = emitter if fanout is None and not measure else Emitter()
+    if fanout is not None or measure:
+        output.write('return ')
 
     if parameters:
         parameters_dict = OrderedDict({})
@@ -199,7 +539,7 @@ def get(
             url, indent=indent, quote_char=quote_char,
             wrap=wrap,
         )
-    response += (
+    output.write((
         'fetch(%(newline)s%(indent)s%(url)s%(comma)s'
         '%(space)s%(newline)s'
     ) % {
@@ -209,53 +549,144 @@ def get(
         'comma': ',' if (parameters or headers or kwargs) else '',
         'space': ' ' if (oneline and (parameters or headers or kwargs))
                  else '',
-    }
+    })
 
     # options render
     if headers or kwargs:
-        response += '{indent}{{{newline}'.format(
+        output.write('{indent}{{{newline}'.format(
             indent=indent if not oneline else '',
             newline='\n' if not oneline else '',
-        )
+        ))
 
     if headers:
-        response += _headers_render(
-            headers, indent=indent, oneline=oneline,
+        _headers_render(
+            output, headers, indent=indent, oneline=oneline,
             quote_char=quote_char, wrap=wrap,
-            _comma_at_end=bool(kwargs),
+            _comma_at_end=bool(kwargs), program=_program,
         )
 
     if kwargs:
-        response += _kwargs_render(
-            kwargs, indent=indent, oneline=oneline,
+        _kwargs_render(
+            output, kwargs, indent=indent, oneline=oneline,
             quote_char=quote_char, wrap=wrap,
         )
 
     if headers or kwargs:
-        response += '{indent}}}{newline}'.format(
+        output.write('{indent}}}{newline}'.format(
             indent=indent if not oneline else '',
             newline='\n' if not oneline else '',
-        )
+        ))
 
-    response += _promises_chain_render(
-        quote_char=quote_char, indent=indent,
-        oneline=oneline,
-    )
+    if measure:
+        _measure_render(
+            emitter, output.getvalue(), measure, indent=indent,
+            quote_char=quote_char, oneline=oneline,
+        )
+    elif fanout is None:
+        emitter.write(_promises_chain_render(
+            quote_char=quote_char, indent=indent,
+            oneline=oneline, stream=stream_response, node=node,
+        ))
+    else:
+        _fanout_render(
+            emitter, output.getvalue() + ')', fanout,
+            concurrency=concurrency, indent=indent, quote_char=quote_char,
+            oneline=oneline,
+        )
 
     if teardown:
-        response += teardown
+        emitter.write(teardown)
 
-    return response
+    return emitter.getvalue()
 
 
 def post(
     url, parameters=[], files={}, headers={}, indent=DEFAULT_INDENT,
     quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
     oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    compress=None, fanout=None, concurrency=None, stream_response=False,
+    stream_upload=False, measure=False, _emitter=None, _program=None,
     **kwargs,
 ):
+    '''Bodies built from parameters can be compressed passing
+    ``compress='gzip'`` or ``compress='deflate'``. The body is compressed
+    by a ``CompressionStream`` before performing the request and the
+    ``Content-Encoding`` header is defined. Responses are decompressed by
+    ``fetch``, which accepts compressed content by default:
+
+    ```javascript
+    new Response(
+      new Blob([
+        JSON.stringify({
+          'foo': 'bar'
+        })
+      ]).stream().pipeThrough(new CompressionStream('gzip'))
+    ).arrayBuffer().then(function(body) {
+      return fetch(
+        '<url>',
+        {
+          method: 'POST',
+          body: body,
+          headers: {
+            'Content-Type': 'application/json',
+            'Content-Encoding': 'gzip'
+          }
+        }
+      );
+    }).then(function(response) {
+      ...
+    ```
+
+    ``CompressionStream`` is available in modern browsers and NodeJS
+    v18 or greater. Passing ``fanout``, the function performing the request
+    is ``async`` and awaits the compressed body before calling ``fetch``.
+
+    Passing ``stream_upload=True`` with only one file, the content of the
+    file is sent as the body by a stream instead of being encoded as
+    ``multipart/form-data``, so it's never loaded entirely in memory.
+    NodeJS reads the file by ``fs.createReadStream`` and browsers by the
+    stream of the file selected. The ``duplex: \'half\'`` option, required
+    sending streams by native implementations of fetch, is defined and the
+    content type of the file, if passed, is defined as ``Content-Type``:
+
+    ```javascript
+    const fs = require(\'fs\');
+
+    const fetch = require(\'node-fetch\');
+
+    fetch(
+      \'<url>\',
+      {
+        method: \'POST\',
+        body: fs.createReadStream(\'/path/to/file.bin\'),
+        headers: {
+          \'Content-Type\': \'application/octet-stream\'
+        },
+        \'duplex\': \'half\'
+      }
+    )...
+    ```
+
+    Requests can be measured passing ``measure``, like the [GET method
+    generator](#get) does, reading the body of the response inside the
+    measurement.
+    '''
+    validate_fanout(fanout, concurrency)
+    _validate_program_fanout(fanout, program=_program)
+    _validate_stream_response(stream_response, fanout=fanout)
+    _validate_measure(
+        measure, fanout=fanout, stream_response=stream_response,
+        program=_program,
+    )
+    stream_upload = _validate_stream_upload(
+        stream_upload, parameters=parameters, files=files, compress=compress,
+    )
     # (no setup -> web / setup -> node)
-    response = ''
+    emitter = Emitter() if _emitter is None else _emitter
+    kwargs = _program_kwargs(url, kwargs, program=_program)
+
+    # NodeJS or browser environment
+    node = bool(setup) if _program is None else bool(_program.setup)
 
     # Discover content-type
     content_type = 'application/x-www-form-urlencoded'
@@ -263,45 +694,75 @@ def post(
         if key.lower() == 'content-type':
             content_type = value
             break
-    if content_type.startswith('multipart/form-data') or files:
+    if stream_upload:
+        # the file is the whole body, so its content type is the one of the
+        # request if not defined
+        file_data = list(files.values())[0]
+        headers = OrderedDict(headers)
+        if not isinstance(file_data, str) and file_data is not None and \
+                len(file_data) > 1 and not any(
+                    name.lower() == 'content-type' for name in headers
+                ):
+            headers['Content-Type'] = file_data[1]
+        content_type = None
+        kwargs = OrderedDict(kwargs)
+        kwargs.setdefault('duplex', 'half')
+    elif content_type.startswith('multipart/form-data') or files:
         content_type = 'multipart/form-data'
+    validate_compress(compress, content_type)
+    if not parameters:
+        # requests without body are not compressed
+        compress = None
 
     # Initialization will depend on content type
     if setup:
         if isinstance(setup, str):
-            response += setup
+            emitter.write(setup)
         else:
-            if content_type == 'multipart/form-data':
-                response += (
+            if content_type == 'multipart/form-data' or (
+                stream_upload and node
+            ):
+                emitter.write((
                     'const fs = require(%(quote_char)s'
                     'fs%(quote_char)s);%(newline)s%(newline)s'
                 ) % {
                     'quote_char': quote_char,
                     'newline': '\n' if not oneline else '',
-                }
-            response += (
+                })
+            emitter.write((
                 'const fetch = require(%(quote_char)s'
                 'node-fetch%(quote_char)s);'
             ) % {
                 'quote_char': quote_char,
-            }
+            })
             if content_type == 'multipart/form-data':
-                response += (
+                emitter.write((
                     '%(newline)sconst FormData = require('
                     '%(quote_char)sform-data%(quote_char)s);'
                 ) % {
                     'quote_char': quote_char,
                     'newline': '\n' if not oneline else '',
-                }
+                })
             if not oneline:
-                response += '\n\n'
+                emitter.write('\n\n')
 
-    if content_type == 'multipart/form-data':
-        body = 'formData'
+    # the request is rendered inside a function if performed multiple times
+    output = emitter if fanout is None and not measure else Emitter()
+
+    if stream_upload:
+        body = _file_stream_definition(
+            list(files.values())[0], node=node, indent=indent,
+            quote_char=quote_char, oneline=oneline, wrap=wrap, seed=seed,
+            locale=locale,
+        )
+    elif content_type == 'multipart/form-data':
+        body = 'formData' if _program is None else \
+            _program.variable_name('formData')
 
         # if we are sending files from the browser, select all files
-        if not setup and files:
-            response += (
+        # (programs select them only once)
+        if not node and files and _program is None:
+            output.write((
                 'const files = document.querySelector('
                 '%(quote_char)sinput[type=%(other_quote_char)s'
                 'file%(other_quote_char)s]%(quote_char)s);'
@@ -310,11 +771,12 @@ def post(
                 'quote_char': quote_char,
                 'other_quote_char': '"' if quote_char == '\'' else '\'',
                 'newline': '\n' if not oneline else '',
-            }
+            })
 
-        response += 'const formData = new FormData();{newline}'.format(
+        output.write('const {body} = new FormData();{newline}'.format(
+            body=body,
             newline='\n' if not oneline else '',
-        )
+        ))
 
         # parameters render
         for parameter in parameters:
@@ -323,49 +785,35 @@ def post(
                 parameter, seed=seed, locale=locale,
             )
 
-            # 20 here is the length of `formData.append(, );`
-            _multiline_param = False
-            if 20 + len(quote_char) * 4 + len(name) + len(str(value)) > wrap:
-                _multiline_param = True
-
-            if _multiline_param:
-                _param_name = str_definition(
-                    name, indent=indent,
-                    quote_char=quote_char, wrap=wrap,
-                )
-                _param_value = str_definition(
-                    value, indent=indent,
-                    quote_char=quote_char, wrap=wrap,
-                )
-            else:
-                _value_name_schema = '%(quote_char)s%(string)s%(quote_char)s'
-                _param_name = _value_name_schema % {
-                    'quote_char': quote_char,
-                    'string': escape_by_quote(name, quote_char),
-                }
-                _param_value = _value_name_schema % {
-                    'quote_char': quote_char,
-                    'string': escape_by_quote(str(value), quote_char),
-                }
-
-            response += (
-                'formData.append(%(newline)s%(indent)s'
-                '%(param_name)s,%(space)s'
-                '%(newline)s%(indent)s%(param_value)s'
-                '%(newline)s);'
-            ) % {
-                'newline': '\n' if (not oneline and _multiline_param) else '',
-                'indent': indent if (not oneline and _multiline_param) else '',
-                'space': ' ',
-                'param_name': _param_name,
-                'param_value': _param_value,
-            }
+            # the parameter is appended in one line if fits in the wrap
+            output.write_layout(
+                Group([
+                    body + '.append(',
+                    Nest(indent, [
+                        SOFTLINE,
+                        str_doc(
+                            name, indent=indent,
+                            quote_char=quote_char, wrap=wrap,
+                        ),
+                        ',',
+                        Line(' ', ' '),
+                        str_doc(
+                            str(value), indent=indent,
+                            quote_char=quote_char, wrap=wrap,
+                        ),
+                    ]),
+                    SOFTLINE,
+                    ');',
+                ]),
+                wrap=wrap,
+                flat=oneline,
+            )
             if not oneline:
-                response += '\n'
+                output.write('\n')
 
         # files render
         for i, (file_param_name, file_data) in enumerate(files.items()):
-            response += 'formData.append('
+            output.write(body + '.append(')
             if not oneline:
                 _file_param_name = str_definition(
                     file_param_name,
@@ -386,7 +834,7 @@ def post(
                     ),
                 }
 
-            response += (
+            output.write((
                 '%(newline)s%(indent)s%(file_param_name)s,%(space)s'
                 '%(newline)s%(indent)s'
             ) % {
@@ -394,10 +842,10 @@ def post(
                 'indent': indent if not oneline else '',
                 'file_param_name': _file_param_name,
                 'space': ' ' if oneline else '',
-            }
+            })
 
-            if setup:
-                response += 'fs.createReadStream('  # length: 20
+            if node:
+                output.write('fs.createReadStream(')  # length: 20
 
                 if isinstance(file_data, str):
                     filepath = file_data
@@ -438,7 +886,7 @@ def post(
                         ),
                     )
 
-                response += (
+                output.write((
                     '%(filepath)s),%(space)s%(newline)s%(indent)s{'
                     '%(newline)s%(indent)s%(indent)s'
                     'filename: %(filename)s'
@@ -448,7 +896,7 @@ def post(
                     'indent': indent if not oneline else '',
                     'filepath': _filepath,
                     'filename': _filename,
-                }
+                })
                 if not isinstance(file_data, str) and file_data is not None:
                     if len(file_data) > 1:
                         if not oneline:
@@ -469,28 +917,30 @@ def post(
                                 ),
                             }
 
-                        response += (
+                        output.write((
                             ',%(newline)s%(indent)s%(indent)s'
                             'contentType: %(content_type)s'
                         ) % {
                             'content_type': _content_type,
                             'newline': '\n' if not oneline else '',
                             'indent': indent if not oneline else '',
-                        }
-                response += '{newline}{indent}}}{newline}'.format(
+                        })
+                output.write('{newline}{indent}}}{newline}'.format(
                     newline='\n' if not oneline else '',
                     indent=indent if not oneline else '',
-                )
+                ))
             else:
                 # TODO: Manage content_type and filename?
-                response += 'inputs[%(input_index)d].files[0]%(newline)s' % {
+                output.write((
+                    'inputs[%(input_index)d].files[0]%(newline)s'
+                ) % {
                     'input_index': i,
                     'newline': '\n' if not oneline else '',
-                }
-            response += ');{newline}'.format(
+                })
+            output.write(');{newline}'.format(
                 newline='\n' if not oneline else '',
-            )
-        response += '\n'
+            ))
+        output.write('\n')
     elif content_type == 'text/plain':
         if len(parameters) != 1:
             raise_post_text_plain_n_parameters_not_1(len(parameters))
@@ -502,20 +952,58 @@ def post(
         )
         body = str_definition(
             _value,
-            indent=' ' * (len(indent) * 2 + 6),
+            # 6 here is the length of 'body: '
+            indent=' ' * (len(indent) * 2 + (0 if compress else 6)),
             quote_char=quote_char,
             wrap=wrap,
         )
     else:  # 'application/json' or 'application/x-www-form-urlencoded'
         object_content = ''
 
-        for i, parameter in enumerate(parameters):
-            name = lazy_name_by_parameter(parameter, seed=seed)
-            value = lazy_value_by_parameter(
-                parameter, seed=seed, locale=locale,
+        if content_type == 'application/json' and parameters:
+            # JSON must accepts other data types than string
+            json_body = lazy_json_body_by_parameters(
+                parameters, seed=seed, locale=locale,
             )
+        else:
+            json_body = OrderedDict([
+                (
+                    lazy_name_by_parameter(parameter, seed=seed),
+                    lazy_value_by_parameter(
+                        parameter, seed=seed, locale=locale,
+                    ),
+                ) for parameter in parameters
+            ])
+
+        if not isinstance(json_body, dict):
+            object_content = None
+            body = 'JSON.stringify(%(value)s)' % {
+                'value': value_definition(
+                    json_body,
+                    indent=indent if not oneline else '',
+                    indent_depth=2,
+                    quote_char=quote_char,
+                    wrap=wrap,
+                    newline='\n' if not oneline else '',
+                ),
+            }
+            json_body = {}
 
-            if oneline:
+        for i, (name, value) in enumerate(json_body.items()):
+            if not isinstance(value, str):
+                name_def = '{quote_char}{name}{quote_char}'.format(
+                    name=escape_by_quote(name, quote_char),
+                    quote_char=quote_char,
+                )
+                value_def = value_definition(
+                    value,
+                    indent=indent if not oneline else '',
+                    indent_depth=3,
+                    quote_char=quote_char,
+                    wrap=wrap,
+                    newline='\n' if not oneline else '',
+                )
+            elif oneline:
                 name_def = '{quote_char}{name}{quote_char}'.format(
                     name=escape_by_quote(name, quote_char),
                     quote_char=quote_char,
@@ -548,9 +1036,9 @@ def post(
                 'name': name_def,
                 'indent': indent * 3,
                 'value': value_def,
-                'comma': ',' if i < (len(parameters) - 1) else '',
+                'comma': ',' if i < (len(json_body) - 1) else '',
                 'newline': '\n' if (
-                    not oneline and i < (len(parameters) - 1)
+                    not oneline and i < (len(json_body) - 1)
                 ) else '',
             }
 
@@ -566,10 +1054,55 @@ def post(
                 'newline': '\n' if not oneline else '',
                 'indent': indent * 2,
             }
-        else:
+        elif object_content is not None:
             body = ''
 
-    response += (
+    compressed_body = None
+    if compress:
+        compressed_body = (
+            'new Response(%(newline)s%(indent)snew Blob([%(newline)s'
+            '%(indent)s%(indent)s%(body)s%(newline)s%(indent)s])'
+            '.stream().pipeThrough(new CompressionStream('
+            '%(quote_char)s%(compress)s%(quote_char)s))%(newline)s)'
+            '.arrayBuffer()'
+        ) % {
+            'newline': '\n' if not oneline else '',
+            'indent': indent if not oneline else '',
+            'body': body,
+            'quote_char': quote_char,
+            'compress': compress,
+        }
+
+    if compress and fanout is not None:
+        # the function performing the request is asynchronous, so it awaits
+        # the compressed body before performing the request
+        output.write('const body = await %s;%s' % (
+            compressed_body, '\n' if not oneline else '',
+        ))
+    if fanout is not None or measure:
+        output.write('return ')
+
+    request_emitter = output
+    if compress:
+        if fanout is None:
+            # the body is compressed before performing the request, which is
+            # rendered inside the function that receives it
+            output.write('%s.then(function(body) {%s' % (
+                compressed_body, '\n' if not oneline else '',
+            ))
+            request_emitter = Emitter()
+        body = 'body'
+
+        # the body is sent as binary data, so the content type of forms
+        # must be defined explicitly
+        headers = OrderedDict(headers)
+        if content_type == 'application/x-www-form-urlencoded' and not any(
+            name.lower() == 'content-type' for name in headers
+        ):
+            headers['Content-Type'] = content_type
+        headers['Content-Encoding'] = compress
+
+    request_emitter.write((
         'fetch(%(newline)s%(indent)s%(url)s,%(space)s%(newline)s'
         '%(indent)s{%(indent)s%(newline)s%(indent)s%(indent)smethod:'
         ' %(quote_char)sPOST%(quote_char)s%(comma)s%(newline)s'
@@ -583,10 +1116,10 @@ def post(
             url, quote_char=quote_char,
             indent=indent, wrap=wrap,
         ),
-    }
+    })
 
     if body:
-        response += (
+        request_emitter.write((
             '%(indent)s%(indent)sbody:'
             ' %(body)s%(comma)s%(newline)s'
         ) % {
@@ -594,34 +1127,176 @@ def post(
             'indent': indent if not oneline else '',
             'comma': ',' if (kwargs or headers) else '',
             'body': body,
-        }
+        })
 
     # headers render
     if headers:
-        response += _headers_render(
-            headers, indent=indent, oneline=oneline,
+        _headers_render(
+            request_emitter, headers, indent=indent, oneline=oneline,
             quote_char=quote_char, wrap=wrap,
-            _comma_at_end=bool(kwargs),
+            _comma_at_end=bool(kwargs), program=_program,
         )
 
     # kwargs render
     if kwargs:
-        response += _kwargs_render(
-            kwargs, indent=indent, oneline=oneline,
+        _kwargs_render(
+            request_emitter, kwargs, indent=indent, oneline=oneline,
             quote_char=quote_char, wrap=wrap,
         )
 
-    response += '{indent}}}{newline}'.format(
+    request_emitter.write('{indent}}}{newline}'.format(
         indent=indent if not oneline else '',
         newline='\n' if not oneline else '',
-    )
+    ))
+
+    if compress and fanout is None:
+        # the request is returned by the function, one level indented
+        output.write(
+            ''.join(
+                (indent if not oneline and line.strip() else '') + line
+                for line in request_emitter.getvalue().splitlines(True)
+            ).replace('fetch(', 'return fetch(', 1),
+        )
+        output.write('{indent});{newline}}}'.format(
+            indent=indent if not oneline else '',
+            newline='\n' if not oneline else '',
+        ))
 
-    response += _promises_chain_render(
-        quote_char=quote_char, indent=indent,
-        oneline=oneline,
-    )
+    if measure:
+        _measure_render(
+            emitter, output.getvalue(), measure, indent=indent,
+            quote_char=quote_char, oneline=oneline,
+        )
+    elif fanout is None:
+        emitter.write(_promises_chain_render(
+            quote_char=quote_char, indent=indent,
+            oneline=oneline, stream=stream_response, node=node,
+        ))
+    else:
+        _fanout_render(
+            emitter, output.getvalue() + ')', fanout,
+            concurrency=concurrency, indent=indent, quote_char=quote_char,
+            oneline=oneline, asynchronous=bool(compress),
+        )
 
     if teardown:
-        response += teardown
+        emitter.write(teardown)
+
+    return emitter.getvalue()
+
+
+def program(
+    program, indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    setup=True, teardown=None, wrap=DEFAULT_WRAP, _emitter=None,
+):
+    '''Programs emulate a NodeJS environment by default, requiring the
+    modules needed by all the requests only once. Requests reuse their
+    connections by keep-alive agents, one by protocol, and headers defined
+    by more than one request are defined once as constants:
+
+    ```javascript
+    const http = require('http');
+    const fetch = require('node-fetch');
 
-    return response
+    const httpAgent = new http.Agent({keepAlive: true});
+
+    const HEADERS_1 = {'Accept': 'application/json'};
+
+    fetch('<url>', {
+      headers: HEADERS_1,
+      agent: httpAgent
+    })...
+    ```
+
+    Passing ``setup=False`` the program is rendered for browsers and
+    defining a custom ``setup``, the agents are not defined.
+    '''
+    emitter = Emitter() if _emitter is None else _emitter
+
+    if isinstance(setup, str):
+        emitter.write(setup)
+    elif setup:
+        urls = [kwargs['url'] for _, kwargs in program.requests]
+        modules = []
+        if program.has_files():
+            modules.append('fs')
+        for protocol in ('http', 'https'):
+            if any(url.startswith(protocol + ':') for url in urls) or (
+                protocol == 'http' and not all(
+                    url.startswith('https:') for url in urls
+                )
+            ):
+                modules.append(protocol)
+        modules.append('fetch')
+        if program.has_multipart():
+            modules.append('FormData')
+
+        for module in modules:
+            emitter.write(
+                'const %(name)s = require(%(quote_char)s%(module)s'
+                '%(quote_char)s);\n' % {
+                    'name': module,
+                    'module': {
+                        'fetch': 'node-fetch',
+                        'FormData': 'form-data',
+                    }.get(module, module),
+                    'quote_char': quote_char,
+                },
+            )
+        emitter.write('\n')
+
+        for protocol in ('http', 'https'):
+            if protocol in modules:
+                emitter.write(
+                    'const %(protocol)sAgent = new %(protocol)s.Agent('
+                    '{keepAlive: true});\n' % {'protocol': protocol},
+                )
+        emitter.write('\n')
+    elif program.has_files():
+        emitter.write((
+            'const files = document.querySelector('
+            '%(quote_char)sinput[type=%(other_quote_char)s'
+            'file%(other_quote_char)s]%(quote_char)s);\n\n'
+        ) % {
+            'quote_char': quote_char,
+            'other_quote_char': '"' if quote_char == '\'' else '\'',
+        })
+
+    for name, headers in program.headers_constants:
+        items = []
+        for key, value in headers.items():
+            _key = escape_by_quote(key, quote_char)
+            items.append([
+                '%(quote_char)s%(key)s%(quote_char)s: ' % {
+                    'key': _key,
+                    'quote_char': quote_char,
+                },
+                str_doc(
+                    value, indent=indent + ' ' * (len(_key) + 4),
+                    quote_char=quote_char, wrap=wrap,
+                ),
+            ])
+        emitter.write_layout(
+            Group([
+                'const %s = {' % name,
+                Nest(indent, [SOFTLINE, join([',', LINE], items)]),
+                SOFTLINE,
+                '};',
+            ]),
+            wrap=wrap,
+        )
+        emitter.write('\n\n')
+
+    for i, (func, kwargs) in enumerate(program.requests):
+        if i:
+            # promises chains are separated by blank lines
+            emitter.write('\n')
+        func(
+            indent=indent, quote_char=quote_char, setup=False, wrap=wrap,
+            _emitter=emitter, _program=program, **kwargs,
+        )
+        emitter.write('\n')
+
+    if teardown:
+        emitter.write(str(teardown))
+    return emitter.getvalue()
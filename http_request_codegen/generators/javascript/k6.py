@@ -0,0 +1,525 @@
+'''Javascript k6 load testing scripts generator.'''
+
+import os
+from collections import OrderedDict
+
+
+try:
+    from urllib.parse import urlencode
+except ImportError:
+    from urllib import urlencode
+
+from http_request_codegen.generators.javascript._utils import (
+    DEFAULT_INDENT,
+    DEFAULT_QUOTE_CHAR,
+    DEFAULT_WRAP,
+    escape_by_quote,
+    str_definition,
+    str_doc,
+    value_doc,
+)
+from http_request_codegen.hrc_emitter import Emitter
+from http_request_codegen.hrc_exceptions import (
+    raise_post_text_plain_n_parameters_not_1,
+)
+from http_request_codegen.hrc_layout import Group, bracket
+from http_request_codegen.hrc_valuer import (
+    lazy_json_body_by_parameters,
+    lazy_name_by_parameter,
+    lazy_value_by_parameter,
+)
+
+
+def _validate_options(
+    vus=None, duration=None, rate=None, thresholds=None, setup=True,
+):
+    for argument, value in (('vus', vus), ('rate', rate)):
+        if value is not None and (
+            isinstance(value, bool) or not isinstance(value, int) or
+            value < 1
+        ):
+            raise ValueError(
+                '\'%s\' argument must be a positive integer, but \'%s\''
+                ' passed' % (argument, value),
+            )
+    if duration is not None and not isinstance(duration, str):
+        raise TypeError(
+            '\'duration\' argument must be a string, like \'30s\', but'
+            ' \'%s\' passed' % type(duration).__name__,
+        )
+    if thresholds is not None and not isinstance(thresholds, dict):
+        raise TypeError(
+            '\'thresholds\' argument must be a dictionary, but \'%s\''
+            ' passed' % type(thresholds).__name__,
+        )
+    if rate is not None and (vus is None or duration is None):
+        raise ValueError(
+            '\'rate\' argument requires \'vus\' and \'duration\' arguments',
+        )
+    if not setup:
+        for argument, value in (
+            ('vus', vus), ('duration', duration), ('rate', rate),
+            ('thresholds', thresholds),
+        ):
+            if value is not None:
+                raise ValueError(
+                    '\'%s\' argument requires initialization' % argument,
+                )
+
+
+def _options_doc(
+    vus=None, duration=None, rate=None, thresholds=None,
+    indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+):
+    def string(value):
+        return '%(quote_char)s%(value)s%(quote_char)s' % {
+            'quote_char': quote_char,
+            'value': escape_by_quote(value, quote_char),
+        }
+
+    items = []
+    if rate is not None:
+        # iterations are started at a constant rate by second, by a pool of
+        # virtual users allocated before starting the test
+        items.append([
+            'scenarios: ',
+            bracket(
+                '{',
+                [[
+                    'constant_arrival_rate: ',
+                    bracket(
+                        '{',
+                        [
+                            'executor: ' + string('constant-arrival-rate'),
+                            'rate: %d' % rate,
+                            'timeUnit: ' + string('1s'),
+                            'duration: ' + string(duration),
+                            'preAllocatedVUs: %d' % vus,
+                        ],
+                        '}',
+                        indent,
+                    ),
+                ]],
+                '}',
+                indent,
+            ),
+        ])
+    else:
+        if vus is not None:
+            items.append('vus: %d' % vus)
+        if duration is not None:
+            items.append('duration: ' + string(duration))
+    if thresholds:
+        # metrics names are quoted because they can include tags
+        items.append([
+            'thresholds: ',
+            bracket(
+                '{',
+                [
+                    [
+                        string(metric) + ': ',
+                        Group(bracket(
+                            '[',
+                            [
+                                string(condition) for condition in (
+                                    [conditions]
+                                    if isinstance(conditions, str)
+                                    else conditions
+                                )
+                            ],
+                            ']',
+                            indent,
+                        )),
+                    ] for metric, conditions in thresholds.items()
+                ],
+                '}',
+                indent,
+            ),
+        ])
+    return bracket('{', items, '}', indent) if items else None
+
+
+def _file_path(value, seed=None, locale=None):
+    if isinstance(value, str) or value is None:
+        value = [value]
+    filepath = value[0]
+    if filepath is None:
+        # random filepath
+        filepath = lazy_value_by_parameter(
+            {
+                'name': '',
+                'faker': 'faker.providers.file::file_path',
+            },
+            seed=seed,
+            locale=locale,
+        )
+    return (filepath, value[1] if len(value) > 1 else None)
+
+
+def _files_render(
+    emitter, files, quote_char=DEFAULT_QUOTE_CHAR, oneline=False,
+    wrap=DEFAULT_WRAP, indent=DEFAULT_INDENT, seed=None, locale=None,
+):
+    # files can only be opened in the init context of k6, so their contents
+    # are read in variables before the default function
+    variables = OrderedDict()
+    for i, (name, value) in enumerate(files.items()):
+        filepath, content_type = _file_path(value, seed=seed, locale=locale)
+        variable = 'file' if not i else 'file%d' % (i + 1)
+        emitter.write_layout(
+            Group([
+                'const %s = open' % variable,
+                bracket(
+                    '(',
+                    [
+                        str_doc(
+                            filepath, indent=indent,
+                            quote_char=quote_char, wrap=wrap,
+                        ),
+                        '%(quote_char)sb%(quote_char)s' % {
+                            'quote_char': quote_char,
+                        },
+                    ],
+                    ')',
+                    indent,
+                ),
+                ';',
+            ]),
+            wrap=wrap,
+            flat=oneline,
+        )
+        emitter.write('\n' if not oneline else '')
+        variables[name] = (variable, filepath, content_type)
+    emitter.write('\n' if not oneline else '')
+    return variables
+
+
+def _setup_render(
+    emitter, setup, options_doc=None, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, oneline=False, wrap=DEFAULT_WRAP,
+):
+    if not setup:
+        return
+    elif isinstance(setup, str):
+        emitter.write(setup)
+    else:
+        emitter.write((
+            'import http from %(quote_char)sk6/http%(quote_char)s;'
+            '%(newline)s%(newline)s'
+        ) % {
+            'quote_char': quote_char,
+            'newline': '\n' if not oneline else '',
+        })
+
+    if options_doc is not None:
+        emitter.write_layout(
+            Group(['export const options = ', options_doc, ';']),
+            wrap=wrap,
+            flat=oneline,
+        )
+        emitter.write('\n\n' if not oneline else '')
+
+
+def _params_doc(
+    headers={}, kwargs={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, wrap=DEFAULT_WRAP,
+):
+    # params are placed at the second level of indentation, inside the call
+    items = []
+    if headers:
+        items.append([
+            'headers: ',
+            value_doc(
+                headers, indent=indent, indent_depth=2,
+                quote_char=quote_char, wrap=wrap,
+            ),
+        ])
+    for key, value in kwargs.items():
+        _key = escape_by_quote(key, quote_char)
+        items.append([
+            '%(quote_char)s%(key)s%(quote_char)s: ' % {
+                'key': _key,
+                'quote_char': quote_char,
+            },
+            str_definition(
+                value,
+                indent=indent * 2 + ' ' * (len(_key) + 4),
+                quote_char=quote_char, wrap=wrap,
+            ) if isinstance(value, str) else value_doc(
+                value, indent=indent, indent_depth=2,
+                quote_char=quote_char, wrap=wrap,
+            ),
+        ])
+    return bracket('{', items, '}', indent) if items else None
+
+
+def _request_render(
+    emitter, method, url, body_doc=None, params_doc=None, setup=True,
+    indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR, oneline=False,
+    wrap=DEFAULT_WRAP,
+):
+    newline = '\n' if not oneline else ''
+
+    # with initialization, the request is performed by the default function
+    # executed by each iteration of the virtual users, so `wrap` must be
+    # reduced by its indentation
+    output = emitter if not setup else Emitter()
+
+    arguments = [
+        str_doc(url, indent=indent, quote_char=quote_char, wrap=wrap),
+    ]
+    if method == 'post' and (body_doc is not None or params_doc is not None):
+        arguments.append(body_doc if body_doc is not None else 'null')
+    if params_doc is not None:
+        arguments.append(params_doc)
+
+    # the call is rendered in one line if fits in the wrap, in other case
+    # each argument is rendered in its own line
+    output.write_layout(
+        Group([
+            'http.' + method,
+            bracket('(', arguments, ')', indent),
+            ';',
+        ]),
+        wrap=wrap,
+        flat=oneline,
+    )
+
+    if setup:
+        emitter.write('export default function() {' + newline)
+        emitter.write(''.join(
+            (indent if not oneline and line.strip() else '') + line
+            for line in output.getvalue().splitlines(True)
+        ))
+        emitter.write(newline + '}')
+
+
+def _parameters_dict(parameters, seed=None, locale=None):
+    return OrderedDict([
+        (
+            lazy_name_by_parameter(parameter, seed=seed),
+            lazy_value_by_parameter(parameter, seed=seed, locale=locale),
+        ) for parameter in parameters
+    ])
+
+
+def get(
+    url, parameters=[], headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    vus=None, duration=None, rate=None, thresholds=None,
+    _emitter=None, **kwargs,
+):
+    '''Renders a [k6](https://k6.io) load testing script whose default
+    function, executed by each iteration of the virtual users, performs the
+    request by ``http.get``. Parameters are encoded in the URL and headers
+    and ``kwargs`` are passed as the params of the request, like
+    ``kwargs={'timeout': '10s'}``.
+
+    The options of the test are defined passing the next arguments:
+
+    - ``vus``: number of virtual users running at the same time.
+    - ``duration``: duration of the test, like ``'30s'``.
+    - ``rate``: number of iterations started by second. Defines a
+      ``constant-arrival-rate`` scenario whose duration is ``duration``
+      and whose ``vus`` are allocated before starting the test.
+    - ``thresholds``: dictionary of conditions, one or a list of them, that
+      each metric must meet to pass the test, like
+      ``{'http_req_duration': ['p(95)<500']}``.
+
+    ```javascript
+    import http from 'k6/http';
+
+    export const options = {
+      vus: 10,
+      duration: '30s',
+      thresholds: {
+        'http_req_duration': ['p(95)<500']
+      }
+    };
+
+    export default function() {
+      http.get('<url>');
+    }
+    ```
+
+    Without initialization, only the request is rendered, so the options
+    can't be defined. A custom ``setup`` replaces the import of the
+    ``k6/http`` module, which must be imported as ``http``.
+    '''
+    _validate_options(
+        vus=vus, duration=duration, rate=rate, thresholds=thresholds,
+        setup=setup,
+    )
+    emitter = Emitter() if _emitter is None else _emitter
+
+    _setup_render(
+        emitter, setup,
+        options_doc=_options_doc(
+            vus=vus, duration=duration, rate=rate, thresholds=thresholds,
+            indent=indent, quote_char=quote_char,
+        ),
+        indent=indent, quote_char=quote_char, oneline=oneline, wrap=wrap,
+    )
+    if setup and not oneline:
+        wrap -= len(indent)
+
+    if parameters:
+        url = ('&' if '?' in str(url) else '?').join([
+            str(url),
+            urlencode(_parameters_dict(parameters, seed=seed, locale=locale)),
+        ])
+    _request_render(
+        emitter, 'get', url,
+        params_doc=_params_doc(
+            headers=headers, kwargs=kwargs, indent=indent,
+            quote_char=quote_char, wrap=wrap,
+        ),
+        setup=setup, indent=indent, quote_char=quote_char, oneline=oneline,
+        wrap=wrap,
+    )
+
+    if teardown:
+        emitter.write(str(teardown))
+    return emitter.getvalue()
+
+
+def post(
+    url, parameters=[], files={}, headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    vus=None, duration=None, rate=None, thresholds=None,
+    _emitter=None, **kwargs,
+):
+    '''POST method code generator for k6, which accepts the same options
+    that the [GET method generator](#get). The body is built depending on
+    its content type:
+
+    - ``application/x-www-form-urlencoded``: object, encoded by k6.
+    - ``multipart/form-data``: object whose files are read in the init
+      context by ``open`` and passed as ``http.file``, typed by their
+      content type. The content type header is defined by k6, including
+      the boundary of the body, and fields are identified by their names.
+    - ``application/json``: ``JSON.stringify``.
+    - ``text/plain``: string.
+    '''
+    _validate_options(
+        vus=vus, duration=duration, rate=rate, thresholds=thresholds,
+        setup=setup,
+    )
+    emitter = Emitter() if _emitter is None else _emitter
+
+    # Discover content-type
+    content_type = 'application/x-www-form-urlencoded'
+    for key, value in headers.items():
+        if key.lower() == 'content-type':
+            content_type = value
+            break
+    if content_type.startswith('multipart/form-data') or files:
+        content_type = 'multipart/form-data'
+    if content_type == 'text/plain' and len(parameters) != 1:
+        raise_post_text_plain_n_parameters_not_1(len(parameters))
+
+    _setup_render(
+        emitter, setup,
+        options_doc=_options_doc(
+            vus=vus, duration=duration, rate=rate, thresholds=thresholds,
+            indent=indent, quote_char=quote_char,
+        ),
+        indent=indent, quote_char=quote_char, oneline=oneline, wrap=wrap,
+    )
+    variables = _files_render(
+        emitter, files, quote_char=quote_char, oneline=oneline, wrap=wrap,
+        indent=indent, seed=seed, locale=locale,
+    ) if files else {}
+    if setup and not oneline:
+        wrap -= len(indent)
+
+    body_doc = None
+    if content_type == 'multipart/form-data':
+        headers = OrderedDict(
+            (name, value) for name, value in headers.items()
+            if name.lower() != 'content-type'
+        )
+        items = []
+        for name, value in _parameters_dict(
+            parameters, seed=seed, locale=locale,
+        ).items():
+            _name = escape_by_quote(name, quote_char)
+            items.append([
+                '%(quote_char)s%(name)s%(quote_char)s: ' % {
+                    'quote_char': quote_char,
+                    'name': _name,
+                },
+                # strings are wrapped after the name
+                str_definition(
+                    str(value), indent=indent * 2 + ' ' * (len(_name) + 4),
+                    quote_char=quote_char, wrap=wrap,
+                ),
+            ])
+        for name, (variable, filepath, file_type) in variables.items():
+            file_arguments = [
+                variable,
+                str_doc(
+                    os.path.basename(filepath), indent=indent * 3,
+                    quote_char=quote_char, wrap=wrap,
+                ),
+            ]
+            if file_type is not None:
+                file_arguments.append(
+                    str_doc(
+                        file_type, indent=indent * 3,
+                        quote_char=quote_char, wrap=wrap,
+                    ),
+                )
+            items.append([
+                '%(quote_char)s%(name)s%(quote_char)s: ' % {
+                    'quote_char': quote_char,
+                    'name': escape_by_quote(name, quote_char),
+                },
+                Group([
+                    'http.file',
+                    bracket('(', file_arguments, ')', indent),
+                ]),
+            ])
+        body_doc = bracket('{', items, '}', indent)
+    elif parameters:
+        if content_type == 'text/plain':
+            body_doc = str_doc(
+                lazy_value_by_parameter(
+                    parameters[0], seed=seed, locale=locale,
+                ),
+                indent=indent, quote_char=quote_char, wrap=wrap,
+            )
+        elif content_type == 'application/json':
+            body_doc = [
+                'JSON.stringify(',
+                value_doc(
+                    lazy_json_body_by_parameters(
+                        parameters, seed=seed, locale=locale,
+                    ),
+                    indent=indent, indent_depth=1,
+                    quote_char=quote_char, wrap=wrap,
+                ),
+                ')',
+            ]
+        else:
+            body_doc = value_doc(
+                _parameters_dict(parameters, seed=seed, locale=locale),
+                indent=indent, indent_depth=1,
+                quote_char=quote_char, wrap=wrap,
+            )
+
+    _request_render(
+        emitter, 'post', url, body_doc=body_doc,
+        params_doc=_params_doc(
+            headers=headers, kwargs=kwargs, indent=indent,
+            quote_char=quote_char, wrap=wrap,
+        ),
+        setup=setup, indent=indent, quote_char=quote_char, oneline=oneline,
+        wrap=wrap,
+    )
+
+    if teardown:
+        emitter.write(str(teardown))
+    return emitter.getvalue()
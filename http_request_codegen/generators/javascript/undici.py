@@ -0,0 +1,517 @@
+'''Javascript undici code snippets generator.'''
+
+import os
+from collections import OrderedDict
+
+from http_request_codegen.generators.javascript._utils import (
+    DEFAULT_INDENT,
+    DEFAULT_QUOTE_CHAR,
+    DEFAULT_WRAP,
+    escape_by_quote,
+    measure_render,
+    str_definition,
+    str_doc,
+    value_doc,
+)
+from http_request_codegen.hrc_emitter import Emitter
+from http_request_codegen.hrc_exceptions import (
+    raise_post_text_plain_n_parameters_not_1,
+)
+from http_request_codegen.hrc_http import validate_measure
+from http_request_codegen.hrc_layout import Group, bracket
+from http_request_codegen.hrc_valuer import (
+    lazy_json_body_by_parameters,
+    lazy_name_by_parameter,
+    lazy_value_by_parameter,
+)
+
+
+# arguments of the generators and options of the agent which define them
+AGENT_OPTIONS = OrderedDict([
+    ('connections', 'connections'),
+    ('pipelining', 'pipelining'),
+    ('keep_alive_timeout', 'keepAliveTimeout'),
+])
+
+
+def _agent_options(setup=True, **options):
+    # options passed, validated and sorted as they are rendered
+    agent_options = OrderedDict()
+    for argument in AGENT_OPTIONS:
+        value = options.get(argument)
+        if value is None:
+            continue
+        elif not isinstance(value, int) or isinstance(value, bool) or \
+                value < 1:
+            raise ValueError(
+                '\'%s\' argument must be a positive integer, but \'%s\''
+                ' passed' % (argument, value),
+            )
+        elif not setup or isinstance(setup, str):
+            # the agent is only created by the default initialization
+            raise ValueError(
+                (
+                    '\'%s\' argument requires the agent created by the'
+                    ' initialization snippet, pass \'setup=True\''
+                ) % argument,
+            )
+        agent_options[argument] = value
+    return agent_options
+
+
+def _setup_render(
+    setup, agent_options, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, oneline=False, wrap=DEFAULT_WRAP,
+    multipart=False,
+):
+    if not setup:
+        return ''
+    elif isinstance(setup, str):
+        return setup
+
+    newline = '\n' if not oneline else ''
+    response = ''
+    if multipart:
+        response += 'const fs = require(%(quote_char)sfs%(quote_char)s);' % {
+            'quote_char': quote_char,
+        } + newline
+
+    names = ['request']
+    if agent_options:
+        names.insert(0, 'Agent')
+    if multipart:
+        names.insert(-1, 'FormData')
+    response += (
+        'const {%(names)s} = require(%(quote_char)sundici%(quote_char)s);'
+    ) % {
+        'names': ', '.join(names),
+        'quote_char': quote_char,
+    } + newline * 2
+
+    if agent_options:
+        # connections are shared by all the requests performed by the agent
+        agent_doc = Group([
+            'const agent = new Agent(',
+            bracket(
+                '{',
+                [
+                    '%s: %d' % (AGENT_OPTIONS[name], value)
+                    for name, value in agent_options.items()
+                ],
+                '}',
+                indent,
+            ),
+            ');',
+        ])
+        emitter = Emitter()
+        emitter.write_layout(agent_doc, wrap=wrap, flat=oneline)
+        response += emitter.getvalue() + newline * 2
+    return response
+
+
+def _promises_chain_render(
+    quote_char=DEFAULT_QUOTE_CHAR,
+    indent=DEFAULT_INDENT,
+    oneline=False,
+    measure=False,
+):
+    # the body must be always consumed to release the connection
+    if measure:
+        # the promise which reads it is returned to be measured
+        return (
+            '%(newline)s%(indent)s'
+            'return response.body.text()%(separator)s%(newline)s})'
+        ) % {
+            'newline': '\n' if not oneline else '',
+            'indent': indent if not oneline else '',
+            'separator': ';' if not oneline else '',
+        }
+    return (
+        '%(newline)s%(indent)s'
+        'return response.body.text()%(separator)s%(newline)s})'
+        '.then(function(body) {%(newline)s%(indent)s'
+        'console.log(body)%(separator)s%(newline)s}).catch('
+        'function(err) {%(newline)s%(indent)sconsole.error('
+        '%(quote_char)sError:%(quote_char)s, err)%(separator)s'
+        '%(newline)s});'
+    ) % {
+        'newline': '\n' if not oneline else '',
+        'indent': indent if not oneline else '',
+        'quote_char': quote_char,
+        'separator': ';' if not oneline else '',
+    }
+
+
+def _options_doc(
+    options, headers={}, kwargs={}, agent=False, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, wrap=DEFAULT_WRAP,
+):
+    # options are placed at the second level of indentation, inside the call
+    items = [[name + ': ', doc] for name, doc in options]
+    if headers:
+        items.append([
+            'headers: ',
+            value_doc(
+                headers, indent=indent, indent_depth=2,
+                quote_char=quote_char, wrap=wrap,
+            ),
+        ])
+    if agent:
+        items.append('dispatcher: agent')
+    for key, value in kwargs.items():
+        _key = escape_by_quote(key, quote_char)
+        items.append([
+            '%(quote_char)s%(key)s%(quote_char)s: ' % {
+                'key': _key,
+                'quote_char': quote_char,
+            },
+            str_definition(
+                value,
+                indent=indent * 2 + ' ' * (len(_key) + 4),
+                quote_char=quote_char, wrap=wrap,
+            ) if isinstance(value, str) else value_doc(
+                value, indent=indent, indent_depth=2,
+                quote_char=quote_char, wrap=wrap,
+            ),
+        ])
+    return bracket('{', items, '}', indent) if items else None
+
+
+def _request_render(
+    emitter, url, options_doc=None, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, oneline=False, wrap=DEFAULT_WRAP,
+    measure=False,
+):
+    arguments = [
+        str_doc(url, indent=indent, quote_char=quote_char, wrap=wrap),
+    ]
+    if options_doc is not None:
+        arguments.append(options_doc)
+
+    # the call is rendered in one line if fits in the wrap with the start of
+    # the promises chain, in other case each argument is rendered in its own
+    # line
+    emitter.write_layout(
+        Group([
+            'return request' if measure else 'request',
+            bracket('(', arguments, ')', indent),
+            '.then(function(response) {',
+        ]),
+        wrap=wrap,
+        flat=oneline,
+    )
+    emitter.write(_promises_chain_render(
+        quote_char=quote_char, indent=indent, oneline=oneline,
+        measure=measure,
+    ))
+
+
+def _parameters_dict(parameters, seed=None, locale=None):
+    return OrderedDict([
+        (
+            lazy_name_by_parameter(parameter, seed=seed),
+            lazy_value_by_parameter(parameter, seed=seed, locale=locale),
+        ) for parameter in parameters
+    ])
+
+
+def _form_data_render(
+    emitter, parameters, files, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, oneline=False, wrap=DEFAULT_WRAP,
+    seed=None, locale=None,
+):
+    newline = '\n' if not oneline else ''
+    emitter.write('const formData = new FormData();' + newline)
+
+    appends = []
+    for name, value in _parameters_dict(
+        parameters, seed=seed, locale=locale,
+    ).items():
+        appends.append([
+            str_doc(name, indent=indent, quote_char=quote_char, wrap=wrap),
+            str_doc(
+                str(value), indent=indent,
+                quote_char=quote_char, wrap=wrap,
+            ),
+        ])
+    for name, value in files.items():
+        if isinstance(value, str) or value is None:
+            value = [value]
+
+        # random filepath
+        filepath = value[0]
+        if filepath is None:
+            filepath = lazy_value_by_parameter(
+                {
+                    'name': '',
+                    'faker': 'faker.providers.file::file_path',
+                },
+                seed=seed,
+                locale=locale,
+            )
+
+        # the content of each file is read in a blob, optionally typed
+        blob_items = [
+            Group([
+                '[fs.readFileSync(',
+                str_doc(
+                    filepath, indent=indent * 3,
+                    quote_char=quote_char, wrap=wrap,
+                ),
+                ')]',
+            ]),
+        ]
+        if len(value) > 1:
+            blob_items.append(
+                Group(
+                    bracket(
+                        '{',
+                        [[
+                            'type: ',
+                            str_doc(
+                                value[1], indent=indent * 3,
+                                quote_char=quote_char, wrap=wrap,
+                            ),
+                        ]],
+                        '}',
+                        indent,
+                    ),
+                ),
+            )
+        appends.append([
+            str_doc(name, indent=indent, quote_char=quote_char, wrap=wrap),
+            Group(['new Blob', bracket('(', blob_items, ')', indent)]),
+            str_doc(
+                os.path.basename(filepath), indent=indent,
+                quote_char=quote_char, wrap=wrap,
+            ),
+        ])
+
+    for arguments in appends:
+        emitter.write_layout(
+            Group([
+                'formData.append',
+                bracket('(', arguments, ')', indent),
+                ';',
+            ]),
+            wrap=wrap,
+            flat=oneline,
+        )
+        emitter.write(newline)
+    emitter.write(newline)
+
+
+def get(
+    url, parameters=[], headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    connections=None, pipelining=None, keep_alive_timeout=None,
+    measure=False, _emitter=None, **kwargs,
+):
+    '''The request is performed by the ``request`` function of
+    [undici](https://undici.nodejs.org), the HTTP client of NodeJS.
+    Parameters are passed by its ``query`` option and the body of the
+    response is always consumed, so the connection can be reused.
+
+    Passing ``connections``, ``pipelining`` or ``keep_alive_timeout``, an
+    [``Agent``](https://undici.nodejs.org/#/docs/api/Agent) is created in
+    the initialization snippet with these options and passed as the
+    ``dispatcher`` of the request. The agent limits the number of
+    connections by origin, the number of requests pipelined by each
+    connection and the milliseconds that idle connections are kept alive.
+    Without them, the global agent of undici is used:
+
+    ```javascript
+    const {Agent, request} = require('undici');
+
+    const agent = new Agent({connections: 10, pipelining: 4});
+
+    request('<url>', {dispatcher: agent}).then(function(response) {
+      return response.body.text();
+    })...
+    ```
+
+    The agent is created by the default initialization snippet, so these
+    arguments can't be passed with a custom or without ``setup``.
+
+    Passing ``measure``, the request is rendered inside a function called
+    ``performRequest``, whose duration, reading the body, is measured by an
+    asynchronous ``main`` function using ``performance.now()``. Passing an
+    integer, the request is performed that number of times, one after
+    another, printing the percentiles 50, 90 and 99 of their durations.
+    '''
+    agent_options = _agent_options(
+        setup=setup, connections=connections, pipelining=pipelining,
+        keep_alive_timeout=keep_alive_timeout,
+    )
+    validate_measure(measure)
+    emitter = Emitter() if _emitter is None else _emitter
+
+    emitter.write(
+        _setup_render(
+            setup, agent_options, indent=indent, quote_char=quote_char,
+            oneline=oneline, wrap=wrap,
+        ),
+    )
+
+    # the request is rendered inside a function if measured
+    output = emitter if not measure else Emitter()
+    if measure:
+        wrap -= len(indent)
+
+    options = []
+    if parameters:
+        options.append((
+            'query',
+            value_doc(
+                _parameters_dict(parameters, seed=seed, locale=locale),
+                indent=indent, indent_depth=2,
+                quote_char=quote_char, wrap=wrap,
+            ),
+        ))
+    _request_render(
+        output, url,
+        options_doc=_options_doc(
+            options, headers=headers, kwargs=kwargs,
+            agent=bool(agent_options), indent=indent,
+            quote_char=quote_char, wrap=wrap,
+        ),
+        indent=indent, quote_char=quote_char, oneline=oneline, wrap=wrap,
+        measure=bool(measure),
+    )
+    if measure:
+        # `request` is the function imported from undici
+        measure_render(
+            emitter, output.getvalue(), measure, name='performRequest',
+            indent=indent, quote_char=quote_char, oneline=oneline,
+        )
+
+    if teardown:
+        emitter.write(str(teardown))
+    return emitter.getvalue()
+
+
+def post(
+    url, parameters=[], files={}, headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    connections=None, pipelining=None, keep_alive_timeout=None,
+    measure=False, _emitter=None, **kwargs,
+):
+    '''POST method code generator for undici. The body is built depending
+    on its content type:
+
+    - ``application/x-www-form-urlencoded``: ``URLSearchParams`` serialized
+      as string. The ``Content-Type`` header is defined if it's not passed,
+      because undici only sends the body.
+    - ``multipart/form-data``: ``FormData`` of undici, whose files are
+      read by ``fs.readFileSync`` in blobs typed by their content type.
+      Headers for each file are not supported.
+    - ``application/json``: ``JSON.stringify``.
+    - ``text/plain``: string.
+
+    Requests can be measured passing ``measure``, like the [GET method
+    generator](#get) does. The ``FormData`` of multipart bodies is built
+    inside the measurement.
+    '''
+    agent_options = _agent_options(
+        setup=setup, connections=connections, pipelining=pipelining,
+        keep_alive_timeout=keep_alive_timeout,
+    )
+    validate_measure(measure)
+    emitter = Emitter() if _emitter is None else _emitter
+
+    # Discover content-type
+    content_type = 'application/x-www-form-urlencoded'
+    for key, value in headers.items():
+        if key.lower() == 'content-type':
+            content_type = value
+            break
+    if content_type.startswith('multipart/form-data') or files:
+        content_type = 'multipart/form-data'
+    if content_type == 'text/plain' and len(parameters) != 1:
+        raise_post_text_plain_n_parameters_not_1(len(parameters))
+
+    emitter.write(
+        _setup_render(
+            setup, agent_options, indent=indent, quote_char=quote_char,
+            oneline=oneline, wrap=wrap,
+            multipart=content_type == 'multipart/form-data',
+        ),
+    )
+
+    # the request is rendered inside a function if measured
+    output = emitter if not measure else Emitter()
+    if measure:
+        wrap -= len(indent)
+
+    options = [
+        ('method', '%(quote_char)sPOST%(quote_char)s' % {
+            'quote_char': quote_char,
+        }),
+    ]
+    if content_type == 'multipart/form-data':
+        _form_data_render(
+            output, parameters, files, indent=indent, quote_char=quote_char,
+            oneline=oneline, wrap=wrap, seed=seed, locale=locale,
+        )
+        options.append(('body', 'formData'))
+    elif parameters:
+        if content_type == 'text/plain':
+            # 6 here is the length of 'body: '
+            body_doc = str_definition(
+                lazy_value_by_parameter(
+                    parameters[0], seed=seed, locale=locale,
+                ),
+                indent=indent * 2 + ' ' * 6,
+                quote_char=quote_char, wrap=wrap,
+            )
+        elif content_type == 'application/json':
+            body_doc = [
+                'JSON.stringify(',
+                value_doc(
+                    lazy_json_body_by_parameters(
+                        parameters, seed=seed, locale=locale,
+                    ),
+                    indent=indent, indent_depth=2,
+                    quote_char=quote_char, wrap=wrap,
+                ),
+                ')',
+            ]
+        else:
+            body_doc = [
+                'new URLSearchParams(',
+                value_doc(
+                    _parameters_dict(parameters, seed=seed, locale=locale),
+                    indent=indent, indent_depth=2,
+                    quote_char=quote_char, wrap=wrap,
+                ),
+                ').toString()',
+            ]
+
+            # undici sends string bodies without content type
+            if not any(name.lower() == 'content-type' for name in headers):
+                headers = OrderedDict(headers)
+                headers['Content-Type'] = content_type
+        options.append(('body', body_doc))
+
+    _request_render(
+        output, url,
+        options_doc=_options_doc(
+            options, headers=headers, kwargs=kwargs,
+            agent=bool(agent_options), indent=indent,
+            quote_char=quote_char, wrap=wrap,
+        ),
+        indent=indent, quote_char=quote_char, oneline=oneline, wrap=wrap,
+        measure=bool(measure),
+    )
+    if measure:
+        # `request` is the function imported from undici
+        measure_render(
+            emitter, output.getvalue(), measure, name='performRequest',
+            indent=indent, quote_char=quote_char, oneline=oneline,
+        )
+
+    if teardown:
+        emitter.write(str(teardown))
+    return emitter.getvalue()
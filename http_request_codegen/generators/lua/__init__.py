@@ -0,0 +1 @@
+'''Lua implementations request generators.'''
@@ -0,0 +1,160 @@
+'''Utilities for Lua HTTP request generators.'''
+
+from http_request_codegen.generators.python._utils import (  # noqa: F401
+    indented_layout,
+    post_content_type,
+)
+from http_request_codegen.hrc_layout import Group, bracket
+
+
+DEFAULT_INDENT = '  '
+DEFAULT_QUOTE_CHAR = '\''
+DEFAULT_WRAP = 80
+
+# characters escaped by their own escape sequence
+ESCAPES = {
+    '\\': '\\\\',
+    '\n': '\\n',
+    '\r': '\\r',
+    '\t': '\\t',
+}
+
+
+def escape_by_quote(string, char):
+    '''Escapes a string to be defined inside a Lua string delimited by a
+    quotation character. Backslashes, quotation characters and control
+    characters are escaped, the latest using decimal escape sequences
+    except newlines, carriage returns and tabulations.
+
+    Args:
+        string (str): String to escape.
+        char (str): Quotation character of the string.
+
+    Raises:
+        ValueError: If the character is an invalid Lua string quotation
+            character.
+        TypeError: If the value to escape is not a string.
+
+    Examples:
+        >>> print(escape_by_quote('I need "quotes"\\r\\n escaped.', '"'))
+        I need \\"quotes\\"\\r\\n escaped.
+
+        >>> print(escape_by_quote('\\x00 \\'', "'"))
+        \\000 \\'
+
+        >>> escape_by_quote('foo', '`')
+        Traceback (most recent call last):
+        ...
+        ValueError: '`' is an invalid Lua quotation character
+
+    Returns:
+        str: The escaped string.
+    '''
+    if char not in ('"', '\''):
+        raise ValueError('\'%s\' is an invalid Lua quotation character' % char)
+    if not isinstance(string, str):
+        raise TypeError(
+            'The value \'%s\' can not be escaped because is not a'
+            ' string' % (string,),
+        )
+    escaped = []
+    for character in string:
+        if character == char:
+            escaped.append('\\' + character)
+        elif character in ESCAPES:
+            escaped.append(ESCAPES[character])
+        elif ord(character) < 32 or ord(character) == 127:
+            escaped.append('\\%03d' % ord(character))
+        else:
+            escaped.append(character)
+    return ''.join(escaped)
+
+
+def str_definition(
+    string, indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    wrap=DEFAULT_WRAP, offset=None,
+):
+    '''Creates a definition of a Lua string, concatenating multiple strings
+    in multiple lines if it doesn't fit in the wrap. Escape sequences are
+    never splitted between strings.
+
+    Args:
+        string (str): String to be reproducted.
+        indent (str): Indentation of the lines of the concatenated strings
+            with respect to column 0 of the code.
+        quote_char (str): Quotation character of the string.
+        wrap (int): Maximum anchor of the code.
+        offset (int): Column where the first string starts, if it's not
+            placed after the indentation.
+
+    Examples:
+        >>> print(str_definition('foo'))
+        'foo'
+
+        >>> print(str_definition('foo\\nbar baz', indent='', wrap=12))
+        'foo\\nbar b'
+        .. 'az'
+
+    Returns:
+        str: Lua string definition.
+    '''
+    if offset is None:
+        offset = len(indent)
+    escaped = escape_by_quote(str(string), quote_char)
+    if len(escaped) + offset + 2 <= wrap:
+        return quote_char + escaped + quote_char
+
+    # 2 here are the quotes and 3 the concatenation operator
+    width = max(1, wrap - offset - 2)
+    chunks, chunk = ([], '')
+    for character in str(string):
+        escaped_character = escape_by_quote(character, quote_char)
+        if chunk and len(chunk) + len(escaped_character) > width:
+            chunks.append(chunk)
+            chunk, width = ('', max(1, wrap - len(indent) - 5))
+        chunk += escaped_character
+    chunks.append(chunk)
+    return '%(quote_char)s%(chunks)s%(quote_char)s' % {
+        'quote_char': quote_char,
+        'chunks': ('%s\n%s.. %s' % (quote_char, indent, quote_char)).join(
+            chunks,
+        ),
+    }
+
+
+def table_doc(
+    dictionary, indent=DEFAULT_INDENT, indent_depth=0,
+    quote_char=DEFAULT_QUOTE_CHAR, wrap=DEFAULT_WRAP,
+):
+    '''Creates the layout document of a Lua table whose keys and values are
+    strings.
+
+    Args:
+        dictionary (dict): Mapping to define.
+        indent (str): Indentation string.
+        indent_depth (int): Number of levels of indentation of the table.
+        quote_char (str): Quotation character of the strings.
+        wrap (int): Maximum anchor of the code.
+
+    Examples:
+        >>> from http_request_codegen.hrc_layout import layout
+        >>> layout(table_doc({'Accept': 'text/html'}))
+        "{['Accept'] = 'text/html'}"
+
+    Returns:
+        object: Layout document of the table.
+    '''
+    items = []
+    for key, value in dictionary.items():
+        key_doc = '[%s] = ' % str_definition(
+            key, quote_char=quote_char, wrap=float('inf'),
+        )
+        items.append([
+            key_doc,
+            str_definition(
+                value,
+                indent=indent * (indent_depth + 1) + ' ' * len(key_doc),
+                quote_char=quote_char, wrap=wrap,
+            ),
+        ])
+    return Group(bracket('{', items, '}', indent))
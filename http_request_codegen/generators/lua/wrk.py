@@ -0,0 +1,501 @@
+'''Lua wrk load testing scripts generator.'''
+
+try:
+    from urllib.parse import urlsplit, urlunsplit
+except ImportError:
+    from urlparse import urlsplit, urlunsplit
+
+from http_request_codegen.generators.lua._utils import (
+    DEFAULT_INDENT,
+    DEFAULT_QUOTE_CHAR,
+    DEFAULT_WRAP,
+    indented_layout,
+    post_content_type,
+    str_definition,
+    table_doc,
+)
+from http_request_codegen.hrc_emitter import Emitter
+from http_request_codegen.hrc_exceptions import (
+    raise_post_text_plain_n_parameters_not_1,
+)
+from http_request_codegen.hrc_http import body_headers
+from http_request_codegen.hrc_layout import Group, Line, Nest, bracket, join
+from http_request_codegen.hrc_valuer import (
+    body_chunks_by_parameters,
+    resolve_parameters_variants,
+)
+
+
+def _split_url(url):
+    # wrk connects to the origin passed in the command line, so the script
+    # only defines the path, which keeps the query
+    scheme, netloc, path, query, _ = urlsplit(str(url))
+    return (
+        urlunsplit((scheme, netloc, '', '', '')),
+        urlunsplit(('', '', path or '/', query, '')),
+    )
+
+
+def _function_code(
+    header, statements, indent=DEFAULT_INDENT, oneline=False,
+):
+    if oneline:
+        return ' '.join([header] + statements + ['end'])
+    return '\n'.join(
+        [header] + [indent + statement for statement in statements] +
+        ['end\n'],
+    )
+
+
+def _setup_render(
+    emitter, setup, origin, files=False, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, oneline=False,
+):
+    if isinstance(setup, str):
+        emitter.write(setup)
+    elif setup:
+        # the origin requested by the script must be passed to wrk
+        emitter.write('-- wrk -s script.lua %s\n' % origin)
+        emitter.write('\n' if not oneline else '')
+
+    if files:
+        # the contents of the files are read once, building the bodies
+        emitter.write(
+            _function_code(
+                'local function read_file(path)',
+                [
+                    'local file = assert(io.open(path, %(q)srb%(q)s))' % {
+                        'q': quote_char,
+                    },
+                    'local content = file:read(%(q)s*a%(q)s)' % {
+                        'q': quote_char,
+                    },
+                    'file:close()',
+                    'return content',
+                ],
+                indent=indent, oneline=oneline,
+            ),
+        )
+        emitter.write('\n' if not oneline else ' ')
+
+
+def _request_variants(
+    method, url, parameters=[], files={}, headers={}, seed=None,
+    locale=None, variants=None,
+):
+    # returns the origin and the headers of the request and the path and
+    # the chunks of the body of each variant, whose parameters are resolved
+    # in bulk before rendering them
+    origin, path = _split_url(url)
+    content_type = None
+    if method == 'post':
+        content_type = post_content_type(headers, files)
+        if content_type == 'text/plain' and len(parameters) != 1:
+            raise_post_text_plain_n_parameters_not_1(len(parameters))
+        if parameters or files:
+            headers = body_headers(headers, content_type)
+
+    requests = []
+    for variant_parameters in resolve_parameters_variants(
+        parameters, 1 if variants is None else variants, seed=seed,
+        locale=locale,
+    ):
+        variant_path, body = (path, None)
+        if method == 'get' and variant_parameters:
+            variant_path += ('&' if '?' in path else '?') + \
+                body_chunks_by_parameters(
+                    'application/x-www-form-urlencoded', variant_parameters,
+                )[0]
+        elif method == 'post' and (variant_parameters or files):
+            body = body_chunks_by_parameters(
+                content_type, variant_parameters, files=files,
+                seed=seed, locale=locale,
+            )
+        requests.append((variant_path, body))
+    return (origin, headers, requests)
+
+
+def _body_doc(
+    chunks, indent=DEFAULT_INDENT, indent_depth=0,
+    quote_char=DEFAULT_QUOTE_CHAR, wrap=DEFAULT_WRAP, offset=None,
+):
+    # the contents of the files are concatenated with the encoded parts
+    # of the body, placing each part after the first one in its own line
+    # if they don't fit in one
+    docs = []
+    for chunk in chunks:
+        if isinstance(chunk, tuple):
+            docs.append(
+                'read_file(%s)' % str_definition(
+                    chunk[0], quote_char=quote_char, wrap=float('inf'),
+                ),
+            )
+        elif chunk or len(chunks) == 1:
+            docs.append(
+                str_definition(
+                    chunk, indent=indent * (indent_depth + 1),
+                    quote_char=quote_char, wrap=wrap,
+                    # next parts are placed after the operator
+                    offset=offset if not docs else (
+                        len(indent * (indent_depth + 1)) + 3
+                    ),
+                ),
+            )
+    return Group(Nest(indent, join([Line(' '), '.. '], docs)))
+
+
+def _statics_render(
+    emitter, method, headers={}, path=None, body=None,
+    indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR, oneline=False,
+    wrap=DEFAULT_WRAP,
+):
+    # fields of the request defined for all the requests of the script
+    def string(value):
+        return str_definition(value, quote_char=quote_char, wrap=float('inf'))
+
+    statements = ['wrk.method = ' + string(method.upper())]
+    if path is not None:
+        statements.append(
+            Group([
+                'wrk.path = ',
+                str_definition(
+                    path, indent=indent, quote_char=quote_char, wrap=wrap,
+                    offset=len('wrk.path = '),
+                ),
+            ]),
+        )
+    for name, value in headers.items():
+        prefix = 'wrk.headers[%s] = ' % string(name)
+        statements.append(
+            Group([
+                prefix,
+                str_definition(
+                    value, indent=' ' * len(prefix),
+                    quote_char=quote_char, wrap=wrap,
+                ),
+            ]),
+        )
+    if body is not None:
+        statements.append(
+            Group([
+                'wrk.body = ',
+                _body_doc(
+                    body, indent=indent, quote_char=quote_char, wrap=wrap,
+                    offset=len('wrk.body = '),
+                ),
+            ]),
+        )
+    emitter.write(
+        ('\n' if not oneline else ' ').join(
+            indented_layout(
+                statement, indent=indent, oneline=oneline, wrap=wrap,
+            ) for statement in statements
+        ),
+    )
+
+
+def _formats_render(
+    emitter, requests, method=None, headers=None, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, oneline=False, wrap=DEFAULT_WRAP,
+):
+    # requests are formatted once by `wrk.format` when each thread starts,
+    # as items of the table cycled by the `request` function, so `wrap`
+    # must be reduced by their indentation
+    _wrap = wrap - len(indent * 2)
+    for path, body in requests:
+        arguments = [
+            'nil' if method is None else str_definition(
+                method.upper(), quote_char=quote_char, wrap=float('inf'),
+            ),
+            str_definition(
+                path, indent=indent, quote_char=quote_char, wrap=_wrap,
+            ),
+        ]
+        if body is not None or headers is not None:
+            arguments.append('nil' if headers is None else headers)
+        if body is not None:
+            arguments.append(
+                _body_doc(
+                    body, indent=indent, indent_depth=1,
+                    quote_char=quote_char, wrap=_wrap, offset=len(indent),
+                ),
+            )
+        emitter.write(
+            indented_layout(
+                Group(['wrk.format', bracket('(', arguments, ')', indent)]),
+                indent=indent, indent_depth=2 if not oneline else 0,
+                oneline=oneline, wrap=wrap,
+            ),
+        )
+        emitter.write(',\n' if not oneline else ', ')
+
+
+def _cycle_render(
+    emitter, formats_render, indent=DEFAULT_INDENT, oneline=False,
+):
+    # the table of requests is built when each thread starts, after wrk
+    # defines the `Host` header, and `request` returns them in turn
+    newline = '\n' if not oneline else ' '
+    emitter.write(
+        'local requests = {}%(newline)slocal counter = 0%(newline)s'
+        '%(blank)sfunction init(args)%(newline)s%(indent)srequests = {%(br)s'
+        % {
+            'newline': newline,
+            'blank': newline if not oneline else '',
+            'indent': indent if not oneline else '',
+            'br': newline if not oneline else '',
+        },
+    )
+    formats_render()
+    emitter.write(
+        '%(indent)s}%(newline)send%(newline)s%(blank)s' % {
+            'indent': indent if not oneline else '',
+            'newline': newline,
+            'blank': newline if not oneline else '',
+        },
+    )
+    emitter.write(
+        _function_code(
+            'function request()',
+            [
+                'counter = counter % #requests + 1',
+                'return requests[counter]',
+            ],
+            indent=indent, oneline=oneline,
+        ).rstrip('\n'),
+    )
+
+
+def _render(
+    emitter, method, url, parameters=[], files={}, headers={},
+    indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR, setup=True,
+    teardown=None, oneline=False, wrap=DEFAULT_WRAP, seed=None,
+    locale=None, variants=None, _program=None,
+):
+    origin, headers, requests = _request_variants(
+        method, url, parameters=parameters, files=files, headers=headers,
+        seed=seed, locale=locale, variants=variants,
+    )
+
+    if _program is not None:
+        headers_name = _program.headers_name(headers)
+        _formats_render(
+            emitter, requests, method=method,
+            headers=headers_name or (
+                table_doc(
+                    headers, indent=indent, indent_depth=1,
+                    quote_char=quote_char, wrap=wrap - len(indent * 2),
+                ) if headers else None
+            ),
+            indent=indent, quote_char=quote_char, wrap=wrap,
+        )
+        return origin
+
+    _setup_render(
+        emitter, setup, origin, files=bool(files) and method == 'post',
+        indent=indent, quote_char=quote_char, oneline=oneline,
+    )
+    if variants is None:
+        path, body = requests[0]
+        _statics_render(
+            emitter, method, headers=headers, path=path, body=body,
+            indent=indent, quote_char=quote_char, oneline=oneline,
+            wrap=wrap,
+        )
+    else:
+        _statics_render(
+            emitter, method, headers=headers, indent=indent,
+            quote_char=quote_char, oneline=oneline, wrap=wrap,
+        )
+        emitter.write('\n\n' if not oneline else ' ')
+        _cycle_render(
+            emitter,
+            lambda: _formats_render(
+                emitter, requests, indent=indent, quote_char=quote_char,
+                oneline=oneline, wrap=wrap,
+            ),
+            indent=indent, oneline=oneline,
+        )
+
+    if teardown:
+        emitter.write(str(teardown))
+    return origin
+
+
+def get(
+    url, parameters=[], headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    variants=None, _emitter=None, _program=None, **kwargs,
+):
+    '''Renders a [wrk](https://github.com/wg/wrk) script which defines the
+    request by the fields of the ``wrk`` table. wrk connects to the origin
+    passed in its command line, so the script defines the path of the URL
+    and parameters are encoded in its query. The initialization snippet is a
+    comment with the command which runs the script:
+
+    ```lua
+    -- wrk -s script.lua http://localhost
+
+    wrk.method = 'GET'
+    wrk.path = '/?foo=bar'
+    wrk.headers['Accept'] = 'application/json'
+    ```
+
+    Passing ``variants``, the parameters are resolved that number of times
+    when the script is generated and the requests are formatted once by
+    ``wrk.format`` when each thread starts. The ``request`` function cycles
+    through them, so wrk does no work building requests while it's running:
+
+    ```lua
+    wrk.method = 'GET'
+
+    local requests = {}
+    local counter = 0
+
+    function init(args)
+      requests = {
+        wrk.format(nil, '/?foo=bar'),
+        wrk.format(nil, '/?foo=baz'),
+      }
+    end
+
+    function request()
+      counter = counter % #requests + 1
+      return requests[counter]
+    end
+    ```
+
+    If a ``seed`` is passed, the variant ``i`` is resolved using
+    ``seed + i`` as seed. wrk has no options by request, so ``kwargs`` are
+    ignored.
+    '''
+    emitter = Emitter() if _emitter is None else _emitter
+    _render(
+        emitter, 'get', url, parameters=parameters, headers=headers,
+        indent=indent, quote_char=quote_char, setup=setup,
+        teardown=teardown, oneline=oneline, wrap=wrap, seed=seed,
+        locale=locale, variants=variants, _program=_program,
+    )
+    return emitter.getvalue()
+
+
+def post(
+    url, parameters=[], files={}, headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    variants=None, _emitter=None, _program=None, **kwargs,
+):
+    '''POST method code generator for wrk, which accepts the same arguments
+    that the [GET method generator](#get). The body is encoded when the
+    script is generated, depending on the ``Content-Type`` header, and
+    defined in ``wrk.body``. Forms whose content type is not defined and
+    ``multipart/form-data`` bodies, whose boundary is defined by the
+    generator, define it in ``wrk.headers``. The files of
+    ``multipart/form-data`` bodies are read by a ``read_file`` function
+    when the script is loaded:
+
+    ```lua
+    local function read_file(path)
+      local file = assert(io.open(path, 'rb'))
+      local content = file:read('*a')
+      file:close()
+      return content
+    end
+
+    wrk.method = 'POST'
+    wrk.path = '/'
+    wrk.headers['Content-Type'] = 'multipart/form-data; boundary=...'
+    wrk.body = '--...\\r\\nContent-Disposition: form-data; name="file"...'
+      .. read_file('<path>')
+      .. '\\r\\n--...--\\r\\n'
+    ```
+    '''
+    emitter = Emitter() if _emitter is None else _emitter
+    _render(
+        emitter, 'post', url, parameters=parameters, files=files,
+        headers=headers, indent=indent, quote_char=quote_char, setup=setup,
+        teardown=teardown, oneline=oneline, wrap=wrap, seed=seed,
+        locale=locale, variants=variants, _program=_program,
+    )
+    return emitter.getvalue()
+
+
+def program(
+    program, indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    setup=True, teardown=None, wrap=DEFAULT_WRAP, _emitter=None,
+):
+    '''Requests of programs, and the variants of each one, are formatted by
+    ``wrk.format`` defining their methods and headers, and cycled by the
+    ``request`` function. wrk connects to only one origin, so all the
+    requests must be performed to the same one. The headers defined by more
+    than one request are defined once as local tables:
+
+    ```lua
+    -- wrk -s script.lua http://localhost
+
+    local HEADERS_1 = {['Accept'] = 'application/json'}
+
+    local requests = {}
+    local counter = 0
+
+    function init(args)
+      requests = {
+        wrk.format('GET', '/a', HEADERS_1),
+        wrk.format('POST', '/b', HEADERS_1, 'foo=bar'),
+      }
+    end
+    ...
+    ```
+    '''
+    origins = set(
+        _split_url(kwargs['url'])[0] for _, kwargs in program.requests
+    )
+    if len(origins) > 1:
+        raise ValueError(
+            'wrk performs requests to only one origin, but the requests of'
+            ' the program are performed to %s' % ', '.join(
+                '\'%s\'' % origin for origin in sorted(origins)
+            ),
+        )
+    emitter = Emitter() if _emitter is None else _emitter
+
+    _setup_render(
+        emitter, setup,
+        origins.pop() if origins else 'http://localhost',
+        files=any(
+            kwargs.get('files') for func, kwargs in program.requests
+            if func.__name__ == 'post'
+        ),
+        indent=indent, quote_char=quote_char,
+    )
+    for name, headers in program.headers_constants:
+        emitter.write(
+            indented_layout(
+                Group([
+                    'local %s = ' % name,
+                    table_doc(
+                        headers, indent=indent, quote_char=quote_char,
+                        wrap=wrap,
+                    ),
+                ]),
+                wrap=wrap,
+            ),
+        )
+        emitter.write('\n\n')
+
+    _cycle_render(
+        emitter,
+        lambda: [
+            func(
+                indent=indent, quote_char=quote_char, setup=False,
+                wrap=wrap, _emitter=emitter, _program=program, **kwargs,
+            ) for func, kwargs in program.requests
+        ],
+        indent=indent,
+    )
+    emitter.write('\n')
+
+    if teardown:
+        emitter.write(str(teardown))
+    return emitter.getvalue()
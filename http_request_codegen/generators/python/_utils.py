@@ -2,11 +2,27 @@
 
 # editorconfig-checker-disable-file
 
+from collections import OrderedDict
+
+from http_request_codegen.hrc_http import MEASURE_PERCENTILES
+from http_request_codegen.hrc_layout import (
+    Group,
+    IfBreak,
+    Nest,
+    bracket,
+    layout,
+)
 from http_request_codegen.hrc_string import (
     escape_double_quote,
     escape_single_quote,
+    escaped_chunks,
     lazy_escape_quote_func_by_quote_char,
 )
+from http_request_codegen.hrc_valuer import (
+    lazy_json_body_by_parameters,
+    lazy_name_by_parameter,
+    lazy_value_by_parameter,
+)
 
 
 DEFAULT_INDENT = '    '
@@ -410,7 +426,7 @@ def str_definition(
         str: String reproducted in multiples lines wrapped by ``(`` and ``)``
             characters in multiples lines or simply defined in a single line.
     '''
-    string_escaped = string if not _escape else \
+    string_escaped = str(string) if not _escape else \
         escape_by_quote(str(string), quote_char)
 
     if len(str(string)) + len(indent) + len(quote_char) * 2 < wrap:
@@ -420,36 +436,223 @@ def str_definition(
         )
 
     indent_length = len(indent)
-    response = '({quote_char}'.format(
+    # 2 here is the length of '(' or ' ' and the opening quote
+    chunks = escaped_chunks(
+        string_escaped,
+        wrap - 4 - indent_length,
+        escaped_char=quote_char,
+    )
+    _chars_in_last_line = 2 + indent_length + len(chunks[-1])
+    return '({quote_char}{chunks}{quote_char}{newline}{indent})'.format(
+        chunks='{quote_char}\n{indent} {quote_char}'.format(
+            quote_char=quote_char,
+            indent=indent,
+        ).join(chunks),
+        newline='\n' if _chars_in_last_line >= wrap - 1 else '',
+        indent=indent if _chars_in_last_line >= wrap - 1 else '',
         quote_char=quote_char,
     )
-    _chars_in_current_line = len(response) + indent_length
-    for i, ch in enumerate(string):
-        response += ch
-        _chars_in_current_line += 1
-        if _chars_in_current_line >= wrap - 2:
-            if i >= len(string) - 1:
-                break
-            response += '{quote_char}\n{indent} {quote_char}'.format(
-                quote_char=quote_char,
-                indent=indent,
+
+
+def url_doc(
+    url, indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    wrap=DEFAULT_WRAP,
+):
+    '''Creates the layout document of an URL passed as the first argument
+    of a function. If the call is broken in multiple lines, the URL is
+    wrapped using [``str_definition``](#str_definition).
+
+    Args:
+        url (str): URL to define.
+        indent (str): Indentation of the argument.
+        quote_char (str): Python string quotation character used.
+        wrap (int): Maximum anchor of the code.
+
+    Examples:
+        >>> from http_request_codegen.hrc_layout import Group, layout
+        >>> layout(Group(url_doc('http://localhost')))
+        "'http://localhost'"
+
+    Returns:
+        object: Layout document of the URL.
+    '''
+    return IfBreak(
+        str_definition(url, indent=indent, quote_char=quote_char, wrap=wrap),
+        '{quote_char}{url}{quote_char}'.format(
+            url=url,
+            quote_char=quote_char,
+        ),
+    )
+
+
+def value_doc(
+    value, indent=DEFAULT_INDENT, indent_depth=0,
+    quote_char=DEFAULT_QUOTE_CHAR, wrap=DEFAULT_WRAP,
+):
+    '''Creates the layout document of a JSON serializable value defined as
+    Python code. Nested dictionaries and lists are defined recursively.
+
+    Args:
+        value (object): Value that will be defined as Python code.
+        indent (str): Indentation used for nested values.
+        indent_depth (int): Number of levels of indentation of the value.
+        quote_char (str): Python string quotation character used.
+        wrap (int): Maximum anchor of the code. If it exceeds it, strings will
+            be wrapped in multiple lines.
+
+    Examples:
+        >>> from http_request_codegen.hrc_layout import Group, layout
+        >>> layout(Group(value_doc({'foo': [False, None]})))
+        "{'foo': [False, None]}"
+
+    Returns:
+        object: Layout document of the value.
+    '''
+    if isinstance(value, dict):
+        return dict_doc(
+            value, indent=indent, indent_depth=indent_depth,
+            quote_char=quote_char, wrap=wrap,
+        )
+    elif isinstance(value, (list, tuple)):
+        return bracket(
+            '[',
+            [
+                value_doc(
+                    _value, indent=indent, indent_depth=indent_depth + 1,
+                    quote_char=quote_char, wrap=wrap,
+                ) for _value in value
+            ],
+            ']',
+            indent,
+        )
+    elif isinstance(value, str):
+        return str_definition(
+            value, indent=indent * indent_depth,
+            quote_char=quote_char, wrap=wrap,
+        )
+    return str(value)
+
+
+def dict_doc(
+    dictionary, indent=DEFAULT_INDENT, indent_depth=0,
+    quote_char=DEFAULT_QUOTE_CHAR, wrap=DEFAULT_WRAP,
+    _escape_keys=True, _escape_values=True,
+):
+    '''Creates the layout document of a Python dictionary definition.
+    Nested dictionaries and lists values are defined recursively.
+
+    Args:
+        dictionary (dict): Dictionary that will be defined as Python code.
+        indent (str): Indentation used for the keys and values.
+        indent_depth (int): Number of levels of indentation.
+        quote_char (str): Python string quotation character used.
+        wrap (int): Maximum anchor of the code. If it exceeds it, strings
+            values will be wrapped in multiple lines.
+        _escape_keys (bool): If ``True`` the keys of the dictionary will be
+            escaped against the string of ``quote_char`` argument.
+        _escape_values (bool): If ``True`` the values of the dictionary will be
+            escaped against the string of ``quote_char`` argument.
+
+    Returns:
+        object: Layout document of the dictionary.
+    '''
+    if _escape_keys:
+        escape_quote_func = escape_quote_func_by_quote_char(quote_char)
+
+    items = []
+    for key, value in dictionary.items():
+        _key = key if not _escape_keys else escape_quote_func(key)
+        if isinstance(value, str):
+            _indent = indent * indent_depth * 2 + ' ' * (len(_key) + 4)
+            _value = str_definition(
+                value, indent=_indent,
+                quote_char=quote_char, wrap=wrap,
+                _escape=_escape_values,
             )
-            _chars_in_current_line = 2 + indent_length  # ' ('
-    response += '{quote_char}{newline}{indent})'.format(
-        newline='\n' if _chars_in_current_line >= wrap - 1 else '',
-        indent=indent if _chars_in_current_line >= wrap - 1 else '',
-        quote_char=quote_char,
+        else:
+            _value = value_doc(
+                value, indent=indent, indent_depth=indent_depth + 1,
+                quote_char=quote_char, wrap=wrap,
+            )
+        items.append([
+            '%(quote_char)s%(key)s%(quote_char)s: ' % {
+                'key': _key,
+                'quote_char': quote_char,
+            },
+            _value,
+        ])
+    return bracket('{', items, '}', indent)
+
+
+def kwarg_doc(
+    kwarg_name, value, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, wrap=DEFAULT_WRAP,
+):
+    '''Creates the layout document of any value passed as Python keyword
+    argument to a function, placed at the first level of indentation.
+
+    Args:
+        kwarg_name (str): Name of the argument. Must be a valid Python
+            identifier or a `ValueError` will be raised.
+        value (object): Value of the argument to be reproduced.
+        indent (str): Indentation string.
+        quote_char (str): Python string quotation character used.
+        wrap (int): Maximum anchor of the code. If it exceeds it, strings
+            values will be wrapped in multiple lines.
+
+    Raises:
+        ValueError: If the argument ``kwarg_name`` is not a valid Python
+            identifier.
+
+    Examples:
+        >>> from http_request_codegen.hrc_layout import Group, layout
+        >>> layout(Group(kwarg_doc('foo', {'bar': 1})))
+        "foo={'bar': 1}"
+
+        >>> print(layout(kwarg_doc('foo', {'bar': 1})))
+        foo={
+            'bar': 1
+        }
+
+    Returns:
+        object: Layout document of the keyword argument.
+    '''
+    validate_python_identifier(kwarg_name)
+
+    if isinstance(value, dict):
+        return [
+            kwarg_name + '=',
+            dict_doc(
+                value, indent=indent, indent_depth=1,
+                quote_char=quote_char, wrap=wrap,
+            ),
+        ]
+    elif isinstance(value, str):
+        return IfBreak(
+            kwarg_definition_str_valued(
+                kwarg_name, value, indent=indent,
+                quote_char=quote_char, wrap=wrap,
+                _validate_identifier=False,
+            ),
+            kwarg_definition_str_valued(
+                kwarg_name, value, indent='',
+                quote_char=quote_char, wrap=wrap,
+                _validate_identifier=False,
+            ),
+        )
+    return '{kwarg_name}={value}'.format(
+        kwarg_name=kwarg_name,
+        value=repr(value),
     )
-    return response
 
 
 def dict_definition(
     dictionary, indent=DEFAULT_INDENT, indent_depth=0,
     quote_char=DEFAULT_QUOTE_CHAR, wrap=DEFAULT_WRAP,
     newline='\n', _escape_keys=True, _escape_values=True,
-    _str_definition_func=str_definition,
 ):
-    '''Creates a definition of a Python dictionary.
+    '''Creates a definition of a Python dictionary. Nested dictionaries and
+    lists values are defined recursively.
 
     Args:
         dictionary (str): Dictionary that will be defined as Python code.
@@ -458,7 +661,8 @@ def dict_definition(
         quote_char (str): Python string quotation character used.
         wrap (int): Maximum anchor of the code. If it exceeds it, it will be
             wrapped in multiple lines.
-        newline (str): Newline character.
+        newline (str): Newline character. If is an empty string, the
+            dictionary is defined in one line.
         _escape_keys (bool): If ``True`` the keys of the dictionary will be
             escaped against the string of ``quote_char`` argument.
         _escape_values (bool): If ``True`` the values of the dictionary will be
@@ -470,36 +674,455 @@ def dict_definition(
             'foo': 'bar'
         }
 
+        >>> print(dict_definition({'foo': {'bar': [1, None]}}))
+        {
+            'foo': {
+                'bar': [
+                    1,
+                    None
+                ]
+            }
+        }
+
+        >>> print(dict_definition({'foo': 1, 'bar': [True]}, newline='',
+        ...                       indent=''))
+        {'foo': 1, 'bar': [True]}
+
     Returns:
         str: Definition of the dictionary.
     '''
-    if _escape_keys:
-        escape_quote_func = escape_quote_func_by_quote_char(quote_char)
+    return layout(
+        Nest(
+            indent * indent_depth,
+            dict_doc(
+                dictionary, indent=indent, indent_depth=indent_depth,
+                quote_char=quote_char, wrap=wrap,
+                _escape_keys=_escape_keys, _escape_values=_escape_values,
+            ),
+        ),
+        wrap=wrap,
+        flat=not newline,
+    )
 
-    response = f'{{{newline}'
-    for i, (key, value) in enumerate(dictionary.items()):
-        _key = key if not _escape_keys else escape_quote_func(key)
-        if isinstance(value, str):
-            _indent = indent * indent_depth * 2 + ' ' * (len(_key) + 4)
-            _value = _str_definition_func(
-                value, indent=_indent,
+
+def post_content_type(headers={}, files={}):
+    '''Discovers how the body of a POST request is encoded by Python
+    generators, depending on the ``Content-Type`` header and the files sent.
+    If files are sent the body is always ``multipart/form-data``, otherwise
+    the header is used, defaulting to ``application/x-www-form-urlencoded``.
+
+    Args:
+        headers (dict): Headers of the request.
+        files (dict): Files sent by the request.
+
+    Examples:
+        >>> post_content_type({'Content-Type': 'application/json'})
+        'application/json'
+
+        >>> post_content_type({'content-type': 'text/plain'}, {'a': 'b.txt'})
+        'multipart/form-data'
+
+        >>> post_content_type()
+        'application/x-www-form-urlencoded'
+
+    Returns:
+        str: Content type of the body.
+    '''
+    if files:
+        return 'multipart/form-data'
+    for key, value in headers.items():
+        if str(key).lower() == 'content-type':
+            if 'text/plain' in value:
+                return 'text/plain'
+            elif 'application/json' in value:
+                return 'application/json'
+    return 'application/x-www-form-urlencoded'
+
+
+def indented_layout(
+    doc, indent=DEFAULT_INDENT, indent_depth=0, oneline=False,
+    wrap=DEFAULT_WRAP,
+):
+    '''Renders a document of a statement placed inside indented blocks. The
+    document is laid out at column 0 and its lines are indented after, so
+    the strings wrapped inside it keep their relative indentation.
+
+    Args:
+        doc (object): Document to render.
+        indent (str): Indentation string.
+        indent_depth (int): Number of levels of indentation of the statement.
+        oneline (bool): Renders the document in one line.
+        wrap (int): Maximum anchor of the code, including the indentation.
+
+    Examples:
+        >>> from http_request_codegen.hrc_layout import Group
+        >>> print(indented_layout(
+        ...     Group(['f', bracket('(', ['1', '2'], ')', '  ')]),
+        ...     indent='  ', indent_depth=1, wrap=8,
+        ... ))
+          f(
+            1,
+            2
+          )
+
+    Returns:
+        str: Rendered statement.
+    '''
+    prefix = indent * indent_depth
+    code = layout(doc, wrap=wrap - len(prefix), flat=oneline)
+    if not prefix:
+        return code
+    return ''.join(
+        prefix + line if line.strip() else line
+        for line in code.splitlines(True)
+    )
+
+
+def common_arguments_docs(
+    url, headers={}, indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    wrap=DEFAULT_WRAP, kwargs={},
+):
+    '''Creates the layout documents of the arguments shared by the methods
+    of libraries with the API of requests: the URL, the ``headers`` and the
+    optional keyword arguments.
+
+    Args:
+        url (str): URL of the request.
+        headers (dict): Headers of the request.
+        indent (str): Indentation string.
+        quote_char (str): Python string quotation character used.
+        wrap (int): Maximum anchor of the code.
+        kwargs (dict): Optional keyword arguments.
+
+    Examples:
+        >>> from http_request_codegen.hrc_layout import Group
+        >>> layout(Group(bracket('(', common_arguments_docs(
+        ...     'http://localhost', kwargs={'timeout': 5},
+        ... ), ')', '    ')))
+        "('http://localhost', timeout=5)"
+
+    Returns:
+        list: Layout documents of the arguments.
+    '''
+    arguments = [
+        url_doc(url, indent=indent, quote_char=quote_char, wrap=wrap),
+    ]
+    if headers:
+        arguments.append([
+            'headers=',
+            dict_doc(
+                headers, indent=indent, indent_depth=1,
                 quote_char=quote_char, wrap=wrap,
-                _escape=_escape_values,
+            ),
+        ])
+    for key, value in kwargs.items():
+        arguments.append(
+            kwarg_doc(
+                key, value, indent=indent,
+                quote_char=quote_char, wrap=wrap,
+            ),
+        )
+    return arguments
+
+
+def parameters_dict(parameters, seed=None, locale=None, bool_to_str=False):
+    '''Builds a dictionary with the names and values of request parameters.
+
+    Args:
+        parameters (list): Parameters of the request.
+        seed (int): Seed used generating random values.
+        locale (str): Locale used generating random values.
+        bool_to_str (bool): Converts boolean values to strings, for libraries
+            which would encode them differently than ``str`` does.
+
+    Examples:
+        >>> dict(parameters_dict([{'name': 'foo', 'value': 'bar'}]))
+        {'foo': 'bar'}
+
+    Returns:
+        dict: Names of the parameters mapped to their values.
+    '''
+    response = OrderedDict()
+    for parameter in parameters:
+        value = lazy_value_by_parameter(parameter, seed=seed, locale=locale)
+        if bool_to_str and isinstance(value, bool):
+            value = str(value)
+        response[lazy_name_by_parameter(parameter, seed=seed)] = value
+    return response
+
+
+def body_doc(
+    content_type, parameters, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, wrap=DEFAULT_WRAP, seed=None,
+    locale=None, text_kwarg='data', bool_to_str=False,
+):
+    '''Creates the layout document of the keyword argument that defines the
+    body of a POST request for libraries with the API of requests, which is
+    ``json`` for ``application/json`` content, ``data`` for
+    ``application/x-www-form-urlencoded`` content or the argument defined by
+    ``text_kwarg`` for ``text/plain`` content.
+
+    Args:
+        content_type (str): Content type of the body, as returned by
+            [``post_content_type``](#post_content_type).
+        parameters (list): Parameters of the request.
+        indent (str): Indentation string.
+        quote_char (str): Python string quotation character used.
+        wrap (int): Maximum anchor of the code.
+        seed (int): Seed used generating random values.
+        locale (str): Locale used generating random values.
+        text_kwarg (str): Name of the argument of ``text/plain`` bodies.
+        bool_to_str (bool): Converts boolean values of form bodies to
+            strings.
+
+    Examples:
+        >>> from http_request_codegen.hrc_layout import Group
+        >>> layout(Group(body_doc('text/plain', [{'value': 'foo'}],
+        ...                       text_kwarg='content')))
+        "content='foo'"
+
+    Returns:
+        object: Layout document of the argument.
+    '''
+    if content_type == 'text/plain':
+        # plus 1 here is the length of '='
+        return [
+            text_kwarg + '=',
+            str_definition(
+                lazy_value_by_parameter(
+                    parameters[0], seed=seed, locale=locale,
+                ),
+                quote_char=quote_char,
+                indent=indent + (' ' * (len(text_kwarg) + 1)),
+                wrap=wrap,
+            ),
+        ]
+    elif content_type == 'application/json':
+        # JSON must accepts other data types than string
+        return [
+            'json=',
+            value_doc(
+                lazy_json_body_by_parameters(
+                    parameters, seed=seed, locale=locale,
+                ),
+                indent=indent, indent_depth=1,
+                quote_char=quote_char, wrap=wrap,
+            ),
+        ]
+    return [
+        'data=',
+        dict_doc(
+            parameters_dict(
+                parameters, seed=seed, locale=locale,
+                bool_to_str=bool_to_str,
+            ),
+            indent=indent, indent_depth=1,
+            quote_char=quote_char, wrap=wrap,
+        ),
+    ]
+
+
+def file_doc(
+    value, indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    wrap=DEFAULT_WRAP, seed=None, locale=None,
+):
+    '''Creates the layout document of the tuple that defines a file sent by
+    libraries with the API of requests: its name, the file object and
+    optionally its content type and headers. If the path of the file is not
+    defined, a random one is used.
+
+    Args:
+        value (object): File definition, a path or a list with the path,
+            the content type and the headers of the file.
+        indent (str): Indentation string.
+        quote_char (str): Python string quotation character used.
+        wrap (int): Maximum anchor of the code.
+        seed (int): Seed used generating random values.
+        locale (str): Locale used generating random values.
+
+    Examples:
+        >>> from http_request_codegen.hrc_layout import Group
+        >>> layout(Group(file_doc(['bar.txt', 'text/plain'])))
+        "('bar.txt', open('bar.txt', 'rb'), 'text/plain')"
+
+    Returns:
+        object: Layout document of the tuple.
+    '''
+    if isinstance(value, str) or value is None:
+        value = [value]
+
+    # random filepath
+    filepath = value[0]
+    if filepath is None:
+        filepath = lazy_value_by_parameter(
+            {
+                'name': '',
+                'faker': 'faker.providers.file::file_path',
+            },
+            seed=seed,
+            locale=locale,
+        )
+
+    file_items = [
+        str_definition(
+            filepath,
+            indent=indent * 3,
+            quote_char=quote_char,
+            wrap=wrap,
+        ),
+        Group(
+            bracket(
+                'open(',
+                [
+                    str_definition(
+                        filepath,
+                        indent=indent * 4,
+                        quote_char=quote_char,
+                        wrap=wrap,
+                    ),
+                    '%(quote_char)srb%(quote_char)s' % {
+                        'quote_char': quote_char,
+                    },
+                ],
+                ')',
+                indent,
+            ),
+        ),
+    ]
+    if len(value) > 1:
+        # file content type
+        file_items.append(
+            str_definition(
+                value[1],
+                indent=indent * 3,
+                quote_char=quote_char,
+                wrap=wrap,
+            ),
+        )
+    if len(value) > 2:
+        # file headers
+        file_items.append(
+            dict_doc(
+                value[2], indent=indent, indent_depth=3,
+                quote_char=quote_char, wrap=wrap,
+            ),
+        )
+    return bracket('(', file_items, ')', indent)
+
+
+def files_doc(
+    files, indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    wrap=DEFAULT_WRAP, seed=None, locale=None,
+):
+    '''Creates the layout document of the ``files`` keyword argument of
+    libraries with the API of requests. Each file is defined by a tuple
+    created by [``file_doc``](#file_doc).
+
+    Args:
+        files (dict): Files sent by the request.
+        indent (str): Indentation string.
+        quote_char (str): Python string quotation character used.
+        wrap (int): Maximum anchor of the code.
+        seed (int): Seed used generating random values.
+        locale (str): Locale used generating random values.
+
+    Examples:
+        >>> from http_request_codegen.hrc_layout import Group
+        >>> layout(Group(files_doc({'foo': 'bar.txt'})))
+        "files={'foo': ('bar.txt', open('bar.txt', 'rb'))}"
+
+    Returns:
+        object: Layout document of the argument.
+    '''
+    files_items = []
+    for key, value in files.items():
+        files_items.append([
+            '%(quote_char)s%(key)s%(quote_char)s: ' % {
+                'key': escape_by_quote(key, quote_char),
+                'quote_char': quote_char,
+            },
+            file_doc(
+                value, indent=indent, quote_char=quote_char, wrap=wrap,
+                seed=seed, locale=locale,
+            ),
+        ])
+    return ['files=', bracket('{', files_items, '}', indent)]
+
+
+def measured_statements(
+    statements, measure, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, oneline=False,
+):
+    '''Wraps the statements which perform a request measuring their
+    duration by ``time.perf_counter``, so ``time`` must be imported. If
+    ``measure`` is an integer, the statements are performed that number of
+    times inside a loop and the percentiles of the durations are printed.
+
+    Python does not allow to define compound statements after other
+    statements in the same line, so in ``oneline`` mode the measurement is
+    rendered in the same line only if the request is a simple statement.
+
+    Args:
+        statements (str): Code which performs the request.
+        measure (bool, int): ``True`` to measure the request once or the
+            number of times that it is performed.
+        indent (str): Indentation string.
+        quote_char (str): Python string quotation character used.
+        oneline (bool): Renders the measurement in one line, if possible.
+
+    Examples:
+        >>> print(measured_statements('req = requests.get(url)', True))
+        start = time.perf_counter()
+        req = requests.get(url)
+        print('%.2f ms' % ((time.perf_counter() - start) * 1000))
+
+        >>> print(measured_statements('req = requests.get(url)', 10))
+        timings = []
+        for _ in range(10):
+            start = time.perf_counter()
+            req = requests.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        for percentile in (50, 90, 99):
+            timing = timings[len(timings) * percentile // 100]
+            print('p%d: %.2f ms' % (percentile, timing))
+
+    Returns:
+        str: Measured statements.
+    '''
+    start_line = 'start = time.perf_counter()'
+    elapsed = '(time.perf_counter() - start) * 1000'
+    if measure is True:
+        print_line = (
+            'print(%(quote_char)s%%.2f ms%(quote_char)s %% (%(elapsed)s))'
+        ) % {'quote_char': quote_char, 'elapsed': elapsed}
+        if oneline and '\n' not in statements and not statements.startswith(
+            ('async ', 'for ', 'if ', 'while ', 'with '),
+        ):
+            return '%s;%s;%s;' % (
+                start_line, statements.rstrip(';'), print_line,
             )
-        else:
-            _value = str(value)
-        response += (
-            '%(indents)s%(quote_char)s%(key)s%(quote_char)s:'
-            ' %(value)s%(comma)s%(newline)s'
-        ) % {
-            'indents': indent * (indent_depth + 1),
-            'key': _key,
-            'value': _value,
-            'quote_char': quote_char,
-            'newline': newline,
-            'comma': ',' if i < len(dictionary) - 1 else '',
-        }
-    response += '{indent}}}'.format(
-        indent=(indent * indent_depth) if dictionary else '',
+        return '\n'.join([start_line, statements, print_line])
+
+    lines = [
+        'timings = []',
+        'for _ in range(%d):' % measure,
+        indent + start_line,
+    ]
+    lines.extend(
+        indent + line if line.strip() else line
+        for line in statements.split('\n')
     )
-    return response
+    lines.extend([
+        indent + 'timings.append(%s)' % elapsed,
+        'timings.sort()',
+        'for percentile in (%s):' % ', '.join(
+            str(percentile) for percentile in MEASURE_PERCENTILES
+        ),
+        indent + 'timing = timings[len(timings) * percentile // 100]',
+        indent + (
+            'print(%(quote_char)sp%%d: %%.2f ms%(quote_char)s'
+            ' %% (percentile, timing))'
+        ) % {'quote_char': quote_char},
+    ])
+    return '\n'.join(lines)
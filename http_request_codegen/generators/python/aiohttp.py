@@ -0,0 +1,383 @@
+'''Python aiohttp code snippets generator.'''
+
+from http_request_codegen.generators.python._utils import (
+    DEFAULT_INDENT,
+    DEFAULT_QUOTE_CHAR,
+    DEFAULT_WRAP,
+    body_doc,
+    common_arguments_docs,
+    dict_doc,
+    indented_layout,
+    kwarg_doc,
+    measured_statements,
+    parameters_dict,
+    post_content_type,
+    str_definition,
+)
+from http_request_codegen.hrc_emitter import Emitter
+from http_request_codegen.hrc_exceptions import (
+    raise_post_text_plain_n_parameters_not_1,
+)
+from http_request_codegen.hrc_http import validate_fanout, validate_measure
+from http_request_codegen.hrc_layout import Group, bracket
+from http_request_codegen.hrc_valuer import (
+    lazy_name_by_parameter,
+    lazy_value_by_parameter,
+)
+
+
+def _statements_depth(
+    setup=True, fanout=None, concurrency=None, measure=False,
+):
+    # levels of indentation of the statements performing the request
+    if fanout is None:
+        if setup and not isinstance(setup, str):
+            return 2
+        # inside the loop that performs the request multiple times
+        return 1 if measure and measure is not True else 0
+    return 2 if concurrency else 1
+
+
+def _add_field_doc(arguments, indent=DEFAULT_INDENT):
+    return Group(['form.add_field', bracket('(', arguments, ')', indent)])
+
+
+def _request_render(
+    emitter, method, arguments, form_docs=[], indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None, oneline=False,
+    wrap=DEFAULT_WRAP, fanout=None, concurrency=None, measure=False,
+):
+    # statements rendered without initialization are placed inside the loop
+    # that performs the request multiple times
+    _wrap = wrap - len(indent) if measure and measure is not True and (
+        not setup or isinstance(setup, str)
+    ) else wrap
+
+    def measured(statements):
+        if not measure:
+            return statements
+        return measured_statements(
+            statements, measure, indent=indent, quote_char=quote_char,
+            oneline=oneline,
+        )
+
+    def statements(depth, result, wrap=wrap):
+        # statements that perform the request at the given depth,
+        # assigning or returning the text of the response
+        lines = [
+            indented_layout(
+                doc, indent=indent, indent_depth=depth,
+                oneline=oneline, wrap=wrap,
+            ) for doc in form_docs
+        ]
+        lines.append(
+            indented_layout(
+                Group([
+                    'async with session.%s' % method,
+                    bracket('(', arguments, ')', indent),
+                    ' as resp:',
+                ]),
+                indent=indent, indent_depth=depth, oneline=oneline, wrap=wrap,
+            ) + (' ' if oneline else '\n' + indent * (depth + 1)) + result,
+        )
+        return '\n'.join(lines)
+
+    def gather_render(depth, result, wrap=wrap):
+        request_arguments = 'session, semaphore' if concurrency else 'session'
+        return indented_layout(
+            Group([
+                result + 'await asyncio.gather',
+                bracket(
+                    '(',
+                    ['*(request(%s) for _ in range(%d))' % (
+                        request_arguments, fanout,
+                    )],
+                    ')',
+                    indent,
+                ),
+            ]),
+            indent=indent, indent_depth=depth, oneline=oneline, wrap=wrap,
+        )
+
+    if setup:
+        if isinstance(setup, str):
+            emitter.write(setup)
+        else:
+            emitter.write(
+                'import asyncio\n%s\nimport aiohttp\n\n\n' % (
+                    'import time\n' if measure else ''
+                ),
+            )
+
+    if fanout is None:
+        if setup and not isinstance(setup, str):
+            emitter.write(
+                'async def main():\n%(indent)sasync with'
+                ' aiohttp.ClientSession() as session:\n' % {
+                    'indent': indent,
+                },
+            )
+            emitter.write(statements(2, 'return await resp.text()'))
+            emitter.write(
+                '\n\n\n' + measured('req = asyncio.run(main())'),
+            )
+        else:
+            emitter.write(
+                measured(statements(0, 'req = await resp.text()', _wrap)),
+            )
+    else:
+        semaphore_line = (
+            'semaphore = asyncio.Semaphore(%d)' % concurrency
+            if concurrency else None
+        )
+        if concurrency:
+            emitter.write(
+                'async def request(session, semaphore):\n'
+                '%(indent)sasync with semaphore:\n' % {'indent': indent},
+            )
+            emitter.write(statements(2, 'return await resp.text()'))
+        else:
+            emitter.write('async def request(session):\n')
+            emitter.write(statements(1, 'return await resp.text()'))
+
+        if setup and not isinstance(setup, str):
+            emitter.write('\n\n\nasync def main():\n')
+            if semaphore_line:
+                emitter.write(indent + semaphore_line + '\n')
+            emitter.write(
+                '%(indent)sasync with aiohttp.ClientSession() as'
+                ' session:\n' % {'indent': indent},
+            )
+            emitter.write(gather_render(2, 'return '))
+            emitter.write(
+                '\n\n\n' + measured('req = asyncio.run(main())'),
+            )
+        else:
+            emitter.write('\n\n\n')
+            if semaphore_line:
+                emitter.write(semaphore_line + '\n')
+            emitter.write(measured(gather_render(0, 'req = ', _wrap)))
+
+    if teardown:
+        emitter.write(str(teardown))
+
+
+def get(
+    url, parameters=[], headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    fanout=None, concurrency=None, measure=False, _emitter=None, **kwargs,
+):
+    '''The request is performed by an ``aiohttp.ClientSession`` inside an
+    ``async with`` block and the text of the response is assigned to the
+    variable ``req``. Parameters are passed using the ``params`` argument of
+    the
+    [``ClientSession.get``](https://docs.aiohttp.org/en/stable/client_reference.html#aiohttp.ClientSession.get)
+    method. Boolean values are passed as strings because ``aiohttp`` only
+    accepts strings and numbers as query values.
+
+    The initialization snippet imports the modules, opens the session in a
+    ``main`` coroutine and runs it using ``asyncio.run``. Without it or if a
+    custom ``setup`` is passed, the request is rendered as the body of a
+    coroutine where a ``session`` is defined:
+
+    ```python
+    async with session.get('<url>') as resp:
+        req = await resp.text()
+    ```
+
+    Passing ``fanout``, the request is performed the number of times
+    defined by it concurrently over the same session using
+    ``asyncio.gather``, so ``req`` will be the list of texts of the
+    responses. The number of requests performed at the same time can be
+    limited by ``concurrency``, which uses an ``asyncio.Semaphore``:
+
+    ```python
+    import asyncio
+
+    import aiohttp
+
+
+    async def request(session, semaphore):
+        async with semaphore:
+            async with session.get('<url>') as resp:
+                return await resp.text()
+
+
+    async def main():
+        semaphore = asyncio.Semaphore(10)
+        async with aiohttp.ClientSession() as session:
+            return await asyncio.gather(
+                *(request(session, semaphore) for _ in range(100))
+            )
+
+
+    req = asyncio.run(main())
+    ```
+
+    The duration of the request can be measured passing ``measure``, like
+    the requests generator does. With initialization, the whole coroutine
+    is measured, including the opening of the session.
+
+    Python does not allow to define compound statements after other
+    statements in the same line, so the ``oneline`` argument only renders
+    each statement of the request in one line.
+    '''
+    validate_fanout(fanout, concurrency)
+    validate_measure(measure)
+    emitter = Emitter() if _emitter is None else _emitter
+
+    # documents are built for the width available at their indentation
+    _wrap = wrap - len(indent) * _statements_depth(
+        setup=setup, fanout=fanout, concurrency=concurrency, measure=measure,
+    )
+
+    arguments = common_arguments_docs(
+        url, headers=headers, indent=indent, quote_char=quote_char,
+        wrap=_wrap, kwargs=kwargs,
+    )
+
+    # parameters
+    if parameters:
+        arguments.insert(1, [
+            'params=',
+            dict_doc(
+                parameters_dict(
+                    parameters, seed=seed, locale=locale, bool_to_str=True,
+                ),
+                indent=indent, indent_depth=1,
+                quote_char=quote_char, wrap=_wrap,
+            ),
+        ])
+
+    _request_render(
+        emitter, 'get', arguments, indent=indent, setup=setup,
+        quote_char=quote_char, teardown=teardown, oneline=oneline, wrap=wrap,
+        fanout=fanout, concurrency=concurrency, measure=measure,
+    )
+    return emitter.getvalue()
+
+
+def post(
+    url, parameters=[], files={}, headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    fanout=None, concurrency=None, measure=False, _emitter=None, **kwargs,
+):
+    '''POST method code generator for Python aiohttp library. The body is
+    built following the same rules as the requests generator. Multipart
+    bodies are built using an ``aiohttp.FormData`` instance, which does not
+    support headers for each file, so those are not rendered.
+    '''
+    validate_fanout(fanout, concurrency)
+    validate_measure(measure)
+    emitter = Emitter() if _emitter is None else _emitter
+
+    # documents are built for the width available at their indentation
+    _wrap = wrap - len(indent) * _statements_depth(
+        setup=setup, fanout=fanout, concurrency=concurrency, measure=measure,
+    )
+
+    content_type = post_content_type(headers, files)
+    if content_type == 'text/plain' and len(parameters) != 1:
+        raise_post_text_plain_n_parameters_not_1(len(parameters))
+
+    arguments = common_arguments_docs(
+        url, headers=headers, indent=indent, quote_char=quote_char,
+        wrap=_wrap, kwargs=kwargs,
+    )
+
+    form_docs = []
+    if content_type == 'multipart/form-data':
+        # fields are not quoted, so the filenames are sent as they are,
+        # like the requests library does
+        form_docs.append('form = aiohttp.FormData(quote_fields=False)')
+        for parameter in parameters:
+            form_docs.append(
+                _add_field_doc(
+                    [
+                        str_definition(
+                            lazy_name_by_parameter(parameter, seed=seed),
+                            indent=indent, quote_char=quote_char, wrap=_wrap,
+                        ),
+                        # form fields values must be strings
+                        str_definition(
+                            str(
+                                lazy_value_by_parameter(
+                                    parameter, seed=seed, locale=locale,
+                                ),
+                            ),
+                            indent=indent, quote_char=quote_char, wrap=_wrap,
+                        ),
+                    ],
+                    indent=indent,
+                ),
+            )
+        for key, value in files.items():
+            if isinstance(value, str) or value is None:
+                value = [value]
+
+            # random filepath
+            filepath = value[0]
+            if filepath is None:
+                filepath = lazy_value_by_parameter(
+                    {
+                        'name': '',
+                        'faker': 'faker.providers.file::file_path',
+                    },
+                    seed=seed,
+                    locale=locale,
+                )
+
+            field_arguments = [
+                str_definition(
+                    key, indent=indent, quote_char=quote_char, wrap=_wrap,
+                ),
+                Group(
+                    bracket(
+                        'open(',
+                        [
+                            str_definition(
+                                filepath,
+                                indent=indent * 2,
+                                quote_char=quote_char,
+                                wrap=_wrap,
+                            ),
+                            '%(quote_char)srb%(quote_char)s' % {
+                                'quote_char': quote_char,
+                            },
+                        ],
+                        ')',
+                        indent,
+                    ),
+                ),
+                kwarg_doc(
+                    'filename', filepath, indent=indent,
+                    quote_char=quote_char, wrap=_wrap,
+                ),
+            ]
+            if len(value) > 1:
+                field_arguments.append(
+                    kwarg_doc(
+                        'content_type', value[1], indent=indent,
+                        quote_char=quote_char, wrap=_wrap,
+                    ),
+                )
+            form_docs.append(_add_field_doc(field_arguments, indent=indent))
+        arguments.insert(1, 'data=form')
+    elif parameters:
+        arguments.insert(
+            1,
+            body_doc(
+                content_type, parameters, indent=indent,
+                quote_char=quote_char, wrap=_wrap, seed=seed, locale=locale,
+            ),
+        )
+
+    _request_render(
+        emitter, 'post', arguments, form_docs=form_docs, indent=indent,
+        quote_char=quote_char, setup=setup, teardown=teardown,
+        oneline=oneline, wrap=wrap, fanout=fanout, concurrency=concurrency,
+        measure=measure,
+    )
+    return emitter.getvalue()
@@ -0,0 +1,369 @@
+'''Python httpx code snippets generator.'''
+
+from http_request_codegen.generators.python._utils import (
+    DEFAULT_INDENT,
+    DEFAULT_QUOTE_CHAR,
+    DEFAULT_WRAP,
+    body_doc,
+    common_arguments_docs,
+    dict_doc,
+    files_doc,
+    indented_layout,
+    measured_statements,
+    parameters_dict,
+    post_content_type,
+    value_doc,
+)
+from http_request_codegen.hrc_emitter import Emitter
+from http_request_codegen.hrc_exceptions import (
+    raise_post_text_plain_n_parameters_not_1,
+)
+from http_request_codegen.hrc_http import validate_measure
+from http_request_codegen.hrc_layout import Group, bracket, layout
+
+
+CLIENT_ARGUMENTS = (
+    'http2', 'max_connections', 'max_keepalive_connections', 'client_timeout',
+)
+
+
+def _statements_depth(setup=True, asynchronous=False, measure=False):
+    # levels of indentation of the statement performing the request
+    if asynchronous and setup and not isinstance(setup, str):
+        return 2
+    return 1 if measure and measure is not True else 0
+
+
+def _validate_client(
+    session=False, asynchronous=False, http2=False, max_connections=None,
+    max_keepalive_connections=None, client_timeout=None, setup=True,
+):
+    for argument, value in zip(
+        CLIENT_ARGUMENTS,
+        (http2, max_connections, max_keepalive_connections, client_timeout),
+    ):
+        if not value:
+            continue
+        if not session and not asynchronous:
+            raise ValueError(
+                (
+                    '\'%s\' argument requires a client, pass'
+                    ' \'session=True\' or \'asynchronous=True\''
+                ) % argument,
+            )
+        elif not setup or isinstance(setup, str):
+            # the client is only created by the default initialization
+            raise ValueError(
+                (
+                    '\'%s\' argument requires the client created by the'
+                    ' initialization snippet, pass \'setup=True\''
+                ) % argument,
+            )
+
+
+def _client_doc(
+    asynchronous=False, http2=False, max_connections=None,
+    max_keepalive_connections=None, client_timeout=None,
+    indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+):
+    arguments = []
+    if http2:
+        arguments.append('http2=True')
+    if max_connections is not None or max_keepalive_connections is not None:
+        limits_arguments = []
+        if max_connections is not None:
+            limits_arguments.append('max_connections=%d' % max_connections)
+        if max_keepalive_connections is not None:
+            limits_arguments.append(
+                'max_keepalive_connections=%d' % max_keepalive_connections,
+            )
+        arguments.append([
+            'limits=httpx.Limits',
+            Group(bracket('(', limits_arguments, ')', indent)),
+        ])
+    if client_timeout is not None:
+        if isinstance(client_timeout, dict):
+            arguments.append([
+                'timeout=httpx.Timeout',
+                Group(
+                    bracket(
+                        '(',
+                        [
+                            [
+                                name + '=',
+                                value_doc(
+                                    value, quote_char=quote_char,
+                                    wrap=float('inf'),
+                                ),
+                            ] for name, value in client_timeout.items()
+                        ],
+                        ')',
+                        indent,
+                    ),
+                ),
+            ])
+        else:
+            arguments.append([
+                'timeout=',
+                value_doc(
+                    client_timeout, quote_char=quote_char, wrap=float('inf'),
+                ),
+            ])
+    return Group([
+        'httpx.AsyncClient' if asynchronous else 'httpx.Client',
+        bracket('(', arguments, ')', indent),
+    ])
+
+
+def _request_render(
+    emitter, method, arguments, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None, oneline=False,
+    wrap=DEFAULT_WRAP, session=False, asynchronous=False, http2=False,
+    max_connections=None, max_keepalive_connections=None,
+    client_timeout=None, measure=False,
+):
+    client_doc = _client_doc(
+        asynchronous=asynchronous, http2=http2,
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        client_timeout=client_timeout, indent=indent, quote_char=quote_char,
+    )
+
+    def call_doc(result):
+        return Group([
+            '%s%s.%s' % (
+                result, 'client' if session or asynchronous else 'httpx',
+                method,
+            ),
+            bracket('(', arguments, ')', indent),
+        ])
+
+    def measured(statements):
+        if not measure:
+            return statements
+        return measured_statements(
+            statements, measure, indent=indent, quote_char=quote_char,
+            oneline=oneline,
+        )
+
+    # the request is laid out for the width available inside the loop that
+    # performs it multiple times
+    _wrap = wrap - len(indent) if measure and measure is not True else wrap
+
+    if asynchronous:
+        if setup and not isinstance(setup, str):
+            emitter.write(
+                'import asyncio\n%s\nimport httpx\n\n\n' % (
+                    'import time\n' if measure else ''
+                ),
+            )
+            emitter.write('async def main():\n')
+            emitter.write(
+                indented_layout(
+                    Group(['async with ', client_doc, ' as client:']),
+                    indent=indent, indent_depth=1,
+                    oneline=oneline, wrap=wrap,
+                ),
+            )
+            emitter.write('\n')
+            emitter.write(
+                indented_layout(
+                    call_doc('return await '), indent=indent,
+                    indent_depth=2, oneline=oneline, wrap=wrap,
+                ),
+            )
+            emitter.write(
+                '\n\n\n' + measured('req = asyncio.run(main())'),
+            )
+        else:
+            if setup:
+                emitter.write(setup)
+            emitter.write(
+                measured(
+                    layout(
+                        call_doc('req = await '), wrap=_wrap, flat=oneline,
+                    ),
+                ),
+            )
+    else:
+        if setup:
+            if isinstance(setup, str):
+                emitter.write(setup)
+            else:
+                if measure:
+                    emitter.write(
+                        'import time' + (';' if oneline else '\n\n'),
+                    )
+                emitter.write('import httpx' + (';' if oneline else '\n\n'))
+                if session:
+                    emitter.write('client = ')
+                    emitter.write_layout(client_doc, wrap=wrap, flat=oneline)
+                    emitter.write(';' if oneline else '\n\n')
+        emitter.write(
+            measured(
+                layout(call_doc('req = '), wrap=_wrap, flat=oneline) +
+                (';' if oneline else ''),
+            ),
+        )
+
+    if teardown:
+        emitter.write(str(teardown))
+
+
+def get(
+    url, parameters=[], headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    session=False, asynchronous=False, http2=False, max_connections=None,
+    max_keepalive_connections=None, client_timeout=None, measure=False,
+    _emitter=None, **kwargs,
+):
+    '''Parameters are passed using the ``params`` argument of
+    [``httpx.get``](https://www.python-httpx.org/api/#helper-functions).
+    Boolean values are passed as strings, because ``httpx`` encodes them
+    in lowercase.
+
+    Passing ``session=True``, the request is performed by an
+    [``httpx.Client``](https://www.python-httpx.org/advanced/clients/)
+    created in the initialization snippet, which reuses the connections.
+    Passing ``asynchronous=True``, it is performed by an
+    ``httpx.AsyncClient`` inside a coroutine run by ``asyncio.run`` or,
+    without initialization, as the body of a coroutine where ``client`` is
+    defined.
+
+    The client can be configured by the next arguments:
+
+    - ``http2``: enables HTTP/2, which requires the ``h2`` package.
+    - ``max_connections`` and ``max_keepalive_connections``: limits of the
+      pool of connections, defined by ``httpx.Limits``.
+    - ``client_timeout``: timeout of the requests performed by the client,
+      as a number of seconds or a dictionary with the arguments of
+      ``httpx.Timeout``. The timeout of each request can be defined passing
+      ``timeout`` as any other optional argument.
+
+    The client is created by the default initialization snippet, so these
+    arguments can't be passed with a custom or without ``setup``.
+
+    ```python
+    import asyncio
+
+    import httpx
+
+
+    async def main():
+        async with httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100)
+        ) as client:
+            return await client.get('<url>')
+
+
+    req = asyncio.run(main())
+    ```
+
+    The duration of the request can be measured passing ``measure``, like
+    the requests generator does. Asynchronous requests with initialization
+    measure the whole coroutine, including the opening of the client.
+    '''
+    validate_measure(measure)
+    _validate_client(
+        session=session, asynchronous=asynchronous, http2=http2,
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        client_timeout=client_timeout, setup=setup,
+    )
+    emitter = Emitter() if _emitter is None else _emitter
+
+    # documents are built for the width available at their indentation
+    _wrap = wrap - len(indent) * _statements_depth(
+        setup=setup, asynchronous=asynchronous, measure=measure,
+    )
+
+    arguments = common_arguments_docs(
+        url, headers=headers, indent=indent, quote_char=quote_char,
+        wrap=_wrap, kwargs=kwargs,
+    )
+    if parameters:
+        arguments.insert(1, [
+            'params=',
+            dict_doc(
+                parameters_dict(
+                    parameters, seed=seed, locale=locale, bool_to_str=True,
+                ),
+                indent=indent, indent_depth=1,
+                quote_char=quote_char, wrap=_wrap,
+            ),
+        ])
+
+    _request_render(
+        emitter, 'get', arguments, indent=indent, setup=setup,
+        quote_char=quote_char, teardown=teardown, oneline=oneline,
+        wrap=wrap, session=session, asynchronous=asynchronous, http2=http2,
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        client_timeout=client_timeout, measure=measure,
+    )
+    return emitter.getvalue()
+
+
+def post(
+    url, parameters=[], files={}, headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    session=False, asynchronous=False, http2=False, max_connections=None,
+    max_keepalive_connections=None, client_timeout=None, measure=False,
+    _emitter=None, **kwargs,
+):
+    '''POST method code generator for Python httpx library. The body is
+    built following the same rules as the requests generator, but
+    ``text/plain`` bodies are passed using the ``content`` argument.
+    '''
+    validate_measure(measure)
+    _validate_client(
+        session=session, asynchronous=asynchronous, http2=http2,
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        client_timeout=client_timeout, setup=setup,
+    )
+    emitter = Emitter() if _emitter is None else _emitter
+
+    content_type = post_content_type(headers, files)
+    if content_type == 'text/plain' and len(parameters) != 1:
+        raise_post_text_plain_n_parameters_not_1(len(parameters))
+
+    # documents are built for the width available at their indentation
+    _wrap = wrap - len(indent) * _statements_depth(
+        setup=setup, asynchronous=asynchronous, measure=measure,
+    )
+
+    arguments = common_arguments_docs(
+        url, headers=headers, indent=indent, quote_char=quote_char,
+        wrap=_wrap, kwargs=kwargs,
+    )
+    body_arguments = []
+    if parameters:
+        body_arguments.append(
+            body_doc(
+                content_type, parameters, indent=indent,
+                quote_char=quote_char, wrap=_wrap, seed=seed, locale=locale,
+                text_kwarg='content', bool_to_str=True,
+            ),
+        )
+    if files:
+        body_arguments.append(
+            files_doc(
+                files, indent=indent, quote_char=quote_char, wrap=_wrap,
+                seed=seed, locale=locale,
+            ),
+        )
+    arguments[1:1] = body_arguments
+
+    _request_render(
+        emitter, 'post', arguments, indent=indent, setup=setup,
+        quote_char=quote_char, teardown=teardown, oneline=oneline,
+        wrap=wrap, session=session, asynchronous=asynchronous, http2=http2,
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        client_timeout=client_timeout, measure=measure,
+    )
+    return emitter.getvalue()
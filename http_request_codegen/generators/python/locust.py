@@ -0,0 +1,468 @@
+'''Python locust load testing user classes generator.'''
+
+import re
+from collections import OrderedDict
+
+
+try:
+    from urllib.parse import urlsplit, urlunsplit
+except ImportError:
+    from urlparse import urlsplit, urlunsplit
+
+from http_request_codegen.generators.python._utils import (
+    DEFAULT_INDENT,
+    DEFAULT_QUOTE_CHAR,
+    DEFAULT_WRAP,
+    body_doc,
+    common_arguments_docs,
+    dict_doc,
+    escape_by_quote,
+    files_doc,
+    indented_layout,
+    parameters_dict,
+    post_content_type,
+    validate_python_identifier,
+)
+from http_request_codegen.hrc_emitter import Emitter
+from http_request_codegen.hrc_exceptions import (
+    raise_post_text_plain_n_parameters_not_1,
+)
+from http_request_codegen.hrc_layout import Group, bracket
+
+
+DEFAULT_USER_CLASS = 'WebsiteUser'
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _validate_weight(weight=None):
+    if weight is not None and (
+        isinstance(weight, bool) or not isinstance(weight, int) or
+        weight < 1
+    ):
+        raise ValueError(
+            '\'weight\' argument must be a positive integer, but \'%s\''
+            ' passed' % (weight,),
+        )
+
+
+def _validate_user(user_class=None, wait_time=None, setup=True):
+    if user_class is not None:
+        validate_python_identifier(user_class)
+    if wait_time is not None and not (
+        (_is_number(wait_time) and wait_time >= 0) or (
+            isinstance(wait_time, (list, tuple)) and len(wait_time) == 2 and
+            all(_is_number(value) for value in wait_time) and
+            0 <= wait_time[0] <= wait_time[1]
+        )
+    ):
+        raise ValueError(
+            '\'wait_time\' argument must be a non negative number or a pair'
+            ' of them defining a range, but \'%s\' passed' % (wait_time,),
+        )
+    if not setup:
+        for argument, value in (
+            ('user_class', user_class), ('wait_time', wait_time),
+        ):
+            if value is not None:
+                raise ValueError(
+                    '\'%s\' argument requires initialization' % argument,
+                )
+
+
+def _validate_program_arguments(user_class=None, wait_time=None):
+    for argument, value in (
+        ('user_class', user_class), ('wait_time', wait_time),
+    ):
+        if value is not None:
+            raise ValueError(
+                (
+                    '\'%s\' is defined for the whole program, it can\'t be'
+                    ' defined by requests'
+                ) % argument,
+            )
+
+
+def _split_url(url):
+    # the origin is defined as the host of the user and the requests are
+    # performed by the path, which keeps the query and the fragment
+    scheme, netloc, path, query, fragment = urlsplit(str(url))
+    return (
+        urlunsplit((scheme, netloc, '', '', '')),
+        urlunsplit(('', '', path or '/', query, fragment)),
+    )
+
+
+def _task_name(method, url):
+    path = urlsplit(str(url)).path
+    slug = re.sub(r'[^0-9a-zA-Z]+', '_', path).strip('_').lower()
+    return '%s_%s' % (method, slug or 'index')
+
+
+def _wait_time_code(wait_time):
+    if _is_number(wait_time):
+        return 'constant(%r)' % (wait_time,)
+    return 'between(%r, %r)' % tuple(wait_time)
+
+
+def _user_render(
+    emitter, setup, host=None, user_class=None, wait_time=None,
+    headers={}, indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    oneline=False, wrap=DEFAULT_WRAP,
+):
+    if isinstance(setup, str):
+        emitter.write(setup)
+    elif setup:
+        names = ['HttpUser']
+        if wait_time is not None:
+            names.append(
+                'constant' if _is_number(wait_time) else 'between',
+            )
+        names.append('task')
+        emitter.write('from locust import %s\n\n\n' % ', '.join(names))
+
+    emitter.write(
+        'class %s(HttpUser):\n' % (user_class or DEFAULT_USER_CLASS),
+    )
+    if host is not None:
+        emitter.write(
+            '%(indent)shost = %(quote_char)s%(host)s%(quote_char)s\n' % {
+                'indent': indent,
+                'quote_char': quote_char,
+                'host': escape_by_quote(host, quote_char),
+            },
+        )
+    if wait_time is not None:
+        emitter.write(
+            '%swait_time = %s\n' % (indent, _wait_time_code(wait_time)),
+        )
+    if host is not None or wait_time is not None:
+        emitter.write('\n')
+
+    if headers:
+        # headers shared by all the tasks are defined once in the session
+        # of each user when it starts
+        emitter.write('%sdef on_start(self):\n' % indent)
+        emitter.write(
+            indented_layout(
+                Group([
+                    'self.client.headers.update',
+                    bracket(
+                        '(',
+                        [
+                            dict_doc(
+                                headers, indent=indent, indent_depth=1,
+                                quote_char=quote_char,
+                                wrap=wrap - len(indent * 2),
+                            ),
+                        ],
+                        ')',
+                        indent,
+                    ),
+                ]),
+                indent=indent, indent_depth=2, oneline=oneline, wrap=wrap,
+            ),
+        )
+        emitter.write('\n\n')
+
+
+def _task_render(
+    emitter, name, method, arguments, weight=None, indent=DEFAULT_INDENT,
+    oneline=False, wrap=DEFAULT_WRAP, depth=1,
+):
+    prefix = indent * (depth - 1)
+    emitter.write(
+        '%(prefix)s@task%(weight)s\n%(prefix)sdef %(name)s(self):\n' % {
+            'prefix': prefix,
+            'weight': '' if weight is None else '(%d)' % weight,
+            'name': name,
+        },
+    )
+
+    # the call is rendered in one line if fits in the wrap, in other case
+    # each argument is rendered in its own line
+    emitter.write(
+        indented_layout(
+            Group([
+                'self.client.%s' % method,
+                bracket('(', arguments, ')', indent),
+            ]),
+            indent=indent, indent_depth=depth, oneline=oneline, wrap=wrap,
+        ),
+    )
+
+
+def _request_render(
+    emitter, method, url, arguments_func, setup=True, weight=None,
+    user_class=None, wait_time=None, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, oneline=False, wrap=DEFAULT_WRAP,
+    _program=None,
+):
+    _validate_weight(weight)
+    if _program is None:
+        _validate_user(
+            user_class=user_class, wait_time=wait_time, setup=setup,
+        )
+    else:
+        _validate_program_arguments(
+            user_class=user_class, wait_time=wait_time,
+        )
+
+    if _program is None and setup:
+        host, url = _split_url(url)
+        _user_render(
+            emitter, setup, host=host, user_class=user_class,
+            wait_time=wait_time, indent=indent, quote_char=quote_char,
+            oneline=oneline, wrap=wrap,
+        )
+
+    # the tasks are methods of the user class, whose body is indented one
+    # level more, so `wrap` must be reduced by the indentation of the call
+    depth = 2 if setup or _program is not None else 1
+    name = _task_name(method, url)
+    _task_render(
+        emitter,
+        _program.variable_name(name) if _program is not None else name,
+        method,
+        arguments_func(url, wrap - len(indent * depth)),
+        weight=weight, indent=indent, oneline=oneline, wrap=wrap,
+        depth=depth,
+    )
+
+
+def get(
+    url, parameters=[], headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    weight=None, user_class=None, wait_time=None, _emitter=None,
+    _program=None, **kwargs,
+):
+    '''Renders a [locust](https://locust.io) user class whose task performs
+    the request by the ``client`` of the user, a ``requests.Session``, so
+    parameters, headers and ``kwargs`` are passed like the [requests
+    generator](/reference/python/requests#get) does. The origin of the URL
+    is defined as the ``host`` of the user and the task requests its path:
+
+    ```python
+    from locust import HttpUser, task
+
+
+    class WebsiteUser(HttpUser):
+        host = 'http://localhost'
+
+        @task
+        def get_index(self):
+            self.client.get('/')
+    ```
+
+    The user class is customized passing the next arguments:
+
+    - ``user_class``: name of the class, ``WebsiteUser`` by default.
+    - ``wait_time``: seconds that each user waits between tasks. A number
+      is a constant time and a pair of numbers is a random time between
+      them.
+    - ``weight``: weight of the task, used when the user performs multiple
+      tasks by [programs](/reference/python/locust#program).
+
+    Without initialization only the task is rendered, requesting the whole
+    URL, so it can be placed in an existing user class. A custom ``setup``
+    replaces the import line. Classes can't be defined in one line, so
+    ``oneline`` only renders the calls in one line.
+    '''
+    emitter = Emitter() if _emitter is None else _emitter
+
+    def arguments(url, wrap):
+        arguments = common_arguments_docs(
+            url, headers=headers, indent=indent, quote_char=quote_char,
+            wrap=wrap, kwargs=kwargs,
+        )
+        if parameters:
+            arguments.insert(1, [
+                'params=',
+                dict_doc(
+                    parameters_dict(parameters, seed=seed, locale=locale),
+                    indent=indent, indent_depth=1,
+                    quote_char=quote_char, wrap=wrap,
+                ),
+            ])
+        return arguments
+
+    _request_render(
+        emitter, 'get', url, arguments, setup=setup, weight=weight,
+        user_class=user_class, wait_time=wait_time, indent=indent,
+        quote_char=quote_char, oneline=oneline, wrap=wrap,
+        _program=_program,
+    )
+
+    if teardown:
+        emitter.write(str(teardown))
+    return emitter.getvalue()
+
+
+def post(
+    url, parameters=[], files={}, headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    weight=None, user_class=None, wait_time=None, _emitter=None,
+    _program=None, **kwargs,
+):
+    '''POST method code generator for locust, which accepts the same
+    arguments that the [GET method generator](#get). The body is passed to
+    ``self.client.post`` like the [requests
+    generator](/reference/python/requests#post) does, depending on the
+    ``Content-Type`` header and the files sent:
+
+    ```python
+    from locust import HttpUser, task
+
+
+    class WebsiteUser(HttpUser):
+        host = 'http://localhost'
+
+        @task
+        def post_index(self):
+            self.client.post(
+                '/',
+                json={
+                    'foo': 'bar'
+                },
+                headers={
+                    'Content-Type': 'application/json'
+                }
+            )
+    ```
+    '''
+    emitter = Emitter() if _emitter is None else _emitter
+
+    content_type = post_content_type(headers, files)
+    if content_type == 'text/plain' and len(parameters) != 1:
+        raise_post_text_plain_n_parameters_not_1(len(parameters))
+
+    def arguments(url, wrap):
+        arguments = common_arguments_docs(
+            url, headers=headers, indent=indent, quote_char=quote_char,
+            wrap=wrap, kwargs=kwargs,
+        )
+        # data/json
+        if parameters:
+            arguments.insert(
+                1,
+                body_doc(
+                    content_type, parameters, indent=indent,
+                    quote_char=quote_char, wrap=wrap, seed=seed,
+                    locale=locale,
+                ),
+            )
+        # files
+        if files:
+            arguments.insert(
+                2 if parameters else 1,
+                files_doc(
+                    files, indent=indent, quote_char=quote_char, wrap=wrap,
+                    seed=seed, locale=locale,
+                ),
+            )
+        return arguments
+
+    _request_render(
+        emitter, 'post', url, arguments, setup=setup, weight=weight,
+        user_class=user_class, wait_time=wait_time, indent=indent,
+        quote_char=quote_char, oneline=oneline, wrap=wrap,
+        _program=_program,
+    )
+
+    if teardown:
+        emitter.write(str(teardown))
+    return emitter.getvalue()
+
+
+def _shared_headers(requests):
+    # headers defined with the same value by all the requests, except the
+    # content type, which defines how the body of each request is encoded
+    shared = None
+    for _, kwargs in requests:
+        headers = OrderedDict(
+            (name, value) for name, value in kwargs.get('headers', {}).items()
+            if str(name).lower() != 'content-type'
+        )
+        if shared is None:
+            shared = headers
+        else:
+            shared = OrderedDict(
+                (name, value) for name, value in shared.items()
+                if name in headers and str(headers[name]) == str(value)
+            )
+    return shared or OrderedDict()
+
+
+def program(
+    program, indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    setup=True, teardown=None, wrap=DEFAULT_WRAP, user_class=None,
+    wait_time=None, _emitter=None,
+):
+    '''Requests of programs are rendered as tasks of the same user class,
+    whose ``host`` is the origin of the first request. The requests to other
+    origins are performed by their whole URL. Each task can define its
+    ``weight`` and the user class is customized passing ``user_class`` and
+    ``wait_time`` to the program. The headers defined with the same value by
+    all the requests are updated in the session of each user when it starts.
+    The ``setup`` snippet only replaces the import line, the user class is
+    always rendered:
+
+    ```python
+    from locust import HttpUser, between, task
+
+
+    class WebsiteUser(HttpUser):
+        host = 'http://localhost'
+        wait_time = between(1, 5)
+
+        def on_start(self):
+            self.client.headers.update({'Accept': 'application/json'})
+
+        @task(3)
+        def get_a(self):
+            self.client.get('/a')
+
+        @task
+        def post_b(self):
+            self.client.post('/b', data={'foo': 'bar'})
+    ```
+    '''
+    _validate_user(user_class=user_class, wait_time=wait_time)
+    emitter = Emitter() if _emitter is None else _emitter
+
+    host = None
+    if program.requests:
+        host, _ = _split_url(program.requests[0][1]['url'])
+    headers = _shared_headers(program.requests)
+    _user_render(
+        emitter, setup, host=host, user_class=user_class,
+        wait_time=wait_time, headers=headers, indent=indent,
+        quote_char=quote_char, wrap=wrap,
+    )
+
+    for i, (func, kwargs) in enumerate(program.requests):
+        origin, path = _split_url(kwargs['url'])
+        if i:
+            emitter.write('\n\n')
+        func(
+            indent=indent, quote_char=quote_char, setup=False, wrap=wrap,
+            _emitter=emitter, _program=program,
+            **dict(
+                kwargs,
+                url=path if origin == host else kwargs['url'],
+                headers=OrderedDict(
+                    (name, value)
+                    for name, value in kwargs.get('headers', {}).items()
+                    if name not in headers
+                ),
+            ),
+        )
+    emitter.write('\n')
+
+    if teardown:
+        emitter.write(str(teardown))
+    return emitter.getvalue()
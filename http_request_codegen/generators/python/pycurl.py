@@ -0,0 +1,500 @@
+'''Python pycurl code snippets generator.'''
+
+from http_request_codegen.generators.python._utils import (
+    DEFAULT_INDENT,
+    DEFAULT_QUOTE_CHAR,
+    DEFAULT_WRAP,
+    dict_doc,
+    indented_layout,
+    measured_statements,
+    parameters_dict,
+    post_content_type,
+    str_definition,
+    url_doc,
+    value_doc,
+)
+from http_request_codegen.hrc_emitter import Emitter
+from http_request_codegen.hrc_exceptions import (
+    raise_post_text_plain_n_parameters_not_1,
+)
+from http_request_codegen.hrc_http import validate_fanout, validate_measure
+from http_request_codegen.hrc_layout import Group, bracket
+from http_request_codegen.hrc_valuer import (
+    lazy_json_body_by_parameters,
+    lazy_name_by_parameter,
+    lazy_value_by_parameter,
+)
+
+
+def _setup_render(
+    setup, oneline=False, json=False, urlencode=False, measure=False,
+):
+    if not setup:
+        return ''
+    elif isinstance(setup, str):
+        return setup
+
+    stdlib_imports = ['from io import BytesIO']
+    if measure:
+        stdlib_imports.insert(0, 'import time')
+    if json:
+        stdlib_imports.insert(0, 'import json')
+    if urlencode:
+        stdlib_imports.append('from urllib.parse import urlencode')
+    blocks = [stdlib_imports, ['import pycurl']]
+
+    if oneline:
+        return ''.join(
+            line + ';' for lines in blocks for line in lines
+        )
+    return ''.join('\n'.join(lines) + '\n\n' for lines in blocks)
+
+
+def _statements_depth(fanout=None, measure=False):
+    # levels of indentation of the statements configuring the handles,
+    # inside the loops that create them and perform the request
+    return int(fanout is not None) + int(bool(measure) and measure is not True)
+
+
+def _setopt_doc(option, value, indent=DEFAULT_INDENT):
+    return Group([
+        'curl.setopt',
+        bracket('(', ['pycurl.%s' % option, value], ')', indent),
+    ])
+
+
+def _options_docs(
+    url_value, headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, wrap=DEFAULT_WRAP, kwargs={},
+):
+    # 'URL' and 'HTTPHEADER' options, followed by optional arguments
+    # passed to 'setopt' by their uppercased names
+    options = [_setopt_doc('URL', url_value, indent=indent)]
+    if headers:
+        options.append(
+            _setopt_doc(
+                'HTTPHEADER',
+                value_doc(
+                    [
+                        '%s: %s' % (name, value)
+                        for name, value in headers.items()
+                    ],
+                    indent=indent, indent_depth=1,
+                    quote_char=quote_char, wrap=wrap,
+                ),
+                indent=indent,
+            ),
+        )
+    for key, value in kwargs.items():
+        options.append(
+            _setopt_doc(
+                key.upper(),
+                value_doc(
+                    value, indent=indent, indent_depth=1,
+                    quote_char=quote_char, wrap=wrap,
+                ),
+                indent=indent,
+            ),
+        )
+    return options
+
+
+def _request_render(
+    emitter, options, indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    oneline=False, wrap=DEFAULT_WRAP, fanout=None, concurrency=None,
+    measure=False,
+):
+    if measure:
+        # the request is rendered inside the measurement
+        output = Emitter()
+        _request_render(
+            output, options, indent=indent, oneline=oneline,
+            wrap=wrap if measure is True else wrap - len(indent),
+            fanout=fanout, concurrency=concurrency,
+        )
+        emitter.write(
+            measured_statements(
+                output.getvalue(), measure, indent=indent,
+                quote_char=quote_char, oneline=oneline,
+            ),
+        )
+        return
+
+    def statements(docs, depth=0):
+        return [
+            indented_layout(
+                doc, indent=indent, indent_depth=depth,
+                oneline=oneline, wrap=wrap,
+            ) for doc in docs
+        ]
+
+    handle_docs = ['buffer = BytesIO()', 'curl = pycurl.Curl()']
+    if fanout is not None:
+        # handles share the DNS cache and the connections
+        handle_docs.append('curl.setopt(pycurl.SHARE, share)')
+    handle_docs.extend(options)
+    handle_docs.append('curl.setopt(pycurl.WRITEDATA, buffer)')
+
+    if fanout is None:
+        handle_docs.extend([
+            'curl.perform()',
+            'curl.close()',
+            'req = buffer.getvalue()',
+        ])
+        if oneline:
+            emitter.write(''.join(
+                line + ';' for line in statements(handle_docs)
+            ))
+        else:
+            emitter.write('\n'.join(statements(handle_docs)))
+        return
+
+    handle_docs.extend([
+        'multi.add_handle(curl)',
+        'handles.append((curl, buffer))',
+    ])
+    multi_lines = ['multi = pycurl.CurlMulti()']
+    if concurrency:
+        multi_lines.append(
+            'multi.setopt(pycurl.M_MAX_TOTAL_CONNECTIONS, %d)' % concurrency,
+        )
+
+    blocks = [
+        [
+            'share = pycurl.CurlShare()',
+            'share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS)',
+            'share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_CONNECT)',
+        ],
+        multi_lines + [
+            'handles = []',
+            'for _ in range(%d):' % fanout,
+        ] + statements(handle_docs, depth=1),
+        [
+            'while True:',
+            indent + '_, running = multi.perform()',
+            indent + 'if not running:',
+            indent * 2 + 'break',
+            indent + 'multi.select(1.0)',
+        ],
+        [
+            'req = []',
+            'for curl, buffer in handles:',
+            indent + 'multi.remove_handle(curl)',
+            indent + 'curl.close()',
+            indent + 'req.append(buffer.getvalue())',
+            'multi.close()',
+            'share.close()',
+        ],
+    ]
+    emitter.write('\n\n'.join('\n'.join(lines) for lines in blocks))
+
+
+def get(
+    url, parameters=[], headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    fanout=None, concurrency=None, measure=False, _emitter=None, **kwargs,
+):
+    '''The request is performed by a
+    [``pycurl.Curl``](http://pycurl.io/docs/latest/curlobject.html) handle,
+    configured by ``setopt`` calls, and the body of the response is written
+    in a ``BytesIO`` buffer whose content is assigned to the variable
+    ``req``. Parameters are encoded in the URL using ``urlencode``. Optional
+    arguments are passed to ``setopt`` by their uppercased names, so
+    ``timeout=5`` is rendered as ``curl.setopt(pycurl.TIMEOUT, 5)``.
+
+    Passing ``fanout``, the number of handles defined by it perform the
+    request concurrently, driven by a ``pycurl.CurlMulti`` object, so
+    ``req`` will be the list of bodies of the responses. The handles share
+    the DNS cache and the connections through a ``pycurl.CurlShare`` object.
+    The number of connections opened at the same time can be limited by
+    ``concurrency``:
+
+    ```python
+    from io import BytesIO
+
+    import pycurl
+
+    share = pycurl.CurlShare()
+    share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS)
+    share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_CONNECT)
+
+    multi = pycurl.CurlMulti()
+    multi.setopt(pycurl.M_MAX_TOTAL_CONNECTIONS, 10)
+    handles = []
+    for _ in range(100):
+        buffer = BytesIO()
+        curl = pycurl.Curl()
+        curl.setopt(pycurl.SHARE, share)
+        curl.setopt(pycurl.URL, '<url>')
+        curl.setopt(pycurl.WRITEDATA, buffer)
+        multi.add_handle(curl)
+        handles.append((curl, buffer))
+
+    while True:
+        _, running = multi.perform()
+        if not running:
+            break
+        multi.select(1.0)
+
+    req = []
+    for curl, buffer in handles:
+        multi.remove_handle(curl)
+        curl.close()
+        req.append(buffer.getvalue())
+    multi.close()
+    share.close()
+    ```
+
+    The duration of the request can be measured passing ``measure``, like
+    the requests generator does. With ``fanout``, the duration of all the
+    requests is measured.
+
+    Python does not allow to define compound statements after other
+    statements in the same line, so with ``fanout`` the ``oneline``
+    argument only renders each statement in one line.
+    '''
+    validate_fanout(fanout, concurrency)
+    validate_measure(measure)
+    emitter = Emitter() if _emitter is None else _emitter
+    emitter.write(
+        _setup_render(
+            setup, oneline=oneline, urlencode=bool(parameters),
+            measure=measure,
+        ),
+    )
+
+    # documents are built for the width available at their indentation
+    _wrap = wrap - len(indent) * _statements_depth(
+        fanout=fanout, measure=measure,
+    )
+
+    if parameters:
+        url_value = [
+            url_doc(
+                '%s%s' % (url, '&' if '?' in str(url) else '?'),
+                indent=indent, quote_char=quote_char, wrap=_wrap,
+            ),
+            ' + urlencode(',
+            dict_doc(
+                parameters_dict(parameters, seed=seed, locale=locale),
+                indent=indent, indent_depth=1,
+                quote_char=quote_char, wrap=_wrap,
+            ),
+            ')',
+        ]
+    else:
+        url_value = url_doc(
+            url, indent=indent, quote_char=quote_char, wrap=_wrap,
+        )
+
+    _request_render(
+        emitter,
+        _options_docs(
+            url_value, headers=headers, indent=indent,
+            quote_char=quote_char, wrap=_wrap, kwargs=kwargs,
+        ),
+        indent=indent, quote_char=quote_char, oneline=oneline, wrap=wrap,
+        fanout=fanout, concurrency=concurrency, measure=measure,
+    )
+
+    if teardown:
+        emitter.write(str(teardown))
+    return emitter.getvalue()
+
+
+def post(
+    url, parameters=[], files={}, headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    fanout=None, concurrency=None, measure=False, _emitter=None, **kwargs,
+):
+    '''POST method code generator for Python pycurl library. The body is
+    defined depending on the content type, discovered like the requests
+    generator does:
+
+    - ``application/x-www-form-urlencoded``: ``POSTFIELDS`` option encoded
+      by ``urlencode``.
+    - ``multipart/form-data``: ``HTTPPOST`` option, defining the files by
+      ``FORM_FILE``, ``FORM_FILENAME`` and optionally ``FORM_CONTENTTYPE``.
+      Headers for each file are not supported.
+    - ``application/json``: ``POSTFIELDS`` option serialized by
+      ``json.dumps``.
+    - ``text/plain``: ``POSTFIELDS`` option.
+    '''
+    validate_fanout(fanout, concurrency)
+    validate_measure(measure)
+    emitter = Emitter() if _emitter is None else _emitter
+
+    content_type = post_content_type(headers, files)
+    if content_type == 'text/plain' and len(parameters) != 1:
+        raise_post_text_plain_n_parameters_not_1(len(parameters))
+
+    emitter.write(
+        _setup_render(
+            setup, oneline=oneline,
+            json=content_type == 'application/json' and bool(parameters),
+            urlencode=(
+                content_type == 'application/x-www-form-urlencoded' and
+                bool(parameters)
+            ),
+            measure=measure,
+        ),
+    )
+
+    # documents are built for the width available at their indentation
+    _wrap = wrap - len(indent) * _statements_depth(
+        fanout=fanout, measure=measure,
+    )
+
+    options = _options_docs(
+        url_doc(url, indent=indent, quote_char=quote_char, wrap=_wrap),
+        headers=headers, indent=indent, quote_char=quote_char, wrap=_wrap,
+        kwargs=kwargs,
+    )
+
+    if content_type == 'multipart/form-data':
+        fields_items = []
+        for parameter in parameters:
+            fields_items.append(
+                Group(
+                    bracket(
+                        '(',
+                        [
+                            str_definition(
+                                lazy_name_by_parameter(parameter, seed=seed),
+                                indent=indent * 3,
+                                quote_char=quote_char, wrap=_wrap,
+                            ),
+                            # form fields values must be strings
+                            str_definition(
+                                str(
+                                    lazy_value_by_parameter(
+                                        parameter, seed=seed, locale=locale,
+                                    ),
+                                ),
+                                indent=indent * 3,
+                                quote_char=quote_char, wrap=_wrap,
+                            ),
+                        ],
+                        ')',
+                        indent,
+                    ),
+                ),
+            )
+        for key, value in files.items():
+            if isinstance(value, str) or value is None:
+                value = [value]
+
+            # random filepath
+            filepath = value[0]
+            if filepath is None:
+                filepath = lazy_value_by_parameter(
+                    {
+                        'name': '',
+                        'faker': 'faker.providers.file::file_path',
+                    },
+                    seed=seed,
+                    locale=locale,
+                )
+
+            # the path is sent as the filename, like the requests library
+            # does, instead of its basename
+            file_items = [
+                'pycurl.FORM_FILE',
+                str_definition(
+                    filepath, indent=indent * 4,
+                    quote_char=quote_char, wrap=_wrap,
+                ),
+                'pycurl.FORM_FILENAME',
+                str_definition(
+                    filepath, indent=indent * 4,
+                    quote_char=quote_char, wrap=_wrap,
+                ),
+            ]
+            if len(value) > 1:
+                # file content type
+                file_items.extend([
+                    'pycurl.FORM_CONTENTTYPE',
+                    str_definition(
+                        value[1], indent=indent * 4,
+                        quote_char=quote_char, wrap=_wrap,
+                    ),
+                ])
+            fields_items.append(
+                Group(
+                    bracket(
+                        '(',
+                        [
+                            str_definition(
+                                key, indent=indent * 3,
+                                quote_char=quote_char, wrap=_wrap,
+                            ),
+                            Group(bracket('(', file_items, ')', indent)),
+                        ],
+                        ')',
+                        indent,
+                    ),
+                ),
+            )
+        body_option = _setopt_doc(
+            'HTTPPOST', bracket('[', fields_items, ']', indent),
+            indent=indent,
+        )
+    elif not parameters:
+        body_option = _setopt_doc(
+            'POSTFIELDS', quote_char * 2, indent=indent,
+        )
+    elif content_type == 'text/plain':
+        body_option = _setopt_doc(
+            'POSTFIELDS',
+            str_definition(
+                lazy_value_by_parameter(
+                    parameters[0], seed=seed, locale=locale,
+                ),
+                indent=indent, quote_char=quote_char, wrap=_wrap,
+            ),
+            indent=indent,
+        )
+    elif content_type == 'application/json':
+        body_option = _setopt_doc(
+            'POSTFIELDS',
+            [
+                'json.dumps(',
+                value_doc(
+                    lazy_json_body_by_parameters(
+                        parameters, seed=seed, locale=locale,
+                    ),
+                    indent=indent, indent_depth=1,
+                    quote_char=quote_char, wrap=_wrap,
+                ),
+                ')',
+            ],
+            indent=indent,
+        )
+    else:
+        body_option = _setopt_doc(
+            'POSTFIELDS',
+            [
+                'urlencode(',
+                dict_doc(
+                    parameters_dict(parameters, seed=seed, locale=locale),
+                    indent=indent, indent_depth=1,
+                    quote_char=quote_char, wrap=_wrap,
+                ),
+                ')',
+            ],
+            indent=indent,
+        )
+    # the body is defined after the URL and the headers
+    options.insert(2 if headers else 1, body_option)
+
+    _request_render(
+        emitter, options, indent=indent, quote_char=quote_char,
+        oneline=oneline, wrap=wrap, fanout=fanout, concurrency=concurrency,
+        measure=measure,
+    )
+
+    if teardown:
+        emitter.write(str(teardown))
+    return emitter.getvalue()
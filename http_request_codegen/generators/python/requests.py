@@ -6,26 +6,320 @@ from http_request_codegen.generators.python._utils import (
     DEFAULT_INDENT,
     DEFAULT_QUOTE_CHAR,
     DEFAULT_WRAP,
-    dict_definition,
+    body_doc,
+    dict_doc,
     escape_by_quote,
-    kwarg_definition,
-    kwarg_definition_dict_valued,
+    escape_quote_func_by_quote_char,
+    file_doc,
+    files_doc,
+    kwarg_doc,
+    measured_statements,
+    parameters_dict,
+    post_content_type,
     str_definition,
+    url_doc,
+    value_doc,
 )
+from http_request_codegen.hrc_emitter import Emitter
 from http_request_codegen.hrc_exceptions import (
     raise_post_text_plain_n_parameters_not_1,
 )
+from http_request_codegen.hrc_http import validate_compress, validate_measure
+from http_request_codegen.hrc_layout import Group, bracket
+from http_request_codegen.hrc_program import Identifier
 from http_request_codegen.hrc_valuer import (
+    lazy_json_body_by_parameters,
     lazy_name_by_parameter,
     lazy_value_by_parameter,
 )
 
 
+def _session_lines(
+    quote_char=DEFAULT_QUOTE_CHAR, pool_connections=None, pool_maxsize=None,
+):
+    lines = ['session = requests.Session()']
+    if pool_connections is not None or pool_maxsize is not None:
+        pool_arguments = []
+        if pool_connections is not None:
+            pool_arguments.append('pool_connections=%d' % pool_connections)
+        if pool_maxsize is not None:
+            pool_arguments.append('pool_maxsize=%d' % pool_maxsize)
+        lines.append('adapter = HTTPAdapter(%s)' % ', '.join(pool_arguments))
+        for scheme in ('http://', 'https://'):
+            lines.append(
+                'session.mount(%(quote_char)s%(scheme)s%(quote_char)s,'
+                ' adapter)' % {
+                    'quote_char': quote_char,
+                    'scheme': scheme,
+                },
+            )
+    return lines
+
+
+def _setup_render(
+    setup, oneline=False, quote_char=DEFAULT_QUOTE_CHAR, session=False,
+    pool_connections=None, pool_maxsize=None, stream_upload=False,
+    stdlib_imports=[],
+):
+    if not setup:
+        return ''
+    elif isinstance(setup, str):
+        return setup
+
+    imports = ['import requests']
+    if pool_connections is not None or pool_maxsize is not None:
+        imports.append('from requests.adapters import HTTPAdapter')
+    if stream_upload:
+        imports.append('from requests_toolbelt import MultipartEncoder')
+    blocks = [imports]
+    if stdlib_imports:
+        blocks.insert(0, stdlib_imports)
+    if session:
+        blocks.append(
+            _session_lines(
+                quote_char=quote_char,
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+            ),
+        )
+
+    if oneline:
+        return ''.join(
+            line + ';' for lines in blocks for line in lines
+        )
+    return ''.join('\n'.join(lines) + '\n\n' for lines in blocks)
+
+
+def _compress_imports(compress=None, content_type=None):
+    # modules of the standard library used building compressed bodies,
+    # sorted like isort does
+    if compress is None:
+        return []
+    imports = ['import gzip' if compress == 'gzip' else 'import zlib']
+    if content_type == 'application/json':
+        imports.append('import json')
+    elif content_type == 'application/x-www-form-urlencoded':
+        imports.append('from urllib.parse import urlencode')
+    return _sorted_imports(imports)
+
+
+def _sorted_imports(imports):
+    imports = set(imports)
+    return sorted(
+        line for line in imports if line.startswith('import ')
+    ) + sorted(line for line in imports if line.startswith('from '))
+
+
+def _compressed_body_doc(
+    compress, content_type, parameters, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, wrap=DEFAULT_WRAP, seed=None, locale=None,
+):
+    prefix = 'data=%s.compress(' % ('gzip' if compress == 'gzip' else 'zlib')
+    if content_type == 'text/plain':
+        body = [
+            str_definition(
+                lazy_value_by_parameter(
+                    parameters[0], seed=seed, locale=locale,
+                ),
+                quote_char=quote_char,
+                indent=indent + ' ' * len(prefix),
+                # room for the calls closed after the string
+                wrap=wrap - len('.encode()),'),
+            ),
+            '.encode()',
+        ]
+    elif content_type == 'application/json':
+        body = [
+            'json.dumps(',
+            value_doc(
+                lazy_json_body_by_parameters(
+                    parameters, seed=seed, locale=locale,
+                ),
+                indent=indent, indent_depth=1,
+                quote_char=quote_char, wrap=wrap,
+            ),
+            ').encode()',
+        ]
+    else:
+        body = [
+            'urlencode(',
+            dict_doc(
+                parameters_dict(parameters, seed=seed, locale=locale),
+                indent=indent, indent_depth=1,
+                quote_char=quote_char, wrap=wrap,
+            ),
+            ').encode()',
+        ]
+    return [prefix] + body + [')']
+
+
+def _validate_session(
+    session, pool_connections, pool_maxsize, setup=True, program=None,
+):
+    if program is not None and (
+        pool_connections is not None or pool_maxsize is not None
+    ):
+        raise ValueError(
+            '\'pool_connections\' and \'pool_maxsize\' are defined for the'
+            ' whole program, they can\'t be defined by requests',
+        )
+    if program is None and not session and (
+        pool_connections is not None or pool_maxsize is not None
+    ):
+        raise ValueError(
+            '\'pool_connections\' and \'pool_maxsize\' arguments'
+            ' require \'session=True\'',
+        )
+    if program is None and (not setup or isinstance(setup, str)) and (
+        pool_connections is not None or pool_maxsize is not None
+    ):
+        # the adapter is only mounted by the default initialization
+        raise ValueError(
+            '\'pool_connections\' and \'pool_maxsize\' arguments require'
+            ' the session created by the initialization snippet, pass'
+            ' \'setup=True\'',
+        )
+
+
+def _validate_chunk_size(chunk_size, kwargs={}, oneline=False):
+    if chunk_size is None:
+        return
+    if not isinstance(chunk_size, int) or isinstance(chunk_size, bool) or \
+            chunk_size < 1:
+        raise ValueError(
+            '\'chunk_size\' argument must be a positive integer, but \'%s\''
+            ' passed' % chunk_size,
+        )
+    if not kwargs.get('stream', True):
+        raise ValueError(
+            '\'chunk_size\' argument requires a streamed response, but'
+            ' \'stream=False\' passed',
+        )
+    if oneline:
+        # the loop reading the chunks is a compound statement, which can't
+        # follow other statements in the same line
+        raise ValueError(
+            '\'chunk_size\' argument can\'t be rendered in one line, but'
+            ' \'oneline=True\' passed',
+        )
+
+
+def _headers_doc(
+    headers, indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    wrap=DEFAULT_WRAP, program=None,
+):
+    headers_name = program.headers_name(headers) if program else None
+    if headers_name:
+        return 'headers=' + headers_name
+    return [
+        'headers=',
+        dict_doc(
+            headers, indent=indent, indent_depth=1,
+            quote_char=quote_char, wrap=wrap,
+        ),
+    ]
+
+
+def _call_render(
+    emitter, function, arguments, indent=DEFAULT_INDENT,
+    oneline=False, wrap=DEFAULT_WRAP, chunk_size=None,
+):
+    # the call is rendered in one line if fits in the wrap, in other case
+    # each argument is rendered in its own line
+    emitter.write_layout(
+        Group([function, bracket('(', arguments, ')', indent)]),
+        wrap=wrap,
+        flat=oneline,
+    )
+    if oneline:
+        emitter.write(';')
+
+    if chunk_size is not None:
+        # the content is read by chunks and the connection is released
+        # to the pool after
+        emitter.write(
+            '\nfor chunk in req.iter_content(chunk_size=%d):\n%s...\n'
+            'req.close()' % (chunk_size, indent),
+        )
+
+
+def _multipart_encoder_render(
+    emitter, name, parameters=[], files={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, oneline=False, wrap=DEFAULT_WRAP,
+    seed=None, locale=None,
+):
+    # multipart fields values must be strings
+    fields_pairs = []
+    for parameter in parameters:
+        key = lazy_name_by_parameter(parameter, seed=seed)
+        fields_pairs.append((key, str(
+            lazy_value_by_parameter(parameter, seed=seed, locale=locale),
+        )))
+    for key, value in files.items():
+        fields_pairs.append((
+            key,
+            file_doc(
+                value, indent=indent, quote_char=quote_char, wrap=wrap,
+                seed=seed, locale=locale,
+            ),
+        ))
+
+    # fields are defined by a list of pairs if a parameter and a file
+    # share the same name
+    names = [key for key, _ in fields_pairs]
+    fields_as_dict = len(set(names)) == len(names)
+    fields_items = []
+    for key, value in fields_pairs:
+        key_doc = '%(quote_char)s%(key)s%(quote_char)s' % {
+            'key': escape_by_quote(key, quote_char),
+            'quote_char': quote_char,
+        }
+        if isinstance(value, str):
+            value = str_definition(
+                value,
+                indent=(
+                    indent * 2 + ' ' * (len(key_doc) + 2)
+                    if fields_as_dict else indent * 3
+                ),
+                quote_char=quote_char, wrap=wrap,
+            )
+        if fields_as_dict:
+            fields_items.append([key_doc, ': ', value])
+        else:
+            fields_items.append(
+                Group(bracket('(', [key_doc, value], ')', indent)),
+            )
+
+    emitter.write_layout(
+        Group([
+            '%s = MultipartEncoder' % name,
+            bracket(
+                '(',
+                [[
+                    'fields=',
+                    bracket(
+                        '{' if fields_as_dict else '[',
+                        fields_items,
+                        '}' if fields_as_dict else ']',
+                        indent,
+                    ),
+                ]],
+                ')',
+                indent,
+            ),
+        ]),
+        wrap=wrap,
+        flat=oneline,
+    )
+    emitter.write(';' if oneline else '\n')
+
+
 def get(
     url, parameters=[], headers={}, indent=DEFAULT_INDENT,
     quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
     oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
-    **kwargs,
+    session=False, pool_connections=None, pool_maxsize=None,
+    chunk_size=None, measure=False, _emitter=None, _program=None, **kwargs,
 ):
     '''Parameters are passed using
     [``requests.get``](https://requests.readthedocs.io/en/api/#requests.get)
@@ -46,186 +340,209 @@ def get(
 
     requests.get('<url>'...
     ```
+
+    Passing ``session=True``, the request is performed by a
+    ``requests.Session`` created in the initialization snippet, which reuses
+    the connections if the request is performed multiple times. The pool of
+    connections of the session can be customized with ``pool_connections``
+    and ``pool_maxsize`` arguments, which mount an ``HTTPAdapter`` in the
+    initialization snippet, so these can't be passed with a custom or
+    without ``setup``:
+
+    ```python
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    req = session.get('<url>'...
+    ```
+
+    Passing ``chunk_size``, the response is streamed passing
+    ``stream=True``, so its content is not loaded in memory when the request
+    is performed. It's read by chunks of that size using ``iter_content``
+    instead and the connection is released to the pool after:
+
+    ```python
+    import requests
+
+    req = requests.get('<url>', stream=True)
+    for chunk in req.iter_content(chunk_size=8192):
+        ...
+    req.close()
+    ```
+
+    The loop reading the chunks can't follow other statements in the same
+    line, so ``chunk_size`` can't be passed with ``oneline``.
+
+    Passing ``measure=True``, the duration of the request is measured by
+    ``time.perf_counter`` and printed in milliseconds. Passing an integer,
+    the request is performed that number of times and the 50th, 90th and
+    99th percentiles of the durations are printed:
+
+    ```python
+    import time
+
+    import requests
+
+    timings = []
+    for _ in range(100):
+        start = time.perf_counter()
+        req = requests.get('<url>')
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    for percentile in (50, 90, 99):
+        timing = timings[len(timings) * percentile // 100]
+        print('p%d: %.2f ms' % (percentile, timing))
+    ```
     '''
-    _oneline = oneline
-    response = ''
-
-    # initialization
-    setup_length = 0
-    if setup:
-        if isinstance(setup, str):
-            response += setup
-        else:
-            response += (
-                'import requests%(separator)s'
-                '%(newline)s%(newline)s'
-            ) % {
-                'separator': ';' if oneline else '',
-                'newline': '\n' if not oneline else '',
-            }
-        if oneline:
-            setup_length += len(response)
-
-    # url length
-    url_length = len(url) + 21  # 'req = requests.get(' (19) + '' (2)
-
-    # parameters length
-    parameters_line_length = 0
-    if parameters:
-        parameters_keys = OrderedDict({})
-        parameters_line_length = 9  # 'params={}'
-        for parameter in parameters:
-            name = escape_by_quote(
-                lazy_name_by_parameter(parameter, seed=seed),
-                quote_char,
-            )
-            value = str_definition(
-                lazy_value_by_parameter(parameter, seed=seed, locale=locale),
-                quote_char=quote_char,
-                indent=indent + (' ' * (8 + len(name))),
-                wrap=wrap,
-            )
-            parameters_keys[name] = value
-            parameters_line_length += len(name) + 4 + len(value)
-        parameters_line_length += len(parameters) - 1  # commas except last
-        if headers or kwargs:
-            parameters_line_length += 2  # ', '
+    _validate_session(
+        session, pool_connections, pool_maxsize, setup=setup,
+        program=_program,
+    )
+    _validate_chunk_size(chunk_size, kwargs, oneline=oneline)
+    validate_measure(measure, program=_program)
+    if chunk_size is not None:
+        kwargs = dict(kwargs, stream=True)
+    emitter = Emitter() if _emitter is None else _emitter
+    emitter.write(
+        _setup_render(
+            setup, oneline=oneline, quote_char=quote_char, session=session,
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            stdlib_imports=['import time'] if measure else [],
+        ),
+    )
 
-    headers_line_length = 0
-    if headers:
-        headers_keys = {} if not isinstance(headers, OrderedDict) \
-            else OrderedDict({})
-        headers_line_length += 10  # headers={}
-        for key, value in headers.items():
-            escaped_key = escape_by_quote(key, quote_char)
-            escaped_value = escape_by_quote(value, quote_char)
-            headers_keys[escaped_key] = escaped_value
-            # 2 is ': '
-            headers_line_length += \
-                len(quote_char) * 4 + 2 + len(escaped_key) + len(escaped_value)
-        headers_line_length += len(headers) - 1  # commas except last
-        if kwargs:
-            headers_line_length += 2  # ', '
-
-    kwargs_line_length = 0
-    if kwargs:
-        kwargs_line_length = 2
-        for key, value in kwargs.items():
-            kwargs_line_length += len(key) + len(str(value))
-            if isinstance(value, str):
-                kwargs_line_length += 2
-        kwargs_line_length += len(kwargs) - 1  # commas except last
-
-    # oneliner by wrapping
-    #   here + 1 is function call end ')' and - 1 is the character wrapping,
-    #   so both are negated
-    if setup_length + url_length + parameters_line_length + \
-            headers_line_length + kwargs_line_length < wrap:
-        oneline = True
+    # the request is rendered inside a loop if performed multiple times
+    output = emitter if not measure else Emitter()
+    if measure and measure is not True:
+        wrap -= len(indent)
 
     # url
-    response += (
-        'req = requests.get(%(newline)s%(indent)s%(url)s%(newline2)s'
-        '%(comma)s%(space)s%(newline3)s'
-    ) % {
-        'url': (
-            '{quote_char}{url}{quote_char}'.format(
-                url=url,
-                quote_char=quote_char,
-            )
-        ) if oneline else str_definition(
-            url,
-            indent=indent,
-            quote_char=quote_char,
-            wrap=wrap,
-        ),
-        'indent': indent if not oneline else '',
-        'newline': '\n' if not oneline else '',
-        'newline2': '\n' if not oneline and (
-            not headers and not parameters and not kwargs
-        ) else '',
-        'comma': ',' if headers or parameters or kwargs else '',
-        'space': ' ' if oneline and (parameters or headers or kwargs) else '',
-        'newline3': '\n' if not oneline and (
-            headers or parameters or kwargs
-        ) else '',
-    }
+    arguments = [
+        url_doc(url, indent=indent, quote_char=quote_char, wrap=wrap),
+    ]
 
-    # parameters render
+    # parameters
     if parameters:
-        response += '{indent}params={{{newline}'.format(
-            indent=indent if not oneline else '',
-            newline='\n' if not oneline else '',
-        )
-        for i, (pname, pvalue) in enumerate(parameters_keys.items()):
-            response += (
-                '%(indent)s%(quote_char)s%(parameter_name)s'
-                '%(quote_char)s: %(value)s%(comma)s'
-            ) % {
-                'parameter_name': pname,
-                'indent': indent * 2 if not oneline else '',
-                'quote_char': quote_char,
-                'value': pvalue,
-                'comma': ',' if i < len(parameters) - 1 else '',
-            }
-            response += '\n' if not oneline else ''
-
-        response += '{indent}}}{comma}{newline}'.format(
-            indent=indent if not oneline else '',
-            comma=',' if (headers or kwargs) else '',
-            newline='\n' if not oneline else (
-                '' if (not headers and not kwargs) else ' '
+        arguments.append([
+            'params=',
+            dict_doc(
+                parameters_dict(parameters, seed=seed, locale=locale),
+                indent=indent, indent_depth=1,
+                quote_char=quote_char, wrap=wrap,
             ),
-        )
+        ])
 
-    # headers render
+    # headers
     if headers:
-        response += '{header}{comma}{newline}'.format(
-            header=kwarg_definition_dict_valued(
-                'headers', headers_keys,
-                indent=indent if not oneline else '',
-                quote_char=quote_char,
-                newline='\n' if not oneline else '',
-                _escape_keys=False, _escape_values=False,
-            ),
-            newline='\n' if not oneline else (
-                '' if not kwargs else ' '
+        arguments.append(
+            _headers_doc(
+                headers, indent=indent, quote_char=quote_char,
+                wrap=wrap, program=_program,
             ),
-            comma=',' if kwargs else '',
         )
 
-    # kwargs render
-    if kwargs:
-        for i, (key, value) in enumerate(kwargs.items()):
-            response += '{indent}{repr_kwarg}{comma}{newline}'.format(
-                indent='' if oneline or isinstance(value, dict) else indent,
-                repr_kwarg=kwarg_definition(
-                    key,
-                    value,
-                    indent='' if oneline else indent,
-                    quote_char=quote_char,
-                    wrap=wrap,
-                ),
-                comma=',' if i < len(kwargs) - 1 else '',
-                newline='\n' if not oneline else (
-                    ' ' if i < len(kwargs) - 1 else ''
-                ),
-            )
+    # kwargs
+    for key, value in kwargs.items():
+        arguments.append(
+            kwarg_doc(
+                key, value, indent=indent,
+                quote_char=quote_char, wrap=wrap,
+            ),
+        )
 
-    response += '){separator}'.format(separator=';' if _oneline else '')
+    _call_render(
+        output,
+        'req = %s.get' % (
+            'session' if session or _program else 'requests'
+        ),
+        arguments,
+        indent=indent, oneline=oneline, wrap=wrap, chunk_size=chunk_size,
+    )
+    if measure:
+        emitter.write(
+            measured_statements(
+                output.getvalue(), measure, indent=indent,
+                quote_char=quote_char, oneline=oneline,
+            ),
+        )
 
     if teardown:
-        response += str(teardown)
-    return response
+        emitter.write(str(teardown))
+    return emitter.getvalue()
 
 
 def post(
     url, parameters=[], files={}, headers={}, indent=DEFAULT_INDENT,
     quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
     oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
-    **kwargs,
+    session=False, pool_connections=None, pool_maxsize=None,
+    stream_upload=False, chunk_size=None, compress=None, measure=False,
+    _emitter=None, _program=None, **kwargs,
 ):
-    '''POST method code generator for Python requests library.'''
+    '''POST method code generator for Python requests library.
+
+    The ``multipart/form-data`` bodies built by ``requests`` are loaded
+    entirely in memory before sending them. Passing ``stream_upload=True``,
+    they are built by a
+    [``MultipartEncoder``](https://toolbelt.readthedocs.io/en/latest/uploading-data.html)
+    of the ``requests-toolbelt`` package instead, which reads the files by
+    chunks while the body is sent, computing the ``Content-Length`` and the
+    boundary of the body in advance:
+
+    ```python
+    import requests
+    from requests_toolbelt import MultipartEncoder
+
+    encoder = MultipartEncoder(
+        fields={
+            'foo': 'bar',
+            'file': ('<path>', open('<path>', 'rb'), 'text/plain')
+        }
+    )
+    req = requests.post(
+        '<url>',
+        data=encoder,
+        headers={
+            'Content-Type': encoder.content_type
+        }
+    )
+    ```
+
+    Other bodies are built from parameters only, so they are sent as
+    usual. Responses can be streamed passing ``chunk_size`` and the request
+    can be measured passing ``measure``, like the [GET method
+    generator](#get) does. The encoders of streamed uploads are created
+    inside the measurement.
+
+    Those bodies can be compressed passing ``compress='gzip'`` or
+    ``compress='deflate'``, which encodes them using the ``gzip`` or
+    ``zlib`` modules and defines the ``Content-Encoding`` header. Responses
+    are decompressed by ``requests``, which accepts compressed content by
+    default:
+
+    ```python
+    import gzip
+    import json
+
+    import requests
+
+    req = requests.post(
+        '<url>',
+        data=gzip.compress(json.dumps({
+            'foo': 'bar'
+        }).encode()),
+        headers={
+            'Content-Type': 'application/json',
+            'Content-Encoding': 'gzip'
+        }
+    )
+    ```
+    '''
     # There are 4 possibilities of arguments build since we allow 4 forms
     #   of doing POST requests, depends on 'Content-Type' header content
     #   and the definition of 'files' optional argument. As default,
@@ -235,401 +552,236 @@ def post(
     #   - Content-Type: 'application/x-www-form-urlencoded' -> data={}
     #   - Content-Type: 'text/plain' -> data=''
     #   - Content-Type: 'application/json' -> json={}
-    _oneline = oneline
-    response = ''
-
-    # initialization
-    setup_length = 0
-    if setup:
-        if isinstance(setup, str):
-            response += setup
-        else:
-            response += (
-                'import requests%(separator)s'
-                '%(newline)s%(newline)s'
-            ) % {
-                'separator': ';' if oneline else '',
-                'newline': '\n' if not oneline else '',
-            }
-        if oneline:
-            setup_length += len(response)
-
-    # url length
-    url_length = len(url) + 22  # 'req = requests.post(' (20) + '' (2)
-
-    # headers length and content-type discovering
-    if files:
-        content_type = 'multipart/form-data'
-        _content_type_found = True
-    else:
-        content_type = 'application/x-www-form-urlencoded'
-        _content_type_found = False
-
-    headers_line_length = 0
-    if headers:
-        headers_keys = {} if not isinstance(headers, OrderedDict) \
-            else OrderedDict({})
-        headers_line_length += 10  # headers={}
-        for key, value in headers.items():
-            escaped_key = escape_by_quote(key, quote_char)
-            escaped_value = escape_by_quote(value, quote_char)
-            headers_keys[escaped_key] = escaped_value
-            # 2 is ': '
-            headers_line_length += \
-                len(quote_char) * 4 + 2 + len(escaped_key) + len(escaped_value)
-            if not _content_type_found:
-                _key_lower = str(key).lower()
-                if _key_lower == 'content-type':
-                    if 'text/plain' in value:
-                        content_type = 'text/plain'
-                        _content_type_found = True
-                    elif 'application/json' in value:
-                        content_type = 'application/json'
-                        _content_type_found = True
-        headers_line_length += len(headers) - 1  # commas except last
-        if kwargs:
-            headers_line_length += 2  # ', '
+    _validate_session(
+        session, pool_connections, pool_maxsize, setup=setup,
+        program=_program,
+    )
+    _validate_chunk_size(chunk_size, kwargs, oneline=oneline)
+    validate_measure(measure, program=_program)
+    if chunk_size is not None:
+        kwargs = dict(kwargs, stream=True)
+    emitter = Emitter() if _emitter is None else _emitter
+
+    content_type = post_content_type(headers, files)
 
     if content_type == 'text/plain' and len(parameters) != 1:
         raise_post_text_plain_n_parameters_not_1(len(parameters))
 
-    # data/json length
-    parameters_line_length = 0
-    if parameters:
-        parameters_keys = OrderedDict({})
-
-        # length depends on kwarg used in the request
-        parameters_line_length = {
-            'multipart/form-data': 0,                # files={}
-            'application/json': 7,                   # json={}
-            'application/x-www-form-urlencoded': 7,  # data={}
-        }.get(content_type, 5)  # (text/*)             data=
-
-        for parameter in parameters:
-            if content_type == 'text/plain':
-                name = ''
-            else:
-                name = escape_by_quote(
-                    lazy_name_by_parameter(parameter, seed=seed),
-                    quote_char,
-                )
+    validate_compress(compress, content_type)
+    if not parameters:
+        # requests without body are not compressed
+        compress = None
+
+    stream_upload = stream_upload and content_type == 'multipart/form-data'
+    emitter.write(
+        _setup_render(
+            setup, oneline=oneline, quote_char=quote_char, session=session,
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            stream_upload=stream_upload,
+            stdlib_imports=_sorted_imports(
+                _compress_imports(compress, content_type) +
+                (['import time'] if measure else []),
+            ),
+        ),
+    )
 
-            # JSON must accepts other data types than string
-            _param_value = parameter.get('value')
-            if content_type == 'application/json' and isinstance(
-                    _param_value, (int, float, bool),
-            ):
-                value = _param_value
-                parameters_line_length += len(name) + 4 + len(str(value))
-            else:
-                if content_type == 'text/plain':
-                    _param_value_def_indent = indent + (' ' * 5)
-                else:
-                    _param_value_def_indent = indent + (' ' * (8 + len(name)))
-                value = str_definition(
-                    lazy_value_by_parameter(
-                        parameter,
-                        seed=seed,
-                        locale=locale,
-                    ),
-                    quote_char=quote_char,
-                    indent=_param_value_def_indent,
-                    wrap=wrap,
-                )
-                parameters_line_length += len(name) + 4 + len(value)
-
-            if content_type == 'text/plain':
-                parameters_line_length += len(value) + 2
-            elif content_type != 'application/json':
-                parameters_line_length += len(name) + 4 + len(value)
-            parameters_keys[name] = value
-        parameters_line_length += len(parameters) - 1  # commas except last
-        if files or headers or kwargs:
-            parameters_line_length += 2  # ', '
-
-    # files length
-    files_line_length = 0
-    if files:
-        files_line_length = 8  # files={}
-        files_keys = {} if not isinstance(files, OrderedDict) \
-            else OrderedDict({})
-        for key, value in files.items():
-            escaped_key = escape_by_quote(key, quote_char)
-            files_line_length += len(escaped_key) + 4
-
-            files_keys[escaped_key] = []
-
-            if isinstance(value, str) or value is None:
-                # random filepath
-                if value is None:
-                    value = lazy_value_by_parameter(
-                        {
-                            'name': '',
-                            'faker': 'faker.providers.file::file_path',
-                        },
-                        seed=seed,
-                        locale=locale,
-                    )
-
-                escaped_value = escape_by_quote(value, quote_char)
-                files_keys[escaped_key].append(escaped_value)
-
-            else:  # iterable
-                if len(value) > 2:
-                    # file headers
-                    _fheaders = {}
-                    for hkey, hvalue in value[2].items():
-                        _escaped_key = escape_by_quote(hkey, quote_char)
-                        files_line_length += len(_escaped_key) + 4
-
-                        _escaped_value = escape_by_quote(hvalue, quote_char)
-                        files_line_length += len(_escaped_value) + 2
-
-                        _fheaders[_escaped_key] = _escaped_value
-                    # commas except last + prev ', '
-                    files_line_length += len(value[2]) + 2
-                    files_keys[escaped_key].append(_fheaders)
-                if len(value) > 1:
-                    # file content type
-                    _escaped_value = escape_by_quote(value[1], quote_char)
-                    files_line_length += len(_escaped_value) + 4  # prev ', '
-                    files_keys[escaped_key].insert(0, _escaped_value)
-
-                # random filepath
-                if value[0] is None:
-                    value = list(value)
-                    value[0] = lazy_value_by_parameter(
-                        {
-                            'name': '',
-                            'faker': 'faker.providers.file::file_path',
-                        },
-                        seed=seed,
-                        locale=locale,
-                    )
-                escaped_value = escape_by_quote(value[0], quote_char)
-                files_keys[escaped_key].insert(0, escaped_value)
-
-            _filepath = value if isinstance(value, str) else value[0]
-            _indent = indent * 4
-            _filepath_def = str_definition(
-                _filepath,
-                indent=_indent,
-                quote_char=quote_char,
-                wrap=wrap,
-            )
-            _open_file_multiline = len(_filepath_def) + len(_indent) > wrap
-            _open_file_string = (
-                'open(%(newline)s%(indent1)s%(value)s,'
-                '%(newline)s%(indent2)s%(quote_char)srb'
-                '%(quote_char)s%(newline)s%(indent3)s)'
-            ) % {
-                'quote_char': quote_char,
-                'value': _filepath_def,
-                'newline': '\n' if _open_file_multiline else '',
-                'indent1': _indent if _open_file_multiline else '',
-                'indent2': _indent if _open_file_multiline else ' ',
-                'indent3': indent * 3 if _open_file_multiline else '',
-            }
-            files_keys[escaped_key].insert(1, _open_file_string)
-
-            # 2 filename quotes + () of tuple + , open('', 'rb')
-            files_line_length += len(escaped_value) * 2 + 20
-
-        files_line_length += len(parameters) - 1  # commas except last
-
-    kwargs_line_length = 0
-    if kwargs:
-        kwargs_line_length = 2
-        for key, value in kwargs.items():
-            kwargs_line_length += len(key) + len(str(value))
-            if isinstance(value, str):
-                kwargs_line_length += 2
-        kwargs_line_length += len(kwargs) - 1  # commas except last
-
-    # oneliner by wrapping
-    #   here + 1 is function call end ')' and - 1 is the character wrapping,
-    #   so both are negated
-    if setup_length + url_length + parameters_line_length + \
-            headers_line_length + files_line_length + \
-            kwargs_line_length < wrap:
-        oneline = True
+    # the request is rendered inside a loop if performed multiple times
+    output = emitter if not measure else Emitter()
+    if measure and measure is not True:
+        wrap -= len(indent)
 
     # url
-    response += (
-        'req = requests.post(%(newline)s%(indent)s%(url)s%(newline2)s'
-        '%(comma)s%(space)s%(newline3)s'
-    ) % {
-        'url': (
-            '{quote_char}{url}{quote_char}'.format(
-                url=url, quote_char=quote_char,
-            )
-        ) if oneline else str_definition(
-            url,
-            indent=indent,
-            quote_char=quote_char,
-            wrap=wrap,
-        ),
-        'indent': indent if not oneline else '',
-        'newline': '\n' if not oneline else '',
-        'newline2': '\n' if not oneline and (
-            not headers and not files and not parameters and not kwargs
-        ) else '',
-        'comma': ',' if (files or headers or parameters or kwargs) else '',
-        'space': ' ' if oneline and (
-            files or parameters or headers or kwargs
-        ) else '',
-        'newline3': '\n' if not oneline and (
-            files or parameters or headers or kwargs
-        ) else '',
-    }
+    arguments = [
+        url_doc(url, indent=indent, quote_char=quote_char, wrap=wrap),
+    ]
+
+    if stream_upload:
+        # the encoder is defined before the request and its content type,
+        # which includes the boundary, is sent in the headers
+        encoder_name = _program.variable_name('encoder') if _program \
+            else 'encoder'
+        _multipart_encoder_render(
+            output, encoder_name, parameters=parameters, files=files,
+            indent=indent, quote_char=quote_char, oneline=oneline,
+            wrap=wrap, seed=seed, locale=locale,
+        )
+        arguments.append('data=' + encoder_name)
+
+        content_type_header = Identifier('%s.content_type' % encoder_name)
+        headers = OrderedDict(
+            (
+                name,
+                content_type_header
+                if str(name).lower() == 'content-type' else value,
+            ) for name, value in headers.items()
+        )
+        if content_type_header not in headers.values():
+            headers['Content-Type'] = content_type_header
+        # files and parameters are already defined by the encoder
+        parameters, files = [], {}
+
+    if compress:
+        arguments.append(
+            _compressed_body_doc(
+                compress, content_type, parameters, indent=indent,
+                quote_char=quote_char, wrap=wrap, seed=seed, locale=locale,
+            ),
+        )
 
-    # parameters render
+        # the body is sent as bytes, so the content type of forms must be
+        # defined explicitly
+        headers = OrderedDict(headers)
+        if content_type == 'application/x-www-form-urlencoded' and not any(
+            str(name).lower() == 'content-type' for name in headers
+        ):
+            headers['Content-Type'] = content_type
+        headers['Content-Encoding'] = compress
+        parameters = []
+
+    # data/json
     if parameters:
-        response += '{indent}{kwarg_name}='.format(
-            indent=indent if not oneline else '',
-            kwarg_name='json' if content_type == 'application/json'
-            else 'data',
+        arguments.append(
+            body_doc(
+                content_type, parameters, indent=indent,
+                quote_char=quote_char, wrap=wrap, seed=seed, locale=locale,
+            ),
         )
-        if content_type == 'text/plain':
-            response += '{value}{comma}{newline}'.format(
-                value=parameters_keys[''],
-                comma=',' if (
-                    not oneline or files or headers or kwargs
-                ) else '',
-                newline='\n' if not oneline else ' ',
-            )
-        else:
-            response += '{{{newline}'.format(
-                newline='\n' if not oneline else '',
-            )
-            for i, (pname, pvalue) in enumerate(parameters_keys.items()):
-                response += (
-                    '%(indent)s%(quote_char)s%(parameter_name)s'
-                    '%(quote_char)s: %(value)s%(comma)s'
-                ) % {
-                    'parameter_name': pname,
-                    'indent': indent * 2 if not oneline else '',
-                    'quote_char': quote_char,
-                    'value': pvalue,
-                    'comma': ',' if i < len(parameters) - 1 else '',
-                }
-                response += '\n' if not oneline else ''
-
-            response += '{indent}}}{comma}{newline}'.format(
-                indent=indent if not oneline else '',
-                comma=',' if (files or headers or kwargs) else '',
-                newline='\n' if not oneline else (
-                    '' if (not headers and not files and not kwargs) else ' '
-                ),
-            )
 
-    # files render
+    # files
     if files:
-        response += '{indent}files={{{newline}'.format(
-            indent=indent if not oneline else '',
-            newline='\n' if not oneline else '',
+        arguments.append(
+            files_doc(
+                files, indent=indent, quote_char=quote_char, wrap=wrap,
+                seed=seed, locale=locale,
+            ),
         )
 
-        for i, (fkey, fvalue) in enumerate(files_keys.items()):
-            _value = (
-                '(%(newline1)s%(indent)s%(fpath)s,%(newline2)s'
-                '%(indent)s%(open_file_string)s'
-            ) % {
-                'newline1': '\n' if not oneline else '',
-                'newline2': '\n' if not oneline else ' ',
-                'indent': indent * 3 if not oneline else '',
-                'fpath': str_definition(
-                    fvalue[0],
-                    quote_char=quote_char,
-                    indent=indent * 3,
-                    wrap=wrap,
-                ),
-                'open_file_string': fvalue[1],
-            }
-            if len(fvalue) > 2:
-                _value += ',{newline}{indent}{content_type}'.format(
-                    content_type=str_definition(
-                        fvalue[2],
-                        quote_char=quote_char,
-                        indent=indent * 3,
-                        wrap=wrap,
-                    ),
-                    newline='\n' if not oneline else '',
-                    indent=indent * 3 if not oneline else ' ',
-                )
-            if len(fvalue) > 3:
-                _value += ',{newline}{indent}{headers}'.format(
-                    headers=dict_definition(
-                        fvalue[3],
-                        indent=indent if not oneline else '',
-                        indent_depth=3,
-                        quote_char=quote_char,
-                        newline='\n' if not oneline else '',
-                        _escape_keys=False, _escape_values=False,
-                    ),
-                    newline='\n' if not oneline else '',
-                    indent=indent * 3 if not oneline else ' ',
-                )
-            _value += '{newline}{indent})'.format(
-                newline='' if oneline else '\n',
-                indent='' if oneline else indent * 2,
-            )
-            response += (
-                '%(indent)s%(quote_char)s%(key)s'
-                '%(quote_char)s: %(value)s%(comma)s'
-            ) % {
-                'key': fkey,
-                'indent': indent * 2 if not oneline else '',
-                'quote_char': quote_char,
-                'value': _value,
-                'comma': ',' if i < len(files_keys) - 1 else '',
-            }
-            response += '\n' if not oneline else ''
-
-        response += '{indent}}}{comma}{newline}'.format(
-            indent=indent if not oneline else '',
-            comma=',' if (headers or kwargs) else '',
-            newline='\n' if not oneline else (
-                ' ' if (headers or kwargs) else ''
+    # headers
+    if headers:
+        arguments.append(
+            _headers_doc(
+                headers, indent=indent, quote_char=quote_char,
+                wrap=wrap, program=_program,
             ),
         )
 
-    if headers:
-        response += '{headers}{comma}{newline}'.format(
-            headers=kwarg_definition_dict_valued(
-                'headers', headers_keys,
-                indent=indent if not oneline else '',
-                quote_char=quote_char,
-                newline='\n' if not oneline else '',
-                _escape_keys=False, _escape_values=False,
+    # kwargs
+    for key, value in kwargs.items():
+        arguments.append(
+            kwarg_doc(
+                key, value, indent=indent,
+                quote_char=quote_char, wrap=wrap,
             ),
-            newline='\n' if not oneline else (
-                '' if not kwargs else ' '
+        )
+
+    _call_render(
+        output,
+        'req = %s.post' % (
+            'session' if session or _program else 'requests'
+        ),
+        arguments,
+        indent=indent, oneline=oneline, wrap=wrap, chunk_size=chunk_size,
+    )
+    if measure:
+        emitter.write(
+            measured_statements(
+                output.getvalue(), measure, indent=indent,
+                quote_char=quote_char, oneline=oneline,
             ),
-            comma=',' if kwargs else '',
         )
 
-    # kwargs render
-    if kwargs:
-        for i, (key, value) in enumerate(kwargs.items()):
-            response += '{indent}{repr_kwarg}{comma}{newline}'.format(
-                indent='' if oneline or isinstance(value, dict) else indent,
-                repr_kwarg=kwarg_definition(
-                    key,
-                    value,
-                    indent='' if oneline else indent,
-                    indent_depth=1,
-                    quote_char=quote_char,
-                    wrap=wrap,
-                ),
-                comma=',' if i < len(kwargs) - 1 else '',
-                newline='\n' if not oneline else (
-                    ' ' if i < len(kwargs) - 1 else ''
+    if teardown:
+        emitter.write(str(teardown))
+    return emitter.getvalue()
+
+
+def program(
+    program, indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    setup=True, teardown=None, wrap=DEFAULT_WRAP, pool_connections=None,
+    pool_maxsize=None, _emitter=None,
+):
+    '''Requests of programs are performed by a shared
+    [``requests.Session``](https://requests.readthedocs.io/en/latest/user/advanced/#session-objects),
+    which reuses the connections to the same hosts. The ``setup`` snippet is
+    rendered only once, before the constants of headers and the session:
+
+    ```python
+    import requests
+
+    HEADERS_1 = {
+        'Accept': 'application/json'
+    }
+
+    session = requests.Session()
+
+    req = session.get('<url>', headers=HEADERS_1)
+    ...
+    ```
+
+    The connections pool of the session, configured by ``pool_connections``
+    and ``pool_maxsize``, is shared by all the requests, so these arguments
+    are defined for the whole program and can't be defined by requests.
+    '''
+    emitter = Emitter() if _emitter is None else _emitter
+    emitter.write(
+        _setup_render(
+            setup, pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            stream_upload=any(
+                kwargs.get('stream_upload') and post_content_type(
+                    kwargs.get('headers', {}), kwargs.get('files', {}),
+                ) == 'multipart/form-data'
+                for _, kwargs in program.requests
+            ),
+            stdlib_imports=_sorted_imports(
+                line for _, kwargs in program.requests
+                if kwargs.get('parameters')
+                for line in _compress_imports(
+                    kwargs.get('compress'),
+                    post_content_type(
+                        kwargs.get('headers', {}), kwargs.get('files', {}),
+                    ),
+                )
+            ),
+        ),
+    )
+
+    escape_quote_func = escape_quote_func_by_quote_char(quote_char)
+    for name, headers in program.headers_constants:
+        items = []
+        for key, value in headers.items():
+            _key = escape_quote_func(key)
+            items.append([
+                '%(quote_char)s%(key)s%(quote_char)s: ' % {
+                    'key': _key,
+                    'quote_char': quote_char,
+                },
+                str_definition(
+                    value, indent=indent + ' ' * (len(_key) + 4),
+                    quote_char=quote_char, wrap=wrap,
                 ),
-            )
+            ])
+        emitter.write_layout(
+            Group([name + ' = ', bracket('{', items, '}', indent)]),
+            wrap=wrap,
+        )
+        emitter.write('\n\n')
 
-    response += '){separator}'.format(separator=';' if _oneline else '')
+    emitter.write(
+        '\n'.join(
+            _session_lines(
+                quote_char=quote_char, pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+            ),
+        ) + '\n\n',
+    )
+    for func, kwargs in program.requests:
+        func(
+            indent=indent, quote_char=quote_char, setup=False, wrap=wrap,
+            _emitter=emitter, _program=program, **kwargs,
+        )
+        emitter.write('\n')
 
     if teardown:
-        response += str(teardown)
-    return response
+        emitter.write(str(teardown))
+    return emitter.getvalue()
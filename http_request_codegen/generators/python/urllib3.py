@@ -0,0 +1,411 @@
+'''Python urllib3 code snippets generator.'''
+
+from urllib.parse import urlencode
+
+from http_request_codegen.generators.python._utils import (
+    DEFAULT_INDENT,
+    DEFAULT_QUOTE_CHAR,
+    DEFAULT_WRAP,
+    common_arguments_docs,
+    dict_doc,
+    escape_by_quote,
+    measured_statements,
+    parameters_dict,
+    post_content_type,
+    str_definition,
+    value_doc,
+)
+from http_request_codegen.hrc_emitter import Emitter
+from http_request_codegen.hrc_exceptions import (
+    raise_post_text_plain_n_parameters_not_1,
+)
+from http_request_codegen.hrc_http import validate_measure
+from http_request_codegen.hrc_layout import Group, bracket
+from http_request_codegen.hrc_valuer import (
+    lazy_json_body_by_parameters,
+    lazy_value_by_parameter,
+)
+
+
+def _pool_manager_line(num_pools=None, maxsize=None):
+    pool_arguments = []
+    if num_pools is not None:
+        pool_arguments.append('num_pools=%d' % num_pools)
+    if maxsize is not None:
+        pool_arguments.append('maxsize=%d' % maxsize)
+    return 'http = urllib3.PoolManager(%s)' % ', '.join(pool_arguments)
+
+
+def _setup_render(
+    setup, oneline=False, num_pools=None, maxsize=None, json=False,
+    measure=False,
+):
+    if not setup:
+        return ''
+    elif isinstance(setup, str):
+        return setup
+
+    blocks = [['import urllib3'], [_pool_manager_line(num_pools, maxsize)]]
+    stdlib_imports = []
+    if json:
+        stdlib_imports.append('import json')
+    if measure:
+        stdlib_imports.append('import time')
+    if stdlib_imports:
+        blocks.insert(0, stdlib_imports)
+
+    if oneline:
+        return ''.join(
+            line + ';' for lines in blocks for line in lines
+        )
+    return ''.join('\n'.join(lines) + '\n\n' for lines in blocks)
+
+
+def _method_doc(method, quote_char=DEFAULT_QUOTE_CHAR):
+    return '%(quote_char)s%(method)s%(quote_char)s' % {
+        'method': method,
+        'quote_char': quote_char,
+    }
+
+
+def _request_render(
+    emitter, arguments, indent=DEFAULT_INDENT, quote_char=DEFAULT_QUOTE_CHAR,
+    oneline=False, wrap=DEFAULT_WRAP, preload_content=True, measure=False,
+):
+    if measure:
+        # the request is rendered inside the measurement
+        output = Emitter()
+        _request_render(
+            output, arguments, indent=indent, oneline=oneline, wrap=wrap,
+            preload_content=preload_content,
+        )
+        emitter.write(
+            measured_statements(
+                output.getvalue(), measure, indent=indent,
+                quote_char=quote_char, oneline=oneline,
+            ),
+        )
+        return
+
+    if not preload_content:
+        arguments.append('preload_content=False')
+
+    # the call is rendered in one line if fits in the wrap, in other case
+    # each argument is rendered in its own line
+    emitter.write_layout(
+        Group(['req = http.request', bracket('(', arguments, ')', indent)]),
+        wrap=wrap,
+        flat=oneline,
+    )
+    if oneline:
+        emitter.write(';')
+
+    if not preload_content:
+        # the content is read by chunks and the connection is released
+        # to the pool after
+        emitter.write(
+            '\nfor chunk in req.stream():\n%s...\nreq.release_conn()' % indent,
+        )
+
+
+def _validate_pool(setup, num_pools=None, maxsize=None):
+    # the pool manager is only created by the default initialization
+    if not setup or isinstance(setup, str):
+        pool_arguments = (('num_pools', num_pools), ('maxsize', maxsize))
+        for argument, value in pool_arguments:
+            if value is not None:
+                raise ValueError(
+                    (
+                        '\'%s\' argument requires the pool manager created'
+                        ' by the initialization snippet, pass \'setup=True\''
+                    ) % argument,
+                )
+
+
+def _validate_preload_content(preload_content, oneline=False):
+    if not isinstance(preload_content, bool):
+        raise TypeError(
+            '\'preload_content\' argument must be a boolean, but \'%s\''
+            ' passed' % type(preload_content).__name__,
+        )
+    if not preload_content and oneline:
+        # the loop reading the chunks is a compound statement, which can't
+        # follow other statements in the same line
+        raise ValueError(
+            '\'preload_content=False\' can\'t be rendered in one line, but'
+            ' \'oneline=True\' passed',
+        )
+
+
+def get(
+    url, parameters=[], headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    num_pools=None, maxsize=None, preload_content=True, measure=False,
+    _emitter=None, **kwargs,
+):
+    '''The request is performed by an
+    [``urllib3.PoolManager``](https://urllib3.readthedocs.io/en/stable/reference/urllib3.poolmanager.html)
+    created in the initialization snippet, whose number of pools and
+    connections by pool can be customized with the ``num_pools`` and
+    ``maxsize`` arguments, so these can't be passed with a custom or without
+    ``setup``. Parameters are encoded in the URL by the
+    ``fields`` argument of the ``request`` method or, if the URL already
+    has a query, appended to it when the snippet is generated.
+
+    Passing ``preload_content=False``, the content of the response is not
+    loaded in memory when the request is performed. It's read by chunks
+    instead and the connection is released to the pool after:
+
+    ```python
+    import urllib3
+
+    http = urllib3.PoolManager(num_pools=4, maxsize=10)
+
+    req = http.request('GET', '<url>', preload_content=False)
+    for chunk in req.stream():
+        ...
+    req.release_conn()
+    ```
+
+    The loop reading the chunks can't follow other statements in the same
+    line, so ``preload_content=False`` can't be passed with ``oneline``.
+
+    The duration of the request can be measured passing ``measure``, like
+    the requests generator does.
+    '''
+    _validate_pool(setup, num_pools=num_pools, maxsize=maxsize)
+    _validate_preload_content(preload_content, oneline=oneline)
+    validate_measure(measure)
+    emitter = Emitter() if _emitter is None else _emitter
+    emitter.write(
+        _setup_render(
+            setup, oneline=oneline, num_pools=num_pools, maxsize=maxsize,
+            measure=measure,
+        ),
+    )
+
+    # the request is rendered inside a loop if performed multiple times
+    if measure and measure is not True:
+        wrap -= len(indent)
+
+    if parameters and '?' in str(url):
+        # urllib3 appends the fields to the URL after a '?' separator, so
+        # they're encoded in the URL if it already has a query
+        url = '&'.join([
+            str(url),
+            urlencode(parameters_dict(parameters, seed=seed, locale=locale)),
+        ])
+        parameters = []
+
+    arguments = common_arguments_docs(
+        url, headers=headers, indent=indent, quote_char=quote_char,
+        wrap=wrap, kwargs=kwargs,
+    )
+    arguments.insert(0, _method_doc('GET', quote_char=quote_char))
+    if parameters:
+        arguments.insert(2, [
+            'fields=',
+            dict_doc(
+                parameters_dict(parameters, seed=seed, locale=locale),
+                indent=indent, indent_depth=1,
+                quote_char=quote_char, wrap=wrap,
+            ),
+        ])
+
+    _request_render(
+        emitter, arguments, indent=indent, quote_char=quote_char,
+        oneline=oneline, wrap=wrap, preload_content=preload_content,
+        measure=measure,
+    )
+
+    if teardown:
+        emitter.write(str(teardown))
+    return emitter.getvalue()
+
+
+def post(
+    url, parameters=[], files={}, headers={}, indent=DEFAULT_INDENT,
+    quote_char=DEFAULT_QUOTE_CHAR, setup=True, teardown=None,
+    oneline=False, wrap=DEFAULT_WRAP, seed=None, locale=None,
+    num_pools=None, maxsize=None, preload_content=True, measure=False,
+    _emitter=None, **kwargs,
+):
+    '''POST method code generator for Python urllib3 library. The body is
+    built following the same rules as the requests generator:
+
+    - ``application/x-www-form-urlencoded``: ``fields`` argument passing
+      ``encode_multipart=False``.
+    - ``multipart/form-data``: ``fields`` argument, defining the files by
+      tuples with their name, content and optionally their content type.
+      Headers for each file are not supported.
+    - ``application/json``: ``body`` argument serialized by ``json.dumps``.
+    - ``text/plain``: ``body`` argument.
+    '''
+    _validate_pool(setup, num_pools=num_pools, maxsize=maxsize)
+    _validate_preload_content(preload_content, oneline=oneline)
+    validate_measure(measure)
+    emitter = Emitter() if _emitter is None else _emitter
+
+    content_type = post_content_type(headers, files)
+    if content_type == 'text/plain' and len(parameters) != 1:
+        raise_post_text_plain_n_parameters_not_1(len(parameters))
+
+    emitter.write(
+        _setup_render(
+            setup, oneline=oneline, num_pools=num_pools, maxsize=maxsize,
+            json=content_type == 'application/json' and bool(parameters),
+            measure=measure,
+        ),
+    )
+
+    # the request is rendered inside a loop if performed multiple times
+    if measure and measure is not True:
+        wrap -= len(indent)
+
+    arguments = common_arguments_docs(
+        url, headers=headers, indent=indent, quote_char=quote_char,
+        wrap=wrap, kwargs=kwargs,
+    )
+    arguments.insert(0, _method_doc('POST', quote_char=quote_char))
+
+    body_arguments = []
+    if content_type == 'multipart/form-data':
+        # multipart fields values must be strings
+        fields = parameters_dict(parameters, seed=seed, locale=locale)
+        fields_pairs = [
+            (
+                key,
+                str_definition(
+                    str(value), indent=indent * 2 + ' ' * (len(key) + 4),
+                    quote_char=quote_char, wrap=wrap,
+                ),
+            ) for key, value in fields.items()
+        ]
+        for key, value in files.items():
+            if isinstance(value, str) or value is None:
+                value = [value]
+
+            # random filepath
+            filepath = value[0]
+            if filepath is None:
+                filepath = lazy_value_by_parameter(
+                    {
+                        'name': '',
+                        'faker': 'faker.providers.file::file_path',
+                    },
+                    seed=seed,
+                    locale=locale,
+                )
+
+            file_items = [
+                str_definition(
+                    filepath, indent=indent * 3,
+                    quote_char=quote_char, wrap=wrap,
+                ),
+                [
+                    Group(
+                        bracket(
+                            'open(',
+                            [
+                                str_definition(
+                                    filepath, indent=indent * 4,
+                                    quote_char=quote_char, wrap=wrap,
+                                ),
+                                '%(quote_char)srb%(quote_char)s' % {
+                                    'quote_char': quote_char,
+                                },
+                            ],
+                            ')',
+                            indent,
+                        ),
+                    ),
+                    '.read()',
+                ],
+            ]
+            if len(value) > 1:
+                # file content type
+                file_items.append(
+                    str_definition(
+                        value[1], indent=indent * 3,
+                        quote_char=quote_char, wrap=wrap,
+                    ),
+                )
+            fields_pairs.append(
+                (key, bracket('(', file_items, ')', indent)),
+            )
+
+        # fields are defined by a list of pairs if a parameter and a file
+        # share the same name
+        names = [key for key, _ in fields_pairs]
+        fields_as_dict = len(set(names)) == len(names)
+        fields_items = []
+        for key, value_doc_ in fields_pairs:
+            key_doc = '%(quote_char)s%(key)s%(quote_char)s' % {
+                'key': escape_by_quote(key, quote_char),
+                'quote_char': quote_char,
+            }
+            if fields_as_dict:
+                fields_items.append([key_doc, ': ', value_doc_])
+            else:
+                fields_items.append(
+                    Group(bracket('(', [key_doc, value_doc_], ')', indent)),
+                )
+        body_arguments.append([
+            'fields=',
+            bracket(
+                '{' if fields_as_dict else '[',
+                fields_items,
+                '}' if fields_as_dict else ']',
+                indent,
+            ),
+        ])
+    elif parameters:
+        if content_type == 'text/plain':
+            # 5 here is the length of 'body='
+            body_arguments.append([
+                'body=',
+                str_definition(
+                    lazy_value_by_parameter(
+                        parameters[0], seed=seed, locale=locale,
+                    ),
+                    quote_char=quote_char,
+                    indent=indent + (' ' * 5),
+                    wrap=wrap,
+                ),
+            ])
+        elif content_type == 'application/json':
+            body_arguments.append([
+                'body=json.dumps(',
+                value_doc(
+                    lazy_json_body_by_parameters(
+                        parameters, seed=seed, locale=locale,
+                    ),
+                    indent=indent, indent_depth=1,
+                    quote_char=quote_char, wrap=wrap,
+                ),
+                ')',
+            ])
+        else:
+            body_arguments.extend([
+                [
+                    'fields=',
+                    dict_doc(
+                        parameters_dict(parameters, seed=seed, locale=locale),
+                        indent=indent, indent_depth=1,
+                        quote_char=quote_char, wrap=wrap,
+                    ),
+                ],
+                'encode_multipart=False',
+            ])
+    arguments[2:2] = body_arguments
+
+    _request_render(
+        emitter, arguments, indent=indent, quote_char=quote_char,
+        oneline=oneline, wrap=wrap, preload_content=preload_content,
+        measure=measure,
+    )
+
+    if teardown:
+        emitter.write(str(teardown))
+    return emitter.getvalue()
@@ -1,10 +1,122 @@
 '''http-request-codegen public API.'''
 
+from collections.abc import Iterator
+
+from http_request_codegen.hrc_emitter import Emitter
 from http_request_codegen.hrc_factory import (
     DEFAULT_LANGUAGE,
     get_func_by_lang_impl_method,
+    get_program_func_by_lang_impl,
 )
+from http_request_codegen.hrc_program import Program
 from http_request_codegen.hrc_string import lazy_string
+from http_request_codegen.hrc_valuer import (
+    lazy_value_by_parameter,
+    resolve_parameters,
+)
+
+
+STYLE_ARGUMENTS = ('indent', 'quote_char', 'wrap', 'oneline')
+
+
+def _copy_arguments(value):
+    # copies the containers of arguments, like parameters lists, headers and
+    # files, keeping other values by reference, except iterators, which can
+    # only be consumed once, so they're stored as lists
+    if isinstance(value, dict):
+        return value.__class__(
+            (key, _copy_arguments(item)) for key, item in value.items()
+        )
+    elif isinstance(value, (list, tuple, set)):
+        return value.__class__(_copy_arguments(item) for item in value)
+    elif isinstance(value, Iterator):
+        return list(value)
+    return value
+
+
+class LazySnippet:
+    '''Code snippet of an HTTP request rendered the first time that its
+    code is needed, converting it to a string or getting its length. The
+    rendered code is memoized, so it's only rendered once. Snippets are
+    picklable if the arguments that define them are picklable, and keep
+    their rendered code after pickled.
+
+    Instances are created by
+    [``generate_http_request_code``](#generate_http_request_code) passing
+    ``lazy=True``. The generator of the implementation is discovered at
+    creation, so unsupported implementations raise errors immediately, and
+    the containers of the arguments are copied, so modifying them after
+    doesn't change the snippet. Iterators, like generators of values, are
+    stored as lists.
+
+    Args:
+        **kwargs: Arguments passed to
+            [``generate_http_request_code``](#generate_http_request_code)
+            rendering the snippet.
+
+    Examples:
+        >>> snippet = generate_http_request_code(setup=False, lazy=True)
+        >>> snippet
+        <LazySnippet python/requests GET (not rendered)>
+        >>> print(snippet)
+        req = requests.get('http://localhost')
+        >>> snippet.rendered
+        True
+        >>> len(snippet)
+        38
+
+        >>> import pickle
+        >>> pickle.loads(pickle.dumps(snippet)) == str(snippet)
+        True
+    '''
+    __slots__ = ('kwargs', '_code', '_impl')
+
+    def __init__(self, **kwargs):
+        language = kwargs.get('language')
+        func = get_func_by_lang_impl_method(
+            language=language.lower() if language else language,
+            impl=kwargs.get('impl'),
+            method=kwargs.get('method', 'GET'),
+        )
+        # copied, so later changes of the arguments don't change the snippet
+        self.kwargs = _copy_arguments(kwargs)
+        self._code = None
+        # 'language/impl' of the generator
+        self._impl = '/'.join(func.__module__.split('.')[-2:])
+
+    @property
+    def rendered(self):
+        '''bool: Indicates if the code of the snippet has been rendered.'''
+        return self._code is not None
+
+    def __str__(self):
+        if self._code is None:
+            self._code = generate_http_request_code(**self.kwargs)
+        return self._code
+
+    def __len__(self):
+        return len(str(self))
+
+    def __eq__(self, other):
+        if isinstance(other, LazySnippet):
+            other = str(other)
+        return str(self) == other
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __repr__(self):
+        return '<LazySnippet %s %s%s>' % (
+            self._impl,
+            self.kwargs.get('method', 'GET').upper(),
+            '' if self.rendered else ' (not rendered)',
+        )
+
+    def __getstate__(self):
+        return (self.kwargs, self._code, self._impl)
+
+    def __setstate__(self, state):
+        self.kwargs, self._code, self._impl = state
 
 
 def generate_http_request_code(
@@ -13,7 +125,7 @@ def generate_http_request_code(
     headers={}, files={}, indent=None,
     quote_char='\'', setup=None, teardown=None,
     oneline=False, seed=None, locale=None, wrap=80,
-    **kwargs,
+    lazy=False, **kwargs,
 ):
     '''Generates a code snippet of an HTTP request for a library of a given
     programming language or a CLI of a program, based on a valid HTTP method
@@ -171,6 +283,24 @@ def generate_http_request_code(
                 - Defined as a string must follow the format
                 ``'path.to.provider.module::function'``.
 
+            - **pattern** (*str*): Regular expression that the value must
+                match, like ``r'[A-Z]{3}-\\d{6}'`` for SKU codes. Patterns are
+                compiled once into cached samplers that build the values
+                without backtracking. Unbounded quantifiers are limited to 8
+                repetitions over their minimum, ``.`` and negated sets only
+                produce printable ASCII characters and anchors and lookaround
+                assertions are ignored.
+
+            - **schema** (*dict*): JSON Schema which the value must validate,
+                like ``{'type': 'array', 'items': {'format': 'email'}}``.
+                Schemas are compiled once into cached generators. Supports
+                ``type``, ``enum``, ``const``, ``properties``, ``items``,
+                length, size and numeric ranges keywords, ``pattern``, common
+                ``format`` values, ``allOf``, ``anyOf``, ``oneOf`` and local
+                ``$ref`` references. In JSON bodies, the values are rendered
+                as nested objects and arrays and, if only one parameter
+                without ``name`` is passed, its value is the entire body.
+
         files (dict): Mapping of files to send to URL. Only has effect for POST
             methods. If you define this argument, the `Content-Type` header of
             the request will be assumed to be `'multipart/form-data'`, but only
@@ -206,6 +336,9 @@ def generate_http_request_code(
             multiples code snippets.
         locale (str): Locale used by [faker](https://faker.readthedocs.io)
             library to localize the faked random values for parameters.
+        lazy (bool): Returns a [``LazySnippet``](#lazysnippet) which renders
+            the code snippet the first time that is needed, instead of
+            rendering it immediately.
 
     Raises:
         ValueError: Value is not a valid value in their context.
@@ -216,6 +349,15 @@ def generate_http_request_code(
     Returns:
         str: HTTP request code snippet.
     '''
+    if lazy:
+        return LazySnippet(
+            language=language, impl=impl, method=method, url=url,
+            parameters=parameters, headers=headers, files=files,
+            indent=indent, quote_char=quote_char, setup=setup,
+            teardown=teardown, oneline=oneline, seed=seed, locale=locale,
+            wrap=wrap, **kwargs,
+        )
+
     _function_kwargs = {
         'parameters': parameters, 'headers': headers,
         'oneline': oneline, 'seed': seed, 'locale': locale,
@@ -237,6 +379,205 @@ def generate_http_request_code(
     )(lazy_string(url), **kwargs)
 
 
+def write_http_request_code(
+    file_obj, language=None, impl=None, method='GET',
+    **kwargs,
+):
+    '''Writes a code snippet of an HTTP request into a file-like object,
+    like a file, a socket wrapped by ``makefile`` or an ``io.StringIO``
+    instance. The code is written chunk by chunk while is generated, so huge
+    snippets are streamed without building the whole code in memory.
+
+    Args:
+        file_obj (object): File-like object with a ``write`` method where the
+            code snippet will be written.
+        **kwargs: All other optional arguments are passed to
+            [``generate_http_request_code``](#generate_http_request_code)
+            function.
+
+    Examples:
+        >>> import io
+        >>> f = io.StringIO()
+        >>> write_http_request_code(f, setup=False)
+        >>> f.getvalue()
+        "req = requests.get('http://localhost')"
+
+    Raises:
+        ValueError: Value is not a valid value in their context.
+        TypeError: Values does not complaint with the types supported for it.
+        ImportError: Python module-function path specified can not be imported
+            successfully.
+    '''
+    kwargs['lazy'] = False
+    generate_http_request_code(
+        language=language, impl=impl, method=method,
+        _emitter=Emitter(file_obj), **kwargs,
+    )
+
+
+def generate_http_request_program(
+    requests, language=None, impl=None, indent=None,
+    quote_char='\'', setup=True, teardown=None, seed=None,
+    locale=None, wrap=80, _emitter=None, **kwargs,
+):
+    '''Generates a script which performs multiple HTTP requests. The setup
+    snippet is rendered only once, the requests share a client or session
+    if the implementation allows it and the headers defined by more than one
+    request are defined once as constants. Each request is rendered as a
+    statement in its own line.
+
+    Args:
+        requests (list): Requests of the program. Each request is a
+            dictionary with the arguments of
+            [``generate_http_request_code``](#generate_http_request_code)
+            that define it: ``method``, ``url``, ``parameters``, ``headers``,
+            ``files``, ``seed``, ``locale`` and optional arguments of the
+            implementation.
+        language (str): Programming language or plataform of the program.
+        impl (str): Implementation type used for the program.
+        indent (str): Indentation string used in the generated code.
+        quote_char (str): Quotation character for strings.
+        setup (bool, str): Initialization of the program. If ``True``,
+            includes the code needed by the implementation.
+        teardown (str): Code snippet to include at the end of the program.
+        seed (int): Seed used generating random values of the requests that
+            do not define it.
+        locale (str): Locale used generating random values of the requests
+            that do not define it.
+        wrap (int): Maximum anchor of the rendered code.
+        **kwargs: Optional arguments of the program of the implementation,
+            like ``batch`` for Bash curl.
+
+    Raises:
+        ValueError: The implementation does not support programs, a request
+            defines an argument of the whole program, like ``indent``, or a
+            value is not valid in their context.
+
+    Examples:
+        >>> print(generate_http_request_program([
+        ...     {'url': 'http://localhost/a'},
+        ...     {'url': 'http://localhost/b', 'method': 'POST'},
+        ... ]))
+        import requests
+        <BLANKLINE>
+        session = requests.Session()
+        <BLANKLINE>
+        req = session.get('http://localhost/a')
+        req = session.post('http://localhost/b')
+        <BLANKLINE>
+
+    Returns:
+        str: Program code.
+    '''
+    language = language.lower() if language else language
+    program_func = get_program_func_by_lang_impl(
+        language=language, impl=impl,
+    )
+    program = Program(
+        requests, language=language, impl=impl, setup=setup,
+        seed=seed, locale=locale,
+    )
+
+    _function_kwargs = {
+        'setup': setup, 'teardown': teardown,
+        'wrap': wrap or float('inf'), '_emitter': _emitter,
+    }
+    if indent is not None:
+        _function_kwargs['indent'] = indent
+    if quote_char is not None:
+        _function_kwargs['quote_char'] = quote_char
+    kwargs.update(_function_kwargs)
+    return program_func(program, **kwargs)
+
+
+def _resolve_files(files, seed=None, locale=None):
+    response = {}
+    for name, value in files.items():
+        if value is None or (not isinstance(value, str) and value[0] is None):
+            filepath = lazy_value_by_parameter(
+                {
+                    'name': '',
+                    'faker': 'faker.providers.file::file_path',
+                },
+                seed=seed,
+                locale=locale,
+            )
+            value = filepath if value is None else \
+                [filepath] + list(value[1:])
+        response[name] = value
+    return response
+
+
+def render_variants(spec, styles=[{}]):
+    '''Renders a code snippet of an HTTP request with multiple styles. The
+    URL, names and values of parameters and paths of files are resolved only
+    once, so all the variants show the same values and random values are not
+    built again for each style. Repeated styles are rendered only once.
+
+    Only the resolution of values is shared between styles. Escaping the
+    strings for the quote character and classifying the content type of the
+    body are out of the scope of this function: each generator performs
+    them, by its own rules, while rendering, and both are linear scans of
+    the resolved strings and headers, so each style rendered performs them
+    again.
+
+    Args:
+        spec (dict): Arguments of
+            [``generate_http_request_code``](#generate_http_request_code)
+            function that define the request.
+        styles (list): Styles to render. Each style is a dictionary with
+            some of the next arguments of
+            [``generate_http_request_code``](#generate_http_request_code):
+            ``indent``, ``quote_char``, ``wrap`` and ``oneline``.
+
+    Raises:
+        ValueError: A style defines an argument which is not a style
+            argument.
+
+    Examples:
+        >>> for code in render_variants(
+        ...     {'url': 'http://localhost', 'setup': False},
+        ...     styles=[{'quote_char': '"'}, {'oneline': True}],
+        ... ):
+        ...     print(code)
+        req = requests.get("http://localhost")
+        req = requests.get('http://localhost');
+
+    Returns:
+        list: Code snippets rendered for each style, in the same order.
+    '''
+    for style in styles:
+        for argument in style:
+            if argument not in STYLE_ARGUMENTS:
+                raise ValueError(
+                    (
+                        '\'%s\' is not a style argument, define it in the'
+                        ' specification instead'
+                    ) % argument,
+                )
+
+    seed, locale = (spec.get('seed'), spec.get('locale'))
+    spec = dict(spec, url=lazy_string(spec.get('url', 'http://localhost')))
+    if spec.get('parameters'):
+        spec['parameters'] = resolve_parameters(
+            spec['parameters'], seed=seed, locale=locale,
+        )
+    if spec.get('files'):
+        spec['files'] = _resolve_files(
+            spec['files'], seed=seed, locale=locale,
+        )
+
+    response, renders = ([], {})
+    for style in styles:
+        style_key = tuple(sorted(style.items()))
+        if style_key not in renders:
+            renders[style_key] = generate_http_request_code(
+                **dict(spec, **style),
+            )
+        response.append(renders[style_key])
+    return response
+
+
 def generate_http_request_md_fenced_code_block(
     language=None,
     fence_string='```',
@@ -0,0 +1,97 @@
+'''Writers used by generators to emit the code of snippets.'''
+
+from http_request_codegen.hrc_layout import layout
+
+
+class Emitter:
+    '''Buffer where generators write the code of snippets chunk by chunk,
+    instead of concatenating strings. If a file-like object is passed, the
+    chunks are written directly into it, so big snippets are streamed without
+    building the whole code in memory.
+
+    The column where the next chunk will be written is tracked, so documents
+    of the layout engine can be written after other code.
+
+    Args:
+        file_obj (object): File-like object with a ``write`` method where
+            the code is written. If not defined, the code is kept in memory
+            and can be retrieved using ``getvalue``.
+
+    Examples:
+        >>> emitter = Emitter()
+        >>> emitter.write('import requests\\n\\n')
+        >>> emitter.write('req = ')
+        >>> emitter.column
+        6
+        >>> emitter.getvalue()
+        'import requests\\n\\nreq = '
+
+        >>> import io
+        >>> f = io.StringIO()
+        >>> emitter = Emitter(f)
+        >>> emitter.write('curl')
+        >>> emitter.getvalue() is None, f.getvalue()
+        (True, 'curl')
+    '''
+    __slots__ = ('column', '_chunks', '_write')
+
+    def __init__(self, file_obj=None):
+        self.column = 0
+        if file_obj is None:
+            self._chunks = []
+            self._write = self._chunks.append
+        else:
+            self._chunks = None
+            self._write = file_obj.write
+
+    def write(self, string):
+        '''Writes a chunk of code.
+
+        Args:
+            string (str): Code written.
+        '''
+        if not string:
+            return
+        self._write(string)
+        newline_index = string.rfind('\n')
+        if newline_index < 0:
+            self.column += len(string)
+        else:
+            self.column = len(string) - newline_index - 1
+
+    def write_layout(self, doc, wrap=80, flat=False):
+        '''Writes a document of the layout engine, starting at the current
+        column. See [``layout``](#layout) for details.
+
+        Args:
+            doc (object): Document to render.
+            wrap (int): Lines rendered in one line must be shorter than this
+                width.
+            flat (bool): Renders all the document in one line.
+
+        Examples:
+            >>> from http_request_codegen.hrc_layout import Group, bracket
+            >>> emitter = Emitter()
+            >>> emitter.write('x = ')
+            >>> emitter.write_layout(
+            ...     Group(bracket('[', ['1', '2'], ']', '  ')), wrap=9,
+            ... )
+            >>> print(emitter.getvalue())
+            x = [
+              1,
+              2
+            ]
+        '''
+        self.write(layout(doc, wrap=wrap, flat=flat, column=self.column))
+
+    def getvalue(self):
+        '''Returns the code written, if the emitter is not writing into a
+        file-like object.
+
+        Returns:
+            str: Code written or ``None`` if the code has been written into
+                a file-like object.
+        '''
+        if self._chunks is None:
+            return None
+        return ''.join(self._chunks)
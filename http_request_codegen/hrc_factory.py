@@ -10,6 +10,15 @@ from http_request_codegen.hrc_http import HTTP_METHODS
 DEFAULT_LANGUAGE = 'python'
 DEFAULT_IMPLEMENTATION = 'requests'
 
+# implementations used when a language is passed without implementation
+DEFAULT_IMPLEMENTATIONS = {
+    'bash': 'curl',
+    'go': 'net_http',
+    'javascript': 'fetch',
+    'lua': 'wrk',
+    'python': DEFAULT_IMPLEMENTATION,
+}
+
 GENERATORS_DIR = os.path.abspath(
     os.path.join(os.path.dirname(__file__), 'generators'),
 )
@@ -28,9 +37,9 @@ def get_generators_modules_by_lang_impl():
         response[fname] = {}
 
         for modfname in os.listdir(fpath):
-            if modfname.startswith('_'):
+            modname, ext = os.path.splitext(modfname)
+            if modfname.startswith('_') or ext != '.py':
                 continue
-            modname = modfname.rstrip('.py')
             response[fname][modname] = (
                 'http_request_codegen.generators.%s.%s'
             ) % (fname, modname)
@@ -38,7 +47,7 @@ def get_generators_modules_by_lang_impl():
 
 
 @lru_cache(maxsize=32)
-def get_func_by_lang_impl_method(language=None, impl=None, method=None):
+def get_module_by_lang_impl(language=None, impl=None):
     generators_by_lang_impl = get_generators_modules_by_lang_impl()
 
     if language is None:
@@ -67,7 +76,9 @@ def get_func_by_lang_impl_method(language=None, impl=None, method=None):
             ) % language,
         )
     if impl is None:
-        _impl = list(lang_impls.keys())[0]
+        _impl = DEFAULT_IMPLEMENTATIONS.get(_language)
+        if _impl not in lang_impls:
+            _impl = sorted(lang_impls.keys())[0]
     else:
         _impl = impl
 
@@ -83,17 +94,29 @@ def get_func_by_lang_impl_method(language=None, impl=None, method=None):
             ),
         )
 
-    module = importlib.import_module(impl_modpath)
+    return (
+        importlib.import_module(impl_modpath),
+        _language,
+        _impl,
+    )
+
+
+@lru_cache(maxsize=32)
+def get_func_by_lang_impl_method(language=None, impl=None, method=None):
+    module, _language, _ = get_module_by_lang_impl(
+        language=language, impl=impl,
+    )
 
     if method is None:
         _method = 'get'
     else:
         _method = method.lower()
+        # other functions of the modules, like 'program', are not methods
+        if method.upper() not in HTTP_METHODS:
+            raise ValueError('Invalid HTTP method \'%s\'' % method.upper())
     try:
         func = getattr(module, _method)
     except AttributeError:
-        if method.upper() not in HTTP_METHODS:
-            raise ValueError('Invalid HTTP method \'%s\'' % method.upper())
         raise ValueError(
             (
                 'The implementation \'%s\' of the language \'%s\' does not'
@@ -101,3 +124,19 @@ def get_func_by_lang_impl_method(language=None, impl=None, method=None):
             ) % (impl, _language, _method.upper()),
         )
     return func
+
+
+@lru_cache(maxsize=32)
+def get_program_func_by_lang_impl(language=None, impl=None):
+    module, _language, _impl = get_module_by_lang_impl(
+        language=language, impl=impl,
+    )
+    try:
+        return module.program
+    except AttributeError:
+        raise ValueError(
+            (
+                'The implementation \'%s\' of the language \'%s\' does not'
+                ' support programs.'
+            ) % (_impl, _language),
+        )
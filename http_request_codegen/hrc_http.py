@@ -1,5 +1,8 @@
 '''HTTP utitlities of http-request-codegen.'''
 
+from collections import OrderedDict
+
+
 HTTP_METHODS = [
     'GET',
     'POST',
@@ -9,3 +12,167 @@ HTTP_METHODS = [
     'PATCH',
     'OPTIONS',
 ]
+
+# encodings supported compressing the bodies of requests
+CONTENT_ENCODINGS = [
+    'gzip',
+    'deflate',
+]
+
+# percentiles of the durations printed measuring repeated requests
+MEASURE_PERCENTILES = [50, 90, 99]
+
+# boundary of multipart/form-data bodies built by the generators
+MULTIPART_BOUNDARY = 'HttpRequestCodegenBoundary'
+
+
+def validate_compress(compress, content_type=None):
+    '''Validates the compression of the body of a request. Only bodies
+    built as a whole from parameters can be compressed, so
+    ``multipart/form-data`` bodies are not supported.
+
+    Args:
+        compress (str): Encoding of the compressed body, one of
+            ``CONTENT_ENCODINGS`` or ``None`` if the body is not compressed.
+        content_type (str): Content type of the body.
+
+    Raises:
+        ValueError: if the encoding is not supported or the body is
+            ``multipart/form-data`` encoded.
+
+    Examples:
+        >>> validate_compress('gzip', 'application/json')
+        >>> validate_compress('br')
+        Traceback (most recent call last):
+        ...
+        ValueError: 'compress' argument must be one of 'gzip', 'deflate'...
+        >>> validate_compress('gzip', 'multipart/form-data')
+        Traceback (most recent call last):
+        ...
+        ValueError: 'multipart/form-data' bodies can't be compressed
+    '''
+    if compress is None:
+        return
+    if compress not in CONTENT_ENCODINGS:
+        raise ValueError(
+            '\'compress\' argument must be one of %s, but \'%s\' passed' % (
+                ', '.join(
+                    '\'%s\'' % encoding for encoding in CONTENT_ENCODINGS
+                ),
+                compress,
+            ),
+        )
+    if content_type == 'multipart/form-data':
+        raise ValueError(
+            '\'multipart/form-data\' bodies can\'t be compressed',
+        )
+
+
+def validate_fanout(fanout=None, concurrency=None):
+    '''Validates the arguments of generators which perform a request
+    multiple times concurrently.
+
+    Args:
+        fanout (int): Number of times that the request is performed.
+        concurrency (int): Maximum number of requests performed at the
+            same time.
+
+    Raises:
+        ValueError: if ``fanout`` or ``concurrency`` are not positive
+            integers or ``concurrency`` is passed without ``fanout``.
+
+    Examples:
+        >>> validate_fanout(10, 2)
+        >>> validate_fanout(concurrency=2)
+        Traceback (most recent call last):
+        ...
+        ValueError: 'concurrency' argument requires 'fanout' argument
+    '''
+    if fanout is not None and (
+        not isinstance(fanout, int) or isinstance(fanout, bool) or fanout < 1
+    ):
+        raise ValueError(
+            '\'fanout\' argument must be a positive integer, but \'%s\''
+            ' passed' % fanout,
+        )
+    if concurrency is not None:
+        if fanout is None:
+            raise ValueError(
+                '\'concurrency\' argument requires \'fanout\' argument',
+            )
+        elif not isinstance(concurrency, int) or \
+                isinstance(concurrency, bool) or concurrency < 1:
+            raise ValueError(
+                '\'concurrency\' argument must be a positive integer, but'
+                ' \'%s\' passed' % concurrency,
+            )
+
+
+def validate_measure(measure=False, program=None):
+    '''Validates the argument of generators which render code measuring the
+    duration of the request. ``True`` measures it once and an integer is the
+    number of times that the request is performed, printing the percentiles
+    ``MEASURE_PERCENTILES`` of their durations.
+
+    Args:
+        measure (bool, int): Measurement of the request.
+        program (Program): Program which renders the request, if any.
+
+    Raises:
+        ValueError: if ``measure`` is not a boolean or a positive integer or
+            the request is rendered by a program.
+
+    Examples:
+        >>> validate_measure(True)
+        >>> validate_measure(10)
+        >>> validate_measure(0)
+        Traceback (most recent call last):
+        ...
+        ValueError: 'measure' argument must be a boolean or a positive ...
+    '''
+    if not isinstance(measure, bool) and (
+        not isinstance(measure, int) or measure < 1
+    ):
+        raise ValueError(
+            '\'measure\' argument must be a boolean or a positive integer,'
+            ' but \'%s\' passed' % measure,
+        )
+    if measure and program is not None:
+        raise ValueError('\'measure\' argument is not supported by programs')
+
+
+def body_headers(headers, content_type, boundary=MULTIPART_BOUNDARY):
+    '''Returns the headers of a request whose body is encoded by the
+    generator, used by load testing tools which send the bodies as they are
+    defined. The ``Content-Type`` header of forms is added if it's not
+    defined and the one of ``multipart/form-data`` bodies defines their
+    boundary.
+
+    Args:
+        headers (dict): Headers of the request.
+        content_type (str): Content type of the body.
+        boundary (str): Boundary of ``multipart/form-data`` bodies.
+
+    Examples:
+        >>> body_headers({'Accept': 'text/html'}, 'multipart/form-data', 'b')
+        OrderedDict([('Accept', 'text/html'), \
+('Content-Type', 'multipart/form-data; boundary=b')])
+
+    Returns:
+        dict: Headers of the request.
+    '''
+    response = OrderedDict()
+    content_type_header = None
+    if content_type == 'multipart/form-data':
+        content_type_header = 'multipart/form-data; boundary=%s' % boundary
+    elif content_type == 'application/x-www-form-urlencoded':
+        content_type_header = content_type
+    for name, value in headers.items():
+        if str(name).lower() == 'content-type':
+            if content_type == 'multipart/form-data':
+                value = content_type_header
+            content_type_header = None
+        response[name] = value
+    if content_type_header is not None:
+        response['Content-Type'] = content_type_header
+    return response
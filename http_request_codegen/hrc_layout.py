@@ -0,0 +1,257 @@
+'''Layout engine used by generators to render code in one or multiple lines.
+
+Generators describe the code as a document built by strings, lists of
+documents and the nodes defined here. Groups of the document are rendered
+in one line if they fit in the available width or in multiple lines, breaking
+all its lines, otherwise. The document is measured and rendered in a single
+pass by the ``layout`` function, in the manner of Wadler-style pretty
+printers.
+'''
+
+_MODE_FLAT, _MODE_BREAK = (0, 1)
+
+
+class Group:
+    '''Part of a document rendered in one line if fits in the available
+    width. Otherwise, its lines are broken, but nested groups are laid out
+    again.
+
+    Args:
+        doc (object): Document grouped.
+
+    Examples:
+        >>> doc = Group(bracket('f(', [Group(bracket('[', ['1', '2'], ']',
+        ...                                          '  ')), 'x'], ')', '  '))
+        >>> print(layout(doc, wrap=10))
+        f(
+          [1, 2],
+          x
+        )
+    '''
+    __slots__ = ('doc',)
+
+    def __init__(self, doc):
+        self.doc = doc
+
+
+class Nest:
+    '''Increases the indentation of the broken lines inside a document.
+
+    Args:
+        indent (str): Indentation added.
+        doc (object): Document indented.
+    '''
+    __slots__ = ('indent', 'doc')
+
+    def __init__(self, indent, doc):
+        self.indent = indent
+        self.doc = doc
+
+
+class Line:
+    '''Breakable separator. Rendered as ``flat`` if its group is in one line,
+    or as ``broken`` followed by a newline and the current indentation
+    otherwise.
+
+    Args:
+        flat (str): Text rendered in one line mode.
+        broken (str): Text rendered before the newline in multiple lines mode.
+    '''
+    __slots__ = ('flat', 'broken')
+
+    def __init__(self, flat='', broken=''):
+        self.flat = flat
+        self.broken = broken
+
+
+class IfBreak:
+    '''Document which content depends on the mode of its group.
+
+    Args:
+        broken (object): Document rendered if the group is in multiple lines.
+        flat (object): Document rendered if the group is in one line.
+    '''
+    __slots__ = ('broken', 'flat')
+
+    def __init__(self, broken, flat=''):
+        self.broken = broken
+        self.flat = flat
+
+
+# space or newline
+LINE = Line(' ')
+
+# nothing or newline
+SOFTLINE = Line()
+
+
+def join(separator, docs):
+    '''Joins documents placing a separator between them.
+
+    Args:
+        separator (object): Document placed between each pair of documents.
+        docs (list): Documents to join.
+
+    Examples:
+        >>> join(',', ['a', 'b', 'c'])
+        ['a', ',', 'b', ',', 'c']
+
+    Returns:
+        list: Joined document.
+    '''
+    response = []
+    for i, doc in enumerate(docs):
+        if i:
+            response.append(separator)
+        response.append(doc)
+    return response
+
+
+def bracket(
+    opening, docs, closing, indent,
+    separator=(',', LINE),
+):
+    '''Builds the document of a collection of items wrapped by opening and
+    closing strings, like the definition of a list or the arguments of a
+    function call. If broken in multiple lines, each item is placed in its
+    own indented line.
+
+    Args:
+        opening (str): Opening string, like ``'['``.
+        docs (list): Documents of the items.
+        closing (str): Closing string, like ``']'``.
+        indent (str): Indentation of the items when broken.
+        separator (object): Document between items.
+
+    Examples:
+        >>> layout(Group(bracket('[', ['1', '2'], ']', '  ')))
+        '[1, 2]'
+
+        >>> print(layout(Group(bracket('[', ['1', '2'], ']', '  ')), wrap=5))
+        [
+          1,
+          2
+        ]
+
+    Returns:
+        list: Document of the collection.
+    '''
+    if not docs:
+        return opening + closing
+    return [
+        opening,
+        Nest(indent, [SOFTLINE, join(list(separator), docs)]),
+        SOFTLINE,
+        closing,
+    ]
+
+
+def _fits(commands, rest_commands, width):
+    # Checks if the first commands fit in the width until the first line
+    # broken of the rest of commands is found
+    rest_index = len(rest_commands)
+    commands = list(commands)
+    while width >= 0:
+        if not commands:
+            if not rest_index:
+                return True
+            rest_index -= 1
+            commands.append(rest_commands[rest_index])
+            continue
+
+        indent, mode, doc = commands.pop()
+        if isinstance(doc, str):
+            width -= len(doc)
+        elif isinstance(doc, list):
+            for subdoc in reversed(doc):
+                commands.append((indent, mode, subdoc))
+        elif isinstance(doc, Line):
+            if mode == _MODE_BREAK:
+                return True
+            width -= len(doc.flat)
+        elif isinstance(doc, IfBreak):
+            commands.append((
+                indent, mode,
+                doc.broken if mode == _MODE_BREAK else doc.flat,
+            ))
+        elif isinstance(doc, Nest):
+            commands.append((indent + doc.indent, mode, doc.doc))
+        else:  # Group
+            commands.append((indent, mode, doc.doc))
+    return False
+
+
+def layout(doc, wrap=80, flat=False, column=0):
+    '''Renders a document, placing each group in one line if fits in the
+    width defined by ``wrap`` or breaking its lines otherwise. Each group is
+    measured only until the end of its line, so the document is rendered in
+    linear time.
+
+    Args:
+        doc (object): Document to render.
+        wrap (int): Lines rendered in one line must be shorter than this
+            width. ``None`` means infinite width.
+        flat (bool): Renders all the document in one line.
+        column (int): Column where the document starts.
+
+    Examples:
+        >>> doc = Group(['foo(', Nest('    ', [SOFTLINE, 'bar']), SOFTLINE,
+        ...              ')'])
+        >>> layout(doc)
+        'foo(bar)'
+
+        >>> print(layout(doc, wrap=8))
+        foo(
+            bar
+        )
+
+        >>> layout(doc, wrap=8, flat=True)
+        'foo(bar)'
+
+    Returns:
+        str: Rendered document.
+    '''
+    if wrap is None:
+        wrap = float('inf')
+
+    response = []
+    position = column
+    commands = [('', _MODE_FLAT if flat else _MODE_BREAK, doc)]
+    while commands:
+        indent, mode, doc = commands.pop()
+        if isinstance(doc, str):
+            response.append(doc)
+            if '\n' in doc:  # multiline strings
+                position = len(doc) - doc.rindex('\n') - 1
+            else:
+                position += len(doc)
+        elif isinstance(doc, list):
+            for subdoc in reversed(doc):
+                commands.append((indent, mode, subdoc))
+        elif isinstance(doc, Line):
+            if mode == _MODE_BREAK:
+                response.append(doc.broken + '\n' + indent)
+                position = len(indent)
+            else:
+                response.append(doc.flat)
+                position += len(doc.flat)
+        elif isinstance(doc, IfBreak):
+            commands.append((
+                indent, mode,
+                doc.broken if mode == _MODE_BREAK else doc.flat,
+            ))
+        elif isinstance(doc, Nest):
+            commands.append((indent + doc.indent, mode, doc.doc))
+        elif mode == _MODE_FLAT:  # Group inside a flat group
+            commands.append((indent, mode, doc.doc))
+        else:  # Group
+            # 1 here is the last column, that must be empty
+            _fits_flat = _fits(
+                [(indent, _MODE_FLAT, doc.doc)],
+                commands,
+                wrap - position - 1,
+            )
+            commands.append(
+                (indent, _MODE_FLAT if _fits_flat else _MODE_BREAK, doc.doc),
+            )
+    return ''.join(response)
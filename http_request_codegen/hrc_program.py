@@ -0,0 +1,181 @@
+'''Programs performing multiple HTTP requests in one script.'''
+
+from collections import OrderedDict
+
+from http_request_codegen.hrc_factory import get_func_by_lang_impl_method
+from http_request_codegen.hrc_string import lazy_string
+
+
+# arguments defined for the whole program, not by each request
+PROGRAM_ARGUMENTS = (
+    'language', 'impl', 'indent', 'quote_char', 'wrap', 'oneline',
+    'setup', 'teardown', 'lazy',
+)
+
+
+class Identifier:
+    '''Name of a variable defined by a program. Passed as value of optional
+    arguments of generators, is rendered as is, without quotes.
+
+    Args:
+        name (str): Name of the variable.
+
+    Examples:
+        >>> str(Identifier('session'))
+        'session'
+    '''
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return self.name
+
+
+class Program:
+    '''Requests of a program and the state shared between them, used by
+    generators rendering all the requests in one script.
+
+    URLs are resolved when the program is created. Headers mappings defined
+    by more than one request are collected in ``headers_constants`` to be
+    defined once, named as ``HEADERS_1``, ``HEADERS_2``...
+
+    Args:
+        requests (list): Requests of the program. Each request is a
+            dictionary with the arguments of
+            [``generate_http_request_code``](#generate_http_request_code)
+            that define it (``method``, ``url``, ``parameters``, ``headers``,
+            ``files``, ``seed``, ``locale`` and optional arguments of the
+            implementation).
+        language (str): Programming language or platform of the program.
+        impl (str): Implementation used by the program.
+        setup (bool, str): Initialization of the program.
+        seed (int): Seed used generating random values of the requests that
+            do not define it.
+        locale (str): Locale used generating random values of the requests
+            that do not define it.
+
+    Raises:
+        ValueError: A request defines an argument which is defined for the
+            whole program or its method is not supported by the
+            implementation.
+
+    Examples:
+        >>> program = Program([
+        ...     {'url': 'http://localhost/a', 'headers': {'Accept': 'a/b'}},
+        ...     {'url': 'http://localhost/b', 'headers': {'Accept': 'a/b'}},
+        ...     {'url': 'http://localhost/c', 'headers': {'Accept': 'c/d'}},
+        ... ])
+        >>> program.headers_constants
+        [('HEADERS_1', {'Accept': 'a/b'})]
+        >>> program.headers_name({'Accept': 'a/b'})
+        'HEADERS_1'
+        >>> program.headers_name({'Accept': 'c/d'}) is None
+        True
+    '''
+
+    def __init__(
+        self, requests, language=None, impl=None, setup=True,
+        seed=None, locale=None,
+    ):
+        self.setup = setup
+        self.requests = []
+        self._names_counts = {}
+
+        headers_counts = OrderedDict()
+        for request in requests:
+            for argument in request:
+                if argument in PROGRAM_ARGUMENTS:
+                    raise ValueError(
+                        (
+                            '\'%s\' is defined for the whole program, it'
+                            ' can\'t be defined by requests'
+                        ) % argument,
+                    )
+            kwargs = dict(request)
+            method = kwargs.pop('method', 'GET').upper()
+            kwargs['url'] = lazy_string(kwargs.get('url', 'http://localhost'))
+            kwargs.setdefault('seed', seed)
+            kwargs.setdefault('locale', locale)
+            func = get_func_by_lang_impl_method(
+                language=language, impl=impl, method=method,
+            )
+            self.requests.append((func, kwargs))
+
+            if kwargs.get('headers'):
+                key = self._headers_key(kwargs['headers'])
+                headers_counts[key] = headers_counts.get(key, 0) + 1
+
+        self.headers_constants = []
+        self._headers_names = {}
+        for key, count in headers_counts.items():
+            if count > 1:
+                name = 'HEADERS_%d' % (len(self.headers_constants) + 1)
+                self.headers_constants.append((name, dict(key)))
+                self._headers_names[key] = name
+
+    @staticmethod
+    def _headers_key(headers):
+        return tuple(
+            (str(name), str(value)) for name, value in headers.items()
+        )
+
+    def headers_name(self, headers):
+        '''Returns the name of the constant which defines a mapping of
+        headers, if it's defined by more than one request.
+
+        Args:
+            headers (dict): Headers of a request.
+
+        Returns:
+            str: Name of the constant or ``None`` if the headers are not
+                defined as a constant.
+        '''
+        return self._headers_names.get(self._headers_key(headers))
+
+    def variable_name(self, prefix):
+        '''Returns a new variable name, unique in the program. The first
+        name is the prefix itself and next ones are suffixed by a counter.
+
+        Args:
+            prefix (str): Prefix of the name.
+
+        Examples:
+            >>> program = Program([])
+            >>> [program.variable_name('formData') for _ in range(3)]
+            ['formData', 'formData2', 'formData3']
+
+        Returns:
+            str: Variable name.
+        '''
+        count = self._names_counts.get(prefix, 0) + 1
+        self._names_counts[prefix] = count
+        return prefix if count == 1 else '%s%d' % (prefix, count)
+
+    def has_files(self):
+        '''Indicates if any request of the program sends files.
+
+        Returns:
+            bool: ``True`` if any request sends files.
+        '''
+        return any(kwargs.get('files') for _, kwargs in self.requests)
+
+    def has_multipart(self):
+        '''Indicates if any request of the program sends a
+        ``multipart/form-data`` encoded body.
+
+        Returns:
+            bool: ``True`` if any request sends a multipart body.
+        '''
+        for _, kwargs in self.requests:
+            if kwargs.get('files'):
+                return True
+            for name, value in kwargs.get('headers', {}).items():
+                if name.lower() == 'content-type' and \
+                        'multipart/form-data' in str(value):
+                    return True
+        return False
@@ -0,0 +1,213 @@
+'''Regular expressions values samplers.'''
+
+import random
+import string
+from functools import lru_cache
+
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+
+# Maximum number of extra repetitions sampled for unbounded regex quantifiers
+# like ``*``, ``+`` or ``{n,}``
+PATTERN_MAX_EXTRA_REPEAT = 8
+
+_PATTERN_ANY_CHARS = (
+    string.ascii_letters + string.digits + string.punctuation + ' '
+)
+_PATTERN_CATEGORIES_CHARS = {
+    sre_parse.CATEGORY_DIGIT: string.digits,
+    sre_parse.CATEGORY_NOT_DIGIT: ''.join(
+        ch for ch in _PATTERN_ANY_CHARS if ch not in string.digits
+    ),
+    sre_parse.CATEGORY_SPACE: ' ',
+    sre_parse.CATEGORY_NOT_SPACE: _PATTERN_ANY_CHARS.replace(' ', ''),
+    sre_parse.CATEGORY_WORD: string.ascii_letters + string.digits + '_',
+    sre_parse.CATEGORY_NOT_WORD: ''.join(
+        ch for ch in _PATTERN_ANY_CHARS
+        if ch not in string.ascii_letters + string.digits + '_'
+    ),
+}
+_PATTERN_REPEATS = tuple(
+    getattr(sre_parse, opcode) for opcode in (
+        'MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT',
+    ) if hasattr(sre_parse, opcode)
+)
+_PATTERN_EMPTY_OPCODES = tuple(
+    getattr(sre_parse, opcode) for opcode in (
+        'AT', 'ASSERT', 'ASSERT_NOT',
+    )
+)
+
+
+def _pattern_charset(items):
+    negate, chars = (False, [])
+    for opcode, argument in items:
+        if opcode is sre_parse.NEGATE:
+            negate = True
+        elif opcode is sre_parse.LITERAL:
+            chars.append(chr(argument))
+        elif opcode is sre_parse.RANGE:
+            chars.extend(chr(c) for c in range(argument[0], argument[1] + 1))
+        elif opcode is sre_parse.CATEGORY:
+            chars.extend(_PATTERN_CATEGORIES_CHARS[argument])
+        else:
+            raise ValueError(
+                'Regex set item \'%s\' is not supported by patterns' % opcode,
+            )
+    if negate:
+        excluded = set(chars)
+        chars = [ch for ch in _PATTERN_ANY_CHARS if ch not in excluded]
+    if not chars:
+        raise ValueError('Regex set can not match any printable character')
+    # unique characters preserving order, so seeded samples are reproducible
+    return ''.join(dict.fromkeys(chars))
+
+
+def _pattern_single_charset(subpattern):
+    # characters that a subpattern matching only one character can take
+    if len(subpattern) != 1:
+        return None
+    opcode, argument = subpattern[0]
+    if opcode is sre_parse.IN:
+        return _pattern_charset(argument)
+    elif opcode is sre_parse.ANY:
+        return _PATTERN_ANY_CHARS
+    elif opcode is sre_parse.NOT_LITERAL:
+        return _pattern_charset([
+            (sre_parse.NEGATE, None), (sre_parse.LITERAL, argument),
+        ])
+    return None
+
+
+def _compile_pattern_subpattern(subpattern):
+    # Compiles a parsed regex into a list of samplers, functions which
+    # receive the groups mapping and return a string. Consecutive literals
+    # are merged and single characters repetitions are sampled at once,
+    # so no backtracking nor rejection is needed generating values.
+    samplers, literal = ([], '')
+    for opcode, argument in subpattern:
+        if opcode is sre_parse.LITERAL:
+            literal += chr(argument)
+            continue
+        if literal:
+            samplers.append(lambda groups, _literal=literal: _literal)
+            literal = ''
+
+        if opcode in (sre_parse.IN, sre_parse.ANY, sre_parse.NOT_LITERAL):
+            chars = _pattern_single_charset([(opcode, argument)])
+            samplers.append(
+                lambda groups, _chars=chars: random.choice(_chars),
+            )
+        elif opcode in _PATTERN_REPEATS:
+            _min, _max, repeated = argument
+            if _max is sre_parse.MAXREPEAT:
+                _max = _min + PATTERN_MAX_EXTRA_REPEAT
+            chars = _pattern_single_charset(repeated)
+            if chars is not None and _min == _max:
+                def _sampler(groups, _chars=chars, _k=_min):
+                    return ''.join(random.choices(_chars, k=_k))
+            elif chars is not None:
+                def _sampler(groups, _chars=chars, _min=_min, _max=_max):
+                    return ''.join(random.choices(
+                        _chars, k=random.randint(_min, _max),
+                    ))
+            else:
+                def _sampler(
+                    groups,
+                    _repeated=_compile_pattern_subpattern(repeated),
+                    _min=_min, _max=_max,
+                ):
+                    return ''.join(
+                        _repeated(groups)
+                        for _ in range(random.randint(_min, _max))
+                    )
+            samplers.append(_sampler)
+        elif opcode is sre_parse.SUBPATTERN:
+            group, subsubpattern = (argument[0], argument[-1])
+
+            def _sampler(
+                groups, _group=group,
+                _subpattern=_compile_pattern_subpattern(subsubpattern),
+            ):
+                value = _subpattern(groups)
+                if _group is not None:
+                    groups[_group] = value
+                return value
+            samplers.append(_sampler)
+        elif opcode is getattr(sre_parse, 'ATOMIC_GROUP', None):
+            samplers.append(_compile_pattern_subpattern(argument))
+        elif opcode is sre_parse.BRANCH:
+            branches = [
+                _compile_pattern_subpattern(branch) for branch in argument[1]
+            ]
+            samplers.append(
+                lambda groups, _branches=branches: random.choice(
+                    _branches,
+                )(groups),
+            )
+        elif opcode is sre_parse.GROUPREF:
+            samplers.append(
+                lambda groups, _group=argument: groups.get(_group, ''),
+            )
+        elif opcode in _PATTERN_EMPTY_OPCODES:
+            # anchors and lookarounds are not consumers of characters
+            continue
+        else:
+            raise ValueError(
+                'Regex operation \'%s\' is not supported by patterns' % opcode,
+            )
+    if literal:
+        samplers.append(lambda groups, _literal=literal: _literal)
+
+    if len(samplers) == 1:
+        return samplers[0]
+    return lambda groups: ''.join(sampler(groups) for sampler in samplers)
+
+
+@lru_cache(maxsize=128)
+def compile_pattern_sampler(pattern):
+    '''Compiles a regular expression into a function that generates random
+    strings matched by the pattern. Compiled samplers are cached by pattern,
+    so the regular expression is only parsed the first time that is used.
+
+    Unbounded quantifiers (``*``, ``+`` and ``{n,}``) are limited to
+    ``PATTERN_MAX_EXTRA_REPEAT`` repetitions over their minimum, ``.`` and
+    negated sets only produce printable ASCII characters and ``\\s`` only
+    produces spaces. Anchors and lookaround assertions are ignored.
+
+    Args:
+        pattern (str): Regular expression.
+
+    Raises:
+        ValueError: if the pattern is not a valid regular expression or
+            uses an operation which is not supported by the sampler.
+
+    Examples:
+        >>> sampler = compile_pattern_sampler(r'[A-Z]{3}-\\d{6}')
+        >>> import re
+        >>> re.fullmatch(r'[A-Z]{3}-\\d{6}', sampler()) is not None
+        True
+
+        >>> sampler = compile_pattern_sampler(r'(foo|bar)-\\1')
+        >>> sampler() in ('foo-foo', 'bar-bar')
+        True
+
+        >>> compile_pattern_sampler('[')
+        Traceback (most recent call last):
+        ...
+        ValueError: Invalid pattern '[': unterminated character set at ...
+
+    Returns:
+        function: Function without arguments which returns a random string
+            matching the pattern each time it's called.
+    '''
+    try:
+        subpattern = sre_parse.parse(pattern)
+    except Exception as err:  # ``re.error``
+        raise ValueError('Invalid pattern \'%s\': %s' % (pattern, str(err)))
+    sampler = _compile_pattern_subpattern(list(subpattern))
+    return lambda: sampler({})
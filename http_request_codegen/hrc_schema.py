@@ -0,0 +1,373 @@
+'''JSON Schema values generators.'''
+
+import copy
+import datetime
+import json
+import math
+import random
+import uuid
+from functools import lru_cache
+
+from faker.providers.lorem.en_US import Provider as EnUsLoremProvider
+
+from http_request_codegen.hrc_regex import compile_pattern_sampler
+
+
+SCHEMA_DEFAULT_MINIMUM = -65536
+SCHEMA_DEFAULT_MAXIMUM = 65536
+
+# Maximum number of extra items generated for arrays without ``maxItems``
+SCHEMA_MAX_EXTRA_ITEMS = 2
+
+# Maximum number of nested references followed generating values of recursive
+# schemas, deeper arrays are generated empty and optional properties skipped
+SCHEMA_MAX_REF_DEPTH = 3
+
+# Maximum number of strings sampled from patterns and formats looking for one
+# whose length is inside the bounds of ``minLength`` and ``maxLength``
+SCHEMA_MAX_LENGTH_SAMPLES = 100
+
+_WORDS = tuple(EnUsLoremProvider.word_list)
+
+_DATETIME_MIN_TIMESTAMP = 0              # 1970-01-01T00:00:00
+_DATETIME_MAX_TIMESTAMP = 4102444799     # 2099-12-31T23:59:59
+
+_FORMATS_PATTERNS = {
+    'email': r'[a-z]{4,10}\.[a-z]{4,10}@example\.(com|org|net)',
+    'idn-email': r'[a-z]{4,10}\.[a-z]{4,10}@example\.(com|org|net)',
+    'hostname': r'[a-z]{4,10}\.example\.(com|org|net)',
+    'idn-hostname': r'[a-z]{4,10}\.example\.(com|org|net)',
+    'uri': r'https://[a-z]{4,10}\.example\.(com|org|net)(/[a-z]{3,8}){1,3}',
+    'url': r'https://[a-z]{4,10}\.example\.(com|org|net)(/[a-z]{3,8}){1,3}',
+    'iri': r'https://[a-z]{4,10}\.example\.(com|org|net)(/[a-z]{3,8}){1,3}',
+    'uri-reference': r'(/[a-z]{3,8}){1,3}',
+    'iri-reference': r'(/[a-z]{3,8}){1,3}',
+    'ipv4': (
+        r'(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)'
+        r'(\.(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3}'
+    ),
+    'ipv6': r'[0-9a-f]{1,4}(:[0-9a-f]{1,4}){7}',
+}
+
+
+def _random_datetime():
+    return datetime.datetime.fromtimestamp(
+        random.randint(_DATETIME_MIN_TIMESTAMP, _DATETIME_MAX_TIMESTAMP),
+        tz=datetime.timezone.utc,
+    )
+
+
+_FORMATS_GENERATORS = {
+    'date-time': lambda: _random_datetime().strftime('%Y-%m-%dT%H:%M:%SZ'),
+    'date': lambda: _random_datetime().strftime('%Y-%m-%d'),
+    'time': lambda: _random_datetime().strftime('%H:%M:%SZ'),
+    'uuid': lambda: str(uuid.UUID(int=random.getrandbits(128), version=4)),
+}
+
+
+def _json_pointer(root, ref):
+    if not ref.startswith('#'):
+        raise ValueError(
+            'Only local references are supported by schemas, got \'%s\'' % ref,
+        )
+    node = root
+    for token in ref[1:].split('/'):
+        if not token:
+            continue
+        token = token.replace('~1', '/').replace('~0', '~')
+        try:
+            node = node[int(token) if isinstance(node, list) else token]
+        except (KeyError, IndexError, ValueError):
+            raise ValueError(
+                'Schema reference \'%s\' can not be resolved' % ref,
+            )
+    return node
+
+
+def _length_sampler(sampler, schema):
+    _min_length = schema.get('minLength', 0)
+    _max_length = schema.get('maxLength')
+    if not _min_length and _max_length is None:
+        return sampler
+
+    def _generator():
+        # values can't be cut or padded without breaking the pattern, so
+        # they're sampled again until one has a valid length
+        for _ in range(SCHEMA_MAX_LENGTH_SAMPLES):
+            value = sampler()
+            if len(value) >= _min_length and (
+                _max_length is None or len(value) <= _max_length
+            ):
+                return value
+        raise ValueError(
+            'String schema can not generate values: %s' % json.dumps(schema),
+        )
+    return _generator
+
+
+def _compile_string(schema):
+    if 'pattern' in schema:
+        return _length_sampler(
+            compile_pattern_sampler(schema['pattern']), schema,
+        )
+    elif schema.get('format') in _FORMATS_GENERATORS:
+        return _length_sampler(_FORMATS_GENERATORS[schema['format']], schema)
+    elif schema.get('format') in _FORMATS_PATTERNS:
+        return _length_sampler(
+            compile_pattern_sampler(_FORMATS_PATTERNS[schema['format']]),
+            schema,
+        )
+
+    _min_length = schema.get('minLength', 0)
+    _max_length = schema.get('maxLength')
+
+    def _generator():
+        value = random.choice(_WORDS)
+        while len(value) < _min_length:
+            value += ' ' + random.choice(_WORDS)
+        return value if _max_length is None else value[:_max_length]
+    return _generator
+
+
+def _number_bounds(schema):
+    _min = schema.get('minimum', SCHEMA_DEFAULT_MINIMUM)
+    _max = schema.get('maximum', SCHEMA_DEFAULT_MAXIMUM)
+
+    # draft 4 booleans or draft 6+ numbers
+    exclusive_min = schema.get('exclusiveMinimum')
+    exclusive_max = schema.get('exclusiveMaximum')
+    if not isinstance(exclusive_min, bool) and exclusive_min is not None:
+        _min, exclusive_min = (exclusive_min, True)
+    if not isinstance(exclusive_max, bool) and exclusive_max is not None:
+        _max, exclusive_max = (exclusive_max, True)
+    return (_min, _max, bool(exclusive_min), bool(exclusive_max))
+
+
+def _compile_integer(schema):
+    _min, _max, exclusive_min, exclusive_max = _number_bounds(schema)
+    multiple_of = schema.get('multipleOf', 1)
+
+    # integers are generated as multiples, so no values are discarded
+    _min_factor = math.ceil(_min / multiple_of)
+    _max_factor = math.floor(_max / multiple_of)
+    if exclusive_min and _min_factor * multiple_of == _min:
+        _min_factor += 1
+    if exclusive_max and _max_factor * multiple_of == _max:
+        _max_factor -= 1
+    if _min_factor > _max_factor:
+        raise ValueError(
+            'Integer schema can not generate values: %s' % json.dumps(schema),
+        )
+    return lambda: random.randint(_min_factor, _max_factor) * multiple_of
+
+
+def _compile_number(schema):
+    if 'multipleOf' in schema:
+        return _compile_integer(schema)
+    _min, _max, exclusive_min, exclusive_max = _number_bounds(schema)
+    if _min > _max or (_min == _max and (exclusive_min or exclusive_max)):
+        raise ValueError(
+            'Number schema can not generate values: %s' % json.dumps(schema),
+        )
+
+    def _valid(value):
+        return (value > _min if exclusive_min else value >= _min) and \
+            (value < _max if exclusive_max else value <= _max)
+
+    def _generator():
+        # rounding can place the value outside of the bounds, so the value
+        # is clamped, tried without rounding and finally the middle value
+        value = min(max(round(random.uniform(_min, _max), 2), _min), _max)
+        if _valid(value):
+            return value
+        value = random.uniform(_min, _max)
+        return value if _valid(value) else (_min + _max) / 2
+    return _generator
+
+
+def _compile_array(schema, compile_func, state):
+    items = schema.get('items', {})
+    if isinstance(items, list):  # tuple validation
+        items_generators = [compile_func(item) for item in items]
+        return lambda: [] if state['depth'] > SCHEMA_MAX_REF_DEPTH else [
+            generator() for generator in items_generators
+        ]
+
+    item_generator = compile_func(items)
+    _min_items = schema.get('minItems', 1)
+    _max_items = schema.get(
+        'maxItems', _min_items + SCHEMA_MAX_EXTRA_ITEMS,
+    )
+    return lambda: [] if state['depth'] > SCHEMA_MAX_REF_DEPTH else [
+        item_generator()
+        for _ in range(random.randint(_min_items, _max_items))
+    ]
+
+
+def _compile_object(schema, compile_func, state):
+    required = set(schema.get('required', []))
+    properties_generators = [
+        (name, name in required, compile_func(subschema))
+        for name, subschema in schema.get('properties', {}).items()
+    ]
+    return lambda: {
+        name: generator()
+        for name, is_required, generator in properties_generators
+        if is_required or state['depth'] <= SCHEMA_MAX_REF_DEPTH
+    }
+
+
+def _compile_schema_node(schema, root, references, state):
+    if schema is True or schema is False:
+        schema = {}
+
+    if '$ref' in schema:
+        ref = schema['$ref']
+        if ref not in references:
+            # placeholder breaking recursive references
+            references[ref] = None
+            references[ref] = _compile_schema_node(
+                _json_pointer(root, ref), root, references, state,
+            )
+
+        def _generator():
+            # depth of the references followed, limiting recursive schemas
+            state['depth'] += 1
+            try:
+                return references[ref]()
+            finally:
+                state['depth'] -= 1
+        return _generator
+
+    def _compile(subschema):
+        return _compile_schema_node(subschema, root, references, state)
+
+    # values defined by the schema are copied, so callers can't modify them
+    if 'const' in schema:
+        return lambda: copy.deepcopy(schema['const'])
+    elif 'enum' in schema:
+        if not schema['enum']:
+            raise ValueError(
+                'Enum schema can not generate values: %s' % json.dumps(schema),
+            )
+        return lambda: copy.deepcopy(random.choice(schema['enum']))
+    elif 'allOf' in schema:
+        merged = {
+            key: value for key, value in schema.items() if key != 'allOf'
+        }
+        for subschema in schema['allOf']:
+            for key, value in subschema.items():
+                # properties and required properties of all the subschemas
+                # are merged, other keywords are replaced
+                if key == 'properties':
+                    merged['properties'] = dict(
+                        merged.get('properties', {}), **value,
+                    )
+                elif key == 'required':
+                    merged['required'] = merged.get('required', []) + [
+                        name for name in value
+                        if name not in merged.get('required', [])
+                    ]
+                else:
+                    merged[key] = value
+        return _compile(merged)
+    for combinator in ('oneOf', 'anyOf'):
+        if combinator in schema:
+            generators = [
+                _compile(subschema) for subschema in schema[combinator]
+            ]
+            return lambda: random.choice(generators)()
+
+    _type = schema.get('type')
+    if _type is None:
+        if 'properties' in schema:
+            _type = 'object'
+        elif 'items' in schema:
+            _type = 'array'
+        else:
+            _type = 'string'
+    elif isinstance(_type, list):
+        generators = [
+            _compile(dict(schema, type=subtype)) for subtype in _type
+        ]
+        return lambda: random.choice(generators)()
+
+    if _type == 'string':
+        return _compile_string(schema)
+    elif _type == 'integer':
+        return _compile_integer(schema)
+    elif _type == 'number':
+        return _compile_number(schema)
+    elif _type == 'boolean':
+        return lambda: random.random() < .5
+    elif _type == 'null':
+        return lambda: None
+    elif _type == 'array':
+        return _compile_array(schema, _compile, state)
+    elif _type == 'object':
+        return _compile_object(schema, _compile, state)
+    raise ValueError('Schema type \'%s\' not supported' % _type)
+
+
+@lru_cache(maxsize=128)
+def _compile_schema_json(schema_json):
+    schema = json.loads(schema_json)
+    return _compile_schema_node(schema, schema, {}, {'depth': 0})
+
+
+def compile_schema(schema):
+    '''Compiles a JSON Schema into a function that generates random values
+    which validate against it. Compiled generators are cached, so schemas are
+    only compiled the first time that are used and generating thousands of
+    values only requires calling the returned function.
+
+    Next keywords are supported: ``type`` (also as list of types), ``enum``,
+    ``const``, ``properties``, ``items`` (also as list for tuples),
+    ``minItems``, ``maxItems``, ``minimum``, ``maximum``,
+    ``exclusiveMinimum``, ``exclusiveMaximum``, ``multipleOf``,
+    ``minLength``, ``maxLength``, ``pattern``, ``format``, ``allOf``,
+    ``anyOf``, ``oneOf`` and local ``$ref`` references. All properties of
+    objects are generated, arrays without ``maxItems`` contain up to
+    ``SCHEMA_MAX_EXTRA_ITEMS`` extra items over their minimum (1 by default)
+    and numbers are rounded to 2 decimals if the rounded value is inside
+    their bounds. Strings generated by ``pattern`` or ``format`` are sampled
+    up to ``SCHEMA_MAX_LENGTH_SAMPLES`` times looking for one inside the
+    bounds of ``minLength`` and ``maxLength``. Recursive references are
+    followed up to ``SCHEMA_MAX_REF_DEPTH`` levels, deeper arrays are
+    generated empty and optional properties of deeper objects are skipped.
+    The ``required`` properties of ``allOf`` subschemas are merged.
+
+    Args:
+        schema (dict): JSON Schema specification.
+
+    Raises:
+        ValueError: if the schema uses an unsupported type or reference or
+            does not allow to generate any value.
+
+    Examples:
+        >>> generator = compile_schema({
+        ...     'type': 'object',
+        ...     'properties': {
+        ...         'id': {'type': 'integer', 'minimum': 1, 'maximum': 1},
+        ...         'role': {'enum': ['admin']},
+        ...         'tags': {'type': 'array', 'items': {'const': 'a'},
+        ...                  'minItems': 2, 'maxItems': 2},
+        ...     },
+        ... })
+        >>> generator()
+        {'id': 1, 'role': 'admin', 'tags': ['a', 'a']}
+
+        >>> compile_schema({'type': 'integer'}) is \\
+        ...     compile_schema({'type': 'integer'})
+        True
+
+        >>> compile_schema({'type': 'foo'})
+        Traceback (most recent call last):
+        ...
+        ValueError: Schema type 'foo' not supported
+
+    Returns:
+        function: Function without arguments which returns a new random value
+            each time it's called.
+    '''
+    return _compile_schema_json(json.dumps(schema))
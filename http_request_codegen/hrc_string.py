@@ -313,3 +313,48 @@ def lazy_escape_quote_func_by_quote_char(
                 ),
             }
         raise exception_cls(error_msg_schema)
+
+
+def escaped_chunks(string, width, first_width=None, escaped_char=None):
+    '''Splits a string in chunks of a fixed width slicing it, so the time
+    needed grows linearly with the length of the string. The chunks never
+    split escape sequences of an escaped character, so if the boundary of a
+    chunk falls between a backslash and the escaped character, the chunk is
+    shortened by one character (or enlarged, if it would be empty).
+
+    Args:
+        string (str): String to split.
+        width (int): Width of the chunks. Values lower than 1 are handled
+            as 1.
+        first_width (int): Width of the first chunk, if it differs from the
+            others. Values lower than 1 are handled as 1.
+        escaped_char (str): Character escaped inside the string by a
+            backslash, whose escape sequences can not be splitted.
+
+    Examples:
+        >>> escaped_chunks('abcdefgh', 3)
+        ['abc', 'def', 'gh']
+
+        >>> escaped_chunks('abcdefgh', 3, first_width=2)
+        ['ab', 'cde', 'fgh']
+
+        >>> escaped_chunks("ab\\\\'cdef", 3, escaped_char="'")
+        ['ab', "\\\\'c", 'def']
+
+        >>> escaped_chunks('', 3)
+        ['']
+
+    Returns:
+        list: String chunks, at least one.
+    '''
+    width = max(1, width)
+    chunk_width = width if first_width is None else max(1, first_width)
+    length, start, chunks = (len(string), 0, [])
+    while start < length:
+        end = start + chunk_width
+        if escaped_char and end < length and string[end] == escaped_char \
+                and string[end - 1] == '\\':
+            end = end - 1 if end - 1 > start else end + 1
+        chunks.append(string[start:end])
+        start, chunk_width = (end, width)
+    return chunks or ['']
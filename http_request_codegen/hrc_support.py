@@ -22,6 +22,11 @@ FEATURES_KWARGS = OrderedDict({
     'Custom initialization': 'setup',
     'Custom teardown': 'teardown',
     'Line wrapping': 'wrap',
+    'Sessions': 'session',
+    'Concurrent requests': 'fanout',
+    'HTTP/2': 'http2',
+    'Body compression': 'compress',
+    'Timing measurement': 'measure',
 })
 
 
@@ -1,14 +1,26 @@
 '''Parameter value formatter factory.'''
 
 import importlib
+import json
+import os
 import random
 import uuid
+from collections import OrderedDict
 from functools import lru_cache
 
+
+try:
+    from urllib.parse import urlencode
+except ImportError:
+    from urllib import urlencode
+
 from faker import Faker
 from faker.providers import lorem as faker_lorem_provider
 
+from http_request_codegen.hrc_http import MULTIPART_BOUNDARY
 from http_request_codegen.hrc_meta import CallableTypes
+from http_request_codegen.hrc_regex import compile_pattern_sampler
+from http_request_codegen.hrc_schema import compile_schema
 from http_request_codegen.hrc_string import lazy_string
 
 
@@ -101,6 +113,8 @@ def lazy_value_by_parameter(parameter_data, seed=None, locale=None):
     - ``'value'``
     - ``'values'``
     - ``'faker'``
+    - ``'pattern'``
+    - ``'schema'``
     - ``'type'``
 
     If none of the previous attributes are passed will be treated as if
@@ -113,8 +127,8 @@ def lazy_value_by_parameter(parameter_data, seed=None, locale=None):
 
     Args:
         parameter_data (dict): Parameter specification data. It's defined at
-            **type**, **value**, **values** and **faker** sections of
-            ``parameters`` argument as is defined at
+            **type**, **value**, **values**, **faker**, **pattern** and
+            **schema** sections of ``parameters`` argument as is defined at
             [``generate_http_request_code``](#generate_http_request_code)
             function documentation.
         seed (int): Seed using randomizing values.
@@ -128,6 +142,13 @@ def lazy_value_by_parameter(parameter_data, seed=None, locale=None):
         >>> result in ['foo', 'bar', 'baz']
         True
 
+        >>> result = lazy_value_by_parameter({'pattern': r'SKU-\\d{3}'})
+        >>> result.startswith('SKU-') and result[4:].isnumeric()
+        True
+
+        >>> lazy_value_by_parameter({'schema': {'enum': [[1, 2]]}})
+        '[1, 2]'
+
         >>> result = lazy_value_by_parameter({'type': 'int'})
         >>> result.replace('.', '', 1).lstrip('-').isnumeric() and \\
         ...     isinstance(result, str)
@@ -141,6 +162,9 @@ def lazy_value_by_parameter(parameter_data, seed=None, locale=None):
             not support the defined type.
         ImportError: ``'faker'`` attribute value, when passed as string,
             points to an inexistent Python object.
+        ValueError: ``'pattern'`` attribute value is not a valid regular
+            expression or it's not supported generating values, or the
+            ``'schema'`` attribute value is not a supported JSON Schema.
 
     Returns:
         str: Parameter value.
@@ -183,6 +207,16 @@ def lazy_value_by_parameter(parameter_data, seed=None, locale=None):
                 str(parameter_data['faker']), parameter_data['name'],
             ),
         )
+    elif 'pattern' in parameter_data:
+        sampler = compile_pattern_sampler(parameter_data['pattern'])
+        if seed is not None:
+            random.seed(seed)
+        return sampler()
+    elif 'schema' in parameter_data:
+        value = lazy_json_value_by_parameter(
+            parameter_data, seed=seed, locale=locale,
+        )
+        return value if isinstance(value, str) else json.dumps(value)
     if 'type' not in parameter_data:
         _type = 'str'
     else:
@@ -247,3 +281,278 @@ def lazy_value_by_parameter(parameter_data, seed=None, locale=None):
             parameter_data['type'], parameter_data['name'],
         ),
     )
+
+
+def lazy_json_value_by_parameter(parameter_data, seed=None, locale=None):
+    '''Given a dictionary of parameter options, returns the corresponding value
+    as a JSON serializable object. Values defined by a ``'schema'`` attribute
+    are generated by their compiled JSON Schema, so they can be nested objects
+    or arrays, literal numbers and booleans defined by ``'value'`` attribute
+    are returned as is and all other values are built as strings by
+    [``lazy_value_by_parameter``](#lazy_value_by_parameter).
+
+    This function is used by implementations that render JSON encoded bodies.
+
+    Args:
+        parameter_data (dict): Parameter specification data.
+        seed (int): Seed using randomizing values.
+        locale (str): Locale used for ``faker`` providers.
+
+    Examples:
+        >>> lazy_json_value_by_parameter({'value': 5})
+        5
+
+        >>> lazy_json_value_by_parameter({'value': 'foo'})
+        'foo'
+
+        >>> lazy_json_value_by_parameter({
+        ...     'schema': {
+        ...         'properties': {'tags': {'items': {'const': 'foo'},
+        ...                                 'maxItems': 1}},
+        ...     },
+        ... })
+        {'tags': ['foo']}
+
+    Returns:
+        object: Parameter value.
+    '''
+    if 'schema' in parameter_data:
+        generator = compile_schema(parameter_data['schema'])
+        if seed is not None:
+            random.seed(seed)
+        return generator()
+    elif isinstance(parameter_data.get('value'), (int, float, bool)):
+        return parameter_data['value']
+    return lazy_value_by_parameter(parameter_data, seed=seed, locale=locale)
+
+
+def lazy_json_body_by_parameters(parameters, seed=None, locale=None):
+    '''Builds the JSON serializable body of a request given its parameters.
+    Each parameter is a property of the resulting object unless only one
+    parameter without ``'name'`` and ``'names'`` attributes which defines a
+    ``'schema'`` attribute is passed. In this case, the value generated for
+    the schema is the entire body.
+
+    Args:
+        parameters (list): Parameters specifications data.
+        seed (int): Seed using randomizing values.
+        locale (str): Locale used for ``faker`` providers.
+
+    Examples:
+        >>> dict(lazy_json_body_by_parameters([{'name': 'foo', 'value': 1}]))
+        {'foo': 1}
+
+        >>> lazy_json_body_by_parameters([{'schema': {'const': [1, 2]}}])
+        [1, 2]
+
+    Returns:
+        object: Request body.
+    '''
+    if len(parameters) == 1 and 'schema' in parameters[0] and (
+        'name' not in parameters[0] and 'names' not in parameters[0]
+    ):
+        return lazy_json_value_by_parameter(
+            parameters[0], seed=seed, locale=locale,
+        )
+    return OrderedDict([
+        (
+            lazy_name_by_parameter(parameter, seed=seed),
+            lazy_json_value_by_parameter(
+                parameter, seed=seed, locale=locale,
+            ),
+        ) for parameter in parameters
+    ])
+
+
+def resolve_parameters(parameters, seed=None, locale=None):
+    '''Resolves the names and values of parameters specifications, returning
+    new specifications with fixed names and values. Rendering the resolved
+    parameters multiple times produces the same values each time without
+    building them again, which is useful rendering the same request with
+    different styles.
+
+    Values defined by a ``'schema'`` attribute are resolved as a ``'const'``
+    schema, so they are rendered as JSON objects or arrays by implementations
+    that render JSON encoded bodies. Resolved specifications only contain
+    ``'name'``, ``'value'`` and ``'schema'`` attributes, other attributes
+    like ``'values'``, ``'faker'``, ``'pattern'`` or ``'type'`` are dropped
+    because they only define how the values are built.
+
+    Args:
+        parameters (list): Parameters specifications data.
+        seed (int): Seed using randomizing names and values.
+        locale (str): Locale used for ``faker`` providers.
+
+    Examples:
+        >>> resolve_parameters([{'name': 'foo', 'values': ['bar']}])
+        [{'name': 'foo', 'value': 'bar'}]
+
+        >>> resolve_parameters([{'schema': {'enum': [[1, 2]]}}])
+        [{'schema': {'const': [1, 2]}}]
+
+    Returns:
+        list: Resolved parameters specifications.
+    '''
+    response = []
+    for parameter in parameters:
+        resolved = {}
+        if 'name' in parameter or 'names' in parameter:
+            resolved['name'] = lazy_name_by_parameter(parameter, seed=seed)
+        if 'schema' in parameter:
+            resolved['schema'] = {
+                'const': lazy_json_value_by_parameter(
+                    parameter, seed=seed, locale=locale,
+                ),
+            }
+        elif isinstance(parameter.get('value'), (int, float, bool)):
+            resolved['value'] = parameter['value']
+        else:
+            resolved['value'] = lazy_value_by_parameter(
+                parameter, seed=seed, locale=locale,
+            )
+        response.append(resolved)
+    return response
+
+
+def resolve_parameters_variants(parameters, variants, seed=None, locale=None):
+    '''Resolves multiple variants of parameters specifications at once, used
+    by generators of load testing scripts which cycle through requests built
+    before the test, so the load tool does not build values while it's
+    running. If a seed is passed, the variant ``i`` is resolved using
+    ``seed + i`` as seed, so the variants are reproducible but different.
+
+    Args:
+        parameters (list): Parameters specifications data.
+        variants (int): Number of variants to resolve.
+        seed (int): Seed using randomizing names and values.
+        locale (str): Locale used for ``faker`` providers.
+
+    Raises:
+        ValueError: if ``variants`` is not a positive integer.
+
+    Examples:
+        >>> resolve_parameters_variants([{'name': 'foo', 'value': 1}], 2)
+        [[{'name': 'foo', 'value': 1}], [{'name': 'foo', 'value': 1}]]
+
+        >>> variants = resolve_parameters_variants(
+        ...     [{'name': 'foo', 'values': list(range(100))}], 3, seed=1,
+        ... )
+        >>> variants == resolve_parameters_variants(
+        ...     [{'name': 'foo', 'values': list(range(100))}], 3, seed=1,
+        ... )
+        True
+
+    Returns:
+        list: Lists of resolved parameters specifications, one by variant.
+    '''
+    if isinstance(variants, bool) or not isinstance(variants, int) or \
+            variants < 1:
+        raise ValueError(
+            '\'variants\' argument must be a positive integer, but \'%s\''
+            ' passed' % (variants,),
+        )
+    return [
+        resolve_parameters(
+            parameters, seed=seed if seed is None else seed + i,
+            locale=locale,
+        ) for i in range(variants)
+    ]
+
+
+def body_chunks_by_parameters(
+    content_type, parameters, files={}, seed=None, locale=None,
+    boundary=MULTIPART_BOUNDARY,
+):
+    '''Builds the body of a request encoded as it's sent, used by generators
+    of load testing scripts whose bodies are built before the test. The
+    body is returned as a list of chunks, which are strings with encoded
+    content or ``(filepath,)`` tuples standing for the content of files,
+    read by the scripts. ``multipart/form-data`` bodies are delimited by
+    ``boundary`` and files without content type are sent as
+    ``application/octet-stream``.
+
+    Args:
+        content_type (str): Content type of the body, one of
+            ``application/x-www-form-urlencoded``, ``application/json``,
+            ``text/plain`` or ``multipart/form-data``.
+        parameters (list): Parameters specifications data.
+        files (dict): Files sent by the request.
+        seed (int): Seed using randomizing names and values.
+        locale (str): Locale used for ``faker`` providers.
+        boundary (str): Boundary of ``multipart/form-data`` bodies.
+
+    Examples:
+        >>> body_chunks_by_parameters(
+        ...     'application/x-www-form-urlencoded',
+        ...     [{'name': 'foo', 'value': 'bar baz'}],
+        ... )
+        ['foo=bar+baz']
+
+        >>> body_chunks_by_parameters(
+        ...     'application/json', [{'name': 'foo', 'value': 1}],
+        ... )
+        ['{"foo": 1}']
+
+        >>> body_chunks_by_parameters(
+        ...     'multipart/form-data', [],
+        ...     files={'file': ('/tmp/a.txt', 'text/plain')}, boundary='b',
+        ... )  # doctest: +NORMALIZE_WHITESPACE
+        ['--b\\r\\nContent-Disposition: form-data; name="file";
+          filename="a.txt"\\r\\nContent-Type: text/plain\\r\\n\\r\\n',
+         ('/tmp/a.txt',), '\\r\\n--b--\\r\\n']
+
+    Returns:
+        list: Chunks of the body.
+    '''
+    if content_type == 'application/json':
+        return [
+            json.dumps(
+                lazy_json_body_by_parameters(
+                    parameters, seed=seed, locale=locale,
+                ),
+            ),
+        ]
+
+    pairs = [
+        (
+            str(lazy_name_by_parameter(parameter, seed=seed)),
+            str(lazy_value_by_parameter(parameter, seed=seed, locale=locale)),
+        ) for parameter in parameters
+    ]
+    if content_type == 'text/plain':
+        return [value for _, value in pairs[:1]]
+    elif content_type != 'multipart/form-data':
+        return [urlencode(pairs)]
+
+    chunks, chunk = [], ''
+    for name, value in pairs:
+        chunk += (
+            '--%s\r\nContent-Disposition: form-data; name="%s"\r\n\r\n'
+            '%s\r\n'
+        ) % (boundary, name, value)
+    for name, value in files.items():
+        if isinstance(value, str) or value is None:
+            value = [value]
+        filepath = value[0]
+        if filepath is None:
+            # random filepath
+            filepath = lazy_value_by_parameter(
+                {
+                    'name': '',
+                    'faker': 'faker.providers.file::file_path',
+                },
+                seed=seed,
+                locale=locale,
+            )
+        chunk += (
+            '--%s\r\nContent-Disposition: form-data; name="%s";'
+            ' filename="%s"\r\nContent-Type: %s\r\n\r\n'
+        ) % (
+            boundary, name, os.path.basename(str(filepath)),
+            value[1] if len(value) > 1 and value[1]
+            else 'application/octet-stream',
+        )
+        chunks.extend([chunk, (str(filepath),)])
+        chunk = '\r\n'
+    chunks.append(chunk + '--%s--\r\n' % boundary)
+    return chunks
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+"""Benchmarks string literals definitions wrapping."""
+
+import argparse
+import sys
+import timeit
+
+from http_request_codegen import __version__
+from http_request_codegen.generators.javascript._utils import (
+    str_definition as js_str_definition,
+)
+from http_request_codegen.generators.python._utils import (
+    str_definition as py_str_definition,
+)
+
+
+DESCRIPTION = (
+    'String literals wrapping benchmark. This script measures the time'
+    ' spent defining wrapped strings of growing lengths for each language'
+    ' utilities of http-request-codegen. The time per character must remain'
+    ' constant as the length of the strings grows.'
+)
+
+STR_DEFINITION_FUNCS = {
+    'python': py_str_definition,
+    'javascript': js_str_definition,
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    parser.add_argument(
+        '-v', '--version', action='version',
+        version='%(prog)s ' + __version__,
+        help='Show program version number and exit.',
+    )
+    parser.add_argument(
+        '-s', '--sizes', dest='sizes', type=int, nargs='+',
+        default=[1000, 10000, 100000, 1000000],
+        help='Lengths of the strings to define.', metavar='SIZE',
+    )
+    parser.add_argument(
+        '-n', '--number', dest='number', type=int, default=5,
+        help='Number of repetitions of each measure, the minimum is taken.',
+        metavar='N',
+    )
+    parser.add_argument(
+        '-w', '--wrap', dest='wrap', type=int, default=80,
+        help='Wrap used defining the strings.', metavar='WRAP',
+    )
+    return parser
+
+
+def parse_options(args=[]):
+    parser = build_parser()
+    if '-h' in args or '--help' in args:
+        parser.print_help()
+        sys.exit(0)
+    opts, unknown = parser.parse_known_args(args)
+
+    return opts
+
+
+def main(args=[]):
+    opts = parse_options(args=args)
+
+    sys.stdout.write(
+        '%-12s %10s %12s %16s\n' % (
+            'language', 'length', 'seconds', 'ns/char',
+        ),
+    )
+    for language, str_definition_func in STR_DEFINITION_FUNCS.items():
+        for size in opts.sizes:
+            # quotes are included to measure escaping too
+            string = ('lorem ipsum dolor \'sit\' amet ' * size)[:size]
+            seconds = min(
+                timeit.repeat(
+                    lambda: str_definition_func(string, wrap=opts.wrap),
+                    number=1,
+                    repeat=opts.number,
+                ),
+            )
+            sys.stdout.write(
+                '%-12s %10d %12.6f %16.2f\n' % (
+                    language, size, seconds, seconds / size * 1e9,
+                ),
+            )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(args=sys.argv[1:]))
@@ -1,5 +1,6 @@
 '''Test cases arguments combinations.'''
 
+import mimetypes
 import os
 import sys
 
@@ -1360,6 +1361,97 @@ def get_argument_combinations(
                     },
                 },
             },
+            {
+                'name': 'Data by schema parameter (application/json)',
+                'arguments': {
+                    'url': TEST_BASE_URL,
+                    'parameters': [
+                        {
+                            'name': 'param-1',
+                            'schema': {
+                                'type': 'object',
+                                'properties': {
+                                    'id': {
+                                        'type': 'integer',
+                                        'minimum': 1,
+                                    },
+                                    'tags': {
+                                        'type': 'array',
+                                        'items': {'enum': ['foo', 'bar']},
+                                        'minItems': 2,
+                                        'maxItems': 2,
+                                    },
+                                    'active': {'type': 'boolean'},
+                                    'parent': {'type': 'null'},
+                                },
+                            },
+                        },
+                        {
+                            'name': 'param-2',
+                            'value': 'value-2',
+                        },
+                    ],
+                    'headers': {
+                        'Content-Type': 'application/json',
+                    },
+                    'seed': 5,
+                },
+            },
+            {
+                'name': 'Data by schema body (application/json)',
+                'arguments': {
+                    'url': TEST_BASE_URL,
+                    'parameters': [
+                        {
+                            'schema': {
+                                'type': 'array',
+                                'items': {
+                                    'type': 'object',
+                                    'properties': {
+                                        'email': {'format': 'email'},
+                                        'score': {
+                                            'type': 'number',
+                                            'minimum': 0,
+                                            'maximum': 10,
+                                        },
+                                    },
+                                },
+                                'minItems': 2,
+                                'maxItems': 2,
+                            },
+                        },
+                    ],
+                    'headers': {
+                        'Content-Type': 'application/json',
+                    },
+                    'seed': 5,
+                },
+            },
+            {
+                'name': 'Data by schema body (application/json) (oneline)',
+                'arguments': {
+                    'url': TEST_BASE_URL,
+                    'parameters': [
+                        {
+                            'schema': {
+                                'properties': {
+                                    'name': {'pattern': '[a-z]{4}'},
+                                    'ids': {
+                                        'items': {'const': 1},
+                                        'minItems': 2,
+                                        'maxItems': 2,
+                                    },
+                                },
+                            },
+                        },
+                    ],
+                    'headers': {
+                        'Content-Type': 'application/json',
+                    },
+                    'oneline': True,
+                    'seed': 5,
+                },
+            },
         ])
 
     if include_filenames:
@@ -1371,3 +1463,45 @@ def get_argument_combinations(
                 fname = os.path.join(dirpath, fname)
             args_group['filename'] = fname
     return response
+
+
+def get_runnable_argument_combinations(
+    method='GET', dirpath=None, supported_kwargs=None, unsupported_kwargs=(),
+):
+    # combinations whose optional arguments can be executed by an
+    # implementation, defined by the optional arguments that it supports
+    # or by the ones that it doesn't support
+    response = []
+    for args_group in get_argument_combinations(
+        method=method, dirpath=dirpath,
+    ):
+        kwargs = set(args_group['arguments'].get('kwargs', {}))
+        if supported_kwargs is not None and not kwargs <= set(
+            supported_kwargs,
+        ):
+            continue
+        if kwargs & set(unsupported_kwargs):
+            continue
+        response.append(args_group)
+    return response
+
+
+def files_content_types_arguments(
+    arguments, content_type=None, files_headers=False,
+):
+    # arguments with the content types of the files sent by implementations
+    # that define them when they're not defined, guessing them if a
+    # 'content_type' is not passed, without headers for each file if
+    # they're not supported
+    if not arguments.get('files'):
+        return arguments
+    files = {}
+    for name, value in arguments['files'].items():
+        if isinstance(value, str):
+            value = [
+                value,
+                content_type or mimetypes.guess_type(value)[0] or
+                'application/octet-stream',
+            ]
+        files[name] = value if files_headers else list(value[:2])
+    return dict(arguments, files=files)
@@ -60,6 +60,9 @@ def assert_request_args():
 
         if 'parameters' in request_args:
             for param in request_args['parameters']:
+                if 'name' not in param:
+                    # entire body defined by a schema
+                    continue
                 if content_type == 'text/plain':
                     assert not param['name']
                 else:
@@ -70,7 +73,8 @@ def assert_request_args():
                 for _param in response_args['parameters']:
                     if str(param['name']) == _param['name']:
                         _param_found = True
-                        assert str(param['value']) == _param['value']
+                        if 'value' in param:
+                            assert str(param['value']) == _param['value']
 
                         if content_type == 'text/plain':
                             assert not _param['name']
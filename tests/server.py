@@ -1,7 +1,9 @@
 '''Flask testing server.'''
 
+import io
 import os
 import sys
+import zlib
 
 import flask
 
@@ -17,6 +19,21 @@ def build_test_server():
     # Setup Flask server in new process
     test_server = flask.Flask('http-request-codegen_tests')
 
+    @test_server.before_request
+    def decompress_body():
+        # compressed bodies are decompressed before parsing them
+        content_encoding = flask.request.headers.get('Content-Encoding')
+        if content_encoding not in ('gzip', 'deflate'):
+            return
+        environ = flask.request.environ
+        data = zlib.decompress(
+            environ['wsgi.input'].read(int(environ['CONTENT_LENGTH'])),
+            16 + zlib.MAX_WBITS if content_encoding == 'gzip' else
+            zlib.MAX_WBITS,
+        )
+        environ['wsgi.input'] = io.BytesIO(data)
+        environ['CONTENT_LENGTH'] = str(len(data))
+
     @test_server.route('/', methods=['GET', 'POST'])
     def hello_world():
         response = {
@@ -51,7 +68,7 @@ def build_test_server():
                     ]
                 elif content_type == 'application/json':
                     json_data = flask.request.get_json(silent=True)
-                    if json_data is not None:
+                    if isinstance(json_data, dict):
                         response['parameters'] = [
                             {
                                 'name': name,
@@ -92,6 +109,10 @@ def build_test_server():
                                 if file_headers:
                                     fvalue.append(file_headers)
                             response['files'][file_param_name] = fvalue
+                elif content_type == 'application/octet-stream':
+                    # some clients, like aiohttp, define this content type
+                    # for requests without body
+                    response['parameters'] = []
                 elif len(content_type) < 50:
                     raise NotImplementedError(
                         (
@@ -0,0 +1,79 @@
+'''Test code snippets writing into file-like objects.'''
+
+import io
+import os
+
+import pytest
+
+from http_request_codegen import (
+    generate_http_request_code,
+    supported_methods,
+    write_http_request_code,
+)
+from http_request_codegen.hrc_emitter import Emitter
+
+from tests.combinations import (
+    combination_arguments_to_kwargs,
+    get_argument_combinations,
+)
+
+
+TEST_GENERATORS_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), 'test_generators'),
+)
+
+
+def _golden_cases():
+    response = []
+    for language, impls in supported_methods().items():
+        for impl, methods in impls.items():
+            for method in methods:
+                dirpath = os.path.join(
+                    TEST_GENERATORS_DIR,
+                    'test_%s' % language,
+                    'test_%s' % impl,
+                    method,
+                )
+                if not os.path.isdir(dirpath):
+                    continue
+                for args_group in get_argument_combinations(
+                    method=method, dirpath=dirpath,
+                ):
+                    response.append((language, impl, method, args_group))
+    return response
+
+
+@pytest.mark.parametrize(
+    ('language', 'impl', 'method', 'args_group'),
+    _golden_cases(),
+    ids=lambda value: os.path.basename(value['filename'])
+    if isinstance(value, dict) else value,
+)
+def test_write_http_request_code(language, impl, method, args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    f = io.StringIO()
+    response = write_http_request_code(
+        f, language, impl, method,
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert response is None
+    assert f.getvalue() == expected_result
+
+
+def test_emitter_column():
+    emitter = Emitter()
+    for chunk in ('foo', 'bar\nbaz', '', '\n', 'qux'):
+        emitter.write(chunk)
+        code = emitter.getvalue()
+        assert emitter.column == len(code) - code.rfind('\n') - 1
+
+
+def test_generate_http_request_code__emitter():
+    emitter = Emitter()
+    emitter.write('# header\n')
+    response = generate_http_request_code(setup=False, _emitter=emitter)
+
+    assert response == '# header\nreq = requests.get(\'http://localhost\')'
@@ -7,17 +7,221 @@ import pytest
 from http_request_codegen import generate_http_request_code
 
 from tests.combinations import (
+    argument_combination_to_filename,
     combination_arguments_to_kwargs,
     get_argument_combinations,
 )
+from tests.consts import TEST_BASE_URL
 
 
 CASES_DIRS = {
     method: os.path.abspath(os.path.join(os.path.dirname(__file__), method))
-    for method in ['GET', 'POST']
+    for method in ['GET', 'POST', 'compress', 'large_body', 'measure']
 }
 
 
+COMPRESS_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'POST gzip JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'compress': 'gzip',
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'value': 1},
+            ],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST deflate form parameters + headers',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'compress': 'deflate',
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Accept-Language': 'es'},
+        },
+    },
+    {
+        'name': 'POST gzip JSON parameter (oneline)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'compress': 'gzip',
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Content-Type': 'application/json'},
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'POST gzip without parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'compress': 'gzip',
+        },
+    },
+]
+for _index, _args_group in enumerate(COMPRESS_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['compress'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+LARGE_BODY_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'POST large JSON parameters from standard input',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'large_body': 10,
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'value': 1},
+            ],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST form parameters under large body threshold',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'large_body': 1024,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+        },
+    },
+    {
+        'name': 'POST form parameters from body file',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'body_file': 'body.txt',
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Accept-Language': 'es'},
+        },
+    },
+    {
+        'name': 'POST large body (oneline)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'large_body': 0,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'GET transfer options',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'http2': True,
+            'tcp_fastopen': True,
+            'keepalive_time': 30,
+        },
+    },
+    {
+        'name': 'POST body file + transfer options',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'body_file': 'body.json',
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Content-Type': 'application/json'},
+            'http2': True,
+            'keepalive_time': 60,
+        },
+    },
+]
+for _index, _args_group in enumerate(LARGE_BODY_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['large_body'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+MEASURE_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET measure',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': True,
+        },
+    },
+    {
+        'name': 'GET measure repetitions + parameter + headers',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Accept-Language': 'es'},
+        },
+    },
+    {
+        'name': 'GET measure repetitions (oneline)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'POST measure + JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': True,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST measure repetitions + file (indent 4 spaces)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 20,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {'file': '/tmp/measure-file.txt'},
+            'indent': '    ',
+        },
+    },
+    {
+        'name': 'POST measure repetitions + large body',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'large_body': 0,
+        },
+    },
+    {
+        'name': 'POST measure repetitions + gzip JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'compress': 'gzip',
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Content-Type': 'application/json'},
+            'quote_char': '"',
+        },
+    },
+]
+for _index, _args_group in enumerate(MEASURE_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['measure'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
 @pytest.mark.parametrize(
     'args_group',
     get_argument_combinations(method='GET', dirpath=CASES_DIRS['GET']),
@@ -50,3 +254,87 @@ def test_bash_curl_post(args_group):
     )
 
     assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    COMPRESS_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_bash_curl_compress(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'bash', 'curl', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+def test_bash_curl_compress__multipart():
+    with pytest.raises(ValueError, match='can\'t be compressed'):
+        generate_http_request_code(
+            'bash', 'curl', 'POST', compress='gzip',
+            files={'foo': '/tmp/foo.txt'},
+        )
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    LARGE_BODY_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_bash_curl_large_body(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'bash', 'curl', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'exception', 'message'),
+    (
+        ({'large_body': -1}, ValueError, 'must be a non negative integer'),
+        ({'large_body': True}, ValueError, 'must be a non negative integer'),
+        ({'body_file': 1}, TypeError, '\'body_file\' must be a string'),
+        (
+            {'large_body': 0, 'compress': 'gzip'},
+            ValueError, 'can\'t be used with large bodies',
+        ),
+        ({'keepalive_time': 0}, ValueError, 'must be a positive integer'),
+    ),
+    ids=(
+        'large_body-negative', 'large_body-bool', 'body_file',
+        'compress', 'keepalive_time',
+    ),
+)
+def test_bash_curl_large_body__invalid(kwargs, exception, message):
+    with pytest.raises(exception, match=message):
+        generate_http_request_code(
+            'bash', 'curl', 'POST',
+            parameters=[{'name': 'foo', 'value': 'bar'}], **kwargs,
+        )
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    MEASURE_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_bash_curl_measure(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'bash', 'curl', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
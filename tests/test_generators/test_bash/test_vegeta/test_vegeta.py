@@ -0,0 +1,194 @@
+"""Tests for Bash vegeta implementation generators."""
+
+import os
+import shutil
+import subprocess
+import tempfile
+
+import pytest
+
+from http_request_codegen import generate_http_request_code
+
+from tests.combinations import (
+    argument_combination_to_filename,
+    combination_arguments_to_kwargs,
+    get_argument_combinations,
+)
+from tests.consts import TEMPDIR, TEST_BASE_URL
+
+
+CASES_DIRS = {
+    method: os.path.abspath(os.path.join(os.path.dirname(__file__), method))
+    for method in ['GET', 'POST', 'targets']
+}
+
+TARGETS_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET rate + duration + headers',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'headers': {'Accept': 'application/json'},
+            'rate': 100,
+            'duration': '30s',
+        },
+    },
+    {
+        'name': 'GET variants + seed',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL + '/foo?page=1',
+            'parameters': [
+                {'name': 'q', 'values': ['foo', 'bar', 'baz', 'qux']},
+            ],
+            'variants': 3,
+            'seed': 1,
+        },
+    },
+    {
+        'name': 'POST variants + JSON parameters (one line)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'parameters': [
+                {'name': 'foo', 'values': ['bar', 'baz']},
+                {'name': 'qux', 'value': 1},
+            ],
+            'headers': {'Content-Type': 'application/json'},
+            'variants': 2,
+            'seed': 0,
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'POST parameter + files (double quotes)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {
+                'file': ('/tmp/vegeta-file.txt', 'text/plain'),
+                'other': '/tmp/vegeta-other-file.bin',
+            },
+            'quote_char': '"',
+        },
+    },
+]
+for _index, _args_group in enumerate(TARGETS_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['targets'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='GET', dirpath=CASES_DIRS['GET']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_bash_vegeta_get(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'bash', 'vegeta', 'GET',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='POST', dirpath=CASES_DIRS['POST']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_bash_vegeta_post(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'bash', 'vegeta', 'POST',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    TARGETS_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_bash_vegeta_targets(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'bash', 'vegeta', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'exception', 'error_message'),
+    (
+        ({'rate': 0}, ValueError, 'must be a positive integer'),
+        ({'rate': True}, ValueError, 'must be a positive integer'),
+        ({'duration': 30}, TypeError, 'must be a string'),
+        ({'variants': 0}, ValueError, 'must be a positive integer'),
+    ),
+)
+def test_bash_vegeta_targets__invalid(kwargs, exception, error_message):
+    with pytest.raises(exception, match=error_message):
+        generate_http_request_code('bash', 'vegeta', 'GET', **kwargs)
+
+
+@pytest.mark.skipif(shutil.which('bash') is None, reason='bash not found')
+@pytest.mark.parametrize('oneline', (False, True))
+def test_bash_vegeta_post__bodies(oneline):
+    # the script is run with a 'vegeta' function which writes the targets,
+    # checking the bodies written by the script
+    filepath = os.path.join(TEMPDIR, 'vegeta-body-file.txt')
+    with open(filepath, 'wb') as f:
+        f.write(b'foo\r\nbar')
+
+    try:
+        code = generate_http_request_code(
+            'bash', 'vegeta', 'POST', url=TEST_BASE_URL,
+            parameters=[{'name': 'foo', 'value': 'it\'s $1 "bar"'}],
+            files={'file': filepath}, setup=False, oneline=oneline,
+        )
+        with tempfile.TemporaryDirectory() as dirpath:
+            process = subprocess.run(
+                [
+                    'bash', '-c',
+                    'vegeta() { if [ "$1" = attack ]; then cat > targets.txt;'
+                    ' fi; }\n' + code,
+                ],
+                cwd=dirpath, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                timeout=10,
+            )
+            assert process.returncode == 0, process.stderr
+
+            with open(os.path.join(dirpath, 'targets.txt')) as f:
+                targets = f.read()
+            with open(os.path.join(dirpath, 'body.bin'), 'rb') as f:
+                body = f.read()
+    finally:
+        os.remove(filepath)
+
+    assert targets == (
+        'POST %s\nContent-Type: multipart/form-data;'
+        ' boundary=HttpRequestCodegenBoundary\n@body.bin\n' % TEST_BASE_URL
+    )
+    assert body == (
+        b'--HttpRequestCodegenBoundary\r\nContent-Disposition: form-data;'
+        b' name="foo"\r\n\r\nit\'s $1 "bar"\r\n'
+        b'--HttpRequestCodegenBoundary\r\nContent-Disposition: form-data;'
+        b' name="file"; filename="vegeta-body-file.txt"\r\n'
+        b'Content-Type: application/octet-stream\r\n\r\nfoo\r\nbar\r\n'
+        b'--HttpRequestCodegenBoundary--\r\n'
+    )
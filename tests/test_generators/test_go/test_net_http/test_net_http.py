@@ -0,0 +1,188 @@
+"""Tests for Go net/http implementation generators."""
+
+import os
+import shutil
+import subprocess
+import tempfile
+
+import pytest
+
+from http_request_codegen import generate_http_request_code
+
+from tests.combinations import (
+    argument_combination_to_filename,
+    combination_arguments_to_kwargs,
+    get_argument_combinations,
+)
+from tests.consts import TEST_BASE_URL
+
+
+CASES_DIRS = {
+    method: os.path.abspath(os.path.join(os.path.dirname(__file__), method))
+    for method in ['GET', 'POST', 'transport']
+}
+
+TRANSPORT_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET max idle connections by host + idle timeout',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'max_idle_conns_per_host': 500,
+            'idle_conn_timeout': 30,
+        },
+    },
+    {
+        'name': 'GET without HTTP/2 + query in URL + parameters',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL + '/?page=1',
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'foo', 'value': 'baz'},
+            ],
+            'http2': False,
+        },
+    },
+    {
+        'name': 'POST parameters + files (indent 4 spaces)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {
+                'file': ('/tmp/transport-file.txt', 'text/plain'),
+                'other': '/tmp/transport-other-file.bin',
+            },
+            'indent': '    ',
+        },
+    },
+]
+for _index, _args_group in enumerate(TRANSPORT_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['transport'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+def programs_combinations():
+    # combinations rendered as complete programs
+    response = []
+    for method in ('GET', 'POST'):
+        for args_group in get_argument_combinations(
+            method=method, dirpath=CASES_DIRS[method],
+        ):
+            args_group = dict(args_group, method=method)
+            if args_group['arguments'].get('setup', True) is True and \
+                    not args_group['arguments'].get('teardown'):
+                response.append(args_group)
+    response.extend(TRANSPORT_ARGUMENT_COMBINATIONS)
+    return response
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='GET', dirpath=CASES_DIRS['GET']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_go_net_http_get(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'go', 'net_http', 'GET',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='POST', dirpath=CASES_DIRS['POST']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_go_net_http_post(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'go', 'net_http', 'POST',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    TRANSPORT_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_go_net_http_transport(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'go', 'net_http', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'kwargs',
+    (
+        {'max_idle_conns_per_host': 0},
+        {'max_idle_conns_per_host': True},
+        {'idle_conn_timeout': 1.5},
+    ),
+)
+def test_go_net_http_transport__invalid(kwargs):
+    with pytest.raises(ValueError, match='must be a positive integer'):
+        generate_http_request_code('go', 'net_http', 'GET', **kwargs)
+
+
+@pytest.mark.parametrize('setup', (False, 'package main\n\n'))
+@pytest.mark.parametrize(
+    ('argument', 'value'),
+    (
+        ('max_idle_conns_per_host', 500),
+        ('idle_conn_timeout', 30),
+        ('http2', False),
+    ),
+)
+def test_go_net_http_transport__without_setup(argument, value, setup):
+    error_message = '\'%s\' argument requires the client' % argument
+    with pytest.raises(ValueError, match=error_message):
+        generate_http_request_code(
+            'go', 'net_http', 'GET', setup=setup, **{argument: value},
+        )
+
+
+@pytest.mark.skipif(shutil.which('go') is None, reason='go not found')
+def test_go_net_http__vet():
+    # all the programs are vetted at once as packages of the same module,
+    # which is much faster than vetting them one by one
+    with tempfile.TemporaryDirectory() as dirpath:
+        with open(os.path.join(dirpath, 'go.mod'), 'w') as f:
+            f.write('module vet\n\ngo 1.16\n')
+        for index, args_group in enumerate(programs_combinations()):
+            package_dirpath = os.path.join(dirpath, 'p%03d' % index)
+            os.mkdir(package_dirpath)
+            with open(os.path.join(package_dirpath, 'main.go'), 'w') as f:
+                f.write(
+                    generate_http_request_code(
+                        'go', 'net_http', args_group['method'],
+                        **combination_arguments_to_kwargs(
+                            args_group['arguments'],
+                        ),
+                    ),
+                )
+
+        process = subprocess.run(
+            ['go', 'vet', './...'], cwd=dirpath, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, universal_newlines=True, timeout=300,
+        )
+    assert process.returncode == 0, process.stderr
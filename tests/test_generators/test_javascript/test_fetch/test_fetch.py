@@ -4,20 +4,297 @@ import os
 
 import pytest
 
-from http_request_codegen import generate_http_request_code
+from http_request_codegen import (
+    generate_http_request_code,
+    generate_http_request_program,
+)
 
 from tests.combinations import (
+    argument_combination_to_filename,
     combination_arguments_to_kwargs,
     get_argument_combinations,
 )
+from tests.consts import TEST_BASE_URL
 
 
 CASES_DIRS = {
     method: os.path.abspath(os.path.join(os.path.dirname(__file__), method))
-    for method in ['GET', 'POST']
+    for method in ['GET', 'POST', 'compress', 'fanout', 'stream', 'measure']
 }
 
 
+COMPRESS_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'POST gzip JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'compress': 'gzip',
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'value': 1},
+            ],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST deflate form parameters + headers',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'compress': 'deflate',
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Accept-Language': 'es'},
+        },
+    },
+    {
+        'name': 'POST gzip text parameter (oneline)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'compress': 'gzip',
+            'parameters': [{'value': 'foo bar'}],
+            'headers': {'Content-Type': 'text/plain'},
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'POST gzip without parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'compress': 'gzip',
+        },
+    },
+]
+for _index, _args_group in enumerate(COMPRESS_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['compress'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+FANOUT_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET fanout',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'fanout': 10,
+        },
+    },
+    {
+        'name': 'GET fanout + concurrency + parameter + headers',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'fanout': 100,
+            'concurrency': 10,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Accept-Language': 'es'},
+        },
+    },
+    {
+        'name': 'GET fanout + concurrency (oneline)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'fanout': 10,
+            'concurrency': 2,
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'POST fanout + JSON parameters (indent 4 spaces)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'fanout': 10,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Content-Type': 'application/json'},
+            'indent': '    ',
+        },
+    },
+    {
+        'name': 'POST fanout + concurrency + parameter + file',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'fanout': 20,
+            'concurrency': 4,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {'file': '/tmp/fanout-file.txt'},
+        },
+    },
+    {
+        'name': 'POST fanout + concurrency + gzip text parameter',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'fanout': 20,
+            'concurrency': 4,
+            'compress': 'gzip',
+            'parameters': [{'value': 'foo bar'}],
+            'headers': {'Content-Type': 'text/plain'},
+            'quote_char': '"',
+        },
+    },
+]
+for _index, _args_group in enumerate(FANOUT_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['fanout'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+STREAM_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET stream response',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'stream_response': True,
+        },
+    },
+    {
+        'name': 'GET stream response + setup',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'stream_response': True,
+            'setup': True,
+        },
+    },
+    {
+        'name': 'GET stream response + header (oneline)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'stream_response': True,
+            'headers': {'Accept-Language': 'es'},
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'POST stream upload + file with content type',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'stream_upload': True,
+            'files': {'file': ('/tmp/upload.bin', 'application/octet-stream')},
+        },
+    },
+    {
+        'name': 'POST stream upload + file without setup',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'stream_upload': True,
+            'files': {'file': '/tmp/upload.bin'},
+            'setup': False,
+        },
+    },
+    {
+        'name': 'POST stream upload + stream response + header + kwarg',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'stream_upload': True,
+            'stream_response': True,
+            'files': {'file': ('/tmp/upload.csv', 'text/plain')},
+            'headers': {'Content-Type': 'text/csv'},
+            'kwargs': {'cache': 'no-cache'},
+            'quote_char': '"',
+        },
+    },
+    {
+        'name': 'POST stream response + JSON parameter (indent 4 spaces)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'stream_response': True,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Content-Type': 'application/json'},
+            'indent': '    ',
+        },
+    },
+]
+for _index, _args_group in enumerate(STREAM_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['stream'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+MEASURE_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET measure',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': True,
+        },
+    },
+    {
+        'name': 'GET measure repetitions + parameter + headers',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Accept-Language': 'es'},
+        },
+    },
+    {
+        'name': 'GET measure repetitions (oneline)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'POST measure + JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': True,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST measure repetitions + file (indent 4 spaces)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 20,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {'file': '/tmp/measure-file.txt'},
+            'indent': '    ',
+        },
+    },
+    {
+        'name': 'POST measure repetitions + gzip text parameter',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'compress': 'gzip',
+            'parameters': [{'value': 'foo bar'}],
+            'headers': {'Content-Type': 'text/plain'},
+            'quote_char': '"',
+        },
+    },
+]
+for _index, _args_group in enumerate(MEASURE_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['measure'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
 @pytest.mark.parametrize(
     'args_group',
     get_argument_combinations(method='GET', dirpath=CASES_DIRS['GET']),
@@ -50,3 +327,155 @@ def test_javascript_fetch_post(args_group):
     )
 
     assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    COMPRESS_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_javascript_fetch_compress(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'javascript', 'fetch', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+def test_javascript_fetch_compress__multipart():
+    with pytest.raises(ValueError, match='can\'t be compressed'):
+        generate_http_request_code(
+            'javascript', 'fetch', 'POST', compress='gzip',
+            files={'foo': '/tmp/foo.txt'},
+        )
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    FANOUT_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_javascript_fetch_fanout(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'javascript', 'fetch', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'error_message'),
+    (
+        (
+            {'concurrency': 2},
+            '\'concurrency\' argument requires \'fanout\' argument',
+        ),
+        (
+            {'fanout': 0},
+            '\'fanout\' argument must be a positive integer',
+        ),
+    ),
+)
+def test_javascript_fetch_fanout__invalid(kwargs, error_message):
+    with pytest.raises(ValueError, match=error_message):
+        generate_http_request_code('javascript', 'fetch', 'GET', **kwargs)
+
+
+def test_javascript_fetch_fanout__program():
+    with pytest.raises(ValueError, match='not supported by programs'):
+        generate_http_request_program(
+            [{'url': TEST_BASE_URL, 'fanout': 10}], language='javascript',
+        )
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    STREAM_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_javascript_fetch_stream(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'javascript', 'fetch', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'error_message'),
+    (
+        (
+            {
+                'stream_upload': True,
+                'files': {'foo': '/tmp/foo.txt', 'bar': '/tmp/bar.txt'},
+            },
+            'requires only one file and no parameters',
+        ),
+        (
+            {
+                'stream_upload': True,
+                'files': {'foo': '/tmp/foo.txt'},
+                'parameters': [{'name': 'bar'}],
+            },
+            'requires only one file and no parameters',
+        ),
+        (
+            {'stream_response': True, 'fanout': 10},
+            'can\'t be used with \'fanout\'',
+        ),
+    ),
+)
+def test_javascript_fetch_stream__invalid(kwargs, error_message):
+    with pytest.raises(ValueError, match=error_message):
+        generate_http_request_code('javascript', 'fetch', 'POST', **kwargs)
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    MEASURE_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_javascript_fetch_measure(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'javascript', 'fetch', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'error_message'),
+    (
+        (
+            {'measure': 0},
+            'must be a boolean or a positive integer',
+        ),
+        (
+            {'measure': 10, 'fanout': 10},
+            '\'measure\' argument can\'t be used with \'fanout\'',
+        ),
+        (
+            {'measure': True, 'stream_response': True},
+            '\'measure\' argument can\'t be used with \'stream_response\'',
+        ),
+    ),
+)
+def test_javascript_fetch_measure__invalid(kwargs, error_message):
+    with pytest.raises(ValueError, match=error_message):
+        generate_http_request_code('javascript', 'fetch', 'GET', **kwargs)
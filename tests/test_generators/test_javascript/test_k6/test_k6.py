@@ -0,0 +1,185 @@
+"""Tests for Javascript k6 implementation generators."""
+
+import os
+
+import pytest
+
+from http_request_codegen import generate_http_request_code
+
+from tests.combinations import (
+    argument_combination_to_filename,
+    combination_arguments_to_kwargs,
+    get_argument_combinations,
+)
+from tests.consts import TEST_BASE_URL
+
+
+CASES_DIRS = {
+    method: os.path.abspath(os.path.join(os.path.dirname(__file__), method))
+    for method in ['GET', 'POST', 'options']
+}
+
+OPTIONS_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET vus + duration',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'vus': 10,
+            'duration': '30s',
+        },
+    },
+    {
+        'name': 'GET rate + thresholds + parameter + headers',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'vus': 50,
+            'duration': '1m',
+            'rate': 100,
+            'thresholds': {
+                'http_req_duration': ['p(95)<500', 'p(99)<1500'],
+                'http_req_failed': 'rate<0.01',
+            },
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Accept-Language': 'es'},
+        },
+    },
+    {
+        'name': 'GET vus + thresholds (oneline)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'vus': 10,
+            'thresholds': {'http_req_duration': 'p(95)<500'},
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'GET duration + custom setup',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'duration': '10s',
+            'setup': 'import http from \'k6/http\';\n\n',
+        },
+    },
+    {
+        'name': 'POST vus + duration + JSON parameters (double quotes)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'vus': 10,
+            'duration': '30s',
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'value': 1},
+            ],
+            'headers': {'Content-Type': 'application/json'},
+            'quote_char': '"',
+        },
+    },
+    {
+        'name': 'POST rate + parameter + files (indent 4 spaces)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'vus': 20,
+            'duration': '5m',
+            'rate': 200,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {
+                'file': ('/tmp/options-file.txt', 'text/plain'),
+                'other': '/tmp/options-other-file.bin',
+            },
+            'indent': '    ',
+        },
+    },
+    {
+        'name': 'GET vus + parameter + URL with query',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL + '?baz=1',
+            'vus': 10,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+        },
+    },
+]
+for _index, _args_group in enumerate(OPTIONS_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['options'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='GET', dirpath=CASES_DIRS['GET']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_javascript_k6_get(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'javascript', 'k6', 'GET',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='POST', dirpath=CASES_DIRS['POST']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_javascript_k6_post(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'javascript', 'k6', 'POST',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    OPTIONS_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_javascript_k6_options(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'javascript', 'k6', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'exception', 'error_message'),
+    (
+        ({'vus': 0}, ValueError, 'must be a positive integer'),
+        ({'rate': True}, ValueError, 'must be a positive integer'),
+        ({'duration': 30}, TypeError, 'must be a string'),
+        (
+            {'thresholds': ['p(95)<500']},
+            TypeError, 'must be a dictionary',
+        ),
+        ({'rate': 10, 'vus': 10}, ValueError, 'requires \'vus\' and'),
+        (
+            {'vus': 10, 'setup': False},
+            ValueError, 'requires initialization',
+        ),
+    ),
+)
+def test_javascript_k6_options__invalid(kwargs, exception, error_message):
+    with pytest.raises(exception, match=error_message):
+        generate_http_request_code('javascript', 'k6', 'GET', **kwargs)
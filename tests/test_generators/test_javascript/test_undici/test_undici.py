@@ -0,0 +1,236 @@
+"""Tests for Javascript undici implementation generators."""
+
+import os
+
+import pytest
+
+from http_request_codegen import generate_http_request_code
+
+from tests.combinations import (
+    argument_combination_to_filename,
+    combination_arguments_to_kwargs,
+    get_argument_combinations,
+)
+from tests.consts import TEST_BASE_URL
+
+
+CASES_DIRS = {
+    method: os.path.abspath(os.path.join(os.path.dirname(__file__), method))
+    for method in ['GET', 'POST', 'agent', 'measure']
+}
+
+AGENT_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET agent connections',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'connections': 10,
+        },
+    },
+    {
+        'name': 'GET agent connections + pipelining + keep alive timeout',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'connections': 10,
+            'pipelining': 4,
+            'keep_alive_timeout': 10000,
+        },
+    },
+    {
+        'name': 'GET agent pipelining + parameter + kwarg (oneline)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'pipelining': 4,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'kwargs': {'bodyTimeout': 5000},
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'POST agent pipelining + JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'pipelining': 4,
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'value': 1},
+            ],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST agent connections + parameter + file (indent 4 spaces)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'connections': 2,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {'file': ('/tmp/agent-file.txt', 'text/plain')},
+            'indent': '    ',
+        },
+    },
+]
+for _index, _args_group in enumerate(AGENT_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['agent'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+MEASURE_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET measure',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': True,
+        },
+    },
+    {
+        'name': 'GET measure repetitions + parameter + headers',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Accept-Language': 'es'},
+        },
+    },
+    {
+        'name': 'GET measure repetitions (oneline)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'POST measure + JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': True,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST measure repetitions + file (indent 4 spaces)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 20,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {'file': '/tmp/measure-file.txt'},
+            'indent': '    ',
+        },
+    },
+    {
+        'name': 'GET measure repetitions + agent',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'connections': 10,
+        },
+    },
+]
+for _index, _args_group in enumerate(MEASURE_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['measure'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='GET', dirpath=CASES_DIRS['GET']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_javascript_undici_get(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'javascript', 'undici', 'GET',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='POST', dirpath=CASES_DIRS['POST']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_javascript_undici_post(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'javascript', 'undici', 'POST',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    AGENT_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_javascript_undici_agent(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'javascript', 'undici', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'kwargs',
+    ({'connections': 0}, {'pipelining': True}, {'keep_alive_timeout': 1.5}),
+)
+def test_javascript_undici_agent__invalid(kwargs):
+    with pytest.raises(ValueError, match='must be a positive integer'):
+        generate_http_request_code('javascript', 'undici', 'GET', **kwargs)
+
+
+@pytest.mark.parametrize('setup', (False, 'const agent = null;\n\n'))
+@pytest.mark.parametrize(
+    'argument', ('connections', 'pipelining', 'keep_alive_timeout'),
+)
+def test_javascript_undici_agent__without_setup(argument, setup):
+    error_message = '\'%s\' argument requires the agent' % argument
+    with pytest.raises(ValueError, match=error_message):
+        generate_http_request_code(
+            'javascript', 'undici', 'GET', setup=setup, **{argument: 4},
+        )
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    MEASURE_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_javascript_undici_measure(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'javascript', 'undici', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
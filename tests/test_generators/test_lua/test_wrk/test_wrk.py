@@ -0,0 +1,215 @@
+"""Tests for Lua wrk implementation generators."""
+
+import os
+
+import pytest
+
+from http_request_codegen import (
+    generate_http_request_code,
+    generate_http_request_program,
+)
+
+from tests.combinations import (
+    argument_combination_to_filename,
+    combination_arguments_to_kwargs,
+    get_argument_combinations,
+)
+from tests.consts import TEST_BASE_URL
+
+
+CASES_DIRS = {
+    method: os.path.abspath(os.path.join(os.path.dirname(__file__), method))
+    for method in ['GET', 'POST', 'variants']
+}
+
+VARIANTS_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET variants + seed',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL + '/foo?page=1',
+            'parameters': [
+                {'name': 'q', 'values': ['foo', 'bar', 'baz', 'qux']},
+            ],
+            'headers': {'Accept': 'application/json'},
+            'variants': 3,
+            'seed': 1,
+        },
+    },
+    {
+        'name': 'GET variants (one line)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'variants': 2,
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'POST variants + JSON parameters (indent 4 spaces)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'parameters': [
+                {'name': 'foo', 'values': ['bar', 'baz']},
+                {'name': 'qux', 'value': 1},
+            ],
+            'headers': {'Content-Type': 'application/json'},
+            'variants': 2,
+            'seed': 5,
+            'indent': '    ',
+        },
+    },
+    {
+        'name': 'POST parameter + files (double quotes)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {
+                'file': ('/tmp/wrk-file.txt', 'text/plain'),
+                'other': '/tmp/wrk-other-file.bin',
+            },
+            'quote_char': '"',
+        },
+    },
+    {
+        'name': 'POST variants + files (wrap 40)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'parameters': [{'name': 'foo', 'values': ['bar', 'baz']}],
+            'files': {'file': '/tmp/wrk-file.txt'},
+            'variants': 2,
+            'seed': 0,
+            'wrap': 40,
+        },
+    },
+]
+for _index, _args_group in enumerate(VARIANTS_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['variants'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='GET', dirpath=CASES_DIRS['GET']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_lua_wrk_get(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'lua', 'wrk', 'GET',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='POST', dirpath=CASES_DIRS['POST']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_lua_wrk_post(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'lua', 'wrk', 'POST',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    VARIANTS_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_lua_wrk_variants(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'lua', 'wrk', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize('variants', (0, True, '2'))
+def test_lua_wrk_variants__invalid(variants):
+    with pytest.raises(ValueError, match='must be a positive integer'):
+        generate_http_request_code('lua', 'wrk', 'GET', variants=variants)
+
+
+def test_lua_wrk_program():
+    headers = {'Accept': 'application/json'}
+    result = generate_http_request_program(
+        [
+            {'url': TEST_BASE_URL + '/a', 'headers': headers},
+            {
+                'url': TEST_BASE_URL + '/b', 'method': 'POST',
+                'parameters': [{'name': 'foo', 'values': ['bar', 'baz']}],
+                'headers': headers, 'variants': 2, 'seed': 0,
+            },
+            {'url': TEST_BASE_URL + '/c'},
+        ],
+        language='lua', impl='wrk',
+    )
+    assert result == '''-- wrk -s script.lua http://localhost:8876
+
+local HEADERS_1 = {['Accept'] = 'application/json'}
+
+local requests = {}
+local counter = 0
+
+function init(args)
+  requests = {
+    wrk.format('GET', '/a', HEADERS_1),
+    wrk.format(
+      'POST',
+      '/b',
+      {
+        ['Accept'] = 'application/json',
+        ['Content-Type'] = 'application/x-www-form-urlencoded'
+      },
+      'foo=baz'
+    ),
+    wrk.format(
+      'POST',
+      '/b',
+      {
+        ['Accept'] = 'application/json',
+        ['Content-Type'] = 'application/x-www-form-urlencoded'
+      },
+      'foo=bar'
+    ),
+    wrk.format('GET', '/c'),
+  }
+end
+
+function request()
+  counter = counter % #requests + 1
+  return requests[counter]
+end
+'''
+
+
+def test_lua_wrk_program__multiple_origins():
+    with pytest.raises(ValueError, match='to only one origin'):
+        generate_http_request_program(
+            [
+                {'url': TEST_BASE_URL + '/a'},
+                {'url': 'https://localhost/b'},
+            ],
+            language='lua', impl='wrk',
+        )
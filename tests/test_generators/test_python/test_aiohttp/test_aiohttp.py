@@ -0,0 +1,407 @@
+"""Tests for Python aiohttp implementation generators."""
+
+import ast
+import asyncio
+import json
+import os
+
+import aiohttp
+import pytest
+
+from http_request_codegen import generate_http_request_code
+
+from tests.combinations import (
+    argument_combination_to_filename,
+    combination_arguments_to_kwargs,
+    files_content_types_arguments,
+    get_argument_combinations,
+    get_runnable_argument_combinations,
+)
+from tests.consts import TEMPDIR, TEST_BASE_URL
+
+
+CASES_DIRS = {
+    method: os.path.abspath(os.path.join(os.path.dirname(__file__), method))
+    for method in ['GET', 'POST', 'fanout', 'measure']
+}
+
+FANOUT_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET fanout',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'fanout': 3,
+        },
+    },
+    {
+        'name': 'GET fanout + concurrency',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'fanout': 5,
+            'concurrency': 2,
+        },
+    },
+    {
+        'name': 'GET fanout + concurrency without setup',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'fanout': 5,
+            'concurrency': 2,
+            'setup': False,
+        },
+    },
+    {
+        'name': 'GET fanout + parameters + headers (indent 2 spaces)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'fanout': 4,
+            'concurrency': 4,
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'value': True},
+            ],
+            'headers': {'Accept-Language': 'es'},
+            'indent': '  ',
+        },
+    },
+    {
+        'name': 'GET fanout + parameter (oneline)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'fanout': 2,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'GET fanout + parameter (wrap)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'fanout': 2,
+            'concurrency': 1,
+            'parameters': [{'name': 'foo', 'value': 'bar ' * 20}],
+            'wrap': 50,
+        },
+    },
+    {
+        'name': 'POST fanout + JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'fanout': 3,
+            'concurrency': 2,
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'value': 1},
+            ],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST fanout + parameter + file (double quotes)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'fanout': 2,
+            'concurrency': 2,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {
+                'file': (
+                    os.path.join(TEMPDIR, 'fanout-file.txt'),
+                    'text/plain',
+                ),
+            },
+            'quote_char': '"',
+        },
+    },
+]
+for _index, _args_group in enumerate(FANOUT_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['fanout'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+MEASURE_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET measure',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': True,
+        },
+    },
+    {
+        'name': 'GET measure repetitions + parameter + headers',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Accept-Language': 'es'},
+        },
+    },
+    {
+        'name': 'GET measure repetitions (oneline)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'POST measure + JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': True,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST measure repetitions + file (indent 4 spaces)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 20,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {'file': os.path.join(TEMPDIR, 'measure-file.txt')},
+            'indent': '    ',
+        },
+    },
+]
+for _index, _args_group in enumerate(MEASURE_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['measure'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+def exec_snippet(code):
+    # snippets without initialization are executed as the body of a
+    # coroutine where a session is defined
+    namespace = {}
+    if 'asyncio.run(' in code:
+        exec(code, namespace)
+        return namespace['req']
+
+    async def run():
+        async with aiohttp.ClientSession() as session:
+            namespace.update({
+                'asyncio': asyncio,
+                'aiohttp': aiohttp,
+                'session': session,
+            })
+            await eval(
+                compile(
+                    code, '<snippet>', 'exec',
+                    flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT,
+                ),
+                namespace,
+            )
+    asyncio.run(run())
+    return namespace['req']
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='GET', dirpath=CASES_DIRS['GET']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_aiohttp_get(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'aiohttp', 'GET',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_runnable_argument_combinations(
+        method='GET', dirpath=CASES_DIRS['GET'],
+        unsupported_kwargs=('stream',),
+    ),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_aiohttp_get__response(args_group, assert_request_args):
+    result = generate_http_request_code(
+        'python', 'aiohttp', 'GET',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert_request_args(
+        files_content_types_arguments(args_group['arguments']),
+        json.loads(exec_snippet(result)),
+    )
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='POST', dirpath=CASES_DIRS['POST']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_aiohttp_post(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'aiohttp', 'POST',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_runnable_argument_combinations(
+        method='POST', dirpath=CASES_DIRS['POST'],
+        unsupported_kwargs=('stream',),
+    ),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_aiohttp_post__response(
+    args_group, assert_request_args,
+    create_request_args_files,
+):
+    result = generate_http_request_code(
+        'python', 'aiohttp', 'POST',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    # Create files, if needed
+    files = create_request_args_files(args_group)
+
+    assert_request_args(
+        files_content_types_arguments(args_group['arguments']),
+        json.loads(exec_snippet(result)),
+    )
+
+    for f in files:
+        f.close()
+        os.remove(f.name)
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    FANOUT_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_aiohttp_fanout(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'aiohttp', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    FANOUT_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_aiohttp_fanout__response(
+    args_group, assert_request_args,
+    create_request_args_files,
+):
+    result = generate_http_request_code(
+        'python', 'aiohttp', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    # Create files, if needed
+    files = create_request_args_files(args_group)
+
+    responses = exec_snippet(result)
+    assert len(responses) == args_group['arguments']['fanout']
+    for response in responses:
+        assert_request_args(
+            files_content_types_arguments(args_group['arguments']),
+            json.loads(response),
+        )
+
+    for f in files:
+        f.close()
+        os.remove(f.name)
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'error_message'),
+    (
+        ({'fanout': 0}, '\'fanout\' argument must be a positive integer'),
+        ({'fanout': True}, '\'fanout\' argument must be a positive integer'),
+        ({'concurrency': 2}, 'requires \'fanout\' argument'),
+        (
+            {'fanout': 2, 'concurrency': -1},
+            '\'concurrency\' argument must be a positive integer',
+        ),
+    ),
+)
+def test_python_aiohttp_fanout__invalid(kwargs, error_message):
+    with pytest.raises(ValueError, match=error_message):
+        generate_http_request_code('python', 'aiohttp', 'GET', **kwargs)
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    MEASURE_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_aiohttp_measure(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'aiohttp', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    MEASURE_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_aiohttp_measure__response(
+    args_group, capsys, create_request_args_files,
+):
+    result = generate_http_request_code(
+        'python', 'aiohttp', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    # Create files, if needed
+    files = create_request_args_files(args_group)
+
+    assert exec_snippet(result)
+
+    output = capsys.readouterr().out
+    if args_group['arguments']['measure'] is True:
+        assert output.endswith(' ms\n')
+    else:
+        assert [line.split(':')[0] for line in output.splitlines()] == [
+            'p50', 'p90', 'p99',
+        ]
+
+    for f in files:
+        f.close()
+        os.remove(f.name)
@@ -0,0 +1,485 @@
+"""Tests for Python httpx implementation generators."""
+
+import ast
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from http_request_codegen import generate_http_request_code
+
+from tests.combinations import (
+    argument_combination_to_filename,
+    combination_arguments_to_kwargs,
+    files_content_types_arguments,
+    get_argument_combinations,
+    get_runnable_argument_combinations,
+)
+from tests.consts import TEMPDIR, TEST_BASE_URL
+
+
+CASES_DIRS = {
+    method: os.path.abspath(os.path.join(os.path.dirname(__file__), method))
+    for method in ['GET', 'POST', 'client', 'measure']
+}
+
+CLIENT_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET client',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+        },
+    },
+    {
+        'name': 'GET client without setup',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+            'setup': False,
+        },
+    },
+    {
+        'name': 'GET client + HTTP/2',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+            'http2': True,
+        },
+    },
+    {
+        'name': 'GET client + limits',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+            'max_connections': 100,
+            'max_keepalive_connections': 20,
+        },
+    },
+    {
+        'name': 'GET client + timeout + parameters (oneline)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+            'client_timeout': 10,
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'value': True},
+            ],
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'GET async client',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'asynchronous': True,
+        },
+    },
+    {
+        'name': 'GET async client without setup',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'asynchronous': True,
+            'setup': False,
+        },
+    },
+    {
+        'name': 'GET async client + HTTP/2 + limits + timeouts',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'asynchronous': True,
+            'http2': True,
+            'max_connections': 10,
+            'client_timeout': {'timeout': 10, 'connect': 5},
+            'headers': {'Accept-Language': 'es'},
+        },
+    },
+    {
+        'name': 'GET async client + parameter (wrap)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'asynchronous': True,
+            'parameters': [{'name': 'foo', 'value': 'bar ' * 20}],
+            'wrap': 50,
+        },
+    },
+    {
+        'name': 'POST client + HTTP/2 + JSON parameters (double quotes)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+            'http2': True,
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'value': 1},
+            ],
+            'headers': {'Content-Type': 'application/json'},
+            'quote_char': '"',
+        },
+    },
+    {
+        'name': 'POST async client + text plain parameter',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'asynchronous': True,
+            'parameters': [{'name': '', 'value': 'foo bar baz'}],
+            'headers': {'Content-Type': 'text/plain'},
+        },
+    },
+    {
+        'name': 'POST async client + limits + parameter + file (indent 2)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'asynchronous': True,
+            'max_keepalive_connections': 5,
+            'parameters': [{'name': 'foo', 'value': True}],
+            'files': {
+                'file': (
+                    os.path.join(TEMPDIR, 'client-file.txt'),
+                    'text/plain',
+                ),
+            },
+            'indent': '  ',
+        },
+    },
+]
+for _index, _args_group in enumerate(CLIENT_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['client'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+MEASURE_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET measure',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': True,
+        },
+    },
+    {
+        'name': 'GET measure repetitions + parameter + headers',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Accept-Language': 'es'},
+        },
+    },
+    {
+        'name': 'GET measure repetitions (oneline)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'POST measure + JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': True,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST measure repetitions + file (indent 4 spaces)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 20,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {'file': os.path.join(TEMPDIR, 'measure-file.txt')},
+            'indent': '    ',
+        },
+    },
+    {
+        'name': 'GET measure repetitions + asynchronous client',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'asynchronous': True,
+        },
+    },
+]
+for _index, _args_group in enumerate(MEASURE_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['measure'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+def exec_snippet(code, asynchronous=False):
+    # snippets without initialization are executed with a client defined,
+    # asynchronous ones as the body of a coroutine
+    namespace = {'httpx': httpx}
+    if 'import httpx' in code:
+        exec(code, namespace)
+    elif not asynchronous:
+        with httpx.Client() as client:
+            namespace['client'] = client
+            exec(code, namespace)
+    else:
+        async def run():
+            async with httpx.AsyncClient() as client:
+                namespace['client'] = client
+                await eval(
+                    compile(
+                        code, '<snippet>', 'exec',
+                        flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT,
+                    ),
+                    namespace,
+                )
+        asyncio.run(run())
+    return namespace['req']
+
+
+def runnable_combinations(method, dirpath):
+    # 'stream' is an argument of the requests library, not of httpx, and
+    # httpx rejects headers and cookies values with trailing whitespaces
+    response = []
+    for args_group in get_runnable_argument_combinations(
+        method=method, dirpath=dirpath, unsupported_kwargs=('stream',),
+    ):
+        kwargs = args_group['arguments'].get('kwargs', {})
+        values = list(args_group['arguments'].get('headers', {}).values())
+        values.extend(kwargs.get('cookies', {}).values())
+        if not any(value != value.rstrip() for value in values):
+            response.append(args_group)
+    return response
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='GET', dirpath=CASES_DIRS['GET']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_httpx_get(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'httpx', 'GET',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    runnable_combinations(method='GET', dirpath=CASES_DIRS['GET']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_httpx_get__response(args_group, assert_request_args):
+    result = generate_http_request_code(
+        'python', 'httpx', 'GET',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert_request_args(
+        files_content_types_arguments(
+            args_group['arguments'], files_headers=True,
+        ),
+        exec_snippet(result).json(),
+    )
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='POST', dirpath=CASES_DIRS['POST']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_httpx_post(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'httpx', 'POST',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    runnable_combinations(method='POST', dirpath=CASES_DIRS['POST']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_httpx_post__response(
+    args_group, assert_request_args,
+    create_request_args_files,
+):
+    result = generate_http_request_code(
+        'python', 'httpx', 'POST',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    # Create files, if needed
+    files = create_request_args_files(args_group)
+
+    assert_request_args(
+        files_content_types_arguments(
+            args_group['arguments'], files_headers=True,
+        ),
+        exec_snippet(result).json(),
+    )
+
+    for f in files:
+        f.close()
+        os.remove(f.name)
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    CLIENT_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_httpx_client(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'httpx', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    CLIENT_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_httpx_client__response(
+    args_group, assert_request_args,
+    create_request_args_files,
+):
+    result = generate_http_request_code(
+        'python', 'httpx', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    # Create files, if needed
+    files = create_request_args_files(args_group)
+
+    response = exec_snippet(
+        result, asynchronous=args_group['arguments'].get('asynchronous'),
+    )
+    assert_request_args(
+        files_content_types_arguments(
+            args_group['arguments'], files_headers=True,
+        ),
+        response.json(),
+    )
+
+    for f in files:
+        f.close()
+        os.remove(f.name)
+
+
+@pytest.mark.parametrize(
+    'argument', ('http2', 'max_connections', 'client_timeout'),
+)
+def test_python_httpx_client__without_client(argument):
+    error_message = '\'%s\' argument requires' % argument
+    with pytest.raises(ValueError, match=error_message):
+        generate_http_request_code(
+            'python', 'httpx', 'GET', **{argument: 10},
+        )
+
+
+@pytest.mark.parametrize('setup', (False, 'import httpx\n\n'))
+@pytest.mark.parametrize('client', ('session', 'asynchronous'))
+@pytest.mark.parametrize(
+    'argument', ('http2', 'max_connections', 'client_timeout'),
+)
+def test_python_httpx_client__without_setup(argument, client, setup):
+    error_message = '\'%s\' argument requires the client' % argument
+    with pytest.raises(ValueError, match=error_message):
+        generate_http_request_code(
+            'python', 'httpx', 'GET', setup=setup,
+            **{argument: 10, client: True},
+        )
+
+
+def test_python_httpx_client__timeout_quote_char():
+    result = generate_http_request_code(
+        'python', 'httpx', 'GET', session=True, quote_char='"',
+        client_timeout={'timeout': 10, 'pool': None},
+    )
+    assert 'timeout=httpx.Timeout(timeout=10, pool=None)' in result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    MEASURE_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_httpx_measure(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'httpx', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    MEASURE_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_httpx_measure__response(
+    args_group, capsys, create_request_args_files,
+):
+    result = generate_http_request_code(
+        'python', 'httpx', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    # Create files, if needed
+    files = create_request_args_files(args_group)
+
+    response = exec_snippet(
+        result, asynchronous=args_group['arguments'].get('asynchronous'),
+    )
+    assert response.status_code == 200
+
+    output = capsys.readouterr().out
+    if args_group['arguments']['measure'] is True:
+        assert output.endswith(' ms\n')
+    else:
+        assert [line.split(':')[0] for line in output.splitlines()] == [
+            'p50', 'p90', 'p99',
+        ]
+
+    for f in files:
+        f.close()
+        os.remove(f.name)
@@ -0,0 +1,304 @@
+"""Tests for Python locust implementation generators."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from http_request_codegen import (
+    generate_http_request_code,
+    generate_http_request_program,
+)
+
+from tests.combinations import (
+    argument_combination_to_filename,
+    combination_arguments_to_kwargs,
+    get_argument_combinations,
+)
+from tests.consts import TEMPDIR, TEST_BASE_URL
+
+
+CASES_DIRS = {
+    method: os.path.abspath(os.path.join(os.path.dirname(__file__), method))
+    for method in ['GET', 'POST', 'user']
+}
+
+USER_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET path + query',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL + '/foo/bar-baz?page=1',
+        },
+    },
+    {
+        'name': 'GET weight + wait time range',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'weight': 3,
+            'wait_time': (1, 5),
+        },
+    },
+    {
+        'name': 'GET user class + constant wait time + parameter',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'user_class': 'ApiUser',
+            'wait_time': 0.5,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+        },
+    },
+    {
+        'name': 'GET weight without setup',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'weight': 2,
+            'setup': False,
+        },
+    },
+    {
+        'name': 'GET wait time + custom setup (double quotes)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'wait_time': [0, 1],
+            'setup': 'from locust import HttpUser, between, task\n\n\n',
+            'quote_char': '"',
+        },
+    },
+    {
+        'name': 'POST weight + JSON parameters (indent 2 spaces)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'weight': 5,
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'value': 1},
+            ],
+            'headers': {'Content-Type': 'application/json'},
+            'indent': '  ',
+        },
+    },
+]
+for _index, _args_group in enumerate(USER_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['user'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+def run_locust(code, filename='locustfile.py'):
+    # locust patches the standard library when it's imported, so the users
+    # are run headless in other process
+    filepath = os.path.join(TEMPDIR, filename)
+    with open(filepath, 'w') as f:
+        f.write(code)
+    try:
+        return subprocess.run(
+            [
+                sys.executable, '-m', 'locust', '-f', filepath,
+                '--headless', '-u', '2', '-r', '2', '-t', '2s',
+                '--only-summary',
+            ],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True, timeout=60,
+        )
+    finally:
+        os.remove(filepath)
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='GET', dirpath=CASES_DIRS['GET']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_locust_get(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'locust', 'GET',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='POST', dirpath=CASES_DIRS['POST']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_locust_post(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'locust', 'POST',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    USER_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_locust_user(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'locust', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'error_message'),
+    (
+        ({'weight': 0}, 'must be a positive integer'),
+        ({'weight': True}, 'must be a positive integer'),
+        ({'wait_time': (5, 1)}, 'must be a non negative number or a pair'),
+        ({'wait_time': '1'}, 'must be a non negative number or a pair'),
+        ({'user_class': '1User'}, 'is not a valid Python identifier'),
+        (
+            {'wait_time': 1, 'setup': False},
+            '\'wait_time\' argument requires initialization',
+        ),
+    ),
+)
+def test_python_locust_user__invalid(kwargs, error_message):
+    with pytest.raises(ValueError, match=error_message):
+        generate_http_request_code('python', 'locust', 'GET', **kwargs)
+
+
+def test_python_locust_program__request_wait_time():
+    with pytest.raises(ValueError, match='defined for the whole program'):
+        generate_http_request_program(
+            [{'url': TEST_BASE_URL, 'wait_time': 1}],
+            language='python', impl='locust',
+        )
+
+
+def test_python_locust_program__shared_headers():
+    headers = {'Accept': 'application/json', 'X-Foo': 'bar'}
+    result = generate_http_request_program(
+        [
+            {'url': TEST_BASE_URL + '/a', 'headers': headers, 'weight': 3},
+            {
+                'url': TEST_BASE_URL + '/a', 'method': 'POST',
+                'parameters': [{'name': 'foo', 'value': 'bar'}],
+                'headers': dict(headers, **{
+                    'Content-Type': 'application/json',
+                }),
+            },
+            {
+                'url': 'http://127.0.0.1:8876/b',
+                'headers': {'Accept': 'application/json'},
+            },
+        ],
+        language='python', impl='locust', wait_time=(1, 5),
+    )
+    assert result == '''from locust import HttpUser, between, task
+
+
+class WebsiteUser(HttpUser):
+    host = 'http://localhost:8876'
+    wait_time = between(1, 5)
+
+    def on_start(self):
+        self.client.headers.update({'Accept': 'application/json'})
+
+    @task(3)
+    def get_a(self):
+        self.client.get('/a', headers={'X-Foo': 'bar'})
+
+    @task
+    def post_a(self):
+        self.client.post(
+            '/a',
+            json={
+                'foo': 'bar'
+            },
+            headers={
+                'X-Foo': 'bar',
+                'Content-Type': 'application/json'
+            }
+        )
+
+    @task
+    def get_b(self):
+        self.client.get('http://127.0.0.1:8876/b')
+'''
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    [
+        args_group for args_group in USER_ARGUMENT_COMBINATIONS
+        if args_group['arguments']['url'] == TEST_BASE_URL and
+        args_group['arguments'].get('setup', True)
+    ],
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_locust_user__run(args_group):
+    result = generate_http_request_code(
+        'python', 'locust', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    process = run_locust(result)
+    assert process.returncode == 0, process.stderr
+    assert 'Aggregated' in process.stderr
+    assert '0(0.00%)' in process.stderr
+
+
+def test_python_locust_program__run():
+    filepath = os.path.join(TEMPDIR, 'locust-program-file.txt')
+    with open(filepath, 'w') as f:
+        f.write('foo')
+
+    try:
+        result = generate_http_request_program(
+            [
+                {
+                    'url': TEST_BASE_URL,
+                    'parameters': [{'name': 'foo', 'value': 'bar'}],
+                    'headers': {'Accept-Language': 'es'},
+                    'weight': 3,
+                },
+                {
+                    'url': TEST_BASE_URL, 'method': 'POST',
+                    'parameters': [{'name': 'foo', 'value': 'bar'}],
+                    'headers': {
+                        'Accept-Language': 'es',
+                        'Content-Type': 'text/plain',
+                    },
+                },
+                {
+                    'url': TEST_BASE_URL, 'method': 'POST',
+                    'files': {'file': filepath},
+                    'headers': {'Accept-Language': 'es'},
+                },
+            ],
+            language='python', impl='locust', wait_time=(0.1, 0.2),
+        )
+        assert 'def on_start(self):' in result
+
+        process = run_locust(result)
+    finally:
+        os.remove(filepath)
+
+    assert process.returncode == 0, process.stderr
+    assert 'POST /' in process.stderr
+    assert 'GET /?foo=bar' in process.stderr
@@ -7,16 +7,397 @@ import pytest
 from http_request_codegen import generate_http_request_code
 
 from tests.combinations import (
+    argument_combination_to_filename,
     combination_arguments_to_kwargs,
     get_argument_combinations,
 )
+from tests.consts import TEMPDIR, TEST_BASE_URL
 
 
 CASES_DIRS = {
     method: os.path.abspath(os.path.join(os.path.dirname(__file__), method))
-    for method in ['GET', 'POST']
+    for method in ['GET', 'POST', 'session', 'stream', 'compress', 'measure']
 }
 
+SESSION_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET session',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+        },
+    },
+    {
+        'name': 'GET session without setup',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+            'setup': False,
+        },
+    },
+    {
+        'name': 'GET session + pool connections',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+            'pool_connections': 4,
+        },
+    },
+    {
+        'name': 'GET session + pool connections + pool maxsize',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+            'pool_connections': 4,
+            'pool_maxsize': 20,
+        },
+    },
+    {
+        'name': 'GET session + pool maxsize (double quotes)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+            'pool_maxsize': 20,
+            'quote_char': '"',
+        },
+    },
+    {
+        'name': 'GET session + parameters + headers + teardown',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'type': 'int'},
+            ],
+            'headers': {'Accept-Language': 'es'},
+            'teardown': '\nprint(req.status_code)',
+            'seed': 1,
+        },
+    },
+    {
+        'name': 'GET session + pool maxsize (oneline)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+            'pool_maxsize': 20,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'GET session + parameter (wrap)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+            'parameters': [{'name': 'foo', 'value': 'bar ' * 20}],
+            'wrap': 40,
+        },
+    },
+    {
+        'name': 'POST session + JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'value': 1},
+            ],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST session + pool connections + text plain parameter',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+            'pool_connections': 2,
+            'parameters': [{'name': '', 'value': 'foo bar baz'}],
+            'headers': {'Content-Type': 'text/plain'},
+        },
+    },
+    {
+        'name': 'POST session + pool maxsize + parameter + file (oneline)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+            'pool_maxsize': 8,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {
+                'file': os.path.join(TEMPDIR, 'session-file.txt'),
+            },
+            'oneline': True,
+        },
+    },
+]
+for _index, _args_group in enumerate(SESSION_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['session'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+STREAM_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET chunk size',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'chunk_size': 1024,
+        },
+    },
+    {
+        'name': 'GET chunk size + stream kwarg + parameter (indent 2 spaces)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'chunk_size': 8192,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'kwargs': {'stream': True, 'timeout': 5},
+            'indent': '  ',
+        },
+    },
+    {
+        'name': 'GET session + chunk size',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'session': True,
+            'chunk_size': 1024,
+        },
+    },
+    {
+        'name': 'POST stream upload + file',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'stream_upload': True,
+            'files': {
+                'file': (
+                    os.path.join(TEMPDIR, 'stream-file-1.txt'),
+                    'text/plain',
+                ),
+            },
+        },
+    },
+    {
+        'name': 'POST stream upload + parameters + files + headers',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'stream_upload': True,
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'value': 1},
+            ],
+            'files': {
+                'file-1': (
+                    os.path.join(TEMPDIR, 'stream-file-1.txt'),
+                    'text/plain',
+                ),
+                'file-2': (
+                    os.path.join(TEMPDIR, 'stream-file-2.txt'),
+                    'text/plain',
+                    {'Expires': '0'},
+                ),
+            },
+            'headers': {
+                'Content-Type': 'multipart/form-data',
+                'Accept-Language': 'es',
+            },
+        },
+    },
+    {
+        'name': 'POST stream upload + parameter and file with same name',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'stream_upload': True,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {
+                'foo': (
+                    os.path.join(TEMPDIR, 'stream-file-1.txt'),
+                    'text/plain',
+                ),
+            },
+            'quote_char': '"',
+        },
+    },
+    {
+        'name': 'POST stream upload + chunk size + file',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'stream_upload': True,
+            'chunk_size': 1024,
+            'files': {
+                'file': (
+                    os.path.join(TEMPDIR, 'stream-file-1.txt'),
+                    'text/plain',
+                ),
+            },
+        },
+    },
+    {
+        'name': 'POST stream upload + JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'stream_upload': True,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+]
+for _index, _args_group in enumerate(STREAM_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['stream'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+COMPRESS_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'POST gzip JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'compress': 'gzip',
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'value': 1},
+            ],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST deflate JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'compress': 'deflate',
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST gzip form parameters + headers',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'compress': 'gzip',
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'value': True},
+            ],
+            'headers': {'Accept-Language': 'es'},
+        },
+    },
+    {
+        'name': 'POST deflate text parameter (oneline)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'compress': 'deflate',
+            'parameters': [{'value': 'foo bar'}],
+            'headers': {'Content-Type': 'text/plain'},
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'POST gzip session + JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'compress': 'gzip',
+            'session': True,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST gzip without parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'compress': 'gzip',
+        },
+    },
+]
+for _index, _args_group in enumerate(COMPRESS_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['compress'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+MEASURE_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET measure',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': True,
+        },
+    },
+    {
+        'name': 'GET measure repetitions + parameter + headers',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Accept-Language': 'es'},
+        },
+    },
+    {
+        'name': 'GET measure repetitions (oneline)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'POST measure + JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': True,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST measure repetitions + file (indent 4 spaces)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 20,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {'file': os.path.join(TEMPDIR, 'measure-file.txt')},
+            'indent': '    ',
+        },
+    },
+]
+for _index, _args_group in enumerate(MEASURE_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['measure'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
 
 @pytest.mark.parametrize(
     'args_group',
@@ -97,3 +478,254 @@ def test_python_requests_post__response(
     for f in files:
         f.close()
         os.remove(f.name)
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    SESSION_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_requests_session(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'requests', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    SESSION_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_requests_session__response(
+    args_group, assert_request_args,
+    create_request_args_files,
+):
+    kwargs = combination_arguments_to_kwargs(args_group['arguments'])
+    if kwargs.get('setup') is False:
+        kwargs['setup'] = 'import requests\n\nsession = requests.Session()\n'
+    result = generate_http_request_code(
+        'python', 'requests', args_group['method'], **kwargs,
+    )
+
+    # Create files, if needed
+    files = create_request_args_files(args_group)
+
+    namespace = {}
+    exec(result, namespace)
+    assert isinstance(namespace['session'], namespace['requests'].Session)
+    assert_request_args(args_group['arguments'], namespace['req'].json())
+
+    for f in files:
+        f.close()
+        os.remove(f.name)
+
+
+def test_python_requests_session__pool_without_session():
+    with pytest.raises(ValueError, match='require \'session=True\''):
+        generate_http_request_code(
+            'python', 'requests', 'GET', pool_maxsize=10,
+        )
+
+
+@pytest.mark.parametrize(
+    'setup', (False, 'import requests\n\nsession = requests.Session()\n'),
+)
+@pytest.mark.parametrize('argument', ('pool_connections', 'pool_maxsize'))
+@pytest.mark.parametrize('method', ('GET', 'POST'))
+def test_python_requests_session__pool_without_setup(method, argument, setup):
+    with pytest.raises(ValueError, match='require the session created'):
+        generate_http_request_code(
+            'python', 'requests', method, session=True, setup=setup,
+            **{argument: 10},
+        )
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    STREAM_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_requests_stream(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'requests', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    STREAM_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_requests_stream__response(
+    args_group, assert_request_args,
+    create_request_args_files,
+):
+    result = generate_http_request_code(
+        'python', 'requests', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    # Create files, if needed
+    files = create_request_args_files(args_group)
+
+    namespace = {}
+    exec(result, namespace)
+    assert namespace['req'].status_code == 200
+    if 'chunk_size' in args_group['arguments']:
+        # the content has been consumed by chunks
+        assert namespace['req'].raw.closed
+    else:
+        assert_request_args(args_group['arguments'], namespace['req'].json())
+
+    for f in files:
+        f.close()
+        os.remove(f.name)
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'error_message'),
+    (
+        (
+            {'chunk_size': 0},
+            '\'chunk_size\' argument must be a positive integer',
+        ),
+        (
+            {'chunk_size': 1024, 'stream': False},
+            'requires a streamed response',
+        ),
+        (
+            {'chunk_size': 1024, 'oneline': True},
+            'can\'t be rendered in one line',
+        ),
+    ),
+)
+def test_python_requests_stream__invalid(kwargs, error_message):
+    with pytest.raises(ValueError, match=error_message):
+        generate_http_request_code('python', 'requests', 'GET', **kwargs)
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    COMPRESS_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_requests_compress(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'requests', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    COMPRESS_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_requests_compress__response(args_group, assert_request_args):
+    result = generate_http_request_code(
+        'python', 'requests', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    namespace = {}
+    exec(result, namespace)
+    assert_request_args(args_group['arguments'], namespace['req'].json())
+    if args_group['arguments'].get('parameters'):
+        assert namespace['req'].request.headers['Content-Encoding'] == (
+            args_group['arguments']['compress']
+        )
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'error_message'),
+    (
+        (
+            {'compress': 'br', 'parameters': [{'name': 'foo'}]},
+            '\'compress\' argument must be one of \'gzip\', \'deflate\'',
+        ),
+        (
+            {'compress': 'gzip', 'files': {'foo': '/tmp/foo.txt'}},
+            'can\'t be compressed',
+        ),
+    ),
+)
+def test_python_requests_compress__invalid(kwargs, error_message):
+    with pytest.raises(ValueError, match=error_message):
+        generate_http_request_code('python', 'requests', 'POST', **kwargs)
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    MEASURE_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_requests_measure(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'requests', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    MEASURE_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_requests_measure__response(
+    args_group, capsys, create_request_args_files,
+):
+    result = generate_http_request_code(
+        'python', 'requests', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    # Create files, if needed
+    files = create_request_args_files(args_group)
+
+    namespace = {}
+    exec(result, namespace)
+    assert namespace['req'].status_code == 200
+
+    output = capsys.readouterr().out
+    if args_group['arguments']['measure'] is True:
+        assert output.endswith(' ms\n')
+    else:
+        assert [line.split(':')[0] for line in output.splitlines()] == [
+            'p50', 'p90', 'p99',
+        ]
+
+    for f in files:
+        f.close()
+        os.remove(f.name)
+
+
+@pytest.mark.parametrize('measure', (0, -1, '10', 1.5))
+def test_python_requests_measure__invalid(measure):
+    with pytest.raises(
+        ValueError, match='must be a boolean or a positive integer',
+    ):
+        generate_http_request_code(
+            'python', 'requests', 'GET', measure=measure,
+        )
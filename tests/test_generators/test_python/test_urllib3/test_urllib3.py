@@ -0,0 +1,398 @@
+"""Tests for Python urllib3 implementation generators."""
+
+import json
+import os
+
+import pytest
+
+from http_request_codegen import generate_http_request_code
+
+from tests.combinations import (
+    argument_combination_to_filename,
+    combination_arguments_to_kwargs,
+    files_content_types_arguments,
+    get_argument_combinations,
+    get_runnable_argument_combinations,
+)
+from tests.consts import TEMPDIR, TEST_BASE_URL
+
+
+CASES_DIRS = {
+    method: os.path.abspath(os.path.join(os.path.dirname(__file__), method))
+    for method in ['GET', 'POST', 'pool', 'measure']
+}
+
+POOL_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET num pools',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'num_pools': 4,
+        },
+    },
+    {
+        'name': 'GET num pools + maxsize',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'num_pools': 4,
+            'maxsize': 10,
+        },
+    },
+    {
+        'name': 'GET maxsize + parameters (oneline)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'maxsize': 10,
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'value': 1},
+            ],
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'GET preload content disabled',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'preload_content': False,
+        },
+    },
+    {
+        'name': 'GET preload content disabled (indent 2 spaces)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'preload_content': False,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Accept-Language': 'es'},
+            'indent': '  ',
+        },
+    },
+    {
+        'name': 'POST maxsize + JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'maxsize': 10,
+            'parameters': [
+                {'name': 'foo', 'value': 'bar'},
+                {'name': 'baz', 'value': 1},
+            ],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST preload content disabled + parameter + file',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'preload_content': False,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {
+                'file': (
+                    os.path.join(TEMPDIR, 'pool-file.txt'),
+                    'text/plain',
+                ),
+            },
+            'quote_char': '"',
+        },
+    },
+]
+for _index, _args_group in enumerate(POOL_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['pool'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+MEASURE_ARGUMENT_COMBINATIONS = [
+    {
+        'name': 'GET measure',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': True,
+        },
+    },
+    {
+        'name': 'GET measure repetitions + parameter + headers',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Accept-Language': 'es'},
+        },
+    },
+    {
+        'name': 'GET measure repetitions (oneline)',
+        'method': 'GET',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 10,
+            'oneline': True,
+        },
+    },
+    {
+        'name': 'POST measure + JSON parameters',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': True,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'headers': {'Content-Type': 'application/json'},
+        },
+    },
+    {
+        'name': 'POST measure repetitions + file (indent 4 spaces)',
+        'method': 'POST',
+        'arguments': {
+            'url': TEST_BASE_URL,
+            'measure': 20,
+            'parameters': [{'name': 'foo', 'value': 'bar'}],
+            'files': {'file': os.path.join(TEMPDIR, 'measure-file.txt')},
+            'indent': '    ',
+        },
+    },
+]
+for _index, _args_group in enumerate(MEASURE_ARGUMENT_COMBINATIONS):
+    _args_group['filename'] = os.path.join(
+        CASES_DIRS['measure'],
+        argument_combination_to_filename(_args_group['name'], _index),
+    )
+
+
+def exec_snippet(code):
+    if 'import urllib3' not in code:
+        code = (
+            'import json\n\nimport urllib3\n\n'
+            'http = urllib3.PoolManager()\n\n%s'
+        ) % code
+    namespace = {}
+    exec(code, namespace)
+    return namespace['req']
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='GET', dirpath=CASES_DIRS['GET']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_urllib3_get(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'urllib3', 'GET',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_runnable_argument_combinations(
+        method='GET', dirpath=CASES_DIRS['GET'],
+        supported_kwargs=('timeout',),
+    ),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_urllib3_get__response(args_group, assert_request_args):
+    result = generate_http_request_code(
+        'python', 'urllib3', 'GET',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert_request_args(
+        files_content_types_arguments(args_group['arguments']),
+        json.loads(exec_snippet(result).data),
+    )
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_argument_combinations(method='POST', dirpath=CASES_DIRS['POST']),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_urllib3_post(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'urllib3', 'POST',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    get_runnable_argument_combinations(
+        method='POST', dirpath=CASES_DIRS['POST'],
+        supported_kwargs=('timeout',),
+    ),
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_urllib3_post__response(
+    args_group, assert_request_args,
+    create_request_args_files,
+):
+    result = generate_http_request_code(
+        'python', 'urllib3', 'POST',
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    # Create files, if needed
+    files = create_request_args_files(args_group)
+
+    assert_request_args(
+        files_content_types_arguments(args_group['arguments']),
+        json.loads(exec_snippet(result).data),
+    )
+
+    for f in files:
+        f.close()
+        os.remove(f.name)
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    POOL_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_urllib3_pool(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'urllib3', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    POOL_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_urllib3_pool__response(
+    args_group, assert_request_args,
+    create_request_args_files,
+):
+    result = generate_http_request_code(
+        'python', 'urllib3', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    # Create files, if needed
+    files = create_request_args_files(args_group)
+
+    response = exec_snippet(result)
+    assert response.status == 200
+    if args_group['arguments'].get('preload_content') is False:
+        # the content has been consumed by chunks
+        assert response.data == b''
+    else:
+        assert_request_args(
+            files_content_types_arguments(args_group['arguments']),
+            json.loads(response.data),
+        )
+
+    for f in files:
+        f.close()
+        os.remove(f.name)
+
+
+def test_python_urllib3_preload_content__invalid():
+    with pytest.raises(TypeError, match='must be a boolean'):
+        generate_http_request_code(
+            'python', 'urllib3', 'GET', preload_content='no',
+        )
+    with pytest.raises(ValueError, match='can\'t be rendered in one line'):
+        generate_http_request_code(
+            'python', 'urllib3', 'GET', preload_content=False, oneline=True,
+        )
+
+
+@pytest.mark.parametrize('setup', (False, 'import urllib3\n\n'))
+@pytest.mark.parametrize('argument', ('num_pools', 'maxsize'))
+@pytest.mark.parametrize('method', ('GET', 'POST'))
+def test_python_urllib3_pool__without_setup(method, argument, setup):
+    error_message = '\'%s\' argument requires the pool manager' % argument
+    with pytest.raises(ValueError, match=error_message):
+        generate_http_request_code(
+            'python', 'urllib3', method, setup=setup, **{argument: 4},
+        )
+
+
+def test_python_urllib3_get__url_query():
+    result = generate_http_request_code(
+        'python', 'urllib3', 'GET', url=TEST_BASE_URL + '?x=1',
+        parameters=[{'name': 'a', 'value': 'b'}],
+    )
+    assert 'fields=' not in result
+    assert '?x=1&a=b' in result
+
+    response = json.loads(exec_snippet(result).data)
+    assert response['parameters'] == [
+        {'name': 'x', 'value': '1'},
+        {'name': 'a', 'value': 'b'},
+    ]
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    MEASURE_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_urllib3_measure(args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    result = generate_http_request_code(
+        'python', 'urllib3', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    'args_group',
+    MEASURE_ARGUMENT_COMBINATIONS,
+    ids=lambda args_group: os.path.basename(args_group['filename']),
+)
+def test_python_urllib3_measure__response(
+    args_group, capsys, create_request_args_files,
+):
+    result = generate_http_request_code(
+        'python', 'urllib3', args_group['method'],
+        **combination_arguments_to_kwargs(args_group['arguments']),
+    )
+
+    # Create files, if needed
+    files = create_request_args_files(args_group)
+
+    namespace = {}
+    exec(result, namespace)
+    assert namespace['req'].status == 200
+
+    output = capsys.readouterr().out
+    if args_group['arguments']['measure'] is True:
+        assert output.endswith(' ms\n')
+    else:
+        assert [line.split(':')[0] for line in output.splitlines()] == [
+            'p50', 'p90', 'p99',
+        ]
+
+    for f in files:
+        f.close()
+        os.remove(f.name)
@@ -0,0 +1,85 @@
+'''Test lazy rendering of code snippets.'''
+
+import pickle
+
+import pytest
+
+from http_request_codegen import LazySnippet, generate_http_request_code
+
+
+def _value():
+    _value.calls += 1
+    return 'bar'
+
+
+_value.calls = 0
+
+
+@pytest.mark.parametrize(
+    ('language', 'impl'),
+    (
+        ('python', 'requests'),
+        ('javascript', 'fetch'),
+        ('bash', 'curl'),
+    ),
+)
+def test_lazy_snippet(language, impl):
+    kwargs = {
+        'language': language,
+        'impl': impl,
+        'method': 'POST',
+        'parameters': [{'name': 'foo', 'value': _value}],
+    }
+    _value.calls = 0
+    snippet = generate_http_request_code(lazy=True, **kwargs)
+
+    assert isinstance(snippet, LazySnippet)
+    assert not snippet.rendered
+    assert _value.calls == 0
+
+    code = str(snippet)
+    assert snippet.rendered
+    assert len(snippet) == len(code)
+    assert str(snippet) is code
+    assert _value.calls == 1
+    assert code == generate_http_request_code(**kwargs)
+
+
+def test_lazy_snippet__pickle():
+    snippet = generate_http_request_code(
+        parameters=[{'name': 'foo', 'type': 'int'}], lazy=True,
+    )
+    assert not pickle.loads(pickle.dumps(snippet)).rendered
+
+    code = str(snippet)
+    unpickled = pickle.loads(pickle.dumps(snippet))
+    assert unpickled.rendered
+    assert str(unpickled) == code
+    assert unpickled == snippet
+
+
+def test_lazy_snippet__arguments_copied():
+    parameters = [{'name': 'foo', 'value': 'bar'}]
+    headers = {'Accept': 'text/html'}
+    snippet = generate_http_request_code(
+        parameters=parameters, headers=headers, setup=False, lazy=True,
+    )
+    parameters[0]['value'] = 'baz'
+    headers['Accept'] = 'application/json'
+
+    assert 'bar' in str(snippet)
+    assert 'text/html' in str(snippet)
+
+
+def test_lazy_snippet__generator_values():
+    snippet = generate_http_request_code(
+        parameters=[{'name': 'a', 'values': (value for value in ('x',))}],
+        setup=False, lazy=True,
+    )
+    assert 'x' in str(snippet)
+    assert pickle.loads(pickle.dumps(snippet)) == str(snippet)
+
+
+def test_lazy_snippet__unsupported_impl():
+    with pytest.raises(ValueError):
+        generate_http_request_code(impl='foo', lazy=True)
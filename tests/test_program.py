@@ -0,0 +1,426 @@
+'''Test programs performing multiple requests.'''
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from http_request_codegen import generate_http_request_program
+
+from tests.combinations import (
+    combination_arguments_to_kwargs,
+    get_argument_combinations,
+)
+from tests.consts import TEST_BASE_URL
+
+
+HEADERS = {'Accept': 'application/json', 'X-Foo': 'bar'}
+
+REQUESTS = [
+    {'url': 'http://localhost/a', 'headers': HEADERS},
+    {
+        'url': 'https://localhost/b',
+        'method': 'POST',
+        'parameters': [{'name': 'foo', 'value': 'bar'}],
+        'headers': HEADERS,
+    },
+    {'url': 'http://localhost/c', 'headers': {'Accept': 'text/html'}},
+]
+
+
+@pytest.mark.parametrize(
+    ('language', 'impl', 'expected_result'),
+    (
+        (
+            'python', 'requests',
+            '''import requests
+
+HEADERS_1 = {'Accept': 'application/json', 'X-Foo': 'bar'}
+
+session = requests.Session()
+
+req = session.get('http://localhost/a', headers=HEADERS_1)
+req = session.post(
+    'https://localhost/b',
+    data={
+        'foo': 'bar'
+    },
+    headers=HEADERS_1
+)
+req = session.get('http://localhost/c', headers={'Accept': 'text/html'})
+''',
+        ),
+        (
+            'bash', 'curl',
+            '''#!/usr/bin/env bash
+
+HEADERS_1=(-H 'Accept: application/json' -H 'X-Foo: bar')
+
+curl "${HEADERS_1[@]}" http://localhost/a
+curl -X 'POST' -d 'foo=bar' "${HEADERS_1[@]}" https://localhost/b
+curl -H 'Accept: text/html' http://localhost/c
+''',
+        ),
+        (
+            'javascript', 'fetch',
+            '''const http = require('http');
+const https = require('https');
+const fetch = require('node-fetch');
+
+const httpAgent = new http.Agent({keepAlive: true});
+const httpsAgent = new https.Agent({keepAlive: true});
+
+const HEADERS_1 = {'Accept': 'application/json', 'X-Foo': 'bar'};
+
+fetch(
+  'http://localhost/a',
+  {
+    headers: HEADERS_1,
+    'agent': httpAgent
+  }
+).then(function(response) {
+  console.log(response);
+}).catch(function(err) {
+  console.error('Error:', err);
+});
+
+fetch(
+  'https://localhost/b',
+  {  
+    method: 'POST',
+    body: new URLSearchParams({
+      'foo': 'bar'
+    }),
+    headers: HEADERS_1,
+    'agent': httpsAgent
+  }
+).then(function(response) {
+  console.log(response);
+}).catch(function(err) {
+  console.error('Error:', err);
+});
+
+fetch(
+  'http://localhost/c',
+  {
+    headers: {
+      'Accept': 'text/html'
+    },
+    'agent': httpAgent
+  }
+).then(function(response) {
+  console.log(response);
+}).catch(function(err) {
+  console.error('Error:', err);
+});
+''',  # noqa: W291
+        ),
+        (
+            'python', 'locust',
+            '''from locust import HttpUser, task
+
+
+class WebsiteUser(HttpUser):
+    host = 'http://localhost'
+
+    @task
+    def get_a(self):
+        self.client.get(
+            '/a',
+            headers={
+                'Accept': 'application/json',
+                'X-Foo': 'bar'
+            }
+        )
+
+    @task
+    def post_b(self):
+        self.client.post(
+            'https://localhost/b',
+            data={
+                'foo': 'bar'
+            },
+            headers={
+                'Accept': 'application/json',
+                'X-Foo': 'bar'
+            }
+        )
+
+    @task
+    def get_c(self):
+        self.client.get('/c', headers={'Accept': 'text/html'})
+''',
+        ),
+        (
+            'bash', 'vegeta',
+            '''#!/usr/bin/env bash
+
+printf '%s' 'foo=bar' > body.txt
+
+vegeta attack <<'EOF' | vegeta report
+GET http://localhost/a
+Accept: application/json
+X-Foo: bar
+
+POST https://localhost/b
+Accept: application/json
+X-Foo: bar
+Content-Type: application/x-www-form-urlencoded
+@body.txt
+
+GET http://localhost/c
+Accept: text/html
+EOF
+''',
+        ),
+    ),
+    ids=(
+        'python-requests', 'bash-curl', 'javascript-fetch', 'python-locust',
+        'bash-vegeta',
+    ),
+)
+def test_generate_http_request_program(language, impl, expected_result):
+    result = generate_http_request_program(
+        REQUESTS, language=language, impl=impl,
+    )
+    assert result == expected_result
+
+
+def test_generate_http_request_program__form_data_variables():
+    result = generate_http_request_program(
+        [
+            {'method': 'POST', 'files': {'foo': '/tmp/foo.txt'}},
+            {'method': 'POST', 'files': {'bar': '/tmp/bar.txt'}},
+        ],
+        language='javascript',
+    )
+    assert result.count('require(\'form-data\')') == 1
+    assert 'const formData = new FormData();' in result
+    assert 'const formData2 = new FormData();' in result
+    assert 'body: formData2' in result
+
+
+def test_generate_http_request_program__multipart_encoder_variables():
+    result = generate_http_request_program(
+        [
+            {
+                'method': 'POST', 'files': {'foo': '/tmp/foo.txt'},
+                'stream_upload': True,
+            },
+            {
+                'method': 'POST', 'files': {'bar': '/tmp/bar.txt'},
+                'stream_upload': True,
+            },
+        ],
+    )
+    assert result.count(
+        'from requests_toolbelt import MultipartEncoder',
+    ) == 1
+    assert 'encoder = MultipartEncoder(' in result
+    assert 'encoder2 = MultipartEncoder(' in result
+    assert 'data=encoder2' in result
+
+
+def test_generate_http_request_program__program_argument():
+    with pytest.raises(ValueError, match='\'indent\' is defined for the'):
+        generate_http_request_program([{'indent': '  '}])
+
+
+def test_generate_http_request_program__response():
+    # all requests without files are performed sharing the session
+    requests = []
+    for method in ('GET', 'POST'):
+        for args_group in get_argument_combinations(method=method):
+            kwargs = combination_arguments_to_kwargs(args_group['arguments'])
+            if 'files' in kwargs or 'wrap' in kwargs or 'oneline' in kwargs:
+                continue
+            for argument in ('indent', 'quote_char', 'setup', 'teardown'):
+                kwargs.pop(argument, None)
+            requests.append(dict(kwargs, method=method))
+
+    result = generate_http_request_program(requests)
+    assert result.count('import requests') == 1
+
+    namespace = {}
+    exec(result, namespace)
+    assert namespace['req'].url.startswith(TEST_BASE_URL)
+    assert namespace['req'].status_code == 200
+
+
+def test_generate_http_request_program__python_requests_pool():
+    result = generate_http_request_program(
+        REQUESTS[:1], pool_connections=4, pool_maxsize=8,
+    )
+    assert result.count('from requests.adapters import HTTPAdapter') == 1
+    assert result.count(
+        'adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)',
+    ) == 1
+
+    with pytest.raises(ValueError, match='defined for the whole program'):
+        generate_http_request_program(
+            [dict(REQUESTS[0], session=True, pool_maxsize=8)],
+        )
+
+
+@pytest.mark.parametrize(
+    ('batch', 'concurrency', 'expected_result'),
+    (
+        (
+            'parallel', 4,
+            '''#!/usr/bin/env bash
+
+HEADERS_1=(-H 'Accept: application/json' -H 'X-Foo: bar')
+
+curl --parallel --parallel-max 4 \\
+    "${HEADERS_1[@]}" http://localhost/a \\
+    --next \\
+    -X 'POST' -d 'foo=bar' "${HEADERS_1[@]}" https://localhost/b \\
+    --next \\
+    -H 'Accept: text/html' http://localhost/c
+''',
+        ),
+        (
+            'config', None,
+            '''#!/usr/bin/env bash
+
+curl --parallel --config - <<'EOF'
+-H "Accept: application/json"
+-H "X-Foo: bar"
+url = "http://localhost/a"
+next
+-X "POST"
+-d "foo=bar"
+-H "Accept: application/json"
+-H "X-Foo: bar"
+url = "https://localhost/b"
+next
+-H "Accept: text/html"
+url = "http://localhost/c"
+EOF
+''',
+        ),
+        (
+            'xargs', 8,
+            '''#!/usr/bin/env bash
+
+xargs -P 8 -L 1 curl <<'EOF'
+-H 'Accept: application/json' -H 'X-Foo: bar' http://localhost/a
+-X 'POST' -d 'foo=bar' -H 'Accept: application/json' -H 'X-Foo: bar' https://localhost/b
+-H 'Accept: text/html' http://localhost/c
+EOF
+''',  # noqa: E501
+        ),
+    ),
+    ids=('parallel', 'config', 'xargs'),
+)
+def test_generate_http_request_program__bash_curl_batch(
+    batch, concurrency, expected_result,
+):
+    result = generate_http_request_program(
+        REQUESTS, language='bash', impl='curl', batch=batch,
+        concurrency=concurrency,
+    )
+    assert result == expected_result
+
+
+def test_generate_http_request_program__bash_curl_batch_config_escape():
+    # config files values are escaped from the values of the headers
+    headers = {'X-Foo': 'q"x\\y\'z'}
+    result = generate_http_request_program(
+        [{'url': TEST_BASE_URL, 'headers': headers}],
+        language='bash', impl='curl', batch='config',
+    )
+    assert result == '''#!/usr/bin/env bash
+
+curl --parallel --config - <<'EOF'
+-H "X-Foo: q\\"x\\\\y'z"
+url = "%s"
+EOF
+''' % TEST_BASE_URL
+
+    if shutil.which('curl') is None:
+        return
+    process = subprocess.run(
+        ['bash', '-c', result], stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE, timeout=10,
+    )
+    assert process.returncode == 0, process.stderr
+    response = json.loads(process.stdout)
+    assert response['headers']['X-Foo'] == headers['X-Foo']
+
+
+def test_generate_http_request_program__bash_curl_batch_xargs_wrap():
+    # xargs reads the arguments of each command from one line
+    result = generate_http_request_program(
+        REQUESTS, language='bash', impl='curl', batch='xargs', wrap=20,
+    )
+    lines = result.splitlines()
+    assert len(lines) == 7
+    assert not any(line.endswith('\\') for line in lines)
+
+
+@pytest.mark.parametrize(
+    ('requests', 'kwargs', 'exception', 'message'),
+    (
+        (REQUESTS, {'batch': 'foo'}, ValueError, '\'batch\' must be one of'),
+        (REQUESTS, {'concurrency': 4}, ValueError, 'requires \'batch\''),
+        (
+            REQUESTS, {'batch': 'parallel', 'concurrency': '4'},
+            TypeError, 'must be an integer',
+        ),
+        (
+            REQUESTS, {'batch': 'xargs', 'concurrency': 0},
+            ValueError, 'must be greater than 0',
+        ),
+        (
+            [
+                {
+                    'method': 'POST', 'compress': 'gzip',
+                    'parameters': [{'name': 'foo', 'value': 'bar'}],
+                },
+            ],
+            {'batch': 'parallel'},
+            ValueError, 'can\'t be used by batch programs',
+        ),
+        (
+            [
+                {
+                    'method': 'POST', 'large_body': 0,
+                    'parameters': [{'name': 'foo', 'value': 'bar'}],
+                },
+            ],
+            {'batch': 'config'},
+            ValueError, 'Large bodies can\'t be written by batch programs',
+        ),
+    ),
+    ids=(
+        'batch', 'concurrency', 'concurrency-type', 'concurrency-value',
+        'compress', 'large_body',
+    ),
+)
+def test_generate_http_request_program__bash_curl_batch_invalid(
+    requests, kwargs, exception, message,
+):
+    with pytest.raises(exception, match=message):
+        generate_http_request_program(
+            requests, language='bash', impl='curl', **kwargs,
+        )
+
+
+@pytest.mark.parametrize(
+    ('language', 'kwargs'),
+    (
+        ('python', {}),
+        ('javascript', {}),
+        ('bash', {}),
+        ('bash', {'batch': 'parallel'}),
+    ),
+    ids=('python', 'javascript', 'bash', 'bash-batch'),
+)
+def test_generate_http_request_program__measure(language, kwargs):
+    with pytest.raises(ValueError, match='not supported by programs'):
+        generate_http_request_program(
+            [{'url': TEST_BASE_URL, 'measure': True}], language=language,
+            **kwargs,
+        )
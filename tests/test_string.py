@@ -0,0 +1,71 @@
+'''Test string utilities.'''
+
+import random
+import string
+
+import pytest
+
+from http_request_codegen.generators.javascript._utils import (
+    str_definition as js_str_definition,
+)
+from http_request_codegen.generators.python._utils import (
+    str_definition as py_str_definition,
+)
+from http_request_codegen.hrc_string import escaped_chunks
+
+
+def _char_by_char_str_definition(
+    text, indent, quote_char, wrap, opening, continuation, closing,
+):
+    '''Reference implementation of string literals wrapping, adding
+    characters one by one.'''
+    response = opening + quote_char
+    _chars_in_current_line = len(response) + len(indent)
+    for i, ch in enumerate(text):
+        response += ch
+        _chars_in_current_line += 1
+        if _chars_in_current_line >= wrap - 2:
+            if i >= len(text) - 1:
+                break
+            response += quote_char + '\n' + indent + continuation + quote_char
+            _chars_in_current_line = len(continuation) + 1 + len(indent)
+    if _chars_in_current_line >= wrap - 1:
+        response += quote_char + '\n' + indent + closing
+    else:
+        response += quote_char + closing
+    return response
+
+
+@pytest.mark.parametrize('wrap', (1, 5, 10, 15, 40, 80))
+@pytest.mark.parametrize('indent', ('', '  ', '        '))
+@pytest.mark.parametrize('length', (1, 7, 39, 80, 333))
+def test_str_definition__char_by_char_equivalence(wrap, indent, length):
+    text = ''.join(
+        random.choice(string.ascii_letters + string.digits + ' /?&=')
+        for _ in range(length)
+    )
+
+    if length + len(indent) + 2 >= wrap:
+        assert py_str_definition(
+            text, indent=indent, quote_char='\'', wrap=wrap,
+        ) == _char_by_char_str_definition(
+            text, indent, '\'', wrap, '(', ' ', ')',
+        )
+        assert js_str_definition(
+            text, indent=indent, quote_char='\'', wrap=wrap,
+        ) == _char_by_char_str_definition(
+            text, indent, '\'', wrap, '', '+ ', '',
+        )
+
+
+@pytest.mark.parametrize('quote_char', ('\'', '"'))
+@pytest.mark.parametrize('width', (1, 2, 3, 7))
+def test_escaped_chunks__escape_sequences_not_splitted(quote_char, width):
+    text = ('a%sbc\\%s' % (quote_char, quote_char)) * 5
+    escaped = text.replace(quote_char, '\\' + quote_char)
+    chunks = escaped_chunks(escaped, width, escaped_char=quote_char)
+
+    assert ''.join(chunks) == escaped
+    for chunk in chunks:
+        assert chunk
+        assert not chunk.startswith(quote_char)
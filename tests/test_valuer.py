@@ -1,6 +1,8 @@
 '''Test valuer factories.'''
 
 import builtins
+import json
+import re
 import uuid
 from collections.abc import Iterable
 from types import LambdaType
@@ -9,7 +11,19 @@ import pytest
 from faker.providers.lorem import Provider as LoremProvider
 from faker.providers.lorem.en_US import Provider as EnUsLoremProvider
 
-from http_request_codegen.hrc_valuer import lazy_value_by_parameter
+from http_request_codegen.hrc_regex import (
+    PATTERN_MAX_EXTRA_REPEAT,
+    compile_pattern_sampler,
+)
+from http_request_codegen.hrc_schema import (
+    SCHEMA_MAX_REF_DEPTH,
+    compile_schema,
+)
+from http_request_codegen.hrc_valuer import (
+    lazy_json_body_by_parameters,
+    lazy_json_value_by_parameter,
+    lazy_value_by_parameter,
+)
 
 from tests.conftest import (
     value as _value_func,
@@ -227,3 +241,196 @@ def test_lazy_value_by_parameter__type(_type, seed, result, kwargs):
         assert result(lazy_value_by_parameter(parameter, seed=seed))
     else:
         assert lazy_value_by_parameter(parameter, seed=seed) == result
+
+
+@pytest.mark.parametrize(
+    ('pattern', 'seed', 'result'), (
+        (r'[A-Z]{3}-\d{6}', None, None),
+        (r'\+34 [6-9]\d{2}( \d{3}){2}', None, None),
+        (r'[a-z0-9]+(?:-[a-z0-9]+)*', None, None),
+        (r'^(foo|bar|baz)_\1$', None, None),
+        (r'[^a-z]\w.\S\W\D', None, None),
+        (r'(?i)[a-f]{2,4}', None, None),
+        (r'', None, None),
+
+        # pattern seeded
+        (r'[A-Z]{3}-\d{6}', 5, None),
+        (r'v\d+\.\d+\.\d+(-(alpha|beta|rc)\d?)?', 4, None),
+
+        # invalid pattern
+        ('[', None, ValueError),
+        # no printable characters matched
+        ('[^\x00-\x7f]', None, ValueError),
+    ),
+)
+def test_lazy_value_by_parameter__pattern(pattern, seed, result):
+    parameter = {'name': 'foo', 'pattern': pattern}
+    if hasattr(result, '__traceback__'):
+        with pytest.raises(result):
+            lazy_value_by_parameter(parameter, seed=seed)
+        return
+
+    for _ in range(20):
+        value = lazy_value_by_parameter(parameter, seed=seed)
+        assert isinstance(value, str)
+        assert re.fullmatch(pattern, value)
+        if seed is not None:
+            assert value == lazy_value_by_parameter(parameter, seed=seed)
+
+
+def test_compile_pattern_sampler():
+    sampler = compile_pattern_sampler('a+')
+    assert sampler is compile_pattern_sampler('a+')
+    for _ in range(20):
+        assert 1 <= len(sampler()) <= PATTERN_MAX_EXTRA_REPEAT + 1
+
+
+@pytest.mark.parametrize(
+    ('schema', 'result'), (
+        ({'type': 'integer', 'minimum': 3, 'maximum': 9, 'multipleOf': 3},
+         lambda r: r in (3, 6, 9)),
+        ({'type': 'integer', 'exclusiveMinimum': 0, 'exclusiveMaximum': 2},
+         lambda r: r == 1),
+        ({'type': 'number', 'minimum': 0, 'maximum': 1},
+         lambda r: isinstance(r, float) and 0 <= r <= 1),
+        ({'type': 'number', 'minimum': 0.001, 'maximum': 0.004},
+         lambda r: 0.001 <= r <= 0.004),
+        ({'type': 'number', 'exclusiveMinimum': 0, 'exclusiveMaximum': 0.01},
+         lambda r: 0 < r < 0.01),
+        ({'type': 'number', 'minimum': 1, 'maximum': 1,
+          'exclusiveMaximum': True},
+         ValueError),
+        ({'type': 'string', 'minLength': 20, 'maxLength': 25},
+         lambda r: 20 <= len(r) <= 25),
+        ({'type': 'string', 'format': 'uuid'},
+         lambda r: uuid.UUID(r).version == 4),
+        ({'type': 'string', 'format': 'date'},
+         lambda r: re.fullmatch(r'\d{4}-\d{2}-\d{2}', r)),
+        ({'type': 'string', 'format': 'email'},
+         lambda r: re.fullmatch(r'[a-z.]+@example\.(com|org|net)', r)),
+        ({'type': 'string', 'pattern': '[a-z]+', 'minLength': 5,
+          'maxLength': 6},
+         lambda r: re.fullmatch('[a-z]{5,6}', r)),
+        ({'type': 'string', 'format': 'uri-reference', 'maxLength': 9},
+         lambda r: len(r) <= 9 and re.fullmatch('(/[a-z]{3,8})+', r)),
+        ({'type': ['null', 'boolean']}, lambda r: r in (None, True, False)),
+        ({'enum': ['foo', 1]}, lambda r: r in ('foo', 1)),
+        ({'type': 'array', 'items': [{'const': 1}, {'type': 'null'}]},
+         lambda r: r == [1, None]),
+        ({'type': 'array', 'items': {'type': 'boolean'}, 'minItems': 0},
+         lambda r: len(r) <= 2),
+        ({'properties': {'a': {'$ref': '#/definitions/b'}},
+          'definitions': {'b': {'const': 'c'}}},
+         lambda r: r == {'a': 'c'}),
+        ({'allOf': [{'properties': {'a': {'const': 1}}},
+                    {'properties': {'b': {'const': 2}}}]},
+         lambda r: r == {'a': 1, 'b': 2}),
+        ({'oneOf': [{'const': 1}, {'const': 2}]}, lambda r: r in (1, 2)),
+        ({'type': 'object',
+          'properties': {'next': {'oneOf': [{'type': 'null'},
+                                            {'$ref': '#'}]}}},
+         lambda r: 'next' in r),
+
+        # unsupported
+        ({'type': 'foo'}, ValueError),
+        ({'$ref': 'https://example.com/schema.json'}, ValueError),
+        ({'$ref': '#/definitions/foo'}, ValueError),
+        ({'type': 'integer', 'minimum': 5, 'maximum': 4}, ValueError),
+        ({'enum': []}, ValueError),
+        ({'type': 'string', 'pattern': '[a-z]{2}', 'minLength': 3},
+         ValueError),
+    ),
+)
+def test_lazy_json_value_by_parameter__schema(schema, result):
+    parameter = {'name': 'foo', 'schema': schema}
+    if hasattr(result, '__traceback__'):
+        with pytest.raises(result):
+            lazy_json_value_by_parameter(parameter)
+        return
+
+    for _ in range(20):
+        assert result(lazy_json_value_by_parameter(parameter))
+
+
+@pytest.mark.parametrize('seed', (1, 5, 500))
+def test_lazy_json_value_by_parameter__schema_seeded(seed):
+    parameter = {
+        'name': 'foo',
+        'schema': {
+            'type': 'array',
+            'items': {
+                'properties': {
+                    'id': {'type': 'integer'},
+                    'score': {'type': 'number'},
+                    'code': {'pattern': '[A-Z]{3}'},
+                },
+            },
+        },
+    }
+    value = lazy_json_value_by_parameter(parameter, seed=seed)
+    assert value == lazy_json_value_by_parameter(parameter, seed=seed)
+
+    # string values are encoded as JSON
+    assert json.loads(lazy_value_by_parameter(parameter, seed=seed)) == value
+
+
+def test_lazy_json_body_by_parameters():
+    schema = {'type': 'array', 'items': {'const': 1}, 'maxItems': 1}
+    assert lazy_json_body_by_parameters([{'schema': schema}]) == [1]
+    assert lazy_json_body_by_parameters(
+        [{'name': 'foo', 'schema': schema}, {'name': 'bar', 'value': 1.5}],
+    ) == {'foo': [1], 'bar': 1.5}
+
+
+def test_compile_schema():
+    schema = {'properties': {'foo': {'type': 'boolean'}}}
+    assert compile_schema(schema) is compile_schema(dict(schema))
+
+
+def test_compile_schema__recursive():
+    def depth(tree):
+        return 1 + max([depth(child) for child in tree['children']] or [0])
+
+    generator = compile_schema({
+        'type': 'object',
+        'properties': {
+            'children': {'type': 'array', 'items': {'$ref': '#'}},
+            'name': {'type': 'string'},
+        },
+        'required': ['children'],
+    })
+    for _ in range(20):
+        tree = generator()
+        assert depth(tree) <= SCHEMA_MAX_REF_DEPTH + 2
+
+
+def test_compile_schema__all_of_required():
+    # optional properties of objects deeper than the maximum depth of
+    # references are skipped, so only the required ones are generated
+    generator = compile_schema({
+        '$ref': '#/definitions/ref-%d' % SCHEMA_MAX_REF_DEPTH,
+        'definitions': dict(
+            {
+                'ref-%d' % depth: {
+                    '$ref': '#/definitions/ref-%d' % (depth - 1),
+                } for depth in range(1, SCHEMA_MAX_REF_DEPTH + 1)
+            },
+            **{
+                'ref-0': {
+                    'allOf': [{'required': ['a']}, {'required': ['b']}],
+                    'properties': {
+                        'a': {'const': 1},
+                        'b': {'const': 2},
+                        'c': {'const': 3},
+                    },
+                },
+            },
+        ),
+    })
+    assert generator() == {'a': 1, 'b': 2}
+
+
+def test_compile_schema__constants_copied():
+    generator = compile_schema({'const': {'foo': [1]}})
+    generator()['foo'].append(2)
+    assert generator() == {'foo': [1]}
@@ -0,0 +1,81 @@
+'''Test rendering of code snippets with multiple styles.'''
+
+import os
+import re
+
+import pytest
+
+from http_request_codegen import render_variants
+from http_request_codegen.hrc_api import STYLE_ARGUMENTS
+
+from tests.combinations import combination_arguments_to_kwargs
+from tests.test_emitter import _golden_cases
+
+
+@pytest.mark.parametrize(
+    ('language', 'impl', 'method', 'args_group'),
+    _golden_cases(),
+    ids=lambda value: os.path.basename(value['filename'])
+    if isinstance(value, dict) else value,
+)
+def test_render_variants(language, impl, method, args_group):
+    with open(args_group['filename']) as f:
+        expected_result = f.read()
+
+    spec = combination_arguments_to_kwargs(args_group['arguments'])
+    style = {
+        argument: spec.pop(argument) for argument in STYLE_ARGUMENTS
+        if argument in spec
+    }
+    spec.update({'language': language, 'impl': impl, 'method': method})
+
+    assert render_variants(spec, styles=[style]) == [expected_result]
+
+
+def test_render_variants__values_resolved_once():
+    calls = []
+
+    def value():
+        calls.append(None)
+        return 'bar'
+
+    styles = [
+        {'quote_char': '"'},
+        {'quote_char': '\''},
+        {'indent': '  ', 'wrap': None},
+        {'oneline': True},
+        {'quote_char': '"'},
+    ]
+    for language, impl in (
+        ('python', 'requests'),
+        ('javascript', 'fetch'),
+        ('bash', 'curl'),
+    ):
+        calls.clear()
+        spec = {
+            'language': language,
+            'impl': impl,
+            'method': 'POST',
+            'parameters': [
+                {'name': 'foo', 'value': value},
+                {'name': 'random', 'type': 'int'},
+            ],
+        }
+        variants = render_variants(spec, styles=styles)
+
+        assert len(calls) == 1
+        assert len(variants) == len(styles)
+        assert variants[0] is variants[-1]
+        for variant in variants:
+            assert 'bar' in variant
+
+        # random values are the same in all variants
+        assert len({
+            re.search(r'random\W+(-?\d+)', variant).group(1)
+            for variant in variants
+        }) == 1
+
+
+def test_render_variants__not_style_argument():
+    with pytest.raises(ValueError, match='\'seed\' is not a style argument'):
+        render_variants({}, styles=[{'seed': 1}])